@@ -125,6 +125,11 @@ vr_lab_rear.create_user( VIP = False
                        , HEADTRACKING_TARGET_NAME = 'tracking-dlp-glasses-3'
                        , EYE_DISTANCE = 0.065)
 
+# extrapolate the head tracking to compensate the latency between tracking and display
+#vr_lab_rear.set_tracking_prediction( TARGET_NAME = 'tracking-dlp-glasses-1'
+#                                   , LOOK_AHEAD = 0.03
+#                                   , SMOOTHING = 0.3)
+
 ## Create tools ##
 
 # visibility table
@@ -0,0 +1,286 @@
+#!/usr/bin/python
+
+## @file
+# Headless stand-in for the avango core module. Provides the field classes, field connections
+# and the TimeSensor node so that the framework scripts can be evaluated without a guacamole installation.
+
+# import python libraries
+import time
+
+## @var call_observer
+# Optional callable wrapping every script callback invocation (field change handlers,
+# evaluate methods and Update callbacks). Used by the benchmark to take timings.
+call_observer = None
+
+## Invokes a script callback, passing it to call_observer if one is set.
+# @param CALLBACK The bound method to be called.
+def invoke(CALLBACK):
+
+  if call_observer == None:
+    return CALLBACK()
+
+  return call_observer(CALLBACK)
+
+
+## Base class of all single and multi fields. Values are propagated immediately
+# along field connections and field change handlers are called synchronously.
+class Field(object):
+
+  ## @var _container
+  # Script owning this field, notified about value changes. None for node fields.
+  _container = None
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var _value
+    # Stored value of this field.
+    self._value = self.default_value()
+
+    ## @var _source
+    # Field this field is connected from, None if unconnected.
+    self._source = None
+
+    ## @var _targets
+    # List of fields which are connected from this field.
+    self._targets = []
+
+    ## @var _callbacks
+    # Bound field change handlers to be called when the value is set.
+    self._callbacks = []
+
+    ## @var _propagating
+    # Boolean preventing endless propagation in cyclic (weak) field connections.
+    self._propagating = False
+
+  ## Returns the initial value of a newly created field.
+  def default_value(self):
+    return None
+
+  ## Creates an unconnected copy of this field carrying the same value. Used to
+  # instantiate the class-level field declarations of scripts per instance.
+  def clone(self):
+    _field = self.__class__()
+    _field._value = self.copy_value(self._value)
+    return _field
+
+  ## Returns a copy of a value as returned to the caller of the value property.
+  # @param VALUE The value to be copied.
+  def copy_value(self, VALUE):
+
+    try:
+      return VALUE.copy()
+    except AttributeError:
+      return VALUE
+
+  ## Getter of the value property.
+  def get_value(self):
+    return self.copy_value(self._value)
+
+  ## Setter of the value property.
+  # @param VALUE The value to be set.
+  def set_value(self, VALUE):
+    self._value = VALUE
+    self.touch()
+
+  value = property(lambda self: self.get_value(), lambda self, VALUE: self.set_value(VALUE))
+
+  ## Calls the field change handlers and pushes the value to all connected fields.
+  def touch(self):
+
+    if self._propagating:
+      return
+
+    self._propagating = True
+
+    try:
+      if self._container != None:
+        self._container.field_touched()
+
+      for _callback in self._callbacks:
+        invoke(_callback)
+
+      if len(self._targets) > 0:
+        _value = self.get_value()
+
+        for _target in self._targets:
+          _target.set_value(_value)
+
+    finally:
+      self._propagating = False
+
+  ## Connects this field from another one and takes over its current value.
+  # @param SOURCE The field to connect from.
+  def connect_from(self, SOURCE):
+    self.connect_weak_from(SOURCE)
+    self.set_value(SOURCE.get_value())
+
+  ## Connects this field from another one without taking over the current value.
+  # @param SOURCE The field to connect from.
+  def connect_weak_from(self, SOURCE):
+    self.disconnect()
+    self._source = SOURCE
+    SOURCE._targets.append(self)
+
+  ## Excludes this field from distribution. Nothing to do for the stand-in.
+  # @param FLAG Boolean saying if the field is not to be distributed.
+  def dont_distribute(self, FLAG):
+    pass
+
+  ## Removes the incoming connection of this field.
+  def disconnect(self):
+
+    if self._source != None:
+      self._source._targets.remove(self)
+      self._source = None
+
+  ## Removes the incoming connection of this field if it comes from SOURCE.
+  # @param SOURCE The field to disconnect from.
+  def disconnect_from(self, SOURCE):
+
+    if self._source == SOURCE:
+      self.disconnect()
+
+
+## Field holding a boolean.
+class SFBool(Field):
+  def default_value(self):
+    return False
+
+## Field holding an integer.
+class SFInt(Field):
+  def default_value(self):
+    return 0
+
+## Field holding an unsigned integer.
+class SFUInt(SFInt):
+  pass
+
+## Field holding a float.
+class SFFloat(Field):
+  def default_value(self):
+    return 0.0
+
+## Field holding a double.
+class SFDouble(SFFloat):
+  pass
+
+## Field holding a string.
+class SFString(Field):
+  def default_value(self):
+    return ""
+
+
+## Base class of fields holding a list of values. The value is returned live.
+class MultiField(Field):
+
+  def default_value(self):
+    return []
+
+  def copy_value(self, VALUE):
+    return list(VALUE)
+
+  def get_value(self):
+    return self._value
+
+  def set_value(self, VALUE):
+    self._value = list(VALUE)
+    self.touch()
+
+## Field holding a list of booleans.
+class MFBool(MultiField):
+  pass
+
+## Field holding a list of integers.
+class MFInt(MultiField):
+  pass
+
+## Field holding a list of floats.
+class MFFloat(MultiField):
+  pass
+
+## Field holding a list of strings.
+class MFString(MultiField):
+  pass
+
+
+## Base class of all stand-in nodes. Fields are created on first access, with a default
+# value derived from the field name, so that arbitrary node types can be represented.
+class Node(object):
+
+  ## @var field_types
+  # Dictionary mapping field names to the field classes to be created for them.
+  field_types = {}
+
+  ## Default constructor.
+  # @param kwargs Initial field values, e.g. Name = "head".
+  def __init__(self, **kwargs):
+
+    for _name, _value in kwargs.items():
+      getattr(self, _name).value = _value
+
+  ## Creates a field on first access.
+  # @param NAME The name of the requested field.
+  def __getattr__(self, NAME):
+
+    if NAME.startswith("_") or NAME[0].islower():
+      raise AttributeError(NAME)
+
+    _field = self.create_field(NAME)
+    self.__dict__[NAME] = _field
+    return _field
+
+  ## Creates the field instance for a field name.
+  # @param NAME The name of the field to be created.
+  def create_field(self, NAME):
+
+    for _class in type(self).__mro__:
+
+      try:
+        return _class.field_types[NAME]()
+      except (AttributeError, KeyError):
+        pass
+
+    if NAME.startswith("Button"):
+      return SFBool()
+    elif NAME.startswith("Value") or NAME == "Time":
+      return SFFloat()
+    elif NAME.startswith("Enable") or NAME.startswith("Is"):
+      return SFBool()
+
+    return Field()
+
+  ## Checks if a field was declared for this node.
+  # @param NAME The field name to be checked.
+  def has_field(self, NAME):
+    return NAME in self.__dict__
+
+  ## Adds a field to this node and sets its value.
+  # @param FIELD The field instance to be added.
+  # @param NAME The name of the field.
+  # @param VALUE The initial value.
+  def add_and_init_field(self, FIELD, NAME, VALUE):
+    self.__dict__[NAME] = FIELD
+    FIELD.value = VALUE
+
+  ## Returns the type string of this node.
+  def get_type(self):
+    return "av::" + type(self).__name__
+
+
+## Stand-in namespace for avango.nodes.
+class nodes:
+
+  ## Node supplying the current time in seconds.
+  class TimeSensor(Node):
+
+    ## @var Time
+    # Current time in seconds, read on access.
+    Time = property(lambda self: _TimeField())
+
+
+## Read-only field returning the current time.
+class _TimeField(SFFloat):
+
+  def get_value(self):
+    return time.time()
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+## @file
+# Headless stand-in for avango.daemon. Device sensors are registered so that the benchmark
+# can feed synthetic tracking and device data into them.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+## @var device_sensors
+# List of all DeviceSensor instances, in creation order.
+device_sensors = []
+
+
+## Device service the sensors read from.
+class DeviceService(avango.Node):
+  pass
+
+
+## Stand-in namespace for avango.daemon.nodes.
+class nodes:
+
+  ## Sensor exposing the values of one station.
+  class DeviceSensor(avango.Node):
+
+    ## @var field_types
+    # Dictionary mapping field names to the field classes to be created for them.
+    field_types = { "Station" : avango.SFString
+                  , "Matrix" : avango.gua.SFMatrix4
+                  , "TransmitterOffset" : avango.gua.SFMatrix4
+                  , "ReceiverOffset" : avango.gua.SFMatrix4 }
+
+    ## Default constructor.
+    # @param kwargs Initial field values, usually DeviceService and Station.
+    def __init__(self, **kwargs):
+      avango.Node.__init__(self, **kwargs)
+      device_sensors.append(self)
+
+
+## Daemon station. Only used by the daemon process, which is not run headless.
+class Station(avango.Node):
+  pass
+
+## Daemon input device. Only used by the daemon process, which is not run headless.
+class DTrack(avango.Node):
+  pass
+
+## Daemon input device. Only used by the daemon process, which is not run headless.
+class HIDInput(avango.Node):
+  pass
+
+## Daemon input device. Only used by the daemon process, which is not run headless.
+class TUIOInput(avango.Node):
+  pass
+
+## Daemon input device. Only used by the daemon process, which is not run headless.
+class Oculus(avango.Node):
+  pass
+
+## Runs the daemon. Nothing to do for the stand-in.
+# @param DEVICES List of devices to be served.
+def run(DEVICES):
+  pass
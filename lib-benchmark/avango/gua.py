@@ -0,0 +1,907 @@
+#!/usr/bin/python
+
+## @file
+# Headless stand-in for avango.gua. Provides the math types, the scenegraph node types and a
+# ray test treating every pickable geometry as a unit quad in its local xz-plane.
+
+# import avango-guacamole libraries
+import avango
+
+# import python libraries
+import math
+
+
+## Two-dimensional vector.
+class Vec2(object):
+
+  def __init__(self, X = 0.0, Y = 0.0):
+    self.x = X
+    self.y = Y
+
+  def copy(self):
+    return self.__class__(self.x, self.y)
+
+  def __eq__(self, OTHER):
+    return isinstance(OTHER, Vec2) and self.x == OTHER.x and self.y == OTHER.y
+
+  def __repr__(self):
+    return "(" + str(self.x) + ", " + str(self.y) + ")"
+
+## Two-dimensional vector of unsigned integers.
+class Vec2ui(Vec2):
+  pass
+
+
+## Three-dimensional vector.
+class Vec3(object):
+
+  def __init__(self, X = 0.0, Y = 0.0, Z = 0.0):
+    self.x = X
+    self.y = Y
+    self.z = Z
+
+  def copy(self):
+    return Vec3(self.x, self.y, self.z)
+
+  def __add__(self, OTHER):
+    return Vec3(self.x + OTHER.x, self.y + OTHER.y, self.z + OTHER.z)
+
+  def __sub__(self, OTHER):
+    return Vec3(self.x - OTHER.x, self.y - OTHER.y, self.z - OTHER.z)
+
+  def __mul__(self, OTHER):
+
+    if isinstance(OTHER, Vec3):
+      return Vec3(self.x * OTHER.x, self.y * OTHER.y, self.z * OTHER.z)
+
+    return Vec3(self.x * OTHER, self.y * OTHER, self.z * OTHER)
+
+  __rmul__ = __mul__
+
+  def __truediv__(self, OTHER):
+    return Vec3(self.x / OTHER, self.y / OTHER, self.z / OTHER)
+
+  def __neg__(self):
+    return Vec3(-self.x, -self.y, -self.z)
+
+  def __eq__(self, OTHER):
+    return isinstance(OTHER, Vec3) and self.x == OTHER.x and self.y == OTHER.y and self.z == OTHER.z
+
+  def __ne__(self, OTHER):
+    return not self.__eq__(OTHER)
+
+  __hash__ = object.__hash__
+
+  def __repr__(self):
+    return "(" + str(self.x) + ", " + str(self.y) + ", " + str(self.z) + ")"
+
+  def length(self):
+    return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+  def normalize(self):
+
+    _length = self.length()
+
+    if _length > 0.0:
+      self.x /= _length
+      self.y /= _length
+      self.z /= _length
+
+  def dot(self, OTHER):
+    return self.x * OTHER.x + self.y * OTHER.y + self.z * OTHER.z
+
+  def cross(self, OTHER):
+    return Vec3(self.y * OTHER.z - self.z * OTHER.y,
+                self.z * OTHER.x - self.x * OTHER.z,
+                self.x * OTHER.y - self.y * OTHER.x)
+
+  def lerp_to(self, OTHER, RATIO):
+    return self + (OTHER - self) * RATIO
+
+
+## Four-dimensional vector, also returned when transforming a Vec3 by a Mat4.
+class Vec4(object):
+
+  def __init__(self, X = 0.0, Y = 0.0, Z = 0.0, W = 0.0):
+    self.x = X
+    self.y = Y
+    self.z = Z
+    self.w = W
+
+  def copy(self):
+    return Vec4(self.x, self.y, self.z, self.w)
+
+  def __add__(self, OTHER):
+    return Vec4(self.x + OTHER.x, self.y + OTHER.y, self.z + OTHER.z, self.w + getattr(OTHER, "w", 0.0))
+
+  def __sub__(self, OTHER):
+    return Vec4(self.x - OTHER.x, self.y - OTHER.y, self.z - OTHER.z, self.w - getattr(OTHER, "w", 0.0))
+
+  def __mul__(self, OTHER):
+    return Vec4(self.x * OTHER, self.y * OTHER, self.z * OTHER, self.w * OTHER)
+
+  __rmul__ = __mul__
+
+  def __repr__(self):
+    return "(" + str(self.x) + ", " + str(self.y) + ", " + str(self.z) + ", " + str(self.w) + ")"
+
+  def length(self):
+    return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w)
+
+
+## Color with red, green and blue components.
+class Color(object):
+
+  def __init__(self, R = 0.0, G = 0.0, B = 0.0):
+    self.r = R
+    self.g = G
+    self.b = B
+
+  def copy(self):
+    return Color(self.r, self.g, self.b)
+
+  def __repr__(self):
+    return "(" + str(self.r) + ", " + str(self.g) + ", " + str(self.b) + ")"
+
+
+## Rotation quaternion.
+class Quat(object):
+
+  def __init__(self, X = 0.0, Y = 0.0, Z = 0.0, W = 1.0):
+    self.x = X
+    self.y = Y
+    self.z = Z
+    self.w = W
+
+  def copy(self):
+    return Quat(self.x, self.y, self.z, self.w)
+
+  def __repr__(self):
+    return "(" + str(self.x) + ", " + str(self.y) + ", " + str(self.z) + ", " + str(self.w) + ")"
+
+  ## Returns the rotation angle in degrees.
+  def get_angle(self):
+    return math.degrees(2.0 * math.acos(max(-1.0, min(1.0, self.w))))
+
+  ## Returns the rotation axis.
+  def get_axis(self):
+
+    _s = math.sqrt(max(0.0, 1.0 - self.w * self.w))
+
+    if _s < 0.000001:
+      return Vec3(0.0, 0.0, 0.0)
+
+    return Vec3(self.x / _s, self.y / _s, self.z / _s)
+
+  ## Spherical linear interpolation to another quaternion.
+  # @param OTHER The target quaternion for a ratio of 1.
+  # @param RATIO The interpolation ratio.
+  def slerp_to(self, OTHER, RATIO):
+
+    _dot = self.x * OTHER.x + self.y * OTHER.y + self.z * OTHER.z + self.w * OTHER.w
+    _sign = 1.0
+
+    if _dot < 0.0:
+      _dot = -_dot
+      _sign = -1.0
+
+    if _dot > 0.9995:
+      _a = 1.0 - RATIO
+      _b = RATIO * _sign
+    else:
+      _theta = math.acos(_dot)
+      _a = math.sin((1.0 - RATIO) * _theta) / math.sin(_theta)
+      _b = math.sin(RATIO * _theta) / math.sin(_theta) * _sign
+
+    _quat = Quat(_a * self.x + _b * OTHER.x,
+                 _a * self.y + _b * OTHER.y,
+                 _a * self.z + _b * OTHER.z,
+                 _a * self.w + _b * OTHER.w)
+
+    _length = math.sqrt(_quat.x * _quat.x + _quat.y * _quat.y + _quat.z * _quat.z + _quat.w * _quat.w)
+    return Quat(_quat.x / _length, _quat.y / _length, _quat.z / _length, _quat.w / _length)
+
+
+## Affine 4x4 matrix. Elements are stored row by row, the translation is in the last column.
+class Mat4(object):
+
+  def __init__(self, ELEMENTS = None):
+
+    if ELEMENTS == None:
+      self.m = [1.0, 0.0, 0.0, 0.0,
+                0.0, 1.0, 0.0, 0.0,
+                0.0, 0.0, 1.0, 0.0,
+                0.0, 0.0, 0.0, 1.0]
+    else:
+      self.m = ELEMENTS
+
+  def copy(self):
+    return Mat4(list(self.m))
+
+  def __eq__(self, OTHER):
+    return isinstance(OTHER, Mat4) and self.m == OTHER.m
+
+  def __ne__(self, OTHER):
+    return not self.__eq__(OTHER)
+
+  __hash__ = object.__hash__
+
+  def __repr__(self):
+    return "\n".join(str(self.m[_r * 4 : _r * 4 + 4]) for _r in range(4))
+
+  def __mul__(self, OTHER):
+
+    _a = self.m
+
+    if isinstance(OTHER, Mat4):
+      _b = OTHER.m
+      return Mat4([_a[_r]     * _b[_c] + _a[_r + 1] * _b[_c + 4] + \
+                   _a[_r + 2] * _b[_c + 8] + _a[_r + 3] * _b[_c + 12]
+                   for _r in (0, 4, 8, 12) for _c in (0, 1, 2, 3)])
+
+    _w = getattr(OTHER, "w", 1.0)
+
+    return Vec4(_a[0] * OTHER.x + _a[1] * OTHER.y + _a[2] * OTHER.z + _a[3] * _w,
+                _a[4] * OTHER.x + _a[5] * OTHER.y + _a[6] * OTHER.z + _a[7] * _w,
+                _a[8] * OTHER.x + _a[9] * OTHER.y + _a[10] * OTHER.z + _a[11] * _w,
+                _a[12] * OTHER.x + _a[13] * OTHER.y + _a[14] * OTHER.z + _a[15] * _w)
+
+  def get_element(self, ROW, COLUMN):
+    return self.m[ROW * 4 + COLUMN]
+
+  def set_element(self, ROW, COLUMN, VALUE):
+    self.m[ROW * 4 + COLUMN] = VALUE
+
+  def get_translate(self):
+    return Vec3(self.m[3], self.m[7], self.m[11])
+
+  def set_translate(self, VEC):
+    self.m[3] = VEC.x
+    self.m[7] = VEC.y
+    self.m[11] = VEC.z
+
+  def get_scale(self):
+    _m = self.m
+    return Vec3(math.sqrt(_m[0] * _m[0] + _m[4] * _m[4] + _m[8] * _m[8]),
+                math.sqrt(_m[1] * _m[1] + _m[5] * _m[5] + _m[9] * _m[9]),
+                math.sqrt(_m[2] * _m[2] + _m[6] * _m[6] + _m[10] * _m[10]))
+
+  ## Returns the rotation part as quaternion, ignoring the scaling.
+  def get_rotate_scale_corrected(self):
+
+    _s = self.get_scale()
+    _m = self.m
+
+    _sx = _s.x if _s.x > 0.0 else 1.0
+    _sy = _s.y if _s.y > 0.0 else 1.0
+    _sz = _s.z if _s.z > 0.0 else 1.0
+
+    _m00, _m01, _m02 = _m[0] / _sx, _m[1] / _sy, _m[2] / _sz
+    _m10, _m11, _m12 = _m[4] / _sx, _m[5] / _sy, _m[6] / _sz
+    _m20, _m21, _m22 = _m[8] / _sx, _m[9] / _sy, _m[10] / _sz
+
+    _trace = _m00 + _m11 + _m22
+
+    if _trace > 0.0:
+      _t = math.sqrt(_trace + 1.0) * 2.0
+      return Quat((_m21 - _m12) / _t, (_m02 - _m20) / _t, (_m10 - _m01) / _t, 0.25 * _t)
+
+    elif _m00 > _m11 and _m00 > _m22:
+      _t = math.sqrt(max(0.0, 1.0 + _m00 - _m11 - _m22)) * 2.0
+      return Quat(0.25 * _t, (_m01 + _m10) / _t, (_m02 + _m20) / _t, (_m21 - _m12) / _t)
+
+    elif _m11 > _m22:
+      _t = math.sqrt(max(0.0, 1.0 + _m11 - _m00 - _m22)) * 2.0
+      return Quat((_m01 + _m10) / _t, 0.25 * _t, (_m12 + _m21) / _t, (_m02 - _m20) / _t)
+
+    _t = math.sqrt(max(0.0, 1.0 + _m22 - _m00 - _m11)) * 2.0
+    return Quat((_m02 + _m20) / _t, (_m12 + _m21) / _t, 0.25 * _t, (_m10 - _m01) / _t)
+
+  get_rotate = get_rotate_scale_corrected
+
+
+## Returns an identity matrix.
+def make_identity_mat():
+  return Mat4()
+
+## Returns a translation matrix.
+# @param X Translation vector or translation in x direction.
+def make_trans_mat(X, Y = None, Z = None):
+
+  if Y == None:
+    X, Y, Z = X.x, X.y, X.z
+
+  return Mat4([1.0, 0.0, 0.0, X,
+               0.0, 1.0, 0.0, Y,
+               0.0, 0.0, 1.0, Z,
+               0.0, 0.0, 0.0, 1.0])
+
+## Returns a scaling matrix.
+# @param X Uniform scaling factor, scaling vector or scaling in x direction.
+def make_scale_mat(X, Y = None, Z = None):
+
+  if Y == None:
+
+    if isinstance(X, Vec3):
+      X, Y, Z = X.x, X.y, X.z
+    else:
+      Y, Z = X, X
+
+  return Mat4([X, 0.0, 0.0, 0.0,
+               0.0, Y, 0.0, 0.0,
+               0.0, 0.0, Z, 0.0,
+               0.0, 0.0, 0.0, 1.0])
+
+## Returns a rotation matrix.
+# @param ANGLE Rotation quaternion or rotation angle in degrees.
+# @param X Rotation axis or x component of the rotation axis.
+def make_rot_mat(ANGLE, X = None, Y = None, Z = None):
+
+  if isinstance(ANGLE, Quat):
+    _q = ANGLE
+    _length = math.sqrt(_q.x * _q.x + _q.y * _q.y + _q.z * _q.z + _q.w * _q.w)
+
+    if _length == 0.0:
+      return Mat4()
+
+    _x, _y, _z, _w = _q.x / _length, _q.y / _length, _q.z / _length, _q.w / _length
+
+    return Mat4([1.0 - 2.0 * (_y * _y + _z * _z), 2.0 * (_x * _y - _z * _w), 2.0 * (_x * _z + _y * _w), 0.0,
+                 2.0 * (_x * _y + _z * _w), 1.0 - 2.0 * (_x * _x + _z * _z), 2.0 * (_y * _z - _x * _w), 0.0,
+                 2.0 * (_x * _z - _y * _w), 2.0 * (_y * _z + _x * _w), 1.0 - 2.0 * (_x * _x + _y * _y), 0.0,
+                 0.0, 0.0, 0.0, 1.0])
+
+  if Y == None:
+    X, Y, Z = X.x, X.y, X.z
+
+  _length = math.sqrt(X * X + Y * Y + Z * Z)
+
+  if _length == 0.0:
+    return Mat4()
+
+  _x, _y, _z = X / _length, Y / _length, Z / _length
+  _c = math.cos(math.radians(ANGLE))
+  _s = math.sin(math.radians(ANGLE))
+  _t = 1.0 - _c
+
+  return Mat4([_t * _x * _x + _c, _t * _x * _y - _s * _z, _t * _x * _z + _s * _y, 0.0,
+               _t * _x * _y + _s * _z, _t * _y * _y + _c, _t * _y * _z - _s * _x, 0.0,
+               _t * _x * _z - _s * _y, _t * _y * _z + _s * _x, _t * _z * _z + _c, 0.0,
+               0.0, 0.0, 0.0, 1.0])
+
+## Returns the inverse of an affine matrix.
+# @param MATRIX The matrix to be inverted.
+def make_inverse_mat(MATRIX):
+
+  _m = MATRIX.m
+
+  _c00 = _m[5] * _m[10] - _m[6] * _m[9]
+  _c01 = _m[2] * _m[9] - _m[1] * _m[10]
+  _c02 = _m[1] * _m[6] - _m[2] * _m[5]
+  _c10 = _m[6] * _m[8] - _m[4] * _m[10]
+  _c11 = _m[0] * _m[10] - _m[2] * _m[8]
+  _c12 = _m[2] * _m[4] - _m[0] * _m[6]
+  _c20 = _m[4] * _m[9] - _m[5] * _m[8]
+  _c21 = _m[1] * _m[8] - _m[0] * _m[9]
+  _c22 = _m[0] * _m[5] - _m[1] * _m[4]
+
+  _det = _m[0] * _c00 + _m[1] * _c10 + _m[2] * _c20
+
+  if _det == 0.0:
+    return Mat4()
+
+  _d = 1.0 / _det
+
+  _r00, _r01, _r02 = _c00 * _d, _c01 * _d, _c02 * _d
+  _r10, _r11, _r12 = _c10 * _d, _c11 * _d, _c12 * _d
+  _r20, _r21, _r22 = _c20 * _d, _c21 * _d, _c22 * _d
+
+  return Mat4([_r00, _r01, _r02, -(_r00 * _m[3] + _r01 * _m[7] + _r02 * _m[11]),
+               _r10, _r11, _r12, -(_r10 * _m[3] + _r11 * _m[7] + _r12 * _m[11]),
+               _r20, _r21, _r22, -(_r20 * _m[3] + _r21 * _m[7] + _r22 * _m[11]),
+               0.0, 0.0, 0.0, 1.0])
+
+
+## Field holding a matrix.
+class SFMatrix4(avango.Field):
+  def default_value(self):
+    return Mat4()
+
+## Field holding a Vec2.
+class SFVec2(avango.Field):
+  def default_value(self):
+    return Vec2()
+
+## Field holding a Vec2ui.
+class SFVec2ui(avango.Field):
+  def default_value(self):
+    return Vec2ui()
+
+## Field holding a Vec3.
+class SFVec3(avango.Field):
+  def default_value(self):
+    return Vec3()
+
+## Field holding a Vec4.
+class SFVec4(avango.Field):
+  def default_value(self):
+    return Vec4()
+
+## Field holding a quaternion.
+class SFQuat(avango.Field):
+  def default_value(self):
+    return Quat()
+
+## Field holding a color.
+class SFColor(avango.Field):
+  def default_value(self):
+    return Color()
+
+## Field holding a list of pick results.
+class MFPickResult(avango.MultiField):
+  pass
+
+## Field holding a list of nodes.
+class MFNode(avango.MultiField):
+  pass
+
+
+## Loader flags.
+class LoaderFlags:
+  DEFAULTS = 0
+  LOAD_MATERIALS = 1
+  OPTIMIZE_GEOMETRY = 2
+  MAKE_PICKABLE = 4
+  NORMALIZE_SCALE = 8
+  NORMALIZE_POSITION = 16
+
+## Loader flags of the PLODLoader.
+class PLODLoaderFlags:
+  DEFAULTS = 0
+  MAKE_PICKABLE = 4
+  NORMALIZE_SCALE = 8
+  NORMALIZE_POSITION = 16
+
+## Picking options of SceneGraph.ray_test.
+class PickingOptions:
+  ALL = 0
+  PICK_ONLY_FIRST_OBJECT = 1
+  PICK_ONLY_FIRST_FACE = 2
+  GET_POSITIONS = 4
+  GET_WORLD_POSITIONS = 8
+  GET_NORMALS = 16
+  GET_WORLD_NORMALS = 32
+  INTERPOLATE_NORMALS = 64
+  GET_TEXTURE_COORDS = 128
+
+## Shadow modes of geometry nodes.
+class ShadowMode:
+  OFF = 0
+  LOW_QUALITY = 1
+  HIGH_QUALITY = 2
+
+## Background modes of pipelines.
+class BackgroundMode:
+  COLOR = 0
+  SKYMAP_TEXTURE = 1
+  QUAD_TEXTURE = 2
+
+## Stereo modes of pipelines.
+class StereoMode:
+  MONO = 0
+  SIDE_BY_SIDE = 1
+  ANAGLYPH_RED_GREEN = 2
+  ANAGLYPH_RED_CYAN = 3
+  CHECKERBOARD = 4
+
+## Projection modes of cameras.
+class ProjectionMode:
+  PERSPECTIVE = 0
+  ORTHOGRAPHIC = 1
+
+
+## @var world_transform_fields
+# List of WorldTransform fields which have been created, used to propagate changes along their connections.
+world_transform_fields = []
+
+## @var pickable_nodes
+# List of geometry nodes loaded with the MAKE_PICKABLE flag.
+pickable_nodes = []
+
+
+## Children field, keeping the Parent fields of the contained nodes up to date.
+class _ChildrenField(avango.MultiField):
+
+  def __init__(self, OWNER = None):
+    self.owner = OWNER
+    avango.MultiField.__init__(self)
+
+  def default_value(self):
+    return _ChildList(self)
+
+  def copy_value(self, VALUE):
+    return list(VALUE)
+
+  def set_value(self, VALUE):
+
+    for _child in self._value:
+      _child.Parent._value = None
+
+    self._value = _ChildList(self, VALUE)
+    self.touch()
+
+## List of child nodes setting the Parent field of appended nodes.
+class _ChildList(list):
+
+  def __init__(self, FIELD, NODES = []):
+    list.__init__(self)
+    self.field = FIELD
+
+    for _node in NODES:
+      self.append(_node)
+
+  def append(self, NODE):
+    NODE.Parent._value = self.field.owner
+    list.append(self, NODE)
+
+  def insert(self, INDEX, NODE):
+    NODE.Parent._value = self.field.owner
+    list.insert(self, INDEX, NODE)
+
+  def extend(self, NODES):
+
+    for _node in NODES:
+      self.append(_node)
+
+  def remove(self, NODE):
+    list.remove(self, NODE)
+    NODE.Parent._value = None
+
+
+## WorldTransform field, computed from the Transform fields along the parent chain.
+class _WorldTransformField(SFMatrix4):
+
+  def __init__(self, OWNER = None):
+    self.owner = OWNER
+    SFMatrix4.__init__(self)
+    world_transform_fields.append(self)
+
+  def get_value(self):
+    return self.owner.compute_world_transform()
+
+  def set_value(self, VALUE):
+    self._value = VALUE
+    self.touch()
+
+## Path field, computed from the names along the parent chain.
+class _PathField(avango.SFString):
+
+  def __init__(self, OWNER = None):
+    self.owner = OWNER
+    avango.SFString.__init__(self)
+
+  def get_value(self):
+    return self.owner.compute_path()
+
+## BoundingBox field, computed from the geometries in the subgraph.
+class _BoundingBoxField(avango.Field):
+
+  def __init__(self, OWNER = None):
+    self.owner = OWNER
+    avango.Field.__init__(self)
+
+  def get_value(self):
+    return self.owner.compute_bounding_box()
+
+
+## Axis aligned bounding box in world coordinates.
+class BoundingBox(avango.Node):
+  field_types = {"Min" : SFVec3, "Max" : SFVec3}
+
+
+## Base class of all scenegraph nodes.
+class Node(avango.Node):
+
+  ## @var field_types
+  # Dictionary mapping field names to the field classes to be created for them.
+  field_types = { "Transform" : SFMatrix4
+                , "Name" : avango.SFString
+                , "GroupNames" : avango.MFString
+                , "Material" : avango.SFString
+                , "Geometry" : avango.SFString
+                , "Width" : avango.SFFloat
+                , "Height" : avango.SFFloat }
+
+  ## @var owned_fields
+  # Dictionary mapping names of fields computed from the node itself to their classes.
+  owned_fields = { "Children" : _ChildrenField
+                 , "WorldTransform" : _WorldTransformField
+                 , "Path" : _PathField
+                 , "BoundingBox" : _BoundingBoxField }
+
+  ## @var is_geometry
+  # Boolean saying if the node contributes a unit cube to bounding box computations.
+  is_geometry = False
+
+  ## Creates the field instance for a field name.
+  # @param NAME The name of the field to be created.
+  def create_field(self, NAME):
+
+    if NAME in Node.owned_fields:
+      return Node.owned_fields[NAME](self)
+
+    return avango.Node.create_field(self, NAME)
+
+  ## Returns the type string of this node.
+  def get_type(self):
+    return "av::gua::" + type(self).__name__
+
+  ## Computes the world transformation of this node.
+  def compute_world_transform(self):
+
+    _parent = self.Parent._value
+
+    if _parent == None:
+      return self.Transform._value.copy()
+
+    return _parent.compute_world_transform() * self.Transform._value
+
+  ## Computes the scenegraph path of this node.
+  def compute_path(self):
+
+    _parent = self.Parent._value
+
+    if _parent == None:
+      return "/"
+
+    _parent_path = _parent.compute_path()
+
+    if _parent_path == "/":
+      return "/" + self.Name._value
+
+    return _parent_path + "/" + self.Name._value
+
+  ## Returns the root node of the graph this node is attached to.
+  def get_root(self):
+
+    _node = self
+
+    while _node.Parent._value != None:
+      _node = _node.Parent._value
+
+    return _node
+
+  ## Computes the world space bounding box of the subgraph below this node.
+  def compute_bounding_box(self):
+
+    _points = []
+    self.collect_bounding_points(_points)
+
+    if len(_points) == 0:
+      _translate = self.compute_world_transform().get_translate()
+      return BoundingBox(Min = _translate, Max = _translate.copy())
+
+    return BoundingBox(Min = Vec3(min(_p.x for _p in _points), min(_p.y for _p in _points), min(_p.z for _p in _points)),
+                       Max = Vec3(max(_p.x for _p in _points), max(_p.y for _p in _points), max(_p.z for _p in _points)))
+
+  ## Appends the world space corners of all geometries in the subgraph to a list.
+  # @param POINTS The list to append the corners to.
+  def collect_bounding_points(self, POINTS):
+
+    if self.is_geometry:
+      _mat = self.compute_world_transform()
+
+      for _x in (-0.5, 0.5):
+        for _y in (-0.5, 0.5):
+          for _z in (-0.5, 0.5):
+            POINTS.append(_mat * Vec3(_x, _y, _z))
+
+    for _child in self.Children._value:
+      _child.collect_bounding_points(POINTS)
+
+
+## Result of a ray test.
+class PickResult(avango.Node):
+  field_types = { "Distance" : avango.SFFloat
+                , "Position" : SFVec3
+                , "WorldPosition" : SFVec3
+                , "Normal" : SFVec3
+                , "WorldNormal" : SFVec3 }
+
+
+## Scenegraph holding a root node.
+class SceneGraph(Node):
+
+  def __init__(self, **kwargs):
+    Node.__init__(self, **kwargs)
+    self.Root.value = nodes.TransformNode(Name = "")
+
+  ## Returns the node at a given path or None.
+  # @param PATH The scenegraph path, e.g. "/net/platform_0".
+  def __getitem__(self, PATH):
+
+    _node = self.Root._value
+
+    for _name in PATH.split("/"):
+
+      if _name == "":
+        continue
+
+      for _child in _node.Children._value:
+
+        if _child.Name._value == _name:
+          _node = _child
+          break
+
+      else:
+        return None
+
+    return _node
+
+  ## Updates the cached scenegraph data. Nothing to do for the stand-in.
+  def update_cache(self):
+    pass
+
+  ## Intersects a ray with all pickable geometries of this scenegraph which are in the given group.
+  # @param RAY The RayNode to be tested, pointing along its negative z-axis.
+  # @param OPTIONS The picking options.
+  # @param MASK The group name the picked geometries must have, "" for all.
+  def ray_test(self, RAY, OPTIONS, MASK):
+
+    _ray_mat = RAY.compute_world_transform()
+    _origin = _ray_mat * Vec3(0.0, 0.0, 0.0)
+    _end = _ray_mat * Vec3(0.0, 0.0, -1.0)
+    _root = self.Root._value
+
+    _results = []
+
+    for _node in pickable_nodes:
+
+      if MASK != "" and MASK not in _node.GroupNames._value:
+        continue
+
+      if _node.get_root() != _root:
+        continue
+
+      _node_mat = _node.compute_world_transform()
+      _inv_node_mat = make_inverse_mat(_node_mat)
+
+      _local_origin = _inv_node_mat * _origin
+      _local_end = _inv_node_mat * _end
+      _dir_y = _local_end.y - _local_origin.y
+
+      if _dir_y == 0.0:
+        continue
+
+      _t = -_local_origin.y / _dir_y
+
+      if _t < 0.0 or _t > 1.0:
+        continue
+
+      _position = Vec3(_local_origin.x + (_local_end.x - _local_origin.x) * _t,
+                       0.0,
+                       _local_origin.z + (_local_end.z - _local_origin.z) * _t)
+
+      if abs(_position.x) > 0.5 or abs(_position.z) > 0.5:
+        continue
+
+      _world_position = _node_mat * _position
+
+      _results.append(PickResult(Object = _node,
+                                 Distance = _t,
+                                 Position = _position,
+                                 WorldPosition = Vec3(_world_position.x, _world_position.y, _world_position.z),
+                                 Normal = Vec3(0.0, 1.0, 0.0)))
+
+    _results.sort(key = lambda _result: _result.Distance._value)
+
+    if OPTIONS & PickingOptions.PICK_ONLY_FIRST_OBJECT:
+      _results = _results[:1]
+
+    _field = MFPickResult()
+    _field.value = _results
+    return _field
+
+
+## Geometry loader.
+class _TriMeshLoader(avango.Node):
+
+  ## Creates a geometry node. The file is not read, every geometry is a unit cube.
+  def create_geometry_from_file(self, NAME, FILENAME, MATERIAL, FLAGS = LoaderFlags.DEFAULTS):
+
+    _node = nodes.TriMeshNode(Name = NAME, Geometry = "type=file&file=" + FILENAME + "&flags=" + str(FLAGS), Material = MATERIAL)
+
+    if FLAGS & LoaderFlags.MAKE_PICKABLE:
+      pickable_nodes.append(_node)
+
+    return _node
+
+## Point-based level-of-detail loader.
+class _PLODLoader(avango.Node):
+
+  def create_geometry_from_file(self, NAME, FILENAME, FLAGS = PLODLoaderFlags.DEFAULTS):
+
+    _node = nodes.PLODNode(Name = NAME)
+
+    if FLAGS & PLODLoaderFlags.MAKE_PICKABLE:
+      pickable_nodes.append(_node)
+
+    return _node
+
+## Video avatar loader.
+class _Video3DLoader(avango.Node):
+
+  def load(self, NAME, FILENAME):
+    return nodes.Video3DNode(Name = NAME)
+
+
+## Network transform node, counting the distributed objects.
+class _NetTransform(Node):
+
+  def __init__(self, **kwargs):
+    Node.__init__(self, **kwargs)
+
+    ## @var distributed_objects
+    # Number of objects which have been distributed.
+    self.distributed_objects = 0
+
+  def distribute_object(self, OBJECT):
+    self.distributed_objects += 1
+
+
+## Stand-in namespace for avango.gua.nodes.
+class nodes:
+  TransformNode = type("TransformNode", (Node,), {})
+  TriMeshNode = type("TriMeshNode", (Node,), {"is_geometry" : True})
+  PLODNode = type("PLODNode", (Node,), {"is_geometry" : True})
+  Video3DNode = type("Video3DNode", (Node,), {})
+  TexturedQuadNode = type("TexturedQuadNode", (Node,), {})
+  ScreenNode = type("ScreenNode", (Node,), {})
+  RayNode = type("RayNode", (Node,), {})
+  SunLightNode = type("SunLightNode", (Node,), {})
+  PointLightNode = type("PointLightNode", (Node,), {})
+  SpotLightNode = type("SpotLightNode", (Node,), {})
+  SceneGraph = SceneGraph
+  NetTransform = type("NetTransform", (_NetTransform,), {})
+  TriMeshLoader = type("TriMeshLoader", (_TriMeshLoader,), {})
+  PLODLoader = type("PLODLoader", (_PLODLoader,), {})
+  Video3DLoader = type("Video3DLoader", (_Video3DLoader,), {})
+  Camera = type("Camera", (Node,), {})
+  Window = type("Window", (Node,), {})
+  Pipeline = type("Pipeline", (Node,), {})
+  Viewer = type("Viewer", (Node,), {"run" : lambda self: None})
+  Logger = type("Logger", (avango.Node,), {})
+
+
+## Propagates changed world transformations along the connections of the WorldTransform fields,
+# as done by the scenegraph traversal of a frame.
+def update_world_transforms():
+
+  for _field in world_transform_fields:
+
+    if len(_field._targets) > 0:
+      _mat = _field.owner.compute_world_transform()
+
+      if _mat != _field._value:
+        _field.set_value(_mat)
+
+
+## Loads the materials of a directory. Nothing to do for the stand-in.
+def load_materials_from(DIRECTORY):
+  pass
+
+## Loads the shading models of a directory. Nothing to do for the stand-in.
+def load_shading_models_from(DIRECTORY):
+  pass
+
+## Reloads all materials. Nothing to do for the stand-in.
+def reload_materials():
+  pass
+
+## Creates a texture. Nothing to do for the stand-in.
+def create_texture(FILENAME):
+  pass
+
+## Sets a material uniform. Nothing to do for the stand-in.
+def set_material_uniform(MATERIAL, UNIFORM, VALUE):
+  pass
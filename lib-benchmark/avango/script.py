@@ -0,0 +1,202 @@
+#!/usr/bin/python
+
+## @file
+# Headless stand-in for avango.script. Provides the Script base class, the field_has_changed
+# decorator, the Update node and a frame driver evaluating all registered scripts.
+
+# import avango-guacamole libraries
+import avango
+
+## @var evaluated_scripts
+# List of Script instances which requested framewise evaluation, in creation order.
+evaluated_scripts = []
+
+## @var dirty_scripts
+# List of Script instances whose fields changed since their last evaluation, in order of change.
+dirty_scripts = []
+
+## @var update_nodes
+# List of Update nodes whose callbacks are called every frame, in creation order.
+update_nodes = []
+
+## @var _class_layouts
+# Cache mapping Script subclasses to their field declarations and field change handlers.
+_class_layouts = {}
+
+
+## Decorator marking a method as change handler of a class-level field declaration.
+# @param FIELD The declared field to react on.
+def field_has_changed(FIELD):
+
+  def _decorator(FUNCTION):
+    FUNCTION._changed_field = FIELD
+    return FUNCTION
+
+  return _decorator
+
+
+## Collects the declared fields and field change handlers of a Script subclass.
+# @param CLASS The class to be analyzed.
+def get_class_layout(CLASS):
+
+  try:
+    return _class_layouts[CLASS]
+  except KeyError:
+    pass
+
+  _fields = {}
+  _handlers = {}
+
+  for _class in reversed(CLASS.__mro__):
+
+    for _name, _attribute in _class.__dict__.items():
+
+      if isinstance(_attribute, avango.Field):
+        _fields[_name] = _attribute
+
+      elif hasattr(_attribute, "_changed_field"):
+        _handlers[_name] = _attribute._changed_field
+
+  _field_names = dict((id(_field), _name) for _name, _field in _fields.items())
+  _handler_list = []
+
+  for _handler_name, _field in _handlers.items():
+
+    if id(_field) in _field_names:
+      _handler_list.append( (_field_names[id(_field)], _handler_name) )
+
+  _class_layouts[CLASS] = (list(_fields.items()), _handler_list)
+  return _class_layouts[CLASS]
+
+
+## Base class of all scripts. Class-level field declarations are instantiated per object.
+class Script(object):
+
+  ## Creates the instance fields from the class-level declarations.
+  def __new__(cls, *args, **kwargs):
+
+    self = object.__new__(cls)
+    _fields, _handlers = get_class_layout(cls)
+
+    for _name, _field in _fields:
+      self.__dict__[_name] = _field.clone()
+      self.__dict__[_name]._container = self
+
+    for _field_name, _handler_name in _handlers:
+      self.__dict__[_field_name]._callbacks.append(getattr(self, _handler_name))
+
+    self._always_evaluate = False
+    self._dirty = False
+    return self
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Returns the super object of a class for this instance.
+  # @param CLASS The class to start the lookup from.
+  def super(self, CLASS):
+    return super(CLASS, self)
+
+  ## Enables or disables the framewise evaluation of this script.
+  # @param FLAG Boolean indicating if evaluate() is to be called every frame.
+  def always_evaluate(self, FLAG):
+
+    if FLAG and not self._always_evaluate:
+      evaluated_scripts.append(self)
+    elif not FLAG and self._always_evaluate:
+      evaluated_scripts.remove(self)
+
+    self._always_evaluate = FLAG
+
+  ## Evaluated every frame if always_evaluate is set, otherwise in frames after a field has changed.
+  def evaluate(self):
+    pass
+
+  ## Called whenever one of the fields of this script changes. Requests an evaluation.
+  def field_touched(self):
+
+    if not self._dirty and not self._always_evaluate:
+      self._dirty = True
+      dirty_scripts.append(self)
+
+  ## Checks if a field exists on this script.
+  # @param NAME The field name to be checked.
+  def has_field(self, NAME):
+    return isinstance(self.__dict__.get(NAME), avango.Field)
+
+  ## Adds a field to this script and sets its value.
+  # @param FIELD The field instance to be added.
+  # @param NAME The name of the field.
+  # @param VALUE The initial value.
+  def add_and_init_field(self, FIELD, NAME, VALUE):
+    self.__dict__[NAME] = FIELD
+    FIELD._container = self
+    FIELD.value = VALUE
+
+  ## Returns the type string of this script.
+  def get_type(self):
+    return type(self).__module__ + "::" + type(self).__name__
+
+
+## Field holding an arbitrary python object.
+class SFObject(avango.Field):
+  pass
+
+
+## Stand-in namespace for avango.script.nodes.
+class nodes:
+
+  ## Node calling a callback every frame while active.
+  class Update(avango.Node):
+
+    ## Default constructor.
+    # @param kwargs Initial field values, usually Callback and Active.
+    def __init__(self, **kwargs):
+      avango.Node.__init__(self, **kwargs)
+      update_nodes.append(self)
+
+
+## Evaluates one frame: calls all active Update callbacks, then the evaluate methods of all scripts
+# with framewise evaluation and of all scripts with changed fields. Scripts whose fields are changed
+# by a script evaluated later in the same frame are evaluated in that frame as well, each script at
+# most once; changes arriving after a script's evaluation are handled in the next frame.
+# Field change handlers are called synchronously when values are set.
+def evaluate_frame():
+
+  for _update_node in list(update_nodes):
+
+    if _update_node.Active.value:
+      avango.invoke(_update_node.Callback.value)
+
+  _evaluated = set()
+  _deferred = []
+  _queue = evaluated_scripts + dirty_scripts
+  del dirty_scripts[:]
+
+  while len(_queue) > 0:
+
+    for _script in _queue:
+
+      if id(_script) in _evaluated:
+
+        if _script._dirty:
+          _deferred.append(_script)
+
+        continue
+
+      _evaluated.add(id(_script))
+
+      if type(_script).evaluate is Script.evaluate:
+        _script._dirty = False
+        continue
+
+      # changes made by the script itself during evaluation do not request another evaluation
+      _script._dirty = True
+      avango.invoke(_script.evaluate)
+      _script._dirty = False
+
+    _queue = list(dirty_scripts)
+    del dirty_scripts[:]
+
+  dirty_scripts.extend(_deferred)
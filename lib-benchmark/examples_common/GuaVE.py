@@ -0,0 +1,17 @@
+#!/usr/bin/python
+
+## @file
+# Headless stand-in for the GuaVE interactive shell.
+
+## Interactive shell which is not started in headless runs.
+class GuaVE(object):
+
+  ## Starts the shell. Nothing to do for the stand-in.
+  # @param LOCALS Local variables.
+  # @param GLOBALS Global variables.
+  def start(self, LOCALS, GLOBALS):
+    pass
+
+  ## Lists the variables of the shell. Nothing to do for the stand-in.
+  def list_variables(self):
+    pass
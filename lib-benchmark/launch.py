@@ -0,0 +1,53 @@
+#!/usr/bin/python
+
+## @file
+# Tests the concurrent client launch of the server with stand-in clients running as local processes.
+# Reports the time to first frame per client and the overall launch time.
+
+# import framework libraries
+from ClientLauncher import *
+
+# import python libraries
+import argparse
+import os
+import sys
+
+# Command line parameters:
+# launch.py [--hosts N] [--clients-per-host N] [--startup-time S] [--failure-rate P] [--hang-rate P] [--timeout S] [--retries N]
+
+## Main method for the launch test.
+def start():
+
+  _parser = argparse.ArgumentParser(description = "Client launch test with local stand-in clients.")
+  _parser.add_argument("--hosts", type = int, default = 6, help = "number of simulated display hosts")
+  _parser.add_argument("--clients-per-host", type = int, default = 1, help = "number of clients per display host")
+  _parser.add_argument("--startup-time", type = float, default = 1.0, help = "mean start-up time of a stand-in client in seconds")
+  _parser.add_argument("--failure-rate", type = float, default = 0.0, help = "probability of a stand-in client crashing during start-up")
+  _parser.add_argument("--hang-rate", type = float, default = 0.0, help = "probability of a stand-in client never reporting its first frame")
+  _parser.add_argument("--timeout", type = float, default = 5.0, help = "time in seconds a client may take until its first frame")
+  _parser.add_argument("--retries", type = int, default = 2, help = "number of additional start attempts per client")
+  _args = _parser.parse_args()
+
+  _launch_commands = LocalLaunchCommands()
+  _launch_commands.my_constructor([ sys.executable
+                                  , os.path.join(os.path.dirname(os.path.abspath(__file__)), "stand_in_client.py")
+                                  , "--startup-time", str(_args.startup_time)
+                                  , "--failure-rate", str(_args.failure_rate)
+                                  , "--hang-rate", str(_args.hang_rate) ])
+
+  _launcher = ClientLauncher()
+  _launcher.my_constructor(_launch_commands, TIMEOUT = _args.timeout, RETRIES = _args.retries)
+
+  for _h in range(_args.hosts):
+    for _c in range(_args.clients_per_host):
+      _launcher.add_client("host" + str(_h), ["127.0.0.1", "configs/benchmark.py", "0", str(_h), str(_c), "display_" + str(_h) + "_" + str(_c)])
+
+  _launcher.launch_all()
+  _all_ready = _launcher.wait()
+  _launcher.stop_all()
+
+  if not _all_ready:
+    sys.exit(1)
+
+if __name__ == '__main__':
+  start()
@@ -0,0 +1,338 @@
+#!/usr/bin/python
+
+## @file
+# Headless frame-loop benchmark for the server application. Builds a synthetic workspace
+# configuration, feeds synthetic tracking and device data into it and reports the time spent
+# per frame in each script callback. Runs against the stand-in avango modules in lib-benchmark.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+import avango.daemon
+
+# import framework libraries
+from SceneManager import *
+from ApplicationManager import *
+from DisplayGroup import *
+from PhysicalDisplay import *
+from Portal import *
+from Workspace import Workspace
+from SteeringNavigation import SteeringNavigation
+from StaticNavigation import StaticNavigation
+from InputLog import InputRecorder, InputReplayer
+
+from scene_config import scenegraphs
+
+# import python libraries
+import argparse
+import math
+import sys
+import time
+import types
+
+# Command line parameters:
+# main.py [--workspaces N] [--display-groups N] [--users N] [--tools N] [--portals N] [--frames N] [--warmup N]
+#         [--record FILE] [--replay FILE] [--replay-speed X]
+
+## @var CONFIG_MODULE_NAME
+# Module name under which the synthetic workspace configuration is registered.
+CONFIG_MODULE_NAME = "benchmark_config"
+
+
+## Measures the exclusive time spent in each script callback. Time spent in nested callbacks,
+# e.g. field change handlers triggered by an evaluate method, is attributed to the nested callback.
+class ScriptTimer:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var times
+    # Dictionary mapping callback names to the accumulated exclusive time in seconds.
+    self.times = {}
+
+    ## @var calls
+    # Dictionary mapping callback names to the number of calls.
+    self.calls = {}
+
+    ## @var nested_times
+    # Stack of the time spent in nested callbacks, one entry per running callback.
+    self.nested_times = []
+
+  ## Calls and measures a callback. Installed as avango.call_observer.
+  # @param CALLBACK The bound method to be called.
+  def __call__(self, CALLBACK):
+
+    self.nested_times.append(0.0)
+    _start = time.perf_counter()
+
+    try:
+      return CALLBACK()
+
+    finally:
+      _elapsed = time.perf_counter() - _start
+      _nested = self.nested_times.pop()
+      _name = get_callback_name(CALLBACK)
+
+      self.times[_name] = self.times.get(_name, 0.0) + _elapsed - _nested
+      self.calls[_name] = self.calls.get(_name, 0) + 1
+
+      if len(self.nested_times) > 0:
+        self.nested_times[-1] += _elapsed
+
+
+## Returns a readable name for a callback, e.g. "RayPointer.evaluate".
+# @param CALLBACK The callback to be named.
+def get_callback_name(CALLBACK):
+
+  try:
+    return type(CALLBACK.__self__).__name__ + "." + CALLBACK.__name__
+  except AttributeError:
+    return getattr(CALLBACK, "__name__", str(CALLBACK))
+
+
+## Creates a visibility table in which no display group sees the representations of another one.
+# Entries for equal tags are needed as display groups of different workspaces share their tags.
+# @param TAGS List of all visibility tags.
+def create_visibility_table(TAGS):
+
+  _table = {}
+
+  for _tag in TAGS:
+    _table[_tag] = dict((_other_tag, False) for _other_tag in TAGS)
+
+  return _table
+
+
+## Builds the synthetic workspace configuration and registers it as module.
+# @param ARGS The parsed command line arguments.
+def create_benchmark_config(ARGS):
+
+  _tags = ["dg" + str(_i) for _i in range(ARGS.display_groups)] + ["portal"]
+  _visibility_table = create_visibility_table(_tags)
+  _trace_visibility_list = dict((_tag, False) for _tag in _tags)
+
+  _workspaces = []
+
+  for _w in range(ARGS.workspaces):
+
+    _workspace = Workspace('Benchmark-' + str(_w), avango.gua.make_trans_mat(0.0, 0.043, 0.0))
+
+    for _dg in range(ARGS.display_groups):
+
+      _navigation = SteeringNavigation()
+      _navigation.my_constructor( STARTING_MATRIX = avango.gua.make_trans_mat(_w * 10.0, 0.0, _dg * 10.0)
+                                , STARTING_SCALE = 1.0
+                                , INPUT_DEVICE_TYPE = 'XBoxController'
+                                , INPUT_DEVICE_NAME = 'device-xbox-w' + str(_w) + '-dg' + str(_dg)
+                                , NO_TRACKING_MAT = avango.gua.make_trans_mat(0.0, 1.2, 0.6)
+                                , GROUND_FOLLOWING_SETTINGS = [True, 0.75]
+                                , INVERT = False
+                                , TRACE_VISIBILITY_LIST = _trace_visibility_list
+                                , DEVICE_TRACKING_NAME = 'tracking-xbox-w' + str(_w) + '-dg' + str(_dg)
+                                , IS_REQUESTABLE = True
+                                , REQUEST_BUTTON_NUM = 3
+                                , REACTS_ON_PORTAL_TRANSIT = True)
+
+      _display = PhysicalDisplay( hostname = "benchmark-w" + str(_w) + "-dg" + str(_dg)
+                                , displaystrings = [":0." + str(_u) for _u in range(ARGS.users)]
+                                , size = (3.0, 2.0)
+                                , transformation = avango.gua.make_trans_mat(0.0, 1.2, 0.0))
+
+      _workspace.create_display_group( DISPLAY_LIST = [_display]
+                                     , NAVIGATION_LIST = [_navigation]
+                                     , VISIBILITY_TAG = "dg" + str(_dg)
+                                     , OFFSET_TO_WORKSPACE = avango.gua.make_trans_mat(0.0, 0.0, 1.6))
+
+    for _u in range(ARGS.users):
+      _workspace.create_user( VIP = False
+                            , AVATAR_VISIBILITY_TABLE = _visibility_table
+                            , HEADTRACKING_TARGET_NAME = 'tracking-glasses-w' + str(_w) + '-u' + str(_u)
+                            , EYE_DISTANCE = 0.065)
+
+    for _t in range(ARGS.tools):
+      _workspace.create_ray_pointer( POINTER_TRACKING_STATION = 'tracking-pointer-w' + str(_w) + '-t' + str(_t)
+                                   , POINTER_DEVICE_STATION = 'device-pointer-w' + str(_w) + '-t' + str(_t)
+                                   , VISIBILITY_TABLE = _visibility_table)
+
+    _workspaces.append(_workspace)
+
+  _portal_display_groups = []
+
+  for _p in range(ARGS.portals):
+
+    _navigation = StaticNavigation()
+    _navigation.my_constructor( STATIC_ABS_MAT = avango.gua.make_trans_mat(-20.0, 1.3, _p * 10.0)
+                              , STATIC_SCALE = 1.0)
+
+    _portal = Portal( PORTAL_MATRIX = avango.gua.make_trans_mat(20.0, 1.3, _p * 10.0) * avango.gua.make_rot_mat(90, 0, 1, 0)
+                    , WIDTH = 4.0
+                    , HEIGHT = 2.6
+                    , VIEWING_MODE = "3D"
+                    , CAMERA_MODE = "PERSPECTIVE"
+                    , NEGATIVE_PARALLAX = "False"
+                    , BORDER_MATERIAL = "data/materials/White.gmd"
+                    , TRANSITABLE = True)
+
+    _portal_display_groups.append(DisplayGroup( ID = None
+                                              , DISPLAY_LIST = [_portal]
+                                              , NAVIGATION_LIST = [_navigation]
+                                              , VISIBILITY_TAG = "portal"
+                                              , OFFSET_TO_WORKSPACE = avango.gua.make_identity_mat()
+                                              , WORKSPACE_TRANSMITTER_OFFSET = avango.gua.make_identity_mat()))
+
+  _config = types.ModuleType(CONFIG_MODULE_NAME)
+  _config.workspaces = _workspaces
+  _config.portal_display_groups = _portal_display_groups
+  sys.modules[CONFIG_MODULE_NAME] = _config
+
+## Writes synthetic tracking and device values of a frame into all device sensors.
+# Heads sway slightly, pointers sweep over the ground and navigation devices are deflected sinusoidally.
+# @param FRAME The number of the frame to be simulated.
+def inject_sensor_values(FRAME):
+
+  _time = FRAME / 60.0
+
+  for _i, _sensor in enumerate(avango.daemon.device_sensors):
+
+    _station = _sensor.Station.value
+    _phase = _time + _i * 0.37
+
+    if _station.startswith("tracking-glasses"):
+      _sensor.Matrix.value = avango.gua.make_trans_mat(0.2 * math.sin(_phase), 1.7 + 0.02 * math.sin(3.0 * _phase), 0.5) * \
+                             avango.gua.make_rot_mat(10.0 * math.sin(_phase), 0, 1, 0)
+
+    elif _station.startswith("tracking-pointer"):
+      _sensor.Matrix.value = avango.gua.make_trans_mat(0.3, 1.2, 0.2) * \
+                             avango.gua.make_rot_mat(30.0 * math.sin(0.5 * _phase), 0, 1, 0) * \
+                             avango.gua.make_rot_mat(-35.0 + 10.0 * math.sin(_phase), 1, 0, 0)
+
+    elif _station.startswith("tracking-"):
+      _sensor.Matrix.value = avango.gua.make_trans_mat(0.0, 1.0, 0.6) * \
+                             avango.gua.make_rot_mat(5.0 * math.sin(_phase), 0, 1, 0)
+
+    elif _station.startswith("device-xbox"):
+      _sensor.Value0.value = 0.5 * math.sin(0.2 * _phase)
+      _sensor.Value1.value = 0.6 * math.cos(0.3 * _phase)
+      _sensor.Value2.value = 0.3 * math.sin(0.1 * _phase)
+      _sensor.Value3.value = 0.4 * math.sin(0.25 * _phase)
+
+## Simulates one frame: new sensor values, world transformation updates and script evaluation.
+# @param FRAME The number of the frame to be simulated.
+# @param INJECT_SENSOR_VALUES Boolean saying if synthetic sensor values are to be written, False when replaying an input log.
+def run_frame(FRAME, INJECT_SENSOR_VALUES = True):
+
+  if INJECT_SENSOR_VALUES:
+    inject_sensor_values(FRAME)
+
+  avango.gua.update_world_transforms()
+  avango.script.evaluate_frame()
+
+## Prints the measured times per script callback and the overall frame times.
+# @param TIMER The ScriptTimer holding the measurements.
+# @param FRAME_TIMES List of measured frame times in seconds.
+def print_report(TIMER, FRAME_TIMES):
+
+  _num_frames = len(FRAME_TIMES)
+  _frame_time = sum(FRAME_TIMES) / _num_frames
+  _script_time = sum(TIMER.times.values()) / _num_frames
+
+  print()
+  print("{0:<60} {1:>10} {2:>12} {3:>8}".format("Script callback", "calls/fr", "ms/frame", "share"))
+  print("-" * 93)
+
+  for _name in sorted(TIMER.times, key = lambda _name: TIMER.times[_name], reverse = True):
+
+    _time = TIMER.times[_name] / _num_frames
+
+    print("{0:<60} {1:>10.2f} {2:>12.4f} {3:>7.1f}%".format( _name
+                                                            , TIMER.calls[_name] / _num_frames
+                                                            , _time * 1000.0
+                                                            , _time / _frame_time * 100.0))
+
+  print("-" * 93)
+  print("{0:<60} {1:>10} {2:>12.4f} {3:>7.1f}%".format("all script callbacks", "", _script_time * 1000.0, _script_time / _frame_time * 100.0))
+  print("{0:<60} {1:>10} {2:>12.4f} {3:>7.1f}%".format("frame (incl. stand-in overhead)", "", _frame_time * 1000.0, 100.0))
+
+  _sorted_frame_times = sorted(FRAME_TIMES)
+
+  print()
+  print("Frames: " + str(_num_frames) + \
+        ", min " + str(round(_sorted_frame_times[0] * 1000.0, 3)) + " ms" + \
+        ", median " + str(round(_sorted_frame_times[_num_frames // 2] * 1000.0, 3)) + " ms" + \
+        ", max " + str(round(_sorted_frame_times[-1] * 1000.0, 3)) + " ms")
+
+## Parses the command line arguments.
+def parse_arguments():
+
+  _parser = argparse.ArgumentParser(description = "Headless frame-loop benchmark of the server scripts.")
+  _parser.add_argument("--workspaces", type = int, default = 1, help = "number of workspaces")
+  _parser.add_argument("--display-groups", type = int, default = 1, help = "number of display groups per workspace")
+  _parser.add_argument("--users", type = int, default = 2, help = "number of users per workspace")
+  _parser.add_argument("--tools", type = int, default = 1, help = "number of ray pointers per workspace")
+  _parser.add_argument("--portals", type = int, default = 0, help = "number of transitable portal display groups")
+  _parser.add_argument("--frames", type = int, default = 300, help = "number of measured frames")
+  _parser.add_argument("--warmup", type = int, default = 30, help = "number of unmeasured frames run before")
+  _parser.add_argument("--record", default = None, help = "input log file to which the inputs of all frames are written")
+  _parser.add_argument("--replay", default = None, help = "input log file replayed in a loop instead of the synthetic inputs")
+  _parser.add_argument("--replay-speed", type = float, default = 0.0, help = "replay speed relative to the recording, 0 for one recorded frame per frame")
+  return _parser.parse_args()
+
+## Main method for the benchmark application.
+def start():
+
+  _args = parse_arguments()
+
+  create_benchmark_config(_args)
+
+  # initialize application manager
+  application_manager = ApplicationManager()
+  application_manager.my_constructor(WORKSPACE_CONFIG = CONFIG_MODULE_NAME, START_CLIENTS = False)
+
+  # initialize scene
+  scene_manager = SceneManager()
+
+  # record the inputs or replace them by recorded ones
+  input_recorder = InputRecorder()
+  input_recorder.my_constructor(application_manager.workspaces)
+
+  input_replayer = InputReplayer()
+  input_replayer.my_constructor(application_manager.workspaces)
+
+  if _args.replay != None:
+    input_replayer.start(_args.replay, _args.replay_speed, LOOP = True)
+
+  if _args.record != None:
+    input_recorder.start(_args.record)
+
+  _inject_sensor_values = _args.replay == None
+
+  print("Benchmarking " + str(_args.workspaces) + " workspace(s), " + \
+        str(_args.display_groups) + " display group(s), " + \
+        str(_args.users) + " user(s), " + \
+        str(_args.tools) + " tool(s), " + \
+        str(_args.portals) + " portal(s)")
+
+  for _frame in range(_args.warmup):
+    run_frame(_frame, _inject_sensor_values)
+
+  _timer = ScriptTimer()
+  avango.call_observer = _timer
+
+  _frame_times = []
+
+  for _frame in range(_args.warmup, _args.warmup + _args.frames):
+    _start = time.perf_counter()
+    run_frame(_frame, _inject_sensor_values)
+    _frame_times.append(time.perf_counter() - _start)
+
+  avango.call_observer = None
+
+  input_recorder.stop()
+  input_replayer.stop()
+
+  print_report(_timer, _frame_times)
+
+
+if __name__ == '__main__':
+  start()
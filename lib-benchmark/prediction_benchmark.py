@@ -0,0 +1,247 @@
+#!/usr/bin/python
+
+## @file
+# Replay-driven benchmark of the TrackingPredictor. Feeds the tracking channels of an input log through predictors
+# with different look-ahead times and smoothing parameters and compares the predicted matrices to the recorded ones
+# at the time predicted for. Runs against the stand-in avango modules in lib-benchmark.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from InputLog import InputLog
+from TrackingPredictor import TrackingPredictor
+
+# import python libraries
+import argparse
+import bisect
+import math
+import random
+
+# Command line parameters:
+# prediction_benchmark.py LOG [--look-aheads L1,L2,...] [--smoothings S1,S2,...] [--frame-rate HZ]
+#                             [--noise MM] [--angular-noise DEG] [--seed N]
+
+
+## Reads the tracking channels of an input log and returns a dictionary mapping the channel names to their lists of
+# (time, position, orientation) samples, orientations being (x, y, z, w) quaternion tuples.
+# @param FILENAME The path of the input log.
+# @param FRAME_RATE Frame rate in Hz to compute the sample times from the record numbers. 0 to use the recorded times.
+def read_tracking_samples(FILENAME, FRAME_RATE):
+
+  with open(FILENAME, "rb") as _file:
+
+    _channels = InputLog.read_header(_file)
+    _record_struct = InputLog.get_record_struct([_kind for _kind, _name in _channels])
+    _samples = dict([(_name, []) for _kind, _name in _channels if _kind == InputLog.TRACKING])
+    _num_records = 0
+
+    # number of values of each channel kind in a record
+    _num_values = {InputLog.TRACKING : 16, InputLog.DEVICE : 8, InputLog.BUTTONS : 1}
+
+    while True:
+
+      _bytes = _file.read(_record_struct.size)
+
+      if len(_bytes) < _record_struct.size:
+        break
+
+      _record = _record_struct.unpack(_bytes)
+      _time = _record[0] if FRAME_RATE == 0.0 else _num_records / FRAME_RATE
+      _index = 1
+
+      for _kind, _name in _channels:
+
+        if _kind == InputLog.TRACKING:
+
+          _mat = avango.gua.make_identity_mat()
+
+          for _i in range(16):
+            _mat.set_element(_i // 4, _i % 4, _record[_index + _i])
+
+          _translation = _mat.get_translate()
+          _rotation = _mat.get_rotate()
+          _samples[_name].append( (_time
+                                 , (_translation.x, _translation.y, _translation.z)
+                                 , TrackingPredictor.normalize_quat( (_rotation.x, _rotation.y, _rotation.z, _rotation.w) )) )
+
+        _index += _num_values[_kind]
+
+      _num_records += 1
+
+  return _samples
+
+## Returns the recorded (position, orientation) at a time, interpolated between the neighbouring samples,
+# or None if the time is outside of the recording.
+# @param SAMPLES List of (time, position, orientation) samples sorted by time.
+# @param TIMES List of the sample times.
+# @param TIME The time to interpolate the pose at.
+def interpolate_pose(SAMPLES, TIMES, TIME):
+
+  _i = bisect.bisect_left(TIMES, TIME)
+
+  if _i == len(TIMES):
+    return None
+
+  if TIMES[_i] == TIME:
+    return SAMPLES[_i][1:3]
+
+  if _i == 0:
+    return None
+
+  _t0, _pos0, _quat0 = SAMPLES[_i - 1]
+  _t1, _pos1, _quat1 = SAMPLES[_i]
+  _f = (TIME - _t0) / (_t1 - _t0)
+
+  _position = tuple([_p0 + (_p1 - _p0) * _f for _p0, _p1 in zip(_pos0, _pos1)])
+  _delta = TrackingPredictor.get_rotation_vector(TrackingPredictor.multiply_quats(_quat1, TrackingPredictor.conjugate_quat(_quat0)))
+
+  return (_position, TrackingPredictor.rotate_quat(_quat0, _delta, _f))
+
+## Returns a sample disturbed by gaussian noise, simulating the jitter of a tracking system.
+# @param POSITION The (x, y, z) position.
+# @param ORIENTATION The (x, y, z, w) orientation.
+# @param NOISE Standard deviation of the position noise in meters.
+# @param ANGULAR_NOISE Standard deviation of the orientation noise in radians.
+def add_noise(POSITION, ORIENTATION, NOISE, ANGULAR_NOISE):
+
+  _position = tuple([_p + random.gauss(0.0, NOISE) for _p in POSITION])
+  _rotation_vector = [random.gauss(0.0, ANGULAR_NOISE) for _i in range(3)]
+
+  return (_position, TrackingPredictor.rotate_quat(ORIENTATION, _rotation_vector, 1.0))
+
+## Returns the position error in meters and the angular error in degrees between two poses.
+# @param POSITION1 The first (x, y, z) position.
+# @param ORIENTATION1 The first (x, y, z, w) orientation.
+# @param POSITION2 The second (x, y, z) position.
+# @param ORIENTATION2 The second (x, y, z, w) orientation.
+def compute_errors(POSITION1, ORIENTATION1, POSITION2, ORIENTATION2):
+
+  _position_error = math.sqrt(sum([(_p1 - _p2) * (_p1 - _p2) for _p1, _p2 in zip(POSITION1, POSITION2)]))
+  _difference = TrackingPredictor.get_rotation_vector(TrackingPredictor.multiply_quats(ORIENTATION1, TrackingPredictor.conjugate_quat(ORIENTATION2)))
+
+  return (_position_error, math.degrees(math.sqrt(sum([_v * _v for _v in _difference]))))
+
+## Runs the samples of one channel through a predictor and returns the lists of position and angular errors
+# of the predictions against the recorded poses at the predicted times.
+# @param SAMPLES List of (time, position, orientation) samples sorted by time.
+# @param MEASUREMENTS List of the (position, orientation) tuples passed to the predictor, possibly disturbed by noise.
+# @param LOOK_AHEAD Look-ahead time of the predictor in seconds.
+# @param SMOOTHING Smoothing parameter of the predictor or None to pass the measurements through unpredicted.
+def evaluate(SAMPLES, MEASUREMENTS, LOOK_AHEAD, SMOOTHING):
+
+  _times = [_sample[0] for _sample in SAMPLES]
+  _position_errors = []
+  _angular_errors = []
+
+  if SMOOTHING != None:
+    _predictor = TrackingPredictor()
+    _predictor.my_constructor(LOOK_AHEAD, SMOOTHING)
+
+  for (_time, _true_position, _true_orientation), (_position, _orientation) in zip(SAMPLES, MEASUREMENTS):
+
+    if SMOOTHING != None:
+      _mat = _predictor.update(avango.gua.make_trans_mat(_position[0], _position[1], _position[2]) * TrackingPredictor.make_rot_mat(_orientation), _time)
+      _translation = _mat.get_translate()
+      _rotation = _mat.get_rotate()
+      _position = (_translation.x, _translation.y, _translation.z)
+      _orientation = TrackingPredictor.normalize_quat( (_rotation.x, _rotation.y, _rotation.z, _rotation.w) )
+
+    _target = interpolate_pose(SAMPLES, _times, _time + LOOK_AHEAD)
+
+    if _target == None:
+      continue
+
+    _errors = compute_errors(_position, _orientation, _target[0], _target[1])
+    _position_errors.append(_errors[0])
+    _angular_errors.append(_errors[1])
+
+  return (_position_errors, _angular_errors)
+
+## Returns the mean and the 95th percentile of a list of numbers.
+# @param VALUES The list of numbers.
+def get_statistics(VALUES):
+
+  if len(VALUES) == 0:
+    return (float("nan"), float("nan"))
+
+  _sorted_values = sorted(VALUES)
+  return (sum(_sorted_values) / len(_sorted_values), _sorted_values[min(len(_sorted_values) - 1, int(0.95 * len(_sorted_values)))])
+
+## Runs the benchmark cases of all tracking channels and prints the results.
+# @param SAMPLES Dictionary mapping channel names to their lists of samples.
+# @param LOOK_AHEADS List of look-ahead times in seconds.
+# @param SMOOTHINGS List of smoothing parameters.
+# @param NOISE Standard deviation of the position noise in meters.
+# @param ANGULAR_NOISE Standard deviation of the orientation noise in radians.
+def run_cases(SAMPLES, LOOK_AHEADS, SMOOTHINGS, NOISE, ANGULAR_NOISE):
+
+  print()
+  print("{0:<32} {1:>9} {2:>10} {3:>12} {4:>12} {5:>12} {6:>12}".format("Channel", "look-ahead", "smoothing", "mean mm", "p95 mm", "mean deg", "p95 deg"))
+  print("-" * 106)
+
+  for _name in sorted(SAMPLES):
+
+    _samples = SAMPLES[_name]
+
+    if len(_samples) < 2:
+      continue
+
+    _measurements = [add_noise(_position, _orientation, NOISE, ANGULAR_NOISE) for _time, _position, _orientation in _samples]
+
+    for _look_ahead in LOOK_AHEADS:
+
+      # the unpredicted measurements show the error caused by a latency of the look-ahead time
+      for _smoothing in [None] + SMOOTHINGS:
+
+        _position_errors, _angular_errors = evaluate(_samples, _measurements, _look_ahead, _smoothing)
+        _position_statistics = get_statistics(_position_errors)
+        _angular_statistics = get_statistics(_angular_errors)
+
+        print("{0:<32} {1:>8.0f}ms {2:>10} {3:>12.3f} {4:>12.3f} {5:>12.4f} {6:>12.4f}".format( _name
+                                                                                             , _look_ahead * 1000.0
+                                                                                             , "none" if _smoothing == None else str(_smoothing)
+                                                                                             , _position_statistics[0] * 1000.0
+                                                                                             , _position_statistics[1] * 1000.0
+                                                                                             , _angular_statistics[0]
+                                                                                             , _angular_statistics[1] ))
+
+  print("-" * 106)
+  print("Errors of the predicted poses against the recorded poses at the predicted times. Smoothing 'none' is the unpredicted baseline.")
+
+## Returns the list of numbers of a comma separated command line argument.
+# @param ARGUMENT The command line argument.
+def parse_list(ARGUMENT):
+  return [float(_value) for _value in ARGUMENT.split(",") if _value.strip() != ""]
+
+## Parses the command line arguments.
+def parse_arguments():
+
+  _parser = argparse.ArgumentParser(description = "Measures the error of the tracking prediction over the look-ahead time on a recorded input log.")
+  _parser.add_argument("log", help = "input log file, e.g. recorded by start-benchmark.sh --record FILE")
+  _parser.add_argument("--look-aheads", default = "0,0.01,0.02,0.03,0.05,0.08", help = "comma separated look-ahead times in seconds")
+  _parser.add_argument("--smoothings", default = "0,0.3,0.6", help = "comma separated smoothing parameters in [0, 1)")
+  _parser.add_argument("--frame-rate", type = float, default = 0.0, help = "frame rate in Hz to derive the sample times from, 0 for the recorded times")
+  _parser.add_argument("--noise", type = float, default = 0.0, help = "standard deviation of the position noise added to the measurements in mm")
+  _parser.add_argument("--angular-noise", type = float, default = 0.0, help = "standard deviation of the orientation noise added to the measurements in degrees")
+  _parser.add_argument("--seed", type = int, default = 0, help = "seed of the noise")
+  return _parser.parse_args()
+
+## Main method for the prediction benchmark.
+def start():
+
+  _args = parse_arguments()
+  random.seed(_args.seed)
+
+  _samples = read_tracking_samples(_args.log, _args.frame_rate)
+
+  if len(_samples) == 0:
+    print("The input log does not contain any tracking channels.")
+    return
+
+  run_cases(_samples, parse_list(_args.look_aheads), parse_list(_args.smoothings), _args.noise / 1000.0, math.radians(_args.angular_noise))
+
+
+if __name__ == '__main__':
+  start()
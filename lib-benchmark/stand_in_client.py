@@ -0,0 +1,50 @@
+#!/usr/bin/python
+
+## @file
+# Stand-in for the client application used to test the client launch without display hosts.
+# Takes the same command line parameters as lib-client/main.py after its own options and
+# simulates a start-up delay, crashes and hangs before reporting its first frame.
+
+# import framework libraries
+from ClientLauncher import READY_MARKER
+
+# import python libraries
+import argparse
+import random
+import sys
+import time
+
+# Command line parameters:
+# stand_in_client.py [--startup-time S] [--failure-rate P] [--hang-rate P] SERVER_IP WORKSPACE_CONFIG_FILE WORKSPACE_ID DISPLAY_GROUP_ID SCREEN_ID DISPLAY_NAME
+
+## Main method for the stand-in client.
+def start():
+
+  _parser = argparse.ArgumentParser(description = "Stand-in client simulating the start-up of lib-client/main.py.")
+  _parser.add_argument("--startup-time", type = float, default = 1.0, help = "mean time in seconds until the first frame")
+  _parser.add_argument("--failure-rate", type = float, default = 0.0, help = "probability of crashing during start-up")
+  _parser.add_argument("--hang-rate", type = float, default = 0.0, help = "probability of never reporting the first frame")
+  _parser.add_argument("client_arguments", nargs = 6, help = "command line parameters of lib-client/main.py")
+  _args = _parser.parse_args()
+
+  print("Stand-in client for display", _args.client_arguments[5], "listens to server", _args.client_arguments[0], flush = True)
+
+  time.sleep(random.uniform(0.5, 1.5) * _args.startup_time)
+
+  _random = random.random()
+
+  if _random < _args.failure_rate:
+    print("Simulated crash during start-up", flush = True)
+    sys.exit(1)
+
+  if _random > 1.0 - _args.hang_rate:
+    print("Simulated hang during start-up", flush = True)
+  else:
+    print(READY_MARKER, flush = True)
+
+  # keep running like a client until killed
+  while True:
+    time.sleep(1.0)
+
+if __name__ == '__main__':
+  start()
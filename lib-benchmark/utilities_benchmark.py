@@ -0,0 +1,224 @@
+#!/usr/bin/python
+
+## @file
+# Micro-benchmark of the math helpers in Utilities. Compares calling the scalar functions once per object,
+# as done by the server scripts every frame, to the batched variants, and checks that both compute the same results.
+# Runs against the stand-in avango modules in lib-benchmark.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+import Utilities
+
+# import python libraries
+import argparse
+import math
+import random
+import time
+
+# Command line parameters:
+# utilities_benchmark.py [--count N] [--repeat N] [--seed N]
+
+
+## Returns a list of random rotation matrices, some of them rotated about the singular axis of the Euler angle conversion.
+# @param COUNT The number of matrices.
+def create_random_matrices(COUNT):
+
+  _matrices = []
+
+  for _i in range(COUNT):
+
+    if _i % 10 == 0:
+      _axis = (0, 0, 1)
+    else:
+      _axis = (random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1))
+
+    _matrices.append(avango.gua.make_trans_mat(random.uniform(-5, 5), random.uniform(0, 2), random.uniform(-5, 5)) * \
+                     avango.gua.make_rot_mat(random.uniform(-180, 180), _axis[0], _axis[1], _axis[2]))
+
+  return _matrices
+
+## Returns a list of random vectors.
+# @param COUNT The number of vectors.
+def create_random_vectors(COUNT):
+  return [avango.gua.Vec3(random.uniform(-5, 5), random.uniform(-5, 5), random.uniform(-5, 5)) for _i in range(COUNT)]
+
+## Returns the minimum time in seconds of several calls of a function.
+# @param FUNCTION The function to be measured.
+# @param REPEAT The number of calls.
+def measure(FUNCTION, REPEAT):
+
+  _times = []
+
+  for _i in range(REPEAT):
+    _start = time.perf_counter()
+    FUNCTION()
+    _times.append(time.perf_counter() - _start)
+
+  return min(_times)
+
+## Returns the largest absolute difference between two flat lists of numbers, ignoring positions where both are NaN.
+# Angles are compared modulo 2 pi if ANGLES is True.
+# @param VALUES1 First list of numbers.
+# @param VALUES2 Second list of numbers.
+# @param ANGLES Boolean saying if the numbers are angles in radians.
+def compute_max_difference(VALUES1, VALUES2, ANGLES = False):
+
+  _max_difference = 0.0
+
+  for _value1, _value2 in zip(VALUES1, VALUES2):
+
+    if math.isnan(_value1) and math.isnan(_value2):
+      continue
+
+    _difference = abs(_value1 - _value2)
+
+    if ANGLES:
+      _difference = min(_difference, abs(_difference - 2.0 * math.pi))
+
+    _max_difference = max(_max_difference, _difference)
+
+  return _max_difference
+
+## Returns the flat list of numbers of a batched result, which is a numpy array or a list of numbers or tuples.
+# @param RESULT The batched result.
+def flatten(RESULT):
+
+  _values = []
+
+  for _row in RESULT:
+
+    if hasattr(_row, "__len__"):
+      _values.extend(float(_value) for _value in _row)
+    else:
+      _values.append(float(_row))
+
+  return _values
+
+## Returns the scalar result of a function or NaN values if it fails.
+# @param FUNCTION The scalar function.
+# @param ARGUMENTS The arguments to call the function with.
+# @param NUM_VALUES The number of values returned by the function.
+def call_scalar(FUNCTION, ARGUMENTS, NUM_VALUES = 1):
+
+  try:
+    return FUNCTION(*ARGUMENTS)
+  except ValueError:
+    return (float("nan"),) * NUM_VALUES if NUM_VALUES > 1 else float("nan")
+
+## Runs the benchmark cases and prints the results.
+# @param COUNT The number of objects per call of a batched function.
+# @param REPEAT The number of measurements per case.
+def run_cases(COUNT, REPEAT):
+
+  _matrices = create_random_matrices(COUNT)
+  _points = create_random_vectors(COUNT)
+  _other_points = create_random_vectors(COUNT)
+  _head = avango.gua.Vec3(0.5, 1.7, -0.3)
+  _down = avango.gua.Vec3(0, -1, 0)
+
+  # batched variants are measured on prepared arrays as well as on the avango objects, including the conversion
+  _quats = Utilities.get_quat_array(_matrices)
+  _point_array = Utilities.get_vec3_array(_points)
+  _other_point_array = Utilities.get_vec3_array(_other_points)
+  _head_array = Utilities.get_vec3_array(_head)
+  _down_array = Utilities.get_vec3_array(_down)
+
+  # the scalar function normalizes its inputs in place, so it is measured on copies
+  _rotation_inputs = [(_point.copy(), _other_point.copy()) for _point, _other_point in zip(_points, _other_points)]
+
+  _cases = [ ( "get_euler_angles"
+             , lambda: [call_scalar(Utilities.get_euler_angles, (_mat,), 3) for _mat in _matrices]
+             , lambda: Utilities.get_euler_angles_batch(_matrices)
+             , lambda: Utilities.get_euler_angles_batch(_quats)
+             , True )
+           , ( "get_yaw"
+             , lambda: [Utilities.get_yaw(_mat) for _mat in _matrices]
+             , lambda: Utilities.get_yaw_batch(_matrices)
+             , lambda: Utilities.get_yaw_batch(_quats)
+             , True )
+           , ( "get_rotation_between_vectors"
+             , lambda: [Utilities.get_rotation_between_vectors(_vec1.copy(), _vec2.copy()) for _vec1, _vec2 in _rotation_inputs]
+             , lambda: Utilities.get_rotation_between_vectors_batch(_points, _other_points)
+             , lambda: Utilities.get_rotation_between_vectors_batch(_point_array, _other_point_array)
+             , None )
+           , ( "euclidean_distance"
+             , lambda: [Utilities.euclidean_distance(_point, _other_point) for _point, _other_point in zip(_points, _other_points)]
+             , lambda: Utilities.euclidean_distance_batch(_points, _other_points)
+             , lambda: Utilities.euclidean_distance_batch(_point_array, _other_point_array)
+             , False )
+           , ( "compute_point_to_line_distance"
+             , lambda: [Utilities.compute_point_to_line_distance(_point, _head, _down) for _point in _points]
+             , lambda: Utilities.compute_point_to_line_distance_batch(_points, _head, _down)
+             , lambda: Utilities.compute_point_to_line_distance_batch(_point_array, _head_array, _down_array)
+             , False ) ]
+
+  print()
+  print("{0:<40} {1:>12} {2:>14} {3:>14} {4:>9} {5:>10}".format("Function", "scalar us", "batch obj us", "batch arr us", "speed-up", "max diff"))
+  print("-" * 104)
+
+  for _name, _scalar, _batch_objects, _batch_arrays, _angles in _cases:
+
+    _scalar_time = measure(_scalar, REPEAT)
+    _batch_objects_time = measure(_batch_objects, REPEAT)
+    _batch_arrays_time = measure(_batch_arrays, REPEAT)
+
+    if _angles == None:
+      _difference = compute_rotation_difference(_rotation_inputs, _batch_arrays())
+    else:
+      _difference = compute_max_difference(flatten(_scalar()), flatten(_batch_arrays()), _angles)
+
+    print("{0:<40} {1:>12.3f} {2:>14.3f} {3:>14.3f} {4:>8.1f}x {5:>10.2e}".format( _name
+                                                                                   , _scalar_time / COUNT * 1000000.0
+                                                                                   , _batch_objects_time / COUNT * 1000000.0
+                                                                                   , _batch_arrays_time / COUNT * 1000000.0
+                                                                                   , _scalar_time / _batch_arrays_time
+                                                                                   , _difference ))
+
+  print("-" * 104)
+  print("Times are per object, minimum of " + str(REPEAT) + " runs over " + str(COUNT) + " objects.")
+
+## Returns the largest difference between the rotation matrices of the scalar get_rotation_between_vectors and the ones
+# built from the angles and axes of the batched variant.
+# @param INPUTS List of the (first vector, second vector) tuples passed to both variants.
+# @param BATCH_RESULT The tuple of angles and axes returned by the batched variant.
+def compute_rotation_difference(INPUTS, BATCH_RESULT):
+
+  _max_difference = 0.0
+
+  for (_vec1, _vec2), _angle, _axis in zip(INPUTS, BATCH_RESULT[0], BATCH_RESULT[1]):
+
+    _scalar_mat = Utilities.get_rotation_between_vectors(_vec1.copy(), _vec2.copy())
+    _batch_mat = avango.gua.make_rot_mat(float(_angle), float(_axis[0]), float(_axis[1]), float(_axis[2]))
+
+    for _row in range(4):
+      for _column in range(4):
+        _max_difference = max(_max_difference, abs(_scalar_mat.get_element(_row, _column) - _batch_mat.get_element(_row, _column)))
+
+  return _max_difference
+
+## Parses the command line arguments.
+def parse_arguments():
+
+  _parser = argparse.ArgumentParser(description = "Micro-benchmark of the scalar and batched math helpers in Utilities.")
+  _parser.add_argument("--count", type = int, default = 1000, help = "number of objects per batch")
+  _parser.add_argument("--repeat", type = int, default = 20, help = "number of measurements per function")
+  _parser.add_argument("--seed", type = int, default = 0, help = "seed of the random inputs")
+  return _parser.parse_args()
+
+## Main method for the micro-benchmark.
+def start():
+
+  _args = parse_arguments()
+  random.seed(_args.seed)
+
+  if Utilities.numpy == None:
+    print("numpy is not available, the batched functions fall back to the scalar ones.")
+
+  run_cases(_args.count, _args.repeat)
+
+
+if __name__ == '__main__':
+  start()
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes ClientBoundingBoxManager and ClientBoundingBox.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+from avango.script import field_has_changed
+
+# import framework libraries
+from ClientNodeWatcher import NodeWatcher
+from BoundingBoxEdges import BoundingBoxEdges
+from AssetCache import AssetCache
+
+## Class to create, handle and destroy ClientBoundingBox instances for the bounding box visualizations distributed by the server.
+class ClientBoundingBoxManager:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var boxes
+    # List of currently active ClientBoundingBox instances.
+    self.boxes = []
+
+  ## Custom constructor.
+  # @param SCENEGRAPH Reference to the scenegraph.
+  def my_constructor(self, SCENEGRAPH):
+
+    ## @var SCENEGRAPH
+    # Reference to the scenegraph.
+    self.SCENEGRAPH = SCENEGRAPH
+
+    # carrier nodes are added and removed as children of the server's net node
+    NodeWatcher.subscribe_children(SCENEGRAPH, "/net", self.add_box, self.remove_box)
+
+  ## Creates a ClientBoundingBox for a node added to the server's net node if it is a bounding box carrier node.
+  # @param NODE The added node.
+  def add_box(self, NODE):
+
+    if NODE.Name.value.startswith(BoundingBoxEdges.node_name_prefix):
+      _box = ClientBoundingBox()
+      _box.my_constructor(self.SCENEGRAPH, NODE)
+      self.boxes.append(_box)
+
+  ## Destroys the ClientBoundingBox of a node removed from the server's net node.
+  # @param NODE The removed node.
+  def remove_box(self, NODE):
+
+    for _box in [_box for _box in self.boxes if _box.SERVER_BOX_NODE == NODE]:
+      _box.deactivate()
+      self.boxes.remove(_box)
+
+
+## Client counterpart for the server BoundingBoxVisualization class. Rebuilds the twelve edges of a bounding box
+# from the distributed box description and displays them by local geometries.
+class ClientBoundingBox(avango.script.Script):
+
+  ## @var sf_box_string
+  # Field containing the box description, connected from the name of the server's info node.
+  sf_box_string = avango.SFString()
+
+  ## @var mf_group_names
+  # Field containing the GroupNames of the server carrier node, to be applied to all edges.
+  mf_group_names = avango.MFString()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(ClientBoundingBox).__init__()
+
+  ## Custom constructor.
+  # @param SCENEGRAPH Reference to the scenegraph.
+  # @param SERVER_BOX_NODE The carrier node on server side to be associated with this instance.
+  def my_constructor(self, SCENEGRAPH, SERVER_BOX_NODE):
+
+    ## @var SERVER_BOX_NODE
+    # The carrier node on server side to be associated with this instance.
+    self.SERVER_BOX_NODE = SERVER_BOX_NODE
+
+    ## @var transform_node
+    # Local transform node grouping the edges of this box, following the transformation of the carrier node.
+    self.transform_node = avango.gua.nodes.TransformNode(Name = 'client_' + SERVER_BOX_NODE.Name.value)
+    self.transform_node.Transform.connect_from(SERVER_BOX_NODE.Transform)
+    SCENEGRAPH.Root.value.Children.value.append(self.transform_node)
+
+    ## @var edges
+    # List of the twelve local edge geometries. Created with the first valid box description.
+    self.edges = []
+
+    ## @var material
+    # Material string currently used by the edges.
+    self.material = None
+
+    self.mf_group_names.connect_from(SERVER_BOX_NODE.GroupNames)
+
+    ## @var subscription
+    # NodeSubscription notifying about the info node below the carrier node.
+    self.subscription = NodeWatcher.subscribe_children(SCENEGRAPH, "/net/" + SERVER_BOX_NODE.Name.value, self.connect_info_node, self.disconnect_info_node)
+
+  ## Creates the local edge geometries.
+  # @param MATERIAL The material to be used to display the edges.
+  def create_edges(self, MATERIAL):
+
+    _loader = avango.gua.nodes.TriMeshLoader()
+
+    self.edges = []
+
+    for _i in range(12):
+      _edge = _loader.create_geometry_from_file('edge' + str(_i + 1), AssetCache.get_geometry_path('data/objects/cube.obj'), MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
+      _edge.ShadowMode.value = avango.gua.ShadowMode.OFF
+      _edge.GroupNames.value = list(self.mf_group_names.value)
+      self.edges.append(_edge)
+
+    self.transform_node.Children.value = self.edges
+    self.material = MATERIAL
+
+  ## Connects the box description with the info node. Called when the info node was distributed.
+  # @param INFO_NODE The info node below the carrier node.
+  def connect_info_node(self, INFO_NODE):
+    self.sf_box_string.connect_from(INFO_NODE.Name)
+
+  ## Disconnects the box description from the info node. Called when the info node was removed.
+  # @param INFO_NODE The removed info node.
+  def disconnect_info_node(self, INFO_NODE):
+    self.sf_box_string.disconnect()
+
+  ## Removes the local edges from the scenegraph.
+  def deactivate(self):
+
+    NodeWatcher.unsubscribe(self.subscription)
+    self.transform_node.Transform.disconnect()
+    self.transform_node.Parent.value.Children.value.remove(self.transform_node)
+
+  ## Called whenever sf_box_string changes. Updates the material and the transformations of the edges.
+  @field_has_changed(sf_box_string)
+  def sf_box_string_changed(self):
+
+    _box = BoundingBoxEdges.decode(self.sf_box_string.value)
+
+    # wait until the server wrote a box description
+    if _box == None:
+      return
+
+    _material, _thickness, _bb_min, _bb_max, _scale = _box
+
+    if len(self.edges) == 0:
+      self.create_edges(_material)
+
+    elif _material != self.material:
+
+      for _edge in self.edges:
+        _edge.Material.value = _material
+
+      self.material = _material
+
+    for _edge, _mat in zip(self.edges, BoundingBoxEdges.compute_edge_matrices(_bb_min, _bb_max, _thickness, _scale)):
+      _edge.Transform.value = _mat
+
+  ## Called whenever mf_group_names changes.
+  @field_has_changed(mf_group_names)
+  def mf_group_names_changed(self):
+
+    for _edge in self.edges:
+      _edge.GroupNames.value = list(self.mf_group_names.value)
@@ -0,0 +1,225 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes NodeWatcher, ChildrenWatcher and NodeSubscription.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+from avango.script import field_has_changed
+
+
+## Notifies client scripts when distributed scenegraph nodes appear or disappear.
+#
+# Scripts subscribe to the absolute path of a node, or to the children of a node, with callbacks instead of looking
+# the nodes up every frame until they were distributed. Each node on a subscribed path is watched by a ChildrenWatcher,
+# whose Children field connection is only evaluated when the children change. Watchers of nodes further down a path
+# are attached and detached by the watchers above them. A watcher attached to an existing node processes its current
+# children at once, so the callbacks of all nodes already present, e.g. when joining a running session, are fired
+# in a single pass.
+class NodeWatcher:
+
+  ## @var watchers
+  # Dictionary mapping the absolute paths of the watched nodes to their ChildrenWatcher instances.
+  watchers = {}
+
+  ## Returns the ChildrenWatcher of a path, creating it and the watchers of all nodes above on first use.
+  # @param SCENEGRAPH The scenegraph the path refers to.
+  # @param PATH The absolute path of the node whose children are to be watched.
+  @staticmethod
+  def get_watcher(SCENEGRAPH, PATH):
+
+    _watcher = NodeWatcher.watchers.get(PATH)
+
+    if _watcher == None:
+
+      _watcher = ChildrenWatcher()
+      _watcher.my_constructor(PATH)
+      NodeWatcher.watchers[PATH] = _watcher
+
+      if PATH == "/":
+        _watcher.attach(SCENEGRAPH.Root.value)
+      else:
+        NodeWatcher.subscribe(SCENEGRAPH, PATH, _watcher.attach, _watcher.detach)
+
+    return _watcher
+
+  ## Subscribes to the appearance and disappearance of the node at a path. ON_APPEAR is called at once if the node already exists.
+  # Returns the NodeSubscription to be passed to unsubscribe.
+  # @param SCENEGRAPH The scenegraph the path refers to.
+  # @param PATH The absolute path of the node, e.g. "/net/portal_group".
+  # @param ON_APPEAR Function called with the node when it appeared.
+  # @param ON_DISAPPEAR Function called with the node when it disappeared or None.
+  @staticmethod
+  def subscribe(SCENEGRAPH, PATH, ON_APPEAR, ON_DISAPPEAR = None):
+
+    _parent_path, _name = PATH.rsplit("/", 1)
+
+    _subscription = NodeSubscription()
+    _subscription.my_constructor(_name, ON_APPEAR, ON_DISAPPEAR)
+    NodeWatcher.get_watcher(SCENEGRAPH, _parent_path if _parent_path != "" else "/").add_subscription(_subscription)
+
+    return _subscription
+
+  ## Subscribes to the children appearing below and disappearing from the node at a path. ON_APPEAR is called at once
+  # for all children already present. Returns the NodeSubscription to be passed to unsubscribe.
+  # @param SCENEGRAPH The scenegraph the path refers to.
+  # @param PATH The absolute path of the parent node, e.g. "/net/portal_group".
+  # @param ON_APPEAR Function called with each child node that appeared.
+  # @param ON_DISAPPEAR Function called with each child node that disappeared or None.
+  @staticmethod
+  def subscribe_children(SCENEGRAPH, PATH, ON_APPEAR, ON_DISAPPEAR = None):
+
+    _subscription = NodeSubscription()
+    _subscription.my_constructor(None, ON_APPEAR, ON_DISAPPEAR)
+    NodeWatcher.get_watcher(SCENEGRAPH, PATH).add_subscription(_subscription)
+
+    return _subscription
+
+  ## Cancels a subscription. No further callbacks are fired for it.
+  # @param SUBSCRIPTION The NodeSubscription returned by subscribe or subscribe_children.
+  @staticmethod
+  def unsubscribe(SUBSCRIPTION):
+
+    for _watcher in NodeWatcher.watchers.values():
+
+      if SUBSCRIPTION in _watcher.subscriptions:
+        _watcher.subscriptions.remove(SUBSCRIPTION)
+        break
+
+
+## Subscription of a script to the appearance and disappearance of a node or of the children of a node.
+class NodeSubscription:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param NAME Name of the subscribed child node or None to subscribe to all children.
+  # @param ON_APPEAR Function called with a node when it appeared.
+  # @param ON_DISAPPEAR Function called with a node when it disappeared or None.
+  def my_constructor(self, NAME, ON_APPEAR, ON_DISAPPEAR):
+
+    ## @var name
+    # Name of the subscribed child node or None to subscribe to all children.
+    self.name = NAME
+
+    ## @var on_appear
+    # Function called with a node when it appeared.
+    self.on_appear = ON_APPEAR
+
+    ## @var on_disappear
+    # Function called with a node when it disappeared or None.
+    self.on_disappear = ON_DISAPPEAR
+
+    ## @var nodes
+    # List of the nodes ON_APPEAR was called for and ON_DISAPPEAR was not called for yet.
+    self.nodes = []
+
+  ## Brings the notified nodes up to date with a list of present nodes, firing the callbacks for the differences.
+  # @param NODES List of the nodes matching this subscription.
+  def update(self, NODES):
+
+    for _node in [_node for _node in self.nodes if _node not in NODES]:
+
+      self.nodes.remove(_node)
+
+      if self.on_disappear != None:
+        self.on_disappear(_node)
+
+    for _node in [_node for _node in NODES if _node not in self.nodes]:
+
+      self.nodes.append(_node)
+      self.on_appear(_node)
+
+
+## Watches the children of one scenegraph node for the subscriptions registered in NodeWatcher.
+class ChildrenWatcher(avango.script.Script):
+
+  ## @var mf_children
+  # Children field of the watched node.
+  mf_children = avango.gua.MFNode()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(ChildrenWatcher).__init__()
+
+  ## Custom constructor.
+  # @param PATH The absolute path of the watched node.
+  def my_constructor(self, PATH):
+
+    ## @var path
+    # The absolute path of the watched node.
+    self.path = PATH
+
+    ## @var node
+    # The watched node or None while it does not exist.
+    self.node = None
+
+    ## @var subscriptions
+    # List of the NodeSubscription instances for the children of the watched node.
+    self.subscriptions = []
+
+  ## Starts watching a node that appeared at the path.
+  # @param NODE The node to be watched.
+  def attach(self, NODE):
+
+    self.node = NODE
+    self.mf_children.connect_from(NODE.Children)
+    self.update_subscriptions(self.subscriptions, NODE.Children.value)
+
+  ## Stops watching the node that disappeared from the path. Its children are considered disappeared as well.
+  # @param NODE The node that disappeared.
+  def detach(self, NODE):
+
+    self.node = None
+    self.mf_children.disconnect()
+    self.update_subscriptions(self.subscriptions, [])
+
+  ## Adds a subscription and fires its callbacks for the children already present.
+  # @param SUBSCRIPTION The NodeSubscription to be added.
+  def add_subscription(self, SUBSCRIPTION):
+
+    self.subscriptions.append(SUBSCRIPTION)
+
+    if self.node != None:
+      self.update_subscriptions([SUBSCRIPTION], self.node.Children.value)
+
+  ## Updates subscriptions to a list of children in a single pass over the children.
+  # @param SUBSCRIPTIONS List of the NodeSubscription instances to be updated.
+  # @param CHILDREN List of the current children of the watched node.
+  def update_subscriptions(self, SUBSCRIPTIONS, CHILDREN):
+
+    _names = set([_subscription.name for _subscription in SUBSCRIPTIONS if _subscription.name != None])
+    _named_children = {}
+
+    if len(_names) > 0:
+
+      for _child in CHILDREN:
+
+        _name = _child.Name.value
+
+        if _name in _names and _name not in _named_children:
+          _named_children[_name] = _child
+
+    # callbacks may add or cancel subscriptions
+    for _subscription in list(SUBSCRIPTIONS):
+
+      if _subscription not in self.subscriptions:
+        continue
+
+      if _subscription.name == None:
+        _subscription.update(list(CHILDREN))
+      elif _subscription.name in _named_children:
+        _subscription.update([_named_children[_subscription.name]])
+      else:
+        _subscription.update([])
+
+  ## Called whenever mf_children changes.
+  @field_has_changed(mf_children)
+  def mf_children_changed(self):
+
+    if self.node != None:
+      self.update_subscriptions(self.subscriptions, self.mf_children.value)
@@ -10,33 +10,24 @@ import avango.script
 from avango.script import field_has_changed
 
 # import framework libraries
+from ClientNodeWatcher import NodeWatcher
 from ConsoleIO import *
+from NodeRegistry import NodeRegistry
+from PortalState import PortalState
 
 # import python libraries
 import math
 
 ## Class to create, handle and destroy Portal instances on client side.
-class ClientPortalManager(avango.script.Script):
-
-  ## @var mf_portal_group_children
-  # Children field of the server portal group to be checked for changes.
-  mf_portal_group_children = avango.gua.MFNode()
+class ClientPortalManager:
 
   ## Default constructor.
   def __init__(self):
-    self.super(ClientPortalManager).__init__()
-
-    ## @var mf_portal_group_children_connected
-    # Boolean indicating if the field connection to mf_portal_group_children was established.
-    self.mf_portal_group_children_connected = False
 
     ## @var portals
     # List of currently active ClientPortal instances.
     self.portals = []
 
-    # set evaluation policy
-    self.always_evaluate(True)
-
   ## Custom constructor.
   # @param SCENEGRAPH Reference to the scenegraph.
   # @param VIEW_LIST List of all View instances in the scene.
@@ -50,6 +41,9 @@ class ClientPortalManager(avango.script.Script):
     # List of all View instances in the scene.
     self.VIEW_LIST = VIEW_LIST
 
+    # portal nodes are added and removed as children of the server portal group
+    NodeWatcher.subscribe_children(SCENEGRAPH, "/net/portal_group", self.add_portal, self.remove_portal)
+
   ## Tells all view instances that a new portal was added to the scene.
   # @param SERVER_PORTAL_NODE Server portal grouping node.
   def notify_views_on_added_portal(self, SERVER_PORTAL_NODE):
@@ -64,61 +58,27 @@ class ClientPortalManager(avango.script.Script):
     for _view in self.VIEW_LIST:
       _view.remove_portal_preview(SERVER_PORTAL_NODE)
 
-  ## Evaluated every frame.
-  def evaluate(self):
-
-    try:
-      _portal_group_node = self.SCENEGRAPH["/net/portal_group"]
-    except:
-      return
-
-    # connect mf_portal_group_children only once
-    if _portal_group_node != None and self.mf_portal_group_children_connected == False:
-      self.mf_portal_group_children.connect_from(_portal_group_node.Children)
-      self.mf_portal_group_children_connected = True
-
-  ## Called whenever mf_portal_group_children changes.
-  @field_has_changed(mf_portal_group_children)
-  def mf_portal_group_children_changed(self):
-
-    # boolean list of which Portal instances have already been parsed.
-    _instances_matched = [False for i in range(len(self.portals))]
-
-    # iterate over all children of the server portal node
-    for _node in self.mf_portal_group_children.value:
-
-      _portal_instance_found = False
-      
-      # iterate over all Portal instances
-      for _i in range(len(self.portals)):
-
-        _portal = self.portals[_i]
-
-        # check for matching instance and break when found
-        if _portal.compare_server_portal_node(_node) == True:
-          _portal_instance_found = True
-          _instances_matched[_i] = True
-          break
+  ## Creates a ClientPortal for a portal node added on server side.
+  # @param SERVER_PORTAL_NODE Server portal grouping node.
+  def add_portal(self, SERVER_PORTAL_NODE):
 
-      # if no matching instance was found, add a new ClientPortal for the node
-      if _portal_instance_found == False:
-        _portal = ClientPortal(_node)
-        self.portals.append(_portal)
-        self.notify_views_on_added_portal(_node)
+    _portal = ClientPortal(SERVER_PORTAL_NODE)
+    self.portals.append(_portal)
+    self.notify_views_on_added_portal(SERVER_PORTAL_NODE)
 
-    # check for instances that have not been matched (removed on server side)
-    for _i in range(len(_instances_matched)):
-      _bool = _instances_matched[_i]
+  ## Destroys the ClientPortal of a portal node removed on server side.
+  # @param SERVER_PORTAL_NODE Server portal grouping node.
+  def remove_portal(self, SERVER_PORTAL_NODE):
 
-      if _bool == False:
+    for _portal_to_delete in [_portal for _portal in self.portals if _portal.compare_server_portal_node(SERVER_PORTAL_NODE)]:
 
-        _portal_to_delete = self.portals[_i]
-        self.notify_views_on_removed_portal(_portal_to_delete.SERVER_PORTAL_NODE)
+      self.notify_views_on_removed_portal(SERVER_PORTAL_NODE)
+      NodeRegistry.unregister_portal(NodeRegistry.get_key(SERVER_PORTAL_NODE.Name.value)[4])
 
-        self.portals.remove(_portal_to_delete)
+      self.portals.remove(_portal_to_delete)
 
-        # object destruction
-        del _portal_to_delete
+      # object destruction
+      del _portal_to_delete
 
 
 ## Client counterpart for the server Portal class.
@@ -153,14 +113,26 @@ class PortalPreView(avango.script.Script):
   # Field containing the current height of the portal screen.
   sf_screen_height = avango.SFFloat()
 
-  ## @var mf_portal_modes
-  # Field containing the GroupNames of the associated portal node. Used for transferring portal mode settings.
-  mf_portal_modes = avango.MFString()
+  ## @var sf_portal_state
+  # Field containing the encoded state of the associated portal, see PortalState.
+  sf_portal_state = avango.SFString()
+
+  ## @var mf_border_materials
+  # Field containing the border materials used by the associated portal, referred to by index in sf_portal_state.
+  mf_border_materials = avango.MFString()
 
   ## Default constructor.
   def __init__(self):
     self.super(PortalPreView).__init__()
 
+    ## @var portal_flags
+    # Combination of the PortalState flags of the associated portal. Initialized to the state the pipeline and camera are created in.
+    self.portal_flags = PortalState.VISIBLE
+
+    ## @var border_material_index
+    # Index of the current border material in mf_border_materials. None until the first state was received.
+    self.border_material_index = None
+
   ## Custom constructor.
   # @param SERVER_PORTAL_NODE The portal scenegraph node on server side to be associated with this instance.
   # @param VIEW The View instance to be associated with this instance.
@@ -174,42 +146,61 @@ class PortalPreView(avango.script.Script):
     # The View instance to be associated with this instance.
     self.VIEW = VIEW
 
-    _user_left_eye = VIEW.SCENEGRAPH["/net/w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id) + "/head/eyeL"]
+    _view_node = NodeRegistry.find_node(VIEW.SCENEGRAPH, VIEW.view_key)
 
     # if no node is present, this view is not occupied, stop pre view creation
-    if _user_left_eye == None:
-      print_warning("No user nodes present for " + "w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id))
+    if _view_node == None:
+      print_warning("No user nodes present for " + VIEW.view_name)
       return
     else:
-      print_message("Construct PortalPreView for " + SERVER_PORTAL_NODE.Name.value + " and w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id))
+      print_message("Construct PortalPreView for " + SERVER_PORTAL_NODE.Name.value + " and " + VIEW.view_name)
+
+    ## @var portal_key
+    # Identity of the server portal node in the NodeRegistry.
+    self.portal_key = NodeRegistry.get_key(SERVER_PORTAL_NODE.Name.value)
+    NodeRegistry.register(self.portal_key, SERVER_PORTAL_NODE)
+
+    # the name of the settings node changes with the portal state and is recognized by the state prefix
+    _settings_node = PortalState.find_settings_node(SERVER_PORTAL_NODE)
+
+    if _settings_node == None:
+      print_warning("No settings node present for " + SERVER_PORTAL_NODE.Name.value)
+      return
+
+    _transformed_head_key = VIEW.view_key[0:3] + (None, self.portal_key[4])
 
     ## @var transformed_head_node
     # view_transform_node/head of the corresponding UserRepresentation in the portal on server side.
-    self.transformed_head_node = VIEW.SCENEGRAPH["/net/portal_group/" + SERVER_PORTAL_NODE.Name.value + "/scene_matrix/head_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.transformed_head_node = NodeRegistry.find_node(VIEW.SCENEGRAPH, _transformed_head_key)
 
     ## @var head_node
     # view_transform_node/head of the corresponding physical user representation
-    self.head_node = self.VIEW.SCENEGRAPH["/net/w" + str(self.VIEW.workspace_id) + "_dg" + str(self.VIEW.display_group_id) + "_u" + str(self.VIEW.user_id) + "/head"]
+    self.head_node = NodeRegistry.find_child(VIEW.SCENEGRAPH, VIEW.view_key, NodeRegistry.head_name)
 
     ## @var left_eye_node
     # Scenegraph node representing the left eye's position in the portal's exit space.
-    self.left_eye_node = self.transformed_head_node.Children.value[0]
+    self.left_eye_node = NodeRegistry.find_child(VIEW.SCENEGRAPH, _transformed_head_key, NodeRegistry.left_eye_name)
 
     ## @var right_eye_node
     # Scenegraph node representing the left eye's position in the portal's exit space.
-    self.right_eye_node = self.transformed_head_node.Children.value[1]
+    self.right_eye_node = NodeRegistry.find_child(VIEW.SCENEGRAPH, _transformed_head_key, NodeRegistry.right_eye_name)
 
     ## @var portal_matrix_node
     # Server portal node containing the portal matrix (entry transformation).
-    self.portal_matrix_node = VIEW.SCENEGRAPH["/net/portal_group/" + SERVER_PORTAL_NODE.Name.value + "/portal_matrix/"]
+    self.portal_matrix_node = NodeRegistry.find_child(VIEW.SCENEGRAPH, self.portal_key, NodeRegistry.portal_matrix_name)
 
     ## @var scene_matrix_node
     # Server portal node containing the scene matrix (exit transformation).
-    self.scene_matrix_node = VIEW.SCENEGRAPH["/net/portal_group/" + SERVER_PORTAL_NODE.Name.value + "/scene_matrix/"]
+    self.scene_matrix_node = NodeRegistry.find_child(VIEW.SCENEGRAPH, self.portal_key, NodeRegistry.scene_matrix_name)
 
     ## @var screen_node
     # Screen node representing the screen position in the portal's exit space.
-    self.screen_node = VIEW.SCENEGRAPH["/net/portal_group/" + SERVER_PORTAL_NODE.Name.value + "/scene_matrix/portal_screen"]
+    self.screen_node = NodeRegistry.find_child(VIEW.SCENEGRAPH, self.portal_key, NodeRegistry.scene_matrix_name + "/" + NodeRegistry.portal_screen_name)
+
+    if None in [ self.transformed_head_node, self.head_node, self.left_eye_node, self.right_eye_node
+               , self.portal_matrix_node, self.scene_matrix_node, self.screen_node ]:
+      print_warning("Portal nodes of " + SERVER_PORTAL_NODE.Name.value + " for " + VIEW.view_name + " are incomplete")
+      return
 
     # debug screen visualization
     #_loader = avango.gua.nodes.TriMeshLoader()
@@ -266,7 +257,7 @@ class PortalPreView(avango.script.Script):
     else:
       self.pipeline.EnableStereo.value = False
 
-    self.pipeline.OutputTextureName.value = self.SERVER_PORTAL_NODE.Name.value + "_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)
+    self.pipeline.OutputTextureName.value = self.SERVER_PORTAL_NODE.Name.value + "_" + VIEW.view_name
     
     self.pipeline.BackgroundMode.value = avango.gua.BackgroundMode.SKYMAP_TEXTURE
     self.pipeline.BackgroundTexture.value = "data/textures/sky.jpg"
@@ -279,28 +270,28 @@ class PortalPreView(avango.script.Script):
     _loader = avango.gua.nodes.TriMeshLoader()
 
 
-    self.textured_quad = avango.gua.nodes.TexturedQuadNode(Name = "texture_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id),
-                                                           Texture = self.SERVER_PORTAL_NODE.Name.value + "_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id),
+    self.textured_quad = avango.gua.nodes.TexturedQuadNode(Name = "texture_" + VIEW.view_name,
+                                                           Texture = self.SERVER_PORTAL_NODE.Name.value + "_" + VIEW.view_name,
                                                            IsStereoTexture = self.VIEW.is_stereo,
                                                            Width = self.screen_node.Width.value,
                                                            Height = self.screen_node.Height.value
                                                            )
-    self.textured_quad.GroupNames.value = ["w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.textured_quad.GroupNames.value = [VIEW.view_name]
     self.portal_matrix_node.Children.value.append(self.textured_quad)
 
 
     ## @var back_geometry
     # Geometry being displayed when portal pre view is seen from behind.
-    self.back_geometry = _loader.create_geometry_from_file("back_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id), "data/objects/plane.obj", "data/materials/ShadelessBlue.gmd", avango.gua.LoaderFlags.DEFAULTS)
+    self.back_geometry = _loader.create_geometry_from_file("back_" + VIEW.view_name, "data/objects/plane.obj", "data/materials/ShadelessBlue.gmd", avango.gua.LoaderFlags.DEFAULTS)
     self.back_geometry.Transform.value = avango.gua.make_trans_mat(0.0, 0.0, -0.001) * avango.gua.make_rot_mat(90, 1, 0, 0) * avango.gua.make_scale_mat(self.screen_node.Width.value, 1.0, self.screen_node.Height.value)
-    self.back_geometry.GroupNames.value = ["portal_invisible_group", "w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.back_geometry.GroupNames.value = ["portal_invisible_group", VIEW.view_name]
     self.portal_matrix_node.Children.value.append(self.back_geometry)
 
     ## @var portal_border
     # Geometry node containing the portal's frame.
-    self.portal_border = _loader.create_geometry_from_file("border_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id), "data/objects/screen.obj", "data/materials/ShadelessBlue.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
+    self.portal_border = _loader.create_geometry_from_file("border_" + VIEW.view_name, "data/objects/screen.obj", "data/materials/ShadelessBlue.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
     self.portal_border.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.portal_border.GroupNames.value = ["w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.portal_border.GroupNames.value = [VIEW.view_name]
     self.portal_border.Transform.value = avango.gua.make_scale_mat(self.screen_node.Width.value, self.screen_node.Height.value, 1.0)
     self.portal_matrix_node.Children.value.append(self.portal_border)
 
@@ -309,7 +300,8 @@ class PortalPreView(avango.script.Script):
     self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
 
     # init field connections
-    self.mf_portal_modes.connect_from(VIEW.SCENEGRAPH["/net/portal_group/" + SERVER_PORTAL_NODE.Name.value + "/settings"].GroupNames)
+    self.mf_border_materials.connect_from(_settings_node.GroupNames)
+    self.sf_portal_state.connect_from(_settings_node.Name)
     self.sf_screen_width.connect_from(self.screen_node.Width)
     self.sf_screen_height.connect_from(self.screen_node.Height)
 
@@ -353,9 +345,21 @@ class PortalPreView(avango.script.Script):
     del self.pipeline
     del self.camera
 
-  ## Called whenever mf_portal_modes changes.
-  @field_has_changed(mf_portal_modes)
-  def mf_portal_modes_changed(self):
+  ## Sets the border material referred to by border_material_index if it was already received.
+  def update_border_material(self):
+
+    if self.border_material_index == None or self.border_material_index >= len(self.mf_border_materials.value):
+      return
+
+    _material = self.mf_border_materials.value[self.border_material_index]
+
+    if self.portal_border.Material.value != _material and _material != "None":
+      self.portal_border.Material.value = _material
+      self.back_geometry.Material.value = _material
+
+  ## Called whenever sf_portal_state changes. Only the settings whose flags changed are applied.
+  @field_has_changed(sf_portal_state)
+  def sf_portal_state_changed(self):
 
     # check for deletion
     try:
@@ -363,38 +367,54 @@ class PortalPreView(avango.script.Script):
     except:
       return
 
-    #print "change modes to", self.mf_portal_modes.value[0], self.mf_portal_modes.value[1], self.mf_portal_modes.value[2], self.mf_portal_modes.value[3], self.mf_portal_modes.value[4]
+    _state = PortalState.decode(self.sf_portal_state.value)
+
+    if _state == None:
+      return
+
+    _changed_flags = self.portal_flags ^ _state[0]
+    self.portal_flags = _state[0]
 
     # check for camera mode
-    if self.mf_portal_modes.value[1] == "1-ORTHOGRAPHIC":
-      self.camera.Mode.value = avango.gua.ProjectionMode.ORTHOGRAPHIC
-    else:
-      self.camera.Mode.value = avango.gua.ProjectionMode.PERSPECTIVE
+    if _changed_flags & PortalState.CAMERA_MODE_ORTHOGRAPHIC:
+
+      if self.portal_flags & PortalState.CAMERA_MODE_ORTHOGRAPHIC:
+        self.camera.Mode.value = avango.gua.ProjectionMode.ORTHOGRAPHIC
+      else:
+        self.camera.Mode.value = avango.gua.ProjectionMode.PERSPECTIVE
 
     # check for negative parallax
-    if self.mf_portal_modes.value[2] == "2-True":
-      self.pipeline.EnableGlobalClippingPlane.value = False
-    else:
-      self.pipeline.EnableGlobalClippingPlane.value = True
+    if _changed_flags & PortalState.NEGATIVE_PARALLAX:
+
+      if self.portal_flags & PortalState.NEGATIVE_PARALLAX:
+        self.pipeline.EnableGlobalClippingPlane.value = False
+      else:
+        self.pipeline.EnableGlobalClippingPlane.value = True
 
     # set correct border material
-    if self.portal_border.Material.value != self.mf_portal_modes.value[3].replace("3-", ""):
-      
-      _material = self.mf_portal_modes.value[3].replace("3-", "")
+    if _state[1] != self.border_material_index:
+      self.border_material_index = _state[1]
+      self.update_border_material()
 
-      if _material != "None":
-        self.portal_border.Material.value = _material
-        self.back_geometry.Material.value = _material
+  ## Called whenever mf_border_materials changes.
+  @field_has_changed(mf_border_materials)
+  def mf_border_materials_changed(self):
+
+    # check for deletion
+    try:
+      self.pipeline
+    except:
+      return
+
+    self.update_border_material()
 
   ## Evaluated every frame.
   def evaluate(self):
 
     # trigger frame callback activity
-    _server_view_node_name = "w" + str(self.VIEW.workspace_id) + "_dg" + str(self.VIEW.display_group_id) + "_u" + str(self.VIEW.user_id)
-
     if (len(self.portal_matrix_node.GroupNames.value) != 0 and \
-       (_server_view_node_name) not in self.portal_matrix_node.GroupNames.value) or \
-       self.mf_portal_modes.value[4] == "4-False":
+       self.VIEW.view_name not in self.portal_matrix_node.GroupNames.value) or \
+       not (self.portal_flags & PortalState.VISIBLE):
 
       if self.frame_trigger.Active.value == True:
         self.frame_trigger.Active.value = False
@@ -420,7 +440,7 @@ class PortalPreView(avango.script.Script):
 
 
     # update global clipping plane when negative parallax is false
-    if self.mf_portal_modes.value[2] == "2-False":
+    if not (self.portal_flags & PortalState.NEGATIVE_PARALLAX):
       _portal_scene_mat = avango.gua.make_trans_mat(self.screen_node.Transform.value.get_translate()) * \
                           self.scene_matrix_node.Transform.value * \
                           avango.gua.make_rot_mat(self.screen_node.Transform.value.get_rotate())
@@ -0,0 +1,224 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes ClientTraceManager and ClientTrace.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+from avango.script import field_has_changed
+
+# import framework libraries
+from ClientNodeWatcher import NodeWatcher
+from TracePoints import TracePoints
+import Utilities
+from AssetCache import AssetCache
+
+# import python libraries
+import math
+
+## Class to create, handle and destroy ClientTrace instances for the navigation traces distributed by the server.
+class ClientTraceManager:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var traces
+    # List of currently active ClientTrace instances.
+    self.traces = []
+
+  ## Custom constructor.
+  # @param SCENEGRAPH Reference to the scenegraph.
+  def my_constructor(self, SCENEGRAPH):
+
+    ## @var SCENEGRAPH
+    # Reference to the scenegraph.
+    self.SCENEGRAPH = SCENEGRAPH
+
+    # trace nodes are added and removed as children of the server's net node
+    NodeWatcher.subscribe_children(SCENEGRAPH, "/net", self.add_trace, self.remove_trace)
+
+  ## Creates a ClientTrace for a node added to the server's net node if it is a trace node.
+  # @param NODE The added node.
+  def add_trace(self, NODE):
+
+    if NODE.Name.value.startswith("nav_trace_"):
+      _trace = ClientTrace()
+      _trace.my_constructor(self.SCENEGRAPH, NODE)
+      self.traces.append(_trace)
+
+  ## Destroys the ClientTrace of a node removed from the server's net node.
+  # @param NODE The removed node.
+  def remove_trace(self, NODE):
+
+    for _trace in [_trace for _trace in self.traces if _trace.SERVER_TRACE_NODE == NODE]:
+      _trace.deactivate()
+      self.traces.remove(_trace)
+
+
+## Client counterpart for the server Trace class. Decodes the ring buffer of trace points from the
+# distributed info node and displays it by local line segment geometries.
+class ClientTrace(avango.script.Script):
+
+  ## @var sf_info_string
+  # Field containing the trace settings and the ring buffer of trace points, connected from the name of the server's info node.
+  sf_info_string = avango.SFString()
+
+  ## @var mf_group_names
+  # Field containing the GroupNames of the server trace node, to be applied to all line segments.
+  mf_group_names = avango.MFString()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(ClientTrace).__init__()
+
+  ## Custom constructor.
+  # @param SCENEGRAPH Reference to the scenegraph.
+  # @param SERVER_TRACE_NODE The trace scenegraph node on server side to be associated with this instance.
+  def my_constructor(self, SCENEGRAPH, SERVER_TRACE_NODE):
+
+    ## @var SERVER_TRACE_NODE
+    # The trace scenegraph node on server side to be associated with this instance.
+    self.SERVER_TRACE_NODE = SERVER_TRACE_NODE
+
+    ## @var transform_node
+    # Local transform node grouping the line segments of this trace.
+    self.transform_node = avango.gua.nodes.TransformNode(Name = 'client_' + SERVER_TRACE_NODE.Name.value)
+    SCENEGRAPH.Root.value.Children.value.append(self.transform_node)
+
+    ## @var lines
+    # A list of local scene graph nodes, one per ring buffer slot. Each one represents the line segment
+    # ending at the point in its slot. The segment of the oldest point is hidden.
+    self.lines = []
+
+    ## @var points
+    # List of the decoded points, one (x, y, z) tuple per ring buffer slot.
+    self.points = []
+
+    ## @var segments
+    # List of (start point, end point) tuples currently displayed by the nodes in lines. None for hidden segments.
+    self.segments = []
+
+    self.mf_group_names.connect_from(SERVER_TRACE_NODE.GroupNames)
+
+    ## @var subscription
+    # NodeSubscription notifying about the info node below the server trace node.
+    self.subscription = NodeWatcher.subscribe_children(SCENEGRAPH, "/net/" + SERVER_TRACE_NODE.Name.value, self.connect_info_node, self.disconnect_info_node)
+
+  ## Creates the local line segment geometries.
+  # @param NUM_SLOTS The number of ring buffer slots.
+  # @param TRACE_MATERIAL The material to be used to display the trace.
+  def create_lines(self, NUM_SLOTS, TRACE_MATERIAL):
+
+    _loader = avango.gua.nodes.TriMeshLoader()
+
+    self.lines = []
+    self.segments = [None for _i in range(NUM_SLOTS)]
+
+    for _i in range(NUM_SLOTS):
+      _line = _loader.create_geometry_from_file('line_geometry_' + str(_i), AssetCache.get_geometry_path('data/objects/cube.obj'), 'data/materials/' + TRACE_MATERIAL + '.gmd', avango.gua.LoaderFlags.DEFAULTS)
+      _line.Transform.value = avango.gua.make_scale_mat(0, 0, 0)
+      _line.ShadowMode.value = avango.gua.ShadowMode.OFF
+      _line.GroupNames.value = list(self.mf_group_names.value)
+      self.lines.append(_line)
+
+    self.transform_node.Children.value = self.lines
+
+  ## Calculates the transformation matrices of line segment nodes in the scene graph.
+  # @param SEGMENTS List of (start point, end point) tuples of the line segments, each point given as (x, y, z) tuple.
+  # @param LINE_THICKNESS Thickness of the line segments in meters.
+  def calc_transform_mats(self, SEGMENTS, LINE_THICKNESS):
+
+    # calc the vectors in between the two points of each line segment
+    _vecs = [(_end[0] - _start[0], _end[1] - _start[1], _end[2] - _start[2]) for _start, _end in SEGMENTS]
+
+    # calc the rotations according negative z-axis of all line segments at once
+    _angles, _axes = Utilities.get_rotation_between_vectors_batch([(0.0, 0.0, -1.0)], _vecs)
+
+    _mats = []
+
+    for (_start, _end), _vec, _angle, _axis in zip(SEGMENTS, _vecs, _angles, _axes):
+
+      # the resulting center of the line segment and the scaling needed to connect both points
+      _center = avango.gua.Vec3(_start[0] + _vec[0] * 0.5, _start[1] + _vec[1] * 0.5, _start[2] + _vec[2] * 0.5)
+      _length = math.sqrt(_vec[0] * _vec[0] + _vec[1] * _vec[1] + _vec[2] * _vec[2])
+
+      # build the complete matrix
+      _mats.append(avango.gua.make_trans_mat(_center) * \
+                   avango.gua.make_rot_mat(float(_angle), avango.gua.Vec3(float(_axis[0]), float(_axis[1]), float(_axis[2]))) * \
+                   avango.gua.make_scale_mat(LINE_THICKNESS, LINE_THICKNESS, _length))
+
+    return _mats
+
+  ## Connects the ring buffer of this trace with the info node. Called when the info node was distributed.
+  # @param INFO_NODE The info node below the server trace node.
+  def connect_info_node(self, INFO_NODE):
+    self.sf_info_string.connect_from(INFO_NODE.Name)
+
+  ## Disconnects the ring buffer of this trace from the info node. Called when the info node was removed.
+  # @param INFO_NODE The removed info node.
+  def disconnect_info_node(self, INFO_NODE):
+    self.sf_info_string.disconnect()
+
+  ## Removes the local line segments from the scenegraph.
+  def deactivate(self):
+
+    NodeWatcher.unsubscribe(self.subscription)
+    self.transform_node.Parent.value.Children.value.remove(self.transform_node)
+
+  ## Decodes the ring buffer and updates the line segments whose end points changed.
+  def update_segments(self):
+
+    _trace = TracePoints.decode(self.sf_info_string.value)
+
+    # wait until the server wrote a valid ring buffer
+    if _trace == None:
+      return
+
+    _material, _line_thickness, _crrnt_idx, _points = _trace
+
+    if len(self.lines) != len(_points):
+      self.create_lines(len(_points), _material)
+
+    self.points = _points
+
+    _oldest_idx = (_crrnt_idx + 1) % len(self.points)
+    _changed_indices = []
+
+    for _i in range(len(self.points)):
+
+      if _i == _oldest_idx or self.points[_i - 1] == self.points[_i]:
+        _segment = None
+      else:
+        _segment = (self.points[_i - 1], self.points[_i])
+
+      if _segment == self.segments[_i]:
+        continue
+
+      self.segments[_i] = _segment
+
+      if _segment == None:
+        self.lines[_i].Transform.value = avango.gua.make_scale_mat(0, 0, 0)
+      else:
+        _changed_indices.append(_i)
+
+    # the transformations of all changed line segments are computed in one batch
+    if len(_changed_indices) > 0:
+
+      _mats = self.calc_transform_mats([self.segments[_i] for _i in _changed_indices], _line_thickness)
+
+      for _i, _mat in zip(_changed_indices, _mats):
+        self.lines[_i].Transform.value = _mat
+
+  ## Called whenever sf_info_string changes. The server renames the info node at most once per frame when points were added.
+  @field_has_changed(sf_info_string)
+  def sf_info_string_changed(self):
+    self.update_segments()
+
+  ## Called whenever mf_group_names changes.
+  @field_has_changed(mf_group_names)
+  def mf_group_names_changed(self):
+
+    for _line in self.lines:
+      _line.GroupNames.value = list(self.mf_group_names.value)
@@ -12,8 +12,11 @@ from avango.script import field_has_changed
 
 # import framework libraries
 from ClientTrackingReader import *
+from ClientNodeWatcher import NodeWatcher
 from ClientPortal import *
 from ConsoleIO import *
+from NodeRegistry import NodeRegistry
+from PipelineSettings import PipelineSettings
 
 # import python libraries
 import time
@@ -24,7 +27,7 @@ import time
 class View(avango.script.Script):
 
   ## @var sf_pipeline_string
-  # String field containing the concatenated pipeline values.
+  # String field containing the pipeline settings record, see PipelineSettings.
   sf_pipeline_string = avango.SFString()
 
   ## Default constructor.
@@ -35,6 +38,10 @@ class View(avango.script.Script):
     # A list of all PortalPreView instances for this view.
     self.portal_pre_views = []
 
+    ## @var pipeline_settings
+    # Dictionary mapping the keys of all pipeline settings applied so far to the string representations of their values.
+    self.pipeline_settings = {}
+
   ## Custom constructor.
   # @param SCENEGRAPH Reference to the scenegraph to be displayed.
   # @param VIEWER Reference to the viewer to which the created pipeline will be appended to.
@@ -69,6 +76,14 @@ class View(avango.script.Script):
     # ID of the user to deal with.
     self.user_id = USER_ID
 
+    ## @var view_key
+    # Identity of the server's view transform node of this view in the NodeRegistry.
+    self.view_key = (WORKSPACE_ID, DISPLAY_GROUP_ID, USER_ID, None, None)
+
+    ## @var view_name
+    # Name of the server's view transform node of this view, also used as group name of the user's geometries.
+    self.view_name = NodeRegistry.get_name(self.view_key)
+
     # retrieve the needed values from display
     ## @var display_values
     # Values that are retrieved from the display. Vary for each view on this display.
@@ -96,7 +111,7 @@ class View(avango.script.Script):
     self.camera.Mode.value = DISPLAY_INSTANCE.cameramode
 
     # set render mask for camera
-    _render_mask = "(main_scene | w" + str(WORKSPACE_ID) + "_dg" + str(DISPLAY_GROUP_ID) + "_u" + str(USER_ID) + ") && !do_not_display_group && !portal_invisible_group"
+    _render_mask = "(main_scene | " + self.view_name + ") && !do_not_display_group && !portal_invisible_group"
     self.camera.RenderMask.value = _render_mask
     #print repr(self.camera.RenderMask.value)
 
@@ -110,10 +125,13 @@ class View(avango.script.Script):
       Standard View
     '''
 
-    self.camera.LeftScreen.value = "/net/w" + str(self.workspace_id) + "_dg" + str(self.display_group_id) + "_u" + str(self.user_id) + "/screen_" + str(self.screen_id)
-    self.camera.RightScreen.value = "/net/w" + str(self.workspace_id) + "_dg" + str(self.display_group_id) + "_u" + str(self.user_id) + "/screen_" + str(self.screen_id)
-    self.camera.LeftEye.value = "/net/w" + str(self.workspace_id) + "_dg" + str(self.display_group_id) + "_u" + str(self.user_id) + "/head/eyeL"
-    self.camera.RightEye.value = "/net/w" + str(self.workspace_id) + "_dg" + str(self.display_group_id) + "_u" + str(self.user_id) + "/head/eyeR"
+    _screen_path = NodeRegistry.get_path( (WORKSPACE_ID, DISPLAY_GROUP_ID, USER_ID, SCREEN_ID, None) )
+    _view_path = NodeRegistry.get_path(self.view_key)
+
+    self.camera.LeftScreen.value = _screen_path
+    self.camera.RightScreen.value = _screen_path
+    self.camera.LeftEye.value = _view_path + "/head/eyeL"
+    self.camera.RightEye.value = _view_path + "/head/eyeR"
 
     # create window
     ## @var window
@@ -164,9 +182,8 @@ class View(avango.script.Script):
     # append pipeline to the viewer
     VIEWER.Pipelines.value.append(self.pipeline)
 
-    ## @var frame_trigger
-    # Triggers framewise evaluation of frame_callback method.
-    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+    # receive the pipeline settings once the info node was distributed
+    NodeWatcher.subscribe_children(SCENEGRAPH, "/net/pipeline_values", self.connect_pipeline_info_node, self.disconnect_pipeline_info_node)
   
 
   ## Sets the warp matrices if there is a correct amount of them.
@@ -207,83 +224,71 @@ class View(avango.script.Script):
       del _pre_view
       print("New list of pre views", self.portal_pre_views)
 
-  ## Called whenever sf_pipeline_string changes.
-  @field_has_changed(sf_pipeline_string)
-  def sf_pipeline_string_changed(self):
-      
-    _splitted_string = self.sf_pipeline_string.value.split("#")
-
-    print_message("w" + str(self.workspace_id) + "_dg" + str(self.display_group_id) + "_u" + str(self.user_id) + ": Set pipeline values to " + str(_splitted_string))
+  ## Writes the value of a pipeline setting to the corresponding fields of the pipeline.
+  # @param KEY The key of the setting as listed in PipelineSettings.schema.
+  # @param VALUE The typed value of the setting.
+  def apply_pipeline_setting(self, KEY, VALUE):
 
     # Note: Calling avango.gua.create_texture during runtime causes the application
     # to crash. All textures have to be preloaded, for example in ClientPipelineValues.py
-    # avango.gua.create_texture(_splitted_string[0])
-    
-    if self.display_render_mask == "!main_scene":
-      self.pipeline.BackgroundMode.value = avango.gua.BackgroundMode.COLOR
-      self.pipeline.BackgroundColor.value = avango.gua.Color(0.2, 0.45, 0.6)
-    else:
+    # avango.gua.create_texture(VALUE)
+
+    if KEY == "background_texture":
+
+      if self.display_render_mask == "!main_scene":
+        self.pipeline.BackgroundMode.value = avango.gua.BackgroundMode.COLOR
+        self.pipeline.BackgroundColor.value = avango.gua.Color(0.2, 0.45, 0.6)
+        return
+
       self.pipeline.BackgroundMode.value = avango.gua.BackgroundMode.SKYMAP_TEXTURE
-      self.pipeline.BackgroundTexture.value = _splitted_string[0]
-      self.pipeline.FogTexture.value = _splitted_string[0]
 
-    if _splitted_string[1] == "True":
-      self.pipeline.EnableBloom.value = True
-    else:
-      self.pipeline.EnableBloom.value = False
+    for _field_name in PipelineSettings.pipeline_fields[KEY]:
+      getattr(self.pipeline, _field_name).value = VALUE
 
-    self.pipeline.BloomIntensity.value = float(_splitted_string[2])
-    self.pipeline.BloomThreshold.value = float(_splitted_string[3])
-    self.pipeline.BloomRadius.value = float(_splitted_string[4])
+  ## Called whenever sf_pipeline_string changes. Only the settings whose values changed are applied.
+  @field_has_changed(sf_pipeline_string)
+  def sf_pipeline_string_changed(self):
 
-    if _splitted_string[5] == "True":
-      self.pipeline.EnableSsao.value = True
-    else:
-      self.pipeline.EnableSsao.value = False
+    _version, _strings = PipelineSettings.split(self.sf_pipeline_string.value)
 
-    self.pipeline.SsaoRadius.value = float(_splitted_string[6])
-    self.pipeline.SsaoIntensity.value = float(_splitted_string[7])
+    if _version == None:
 
-    if _splitted_string[8] == "True":
-      self.pipeline.EnableBackfaceCulling.value = True
-    else:
-      self.pipeline.EnableBackfaceCulling.value = False
+      # the record is empty until the pipeline info node was distributed
+      if self.sf_pipeline_string.value != "":
+        print_warning(self.view_name + ": Invalid pipeline settings record header, keeping the previous settings.")
 
-    if _splitted_string[9] == "True":
-      self.pipeline.EnableFrustumCulling.value = True
-    else:
-      self.pipeline.EnableFrustumCulling.value = False
+      return
 
-    if _splitted_string[10] == "True":
-      self.pipeline.EnableFXAA.value = True
-    else:
-      self.pipeline.EnableFXAA.value = False
+    if _version > PipelineSettings.version:
+      print_warning("Pipeline settings of version " + str(_version) + " are newer than the supported version " + str(PipelineSettings.version) + ", unknown settings are ignored.")
 
-    _ambient_color_values = _splitted_string[11].split(",")
-    _ambient_color = avango.gua.Color(float(_ambient_color_values[0]), float(_ambient_color_values[1]), float(_ambient_color_values[2]))
-    self.pipeline.AmbientColor.value = _ambient_color
+    _changed_keys = [_key for _key, _string in _strings.items() if self.pipeline_settings.get(_key) != _string]
 
-    if _splitted_string[12] == "True":
-      self.pipeline.EnableFog.value = True
-    else:
-      self.pipeline.EnableFog.value = False
+    if len(_changed_keys) == 0:
+      return
+
+    print_message(self.view_name + ": Set pipeline values " + ", ".join(_key + "=" + _strings[_key] for _key in _changed_keys))
+
+    for _key in _changed_keys:
+
+      try:
+        _value = PipelineSettings.decode_value(PipelineSettings.types[_key], _strings[_key])
+
+      except (ValueError, IndexError):
+        print_warning(self.view_name + ": Invalid value '" + _strings[_key] + "' of pipeline setting " + _key + ", keeping the previous value.")
+        continue
+
+      self.apply_pipeline_setting(_key, _value)
+      self.pipeline_settings[_key] = _strings[_key]
 
-    self.pipeline.FogStart.value = float(_splitted_string[13])
-    self.pipeline.FogEnd.value = float(_splitted_string[14])
-    self.pipeline.NearClip.value = float(_splitted_string[15])
-    self.pipeline.FarClip.value = float(_splitted_string[16])
-  
     #avango.gua.reload_materials()
-  
-  ## Evaluated every frame until connection is setup.
-  def frame_callback(self):
 
-    try:
-      _pipeline_info_node = self.SCENEGRAPH["/net/pipeline_values"].Children.value[0]
-    except:
-      return
+  ## Connects sf_pipeline_string with the Name field of the pipeline info node. Called when the node was distributed.
+  # @param PIPELINE_INFO_NODE The pipeline info node below the server's pipeline values node.
+  def connect_pipeline_info_node(self, PIPELINE_INFO_NODE):
+    self.sf_pipeline_string.connect_from(PIPELINE_INFO_NODE.Name)
 
-    # connect sf_pipeline_string with Name field of info node once
-    if _pipeline_info_node != None and self.sf_pipeline_string.value == "":
-      self.sf_pipeline_string.connect_from(_pipeline_info_node.Name)
-      self.frame_trigger.Active.value = False
+  ## Disconnects sf_pipeline_string from the Name field of the pipeline info node. Called when the node was removed.
+  # @param PIPELINE_INFO_NODE The removed pipeline info node.
+  def disconnect_pipeline_info_node(self, PIPELINE_INFO_NODE):
+    self.sf_pipeline_string.disconnect()
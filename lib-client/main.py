@@ -13,6 +13,10 @@ import avango.oculus
 import ClientMaterialUpdaters
 from View import *
 from ClientPortal import *
+from ClientTrace import *
+from ClientBoundingBox import *
+from ClientLauncher import ClientReadySignal
+from ConfigCompiler import ConfigCompiler
 from examples_common.GuaVE import GuaVE
 
 # import python libraries
@@ -32,7 +36,6 @@ def start():
 
   # get the workspace config file #
   workspace_config_file = str(sys.argv[2])
-  exec('from ' + workspace_config_file.replace("/", ".").replace(".py", "") + ' import displays', globals())
 
   # get the workspace id
   workspace_id = int(sys.argv[3])
@@ -154,10 +157,18 @@ def start():
   # END PLOD stuff
   '''
 
-  # get the display instance
-  for _display in displays:
-    if _display.name == display_name:
-      handled_display_instance = _display
+  # get the display instance from the compiled configuration written by the server
+  handled_display_instance = ConfigCompiler.load_display(workspace_config_file, display_name)
+
+  # fall back to loading the whole configuration file if the compiled one is missing or outdated
+  if handled_display_instance == None:
+
+    print_warning("No up-to-date compiled configuration for display " + display_name + ", loading " + workspace_config_file)
+    exec('from ' + workspace_config_file.replace("/", ".").replace(".py", "") + ' import displays', globals())
+
+    for _display in displays:
+      if _display.name == display_name:
+        handled_display_instance = _display
 
   # create a viewer
   viewer = avango.gua.nodes.Viewer()
@@ -185,6 +196,18 @@ def start():
   portal_manager = ClientPortalManager()
   portal_manager.my_constructor(graph, views)
 
+  # create client trace manager
+  trace_manager = ClientTraceManager()
+  trace_manager.my_constructor(graph)
+
+  # create client bounding box manager
+  bounding_box_manager = ClientBoundingBoxManager()
+  bounding_box_manager.my_constructor(graph)
+
+  # report the first frame with distributed content to the server's client launcher
+  ready_signal = ClientReadySignal()
+  ready_signal.my_constructor(nettrans)
+
   shell_client = GuaVE()
   shell_client.start(locals(), globals())
 
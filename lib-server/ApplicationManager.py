@@ -12,6 +12,13 @@ from   examples_common.GuaVE import GuaVE
 
 # import framework libraries
 from   ConsoleIO import *
+from   ClientLauncher import *
+from   ConfigCompiler import ConfigCompiler
+from   DistributionPolicy import DistributionPolicy
+from   NodeRegistry import NodeRegistry
+from   StationHub import StationHub
+from   PortalTransit import PortalTransitDetector
+from   VisibilityEngine import VisibilityEngine
 from   scene_config import scenegraphs
 from   Video3D import *
 
@@ -41,6 +48,10 @@ class ApplicationManager(avango.script.Script):
   # List of all Workspace instances active in the setup.
   all_workspaces = []
 
+  ## @var visibility_engine
+  # VisibilityEngine instance maintaining the GroupNames of avatars, tools, videos and traces.
+  visibility_engine = VisibilityEngine()
+
   ## @var sf_key1
   # Boolean field representing the key for action 1.
   sf_key1 = avango.SFBool()
@@ -74,6 +85,11 @@ class ApplicationManager(avango.script.Script):
     _workspace_config_file_name = _workspace_config_file_name.replace("/", ".")
     exec('from ' + _workspace_config_file_name + ' import workspaces', globals())
     exec('from ' + _workspace_config_file_name + ' import portal_display_groups', globals())
+
+    # write the display slices loaded by the clients
+    ConfigCompiler.compile(WORKSPACE_CONFIG, workspaces)
+
+    ApplicationManager.visibility_engine.my_constructor(ApplicationManager.all_user_representations)
     
     # parameters
     ## @var background_texture
@@ -94,17 +110,9 @@ class ApplicationManager(avango.script.Script):
     # Boolean saying if the client processes are to be started automatically.
     self.start_clients = START_CLIENTS
 
-    # kill all running python processes on display hosts
-    if self.start_clients:
-      _own_hostname = open('/etc/hostname', 'r').readline().strip(" \n")
-
-      for _workspace in workspaces:
-        for _display_group in _workspace.display_groups:
-          for _display in _display_group.displays:
-
-            if _display.hostname != _own_hostname:
-              _ssh_kill = subprocess.Popen(["ssh", _display.hostname, "killall python -9"], universal_newlines=True)
-
+    ## @var client_launcher
+    # ClientLauncher instance starting the client processes on the display hosts. None if clients are not started.
+    self.client_launcher = None
 
     # viewing setup and start of client processes #
 
@@ -123,6 +131,12 @@ class ApplicationManager(avango.script.Script):
       # get directory name
       _directory_name = os.path.dirname(os.path.dirname(__file__))
 
+      _launch_commands = SSHLaunchCommands()
+      _launch_commands.my_constructor(_directory_name)
+
+      self.client_launcher = ClientLauncher()
+      self.client_launcher.my_constructor(_launch_commands)
+
     else:
       print_warning("Start of clients disabled for debugging reasons.")
 
@@ -198,8 +212,10 @@ class ApplicationManager(avango.script.Script):
               self.requestable_navigations_last_button_states.append(False)
 
           # create view transform node only when free slot is availa
-          _view_transform_node = avango.gua.nodes.TransformNode(Name = "w" + str(_w_id) + "_dg" + str(_dg_id) + "_u" + str(_u_id))
+          _view_key = (_w_id, _dg_id, _u_id, None, None)
+          _view_transform_node = avango.gua.nodes.TransformNode(Name = NodeRegistry.get_name(_view_key))
           self.NET_TRANS_NODE.Children.value.append(_view_transform_node)
+          NodeRegistry.register(_view_key, _view_transform_node)
 
           # create user representation in display group
           _user_repr = _user.create_user_representation_for(_display_group
@@ -235,19 +251,9 @@ class ApplicationManager(avango.script.Script):
 
               if _display.hostname != _hostname:
 
-                # run client process on host
-                # command line parameters: server ip, platform id, display name, screen number
-                _ssh_run = subprocess.Popen(["ssh", _display.hostname, _directory_name + \
-                "/start-client.sh " + _server_ip + " " + str(WORKSPACE_CONFIG) + " " + str(_w_id) + " " + \
-                str(_dg_id) + " " + str(_s_id) + " " + _display.name]
-                , stderr=subprocess.PIPE, universal_newlines=True)
-                time.sleep(1)
-
-                #print("ssh", _display.hostname, _directory_name + \
-                #"/start-client.sh " + _server_ip + " " + str(WORKSPACE_CONFIG) + " " + str(_w_id) + " " + \
-                #str(_dg_id) + " " + str(_s_id) + " " + _display.name)
-
-
+                # register client process on host, all clients are started concurrently when run is called
+                # command line parameters: server ip, workspace config, workspace id, display group id, screen number, display name
+                self.client_launcher.add_client(_display.hostname, [_server_ip, str(WORKSPACE_CONFIG), str(_w_id), str(_dg_id), str(_s_id), _display.name])
 
 
     ## Handle virtual viewing setups ##
@@ -277,14 +283,17 @@ class ApplicationManager(avango.script.Script):
           if _display.viewing_mode == "2D":
             _complex = False
 
+          # head node of the physical user's view within the portal
+          _head_key = NodeRegistry.get_key(_physical_user_repr.view_transform_node.Name.value)[0:3] + (None, _display.id)
 
           _virtual_user_repr = _physical_user_repr.USER.create_user_representation_for(
                                _display_group
                              , _display.scene_matrix_node
                              , _display_index
-                             , 'head_' + _physical_user_repr.view_transform_node.Name.value
+                             , NodeRegistry.get_name(_head_key)
                              , _complex)
 
+          NodeRegistry.register(_head_key, _virtual_user_repr.head)
           _virtual_user_repr.add_dependent_node(_physical_user_repr.head)
           _virtual_user_repr.add_existing_screen_node(_display.portal_screen_node)
           _virtual_user_representations.append(_virtual_user_repr)
@@ -297,6 +306,11 @@ class ApplicationManager(avango.script.Script):
     for _virtual_user_representation in _virtual_user_representations:
       ApplicationManager.all_user_representations.append(_virtual_user_representation)
 
+    ## @var portal_transit_detector
+    # PortalTransitDetector teleporting workspace navigations entering transitable portals.
+    self.portal_transit_detector = PortalTransitDetector()
+    self.portal_transit_detector.my_constructor(self.workspace_navigations, self.transit_portals)
+
 
     ## Initialize group names ##
 
@@ -332,8 +346,7 @@ class ApplicationManager(avango.script.Script):
 
     ## Keyboard Sensor Setup ##
 
-    self.keyboard_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.keyboard_sensor.Station.value = "device-keyboard0"
+    self.keyboard_sensor = StationHub.get_sensor("device-keyboard0")
 
     self.sf_key1.connect_from(self.keyboard_sensor.Button19) # key F1
     self.sf_key2.connect_from(self.keyboard_sensor.Button20) # key F2
@@ -347,7 +360,9 @@ class ApplicationManager(avango.script.Script):
     self.server_transform = avango.gua.nodes.TransformNode(Name = "server_transform")
     self.server_transform.Transform.value = avango.gua.make_trans_mat(0, 20, 0) * \
                                             avango.gua.make_rot_mat(-90, 1, 0, 0)
-    self.NET_TRANS_NODE.Children.value.append(self.server_transform)
+
+    # the server control monitor is not shown on the clients and therefore kept outside the nettrans node
+    DistributionPolicy.append_server_only_subtree(self.SCENEGRAPH.Root.value, self.server_transform)
 
     ## @var eye
     # Transform node representing the server's eye
@@ -563,66 +578,7 @@ class ApplicationManager(avango.script.Script):
   def evaluate(self):
 
     # handle portal transitions
-    for _nav in self.workspace_navigations:
-
-      # if navigation does not allow portal transit, go to next loop iteration
-      if _nav.reacts_on_portal_transit == False:
-        continue
-
-      # if navigation has no device (e.g. static navigation), do not allow transit
-      try:
-        _nav.device
-      except:
-        continue
-
-      _nav_device_mat = _nav.sf_abs_mat.value * \
-                        avango.gua.make_scale_mat(_nav.sf_scale.value) * \
-                        avango.gua.make_trans_mat(_nav.device.sf_station_mat.value.get_translate())
-
-
-      _nav_device_pos = _nav_device_mat.get_translate()
-
-      _nav_device_pos2 = _nav_device_mat * avango.gua.Vec3(0.0,0.0,1.0)
-      _nav_device_pos2 = avango.gua.Vec3(_nav_device_pos2.x, _nav_device_pos2.y, _nav_device_pos2.z)
-
-      for _tuple in self.transit_portals:
-
-        _portal_display_group = _tuple[0]
-        _portal = _tuple[1]
-        _first_virtual_user_repr = _tuple[2]
-
-        _active_navigation = _portal_display_group.navigations[_first_virtual_user_repr.connected_navigation_id]
-        _mat = avango.gua.make_inverse_mat(_portal.portal_matrix_node.Transform.value)
-
-        _nav_device_portal_space_mat = _mat * _nav_device_mat
-        _nav_device_portal_space_pos = _mat * _nav_device_pos
-        _nav_device_portal_space_pos2 = _mat * _nav_device_pos2
-        _nav_device_portal_space_pos = avango.gua.Vec3(_nav_device_portal_space_pos.x, _nav_device_portal_space_pos.y, _nav_device_portal_space_pos.z)
-
-        # do a teleportation if navigation enters portal
-        if  _nav_device_portal_space_pos.x > -_portal.size[0]/2     and \
-            _nav_device_portal_space_pos.x <  _portal.size[0]/2     and \
-            _nav_device_portal_space_pos.y > -_portal.size[1]/2     and \
-            _nav_device_portal_space_pos.y <  _portal.size[1]/2     and \
-            _nav_device_portal_space_pos.z < 0.0                    and \
-            _nav_device_portal_space_pos2.z >= 0.0                  and \
-            _portal.viewing_mode == "3D":
-
-          _nav.inputmapping.set_abs_mat(avango.gua.make_trans_mat(_portal.portal_screen_node.Transform.value.get_translate()) * \
-                                        _active_navigation.sf_abs_mat.value * \
-                                        avango.gua.make_rot_mat(_portal.portal_screen_node.Transform.value.get_rotate()) * \
-                                        avango.gua.make_scale_mat(_active_navigation.sf_scale.value) * \
-                                        avango.gua.make_trans_mat(_nav_device_portal_space_pos) * \
-                                        avango.gua.make_rot_mat(_nav_device_portal_space_mat.get_rotate_scale_corrected()) * \
-                                        avango.gua.make_trans_mat(_nav.device.sf_station_mat.value.get_translate() * -1.0) * \
-                                        avango.gua.make_inverse_mat(avango.gua.make_scale_mat(_active_navigation.sf_scale.value)))
-
-          if _nav.trace != None:
-            _nav.trace.clear(_nav.inputmapping.sf_abs_mat.value)
-          
-          _nav.inputmapping.scale_stop_time = None
-          _nav.inputmapping.set_scale(_active_navigation.sf_scale.value, False)
-
+    self.portal_transit_detector.handle_portal_transits()
 
     # handle requestable navigations
     for _requestable_nav in self.requestable_navigations:
@@ -697,6 +653,11 @@ class ApplicationManager(avango.script.Script):
   # @param LOCALS Local variables.
   # @param GLOBALS Global variables.
   def run(self, LOCALS, GLOBALS):
+
+    # start the clients in the background, they connect once the viewer is running
+    if self.client_launcher != None:
+      self.client_launcher.launch_all()
+
     self.shell.start(LOCALS, GLOBALS)
     self.viewer.run()
 
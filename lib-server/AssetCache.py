@@ -0,0 +1,242 @@
+#!/usr/bin/python
+
+## @file
+# Contains class AssetCache.
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import hashlib
+import json
+import os
+
+try:
+  import pyassimp
+  import pyassimp.postprocess
+except ImportError:
+  pyassimp = None
+
+
+## On-disk cache of preprocessed geometry files, filled offline by preprocess_assets.py.
+#
+# Each OBJ file is loaded once with assimp's optimizing post-processing steps and exported in assimp's binary
+# format, which guacamole's TriMeshLoader reads without parsing text. The cached file is named after a hash of
+# the contents of the OBJ file and its material libraries and is written next to the source, so relative
+# texture paths in the materials stay valid. The manifest maps source files to their cached files.
+# At runtime, geometry paths are replaced by the cached ones as long as the sources are unchanged.
+# Since the node's geometry name contains the path, clients load the cached files as well.
+class AssetCache:
+
+  ## @var version
+  # Version of the preprocessing. To be increased whenever the processing steps change, invalidating all cached files.
+  version = 1
+
+  ## @var manifest_file
+  # File mapping the source files to their cached files.
+  manifest_file = "data/asset_cache.json"
+
+  ## @var manifest
+  # Dictionary loaded from manifest_file. None if not loaded yet.
+  manifest = None
+
+  ## @var resolved_paths
+  # Dictionary mapping the geometry paths requested in this process to the paths to be loaded.
+  resolved_paths = {}
+
+  ## Returns the list of files a geometry file consists of, i.e. the OBJ file itself and its material libraries.
+  # @param FILENAME Path to the OBJ file.
+  @staticmethod
+  def get_source_files(FILENAME):
+
+    _files = [FILENAME]
+
+    with open(FILENAME, "r", errors = "replace") as _file:
+
+      for _line in _file:
+
+        if _line.startswith("mtllib"):
+
+          _material_file = os.path.join(os.path.dirname(FILENAME), _line[len("mtllib"):].strip())
+
+          if os.path.isfile(_material_file) and _material_file not in _files:
+            _files.append(_material_file)
+
+    return _files
+
+  ## Returns the content hash of a list of files, including the preprocessing version.
+  # @param FILES List of file paths to be hashed in order.
+  @staticmethod
+  def hash_files(FILES):
+
+    _hash = hashlib.sha1(("asset_cache_v" + str(AssetCache.version)).encode())
+
+    for _file_path in FILES:
+      with open(_file_path, "rb") as _file:
+        _hash.update(_file.read())
+
+    return _hash.hexdigest()
+
+  ## Returns a dictionary mapping file paths to their (modification time, size) lists.
+  # @param FILES List of file paths.
+  @staticmethod
+  def get_file_states(FILES):
+    return dict((_file_path, [os.path.getmtime(_file_path), os.path.getsize(_file_path)]) for _file_path in FILES)
+
+  ## Returns the manifest dictionary, loading it on first use. Returns an empty manifest if the file is missing or of another version.
+  @staticmethod
+  def load_manifest():
+
+    if AssetCache.manifest != None:
+      return AssetCache.manifest
+
+    AssetCache.manifest = {"version" : AssetCache.version, "geometries" : {}}
+
+    try:
+      with open(AssetCache.manifest_file, "r") as _file:
+        _manifest = json.load(_file)
+
+    except (IOError, OSError, ValueError):
+      return AssetCache.manifest
+
+    if _manifest.get("version") == AssetCache.version:
+      AssetCache.manifest = _manifest
+
+    return AssetCache.manifest
+
+  ## Writes the manifest dictionary to manifest_file.
+  @staticmethod
+  def write_manifest():
+
+    _temporary_file_path = AssetCache.manifest_file + ".tmp"
+
+    with open(_temporary_file_path, "w") as _file:
+      json.dump(AssetCache.load_manifest(), _file, indent = 1, sort_keys = True)
+
+    os.replace(_temporary_file_path, AssetCache.manifest_file)
+
+  ## Returns True if a manifest entry is still valid for the sources on disk. Sources whose modification time or size
+  # changed are hashed again, so the entry stays valid if only the modification times changed, e.g. after a checkout.
+  # @param ENTRY The manifest entry of the geometry.
+  @staticmethod
+  def entry_is_valid(ENTRY):
+
+    if not os.path.isfile(ENTRY["cache_file"]):
+      return False
+
+    try:
+      if AssetCache.get_file_states(ENTRY["sources"].keys()) == ENTRY["sources"]:
+        return True
+
+      return AssetCache.hash_files(sorted(ENTRY["sources"].keys())) == ENTRY["hash"]
+
+    except (IOError, OSError):
+      return False
+
+  ## Returns the path of the geometry file to be loaded instead of a given one. This is the cached file if it exists
+  # and is up to date, the given path otherwise.
+  # @param FILENAME Path to the geometry file to be loaded.
+  @staticmethod
+  def get_geometry_path(FILENAME):
+
+    try:
+      return AssetCache.resolved_paths[FILENAME]
+    except KeyError:
+      pass
+
+    _path = FILENAME
+    _entry = AssetCache.load_manifest()["geometries"].get(FILENAME)
+
+    if _entry != None and AssetCache.entry_is_valid(_entry):
+      _path = _entry["cache_file"]
+
+    AssetCache.resolved_paths[FILENAME] = _path
+    return _path
+
+  ## Preprocesses a geometry file unless an up-to-date cached file exists. Returns True if the file was processed.
+  # @param FILENAME Path to the OBJ file.
+  @staticmethod
+  def preprocess_geometry(FILENAME):
+
+    _entries = AssetCache.load_manifest()["geometries"]
+    _entry = _entries.get(FILENAME)
+
+    _source_files = AssetCache.get_source_files(FILENAME)
+    _hash = AssetCache.hash_files(sorted(_source_files))
+
+    if _entry != None and _entry["hash"] == _hash and os.path.isfile(_entry["cache_file"]):
+
+      # refresh the file states if only the modification times changed
+      _entry["sources"] = AssetCache.get_file_states(_source_files)
+      return False
+
+    _cache_file = os.path.splitext(FILENAME)[0] + "." + _hash[:16] + ".assbin"
+
+    _scene = pyassimp.load(FILENAME, processing = pyassimp.postprocess.aiProcess_Triangulate
+                                                | pyassimp.postprocess.aiProcess_JoinIdenticalVertices
+                                                | pyassimp.postprocess.aiProcess_GenSmoothNormals
+                                                | pyassimp.postprocess.aiProcess_ImproveCacheLocality
+                                                | pyassimp.postprocess.aiProcess_RemoveRedundantMaterials
+                                                | pyassimp.postprocess.aiProcess_OptimizeMeshes
+                                                | pyassimp.postprocess.aiProcess_SortByPType)
+
+    try:
+      pyassimp.export(_scene, _cache_file, file_type = "assbin")
+    finally:
+      pyassimp.release(_scene)
+
+    # remove the file cached for a previous version of the sources
+    if _entry != None and _entry["cache_file"] != _cache_file and os.path.isfile(_entry["cache_file"]):
+      os.remove(_entry["cache_file"])
+
+    _entries[FILENAME] = { "hash" : _hash
+                         , "cache_file" : _cache_file
+                         , "sources" : AssetCache.get_file_states(_source_files) }
+
+    return True
+
+  ## Preprocesses all OBJ files below a list of directories and writes the manifest.
+  # @param DIRECTORIES List of directories to be searched recursively.
+  @staticmethod
+  def preprocess_directories(DIRECTORIES):
+
+    if pyassimp == None:
+      print_error("Preprocessing assets requires pyassimp, no files were processed.", False)
+      return
+
+    _entries = AssetCache.load_manifest()["geometries"]
+    _num_processed = 0
+    _num_up_to_date = 0
+    _num_failed = 0
+
+    for _directory in DIRECTORIES:
+      for _root, _directories, _filenames in os.walk(_directory):
+        for _filename in sorted(_filenames):
+
+          if not _filename.lower().endswith(".obj"):
+            continue
+
+          _path = os.path.join(_root, _filename)
+
+          try:
+            if AssetCache.preprocess_geometry(_path):
+              _num_processed += 1
+            else:
+              _num_up_to_date += 1
+
+          except Exception as _error:
+            print_warning("Could not preprocess " + _path + ": " + str(_error))
+            _num_failed += 1
+
+    # forget entries of deleted sources
+    for _path in list(_entries.keys()):
+
+      if not os.path.isfile(_path):
+
+        if os.path.isfile(_entries[_path]["cache_file"]):
+          os.remove(_entries[_path]["cache_file"])
+
+        del _entries[_path]
+
+    AssetCache.write_manifest()
+    print_message("Preprocessed " + str(_num_processed) + " geometry files, " + str(_num_up_to_date) + " were up to date, " + str(_num_failed) + " failed.")
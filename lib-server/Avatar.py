@@ -10,6 +10,7 @@ import avango.script
 
 # import framework libraries
 from ApplicationManager import *
+from GeometryRegistry import GeometryRegistry
 import Utilities
 
 # import python libraries
@@ -32,24 +33,22 @@ class Avatar:
     # The UserRepresentation instance to which this Avatar belongs to.
     self.USER_REPRESENTATION = USER_REPRESENTATION
 
-    _loader = avango.gua.nodes.TriMeshLoader()
-    
     ## @var head_geometry
     # Scenegraph node representing the geometry and transformation of the basic avatar's head.
-    self.head_geometry = _loader.create_geometry_from_file('head_avatar',
-                                                           'data/objects/Joseph/JosephHead.obj',
-                                                           'data/materials/ShadelessWhite.gmd',
-                                                           avango.gua.LoaderFlags.LOAD_MATERIALS)
+    self.head_geometry = GeometryRegistry.create_instance('head_avatar',
+                                                          'data/objects/Joseph/JosephHead.obj',
+                                                          'data/materials/ShadelessWhite.gmd',
+                                                          avango.gua.LoaderFlags.LOAD_MATERIALS)
 
     self.head_geometry.Transform.value = avango.gua.make_rot_mat(-90, 0, 1, 0) * avango.gua.make_scale_mat(0.4, 0.4, 0.4)
     self.USER_REPRESENTATION.head.Children.value.append(self.head_geometry)
 
     ## @var body_geometry
     # Scenegraph node representing the geometry and transformation of the basic avatar's body.
-    self.body_geometry = _loader.create_geometry_from_file('body_avatar',
-                                                           'data/objects/Joseph/JosephBody.obj',
-                                                           'data/materials/ShadelessWhite.gmd',
-                                                           avango.gua.LoaderFlags.LOAD_MATERIALS)
+    self.body_geometry = GeometryRegistry.create_instance('body_avatar',
+                                                          'data/objects/Joseph/JosephBody.obj',
+                                                          'data/materials/ShadelessWhite.gmd',
+                                                          avango.gua.LoaderFlags.LOAD_MATERIALS)
     self.USER_REPRESENTATION.head.Children.value.append(self.body_geometry)
 
     ## @var screen_visualizations
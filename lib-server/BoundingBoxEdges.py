@@ -0,0 +1,101 @@
+#!/usr/bin/python
+
+## @file
+# Contains class BoundingBoxEdges.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+## Compact description of a bounding box visualization distributed from the server to the clients.
+#
+# The server distributes one carrier node per visualized bounding box. Its Transform is the world transformation of
+# the visualized object and its GroupNames show or hide the box. The name of its only child stores
+# "<material>#<thickness>#<min>#<max>#<scale>", the box corners being given in the coordinate system of the object and
+# the scale being the world scale of the object, each as comma separated coordinates. The clients rebuild the twelve
+# edge geometries from it.
+class BoundingBoxEdges:
+
+  ## @var node_name_prefix
+  # Prefix of the names of the carrier nodes, by which the clients recognize them below the nettrans node.
+  node_name_prefix = "bb_vis_"
+
+  ## Returns the description string of a bounding box visualization.
+  # @param MATERIAL Material string to be used for the edges.
+  # @param THICKNESS Thickness of the edges in meters.
+  # @param BB_MIN Minimum corner of the box in the coordinate system of the object.
+  # @param BB_MAX Maximum corner of the box in the coordinate system of the object.
+  # @param SCALE World scale of the object.
+  @staticmethod
+  def encode(MATERIAL, THICKNESS, BB_MIN, BB_MAX, SCALE):
+
+    _strings = [MATERIAL, str(THICKNESS)]
+
+    for _vec in [BB_MIN, BB_MAX, SCALE]:
+      _strings.append("{0:.4f},{1:.4f},{2:.4f}".format(_vec.x, _vec.y, _vec.z))
+
+    return "#".join(_strings)
+
+  ## Returns a (material, thickness, minimum corner, maximum corner, scale) tuple for a description string
+  # or None if the string is invalid.
+  # @param STRING The description string to be decoded.
+  @staticmethod
+  def decode(STRING):
+
+    _splitted_string = STRING.split("#")
+
+    if len(_splitted_string) != 5:
+      return None
+
+    try:
+      _vecs = [avango.gua.Vec3(*[float(_value) for _value in _string.split(",")]) for _string in _splitted_string[2:5]]
+      return (_splitted_string[0], float(_splitted_string[1]), _vecs[0], _vecs[1], _vecs[2])
+
+    except (ValueError, TypeError):
+      return None
+
+  ## Returns the list of the transformation matrices of the twelve edges of a box, scaling a unit cube to the edges.
+  # The edge thickness is compensated for the world scale of the object.
+  # @param BB_MIN Minimum corner of the box in the coordinate system of the object.
+  # @param BB_MAX Maximum corner of the box in the coordinate system of the object.
+  # @param THICKNESS Thickness of the edges in meters.
+  # @param SCALE World scale of the object.
+  @staticmethod
+  def compute_edge_matrices(BB_MIN, BB_MAX, THICKNESS, SCALE):
+
+    _x_min	= BB_MIN.x
+    _x_max	= BB_MAX.x
+    _dist_x	= _x_max - _x_min
+    _center_x	= _x_min + _dist_x * 0.5
+
+    _y_min	= BB_MIN.y
+    _y_max	= BB_MAX.y
+    _dist_y	= _y_max - _y_min
+    _center_y	= _y_min + _dist_y * 0.5
+
+    _z_min	= BB_MIN.z
+    _z_max	= BB_MAX.z
+    _dist_z	= _z_max - _z_min
+    _center_z	= _z_min + _dist_z * 0.5
+
+    _matrices = []
+
+    # depth edges
+    _scale_mat = avango.gua.make_scale_mat(THICKNESS/SCALE.x, _dist_y + THICKNESS/SCALE.y, THICKNESS/SCALE.z)
+
+    for _x, _z in [(_x_min, _z_min), (_x_max, _z_min), (_x_min, _z_max), (_x_max, _z_max)]:
+      _matrices.append(avango.gua.make_trans_mat(_x, _center_y, _z) * _scale_mat)
+
+    # width edges
+    _scale_mat = avango.gua.make_scale_mat(_dist_x + THICKNESS/SCALE.x, THICKNESS/SCALE.y, THICKNESS/SCALE.z)
+
+    for _y, _z in [(_y_min, _z_min), (_y_max, _z_min), (_y_min, _z_max), (_y_max, _z_max)]:
+      _matrices.append(avango.gua.make_trans_mat(_center_x, _y, _z) * _scale_mat)
+
+    # height edges
+    _scale_mat = avango.gua.make_scale_mat(THICKNESS/SCALE.x, THICKNESS/SCALE.y, _dist_z + THICKNESS/SCALE.z)
+
+    for _x, _y in [(_x_min, _y_min), (_x_min, _y_max), (_x_max, _y_min), (_x_max, _y_max)]:
+      _matrices.append(avango.gua.make_trans_mat(_x, _y, _center_z) * _scale_mat)
+
+    return _matrices
@@ -0,0 +1,407 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes SSHLaunchCommands, LocalLaunchCommands, LaunchedClient, ClientLauncher and ClientReadySignal.
+
+# import avango-guacamole libraries
+import avango
+import avango.script
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import concurrent.futures
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+## @var READY_MARKER
+# Line printed by a client on its standard output as soon as it rendered its first frame with distributed content.
+READY_MARKER = "NVF_CLIENT_READY"
+
+
+## Builds the commands to stop and start clients on remote display hosts via ssh.
+class SSHLaunchCommands:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param DIRECTORY Directory of the framework on the display hosts.
+  def my_constructor(self, DIRECTORY):
+
+    ## @var directory
+    # Directory of the framework on the display hosts.
+    self.directory = DIRECTORY
+
+  ## Returns the command killing all client processes on a host whose command line contains a pattern.
+  # @param HOSTNAME The host to kill the clients on.
+  # @param PATTERN String contained in the command lines of the processes to be killed.
+  def kill_command(self, HOSTNAME, PATTERN):
+
+    # the bracket keeps the pattern from matching the remote shell running pkill
+    return ["ssh", HOSTNAME, "pkill -9 -f '[" + PATTERN[0] + "]" + PATTERN[1:] + "'"]
+
+  ## Returns the command starting a client on a host.
+  # @param HOSTNAME The host to start the client on.
+  # @param ARGUMENTS List of command line arguments passed to the client.
+  def start_command(self, HOSTNAME, ARGUMENTS):
+    return ["ssh", HOSTNAME, self.directory + "/start-client.sh " + " ".join(ARGUMENTS)]
+
+
+## Starts clients as local processes instead of on remote hosts. Used to test the launch flow without ssh,
+# e.g. with the stand-in client in lib-benchmark.
+class LocalLaunchCommands:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param CLIENT_COMMAND List of strings starting a client process, the client arguments are appended to it.
+  def my_constructor(self, CLIENT_COMMAND):
+
+    ## @var client_command
+    # List of strings starting a client process, the client arguments are appended to it.
+    self.client_command = CLIENT_COMMAND
+
+  ## Returns None as local processes are killed by the launcher itself.
+  # @param HOSTNAME The host to kill the clients on.
+  # @param PATTERN String contained in the command lines of the processes to be killed.
+  def kill_command(self, HOSTNAME, PATTERN):
+    return None
+
+  ## Returns the command starting a client process.
+  # @param HOSTNAME The host the client stands in for.
+  # @param ARGUMENTS List of command line arguments passed to the client.
+  def start_command(self, HOSTNAME, ARGUMENTS):
+    return self.client_command + ARGUMENTS
+
+
+## Launch state of a single client.
+class LaunchedClient:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param HOSTNAME The host to run the client on.
+  # @param ARGUMENTS List of command line arguments passed to the client.
+  def my_constructor(self, HOSTNAME, ARGUMENTS):
+
+    ## @var hostname
+    # The host to run the client on.
+    self.hostname = HOSTNAME
+
+    ## @var arguments
+    # List of command line arguments passed to the client.
+    self.arguments = ARGUMENTS
+
+    ## @var state
+    # Launch state of the client, one of "pending", "starting", "ready" and "failed".
+    self.state = "pending"
+
+    ## @var attempts
+    # Number of start attempts made so far.
+    self.attempts = 0
+
+    ## @var time_to_first_frame
+    # Time in seconds from the start of the successful attempt until the client reported its first frame. None if not ready.
+    self.time_to_first_frame = None
+
+    ## @var error
+    # Description of the last failure or None.
+    self.error = None
+
+    ## @var process
+    # The running client process or None.
+    self.process = None
+
+  ## Returns a short name of the client for console output.
+  def get_name(self):
+    return self.hostname + " (" + " ".join(self.arguments[2:]) + ")"
+
+  ## Returns the string identifying the processes of this client on its host.
+  def get_pattern(self):
+    return "main.py " + " ".join(self.arguments)
+
+
+## Starts the clients on all display hosts concurrently and supervises their start-up.
+#
+# For every client, stale client processes on its host are killed first. Afterwards the client is started
+# and the launcher waits until the client reports its first frame by printing READY_MARKER. Clients
+# exiting or not reporting within the timeout are killed and started again until the number of retries
+# is exhausted. The launch runs in the background, so the server can enter its frame loop, which the
+# clients need to receive the distributed scenegraph.
+class ClientLauncher:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param LAUNCH_COMMANDS SSHLaunchCommands or LocalLaunchCommands instance building the commands to be run.
+  # @param TIMEOUT Time in seconds a client may take until its first frame.
+  # @param RETRIES Number of additional start attempts for clients failing to start.
+  # @param KILL_TIMEOUT Time in seconds the kill command on a host may take.
+  def my_constructor(self, LAUNCH_COMMANDS, TIMEOUT = 60.0, RETRIES = 2, KILL_TIMEOUT = 10.0):
+
+    ## @var launch_commands
+    # SSHLaunchCommands or LocalLaunchCommands instance building the commands to be run.
+    self.launch_commands = LAUNCH_COMMANDS
+
+    ## @var timeout
+    # Time in seconds a client may take until its first frame.
+    self.timeout = TIMEOUT
+
+    ## @var retries
+    # Number of additional start attempts for clients failing to start.
+    self.retries = RETRIES
+
+    ## @var kill_timeout
+    # Time in seconds the kill command on a host may take.
+    self.kill_timeout = KILL_TIMEOUT
+
+    ## @var clients
+    # List of LaunchedClient instances to be started.
+    self.clients = []
+
+    ## @var launch_start
+    # Time at which launch_all was called or None.
+    self.launch_start = None
+
+    ## @var launch_thread
+    # Background thread running the launch or None.
+    self.launch_thread = None
+
+  ## Registers a client to be started by launch_all.
+  # @param HOSTNAME The host to run the client on.
+  # @param ARGUMENTS List of command line arguments passed to the client.
+  def add_client(self, HOSTNAME, ARGUMENTS):
+
+    _client = LaunchedClient()
+    _client.my_constructor(HOSTNAME, ARGUMENTS)
+    self.clients.append(_client)
+
+  ## Starts all registered clients in the background and returns immediately.
+  def launch_all(self):
+
+    if len(self.clients) == 0:
+      return
+
+    self.launch_start = time.time()
+    self.launch_thread = threading.Thread(target = self.run_launch)
+    self.launch_thread.daemon = True
+    self.launch_thread.start()
+
+  ## Waits until all clients are ready or failed. Returns True if all clients are ready.
+  # @param TIMEOUT Maximum time in seconds to wait, None to wait until the launch is finished.
+  def wait(self, TIMEOUT = None):
+
+    if self.launch_thread != None:
+      self.launch_thread.join(TIMEOUT)
+
+    return len([_client for _client in self.clients if _client.state != "ready"]) == 0
+
+  ## Runs the launch of all clients. Stale processes are killed per host before any client is started,
+  # so clients sharing a host do not kill each other.
+  # Unexpected errors mark all clients not ready yet as failed, so the report is printed in any case.
+  def run_launch(self):
+
+    _hostnames = sorted(set(_client.hostname for _client in self.clients))
+
+    try:
+
+      with concurrent.futures.ThreadPoolExecutor(max_workers = len(self.clients)) as _executor:
+
+        _kill_results = dict(zip(_hostnames, _executor.map(self.kill_clients_on, _hostnames)))
+
+        for _client in self.clients:
+
+          if _kill_results[_client.hostname] != None:
+            _client.state = "failed"
+            _client.error = _kill_results[_client.hostname]
+            print_warning("Client on " + _client.get_name() + " not started: " + _client.error)
+
+        list(_executor.map(self.launch_client, [_client for _client in self.clients if _client.state == "pending"]))
+
+    except Exception as _error:
+
+      print_warning("Client launch aborted: " + repr(_error))
+
+      for _client in self.clients:
+
+        if _client.state != "ready":
+          _client.state = "failed"
+          _client.error = "launch aborted: " + repr(_error)
+
+    self.print_report()
+
+  ## Kills all client processes on a host. Returns None on success or an error description.
+  # @param HOSTNAME The host to kill the clients on.
+  def kill_clients_on(self, HOSTNAME):
+    return self.run_kill_command(HOSTNAME, "lib-client/main.py")
+
+  ## Runs a kill command on a host. Returns None on success or an error description.
+  # @param HOSTNAME The host to kill the processes on.
+  # @param PATTERN String contained in the command lines of the processes to be killed.
+  def run_kill_command(self, HOSTNAME, PATTERN):
+
+    _command = self.launch_commands.kill_command(HOSTNAME, PATTERN)
+
+    if _command == None:
+      return None
+
+    try:
+      _process = subprocess.Popen(_command, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+    except OSError as _error:
+      return str(_error)
+
+    try:
+      _process.wait(timeout = self.kill_timeout)
+    except subprocess.TimeoutExpired:
+      _process.kill()
+      _process.wait()
+      return "host not reachable within " + str(self.kill_timeout) + " s"
+
+    return None
+
+  ## Starts a client and retries until it reports its first frame or the retries are exhausted.
+  # @param CLIENT The LaunchedClient instance to be started.
+  def launch_client(self, CLIENT):
+
+    while CLIENT.attempts <= self.retries:
+
+      CLIENT.attempts += 1
+      CLIENT.state = "starting"
+
+      if self.start_attempt(CLIENT):
+        CLIENT.state = "ready"
+        CLIENT.error = None
+        print_message("Client on " + CLIENT.get_name() + " ready after " + str(round(CLIENT.time_to_first_frame, 2)) + " s (attempt " + str(CLIENT.attempts) + ")")
+        return
+
+      print_warning("Client on " + CLIENT.get_name() + " failed in attempt " + str(CLIENT.attempts) + ": " + CLIENT.error)
+      self.stop_client(CLIENT)
+
+    CLIENT.state = "failed"
+
+  ## Runs a single start attempt. Returns True if the client reported its first frame within the timeout.
+  # @param CLIENT The LaunchedClient instance to be started.
+  def start_attempt(self, CLIENT):
+
+    _start_time = time.time()
+
+    try:
+      CLIENT.process = subprocess.Popen(self.launch_commands.start_command(CLIENT.hostname, CLIENT.arguments)
+                                      , stdout = subprocess.PIPE, stderr = subprocess.STDOUT, universal_newlines = True)
+    except OSError as _error:
+      CLIENT.error = str(_error)
+      return False
+
+    # the output is read by a separate thread and forwarded to the console during the whole client lifetime
+    _events = queue.Queue()
+    _reader = threading.Thread(target = self.read_output, args = (CLIENT, CLIENT.process, _events))
+    _reader.daemon = True
+    _reader.start()
+
+    try:
+      _event = _events.get(timeout = self.timeout)
+    except queue.Empty:
+      CLIENT.error = "no first frame within " + str(self.timeout) + " s"
+      return False
+
+    if _event == None:
+      CLIENT.error = "process exited with code " + str(CLIENT.process.wait())
+      return False
+
+    CLIENT.time_to_first_frame = time.time() - _start_time
+    return True
+
+  ## Forwards the output of a client process to the console and reports the ready marker and the end of the output.
+  # @param CLIENT The LaunchedClient instance the process belongs to.
+  # @param PROCESS The client process.
+  # @param EVENTS Queue receiving True when the ready marker was read and None when the output ended.
+  def read_output(self, CLIENT, PROCESS, EVENTS):
+
+    for _line in PROCESS.stdout:
+
+      if _line.strip() == READY_MARKER:
+        EVENTS.put(True)
+      else:
+        sys.stdout.write("[" + CLIENT.hostname + "] " + _line)
+
+    EVENTS.put(None)
+
+  ## Kills the process of a failed start attempt, on the display host as well as locally.
+  # @param CLIENT The LaunchedClient instance to be stopped.
+  def stop_client(self, CLIENT):
+
+    self.run_kill_command(CLIENT.hostname, CLIENT.get_pattern())
+
+    if CLIENT.process != None and CLIENT.process.poll() == None:
+      CLIENT.process.kill()
+      CLIENT.process.wait()
+
+    CLIENT.process = None
+
+  ## Prints the launch state and time to first frame of all clients on the console.
+  def print_report(self):
+
+    _num_ready = len([_client for _client in self.clients if _client.state == "ready"])
+
+    for _client in self.clients:
+
+      if _client.state == "ready":
+        print_message("  " + _client.get_name() + ": ready, first frame after " + str(round(_client.time_to_first_frame, 2)) + " s, " + str(_client.attempts) + " attempt(s)")
+      else:
+        print_warning("  " + _client.get_name() + ": " + _client.state + ", " + str(_client.error))
+
+    _message = str(_num_ready) + " of " + str(len(self.clients)) + " clients ready"
+
+    if self.launch_start != None:
+      _message += " after " + str(round(time.time() - self.launch_start, 2)) + " s"
+
+    if _num_ready == len(self.clients):
+      print_message(_message)
+    else:
+      print_warning(_message)
+
+  ## Kills all started clients.
+  def stop_all(self):
+
+    for _client in self.clients:
+      self.stop_client(_client)
+
+
+## Prints READY_MARKER on the standard output once the client received the distributed scenegraph
+# and rendered a frame with it. Used by the ClientLauncher on the server to detect a successful start.
+class ClientReadySignal:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param NET_TRANS_NODE The client's nettrans node which is filled by distribution.
+  def my_constructor(self, NET_TRANS_NODE):
+
+    ## @var NET_TRANS_NODE
+    # The client's nettrans node which is filled by distribution.
+    self.NET_TRANS_NODE = NET_TRANS_NODE
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method until the marker was printed.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+
+  ## Evaluated every frame until the nettrans node received its first children.
+  def frame_callback(self):
+
+    if len(self.NET_TRANS_NODE.Children.value) > 0:
+      print(READY_MARKER, flush = True)
+      self.frame_trigger.Active.value = False
@@ -0,0 +1,277 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes ConfigCompiler and CompiledDisplay.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import hashlib
+import inspect
+import json
+import os
+
+
+## Writes the physical displays of a workspace configuration file to a cache and loads display slices from it.
+#
+# The server executes the configuration file anyway and writes each physical display to its own slice file
+# in configs/compiled/<config>, containing everything a client needs to set up its views, including the results
+# of register_view. Clients load their slice instead of executing the configuration file, which would build the
+# whole server-side object graph including all devices. Each file stores hashes of the source files it was
+# compiled from and is considered stale if one of them changed.
+class ConfigCompiler:
+
+  ## @var version
+  # Version of the file format. To be increased whenever the contents of the compiled files change.
+  version = 1
+
+  ## @var cache_directory
+  # Directory in which the compiled files are written to, one subdirectory per configuration file.
+  cache_directory = "configs/compiled"
+
+  ## @var display_attributes
+  # Attributes of Display and PhysicalDisplay instances written to the display slices.
+  display_attributes = [ "name", "resolution", "size", "stereo", "hostname", "displaystrings"
+                       , "shutter_timings", "shutter_values", "transformation", "max_viewing_distance"
+                       , "stereomode", "cameramode", "render_mask" ]
+
+  ## Returns the directory of the compiled files of a configuration file.
+  # @param WORKSPACE_CONFIG Filepath of the workspace configuration file.
+  @staticmethod
+  def get_directory(WORKSPACE_CONFIG):
+    return os.path.join(ConfigCompiler.cache_directory, os.path.basename(WORKSPACE_CONFIG).replace(".py", ""))
+
+  ## Returns the filepath of the slice file of a display.
+  # @param WORKSPACE_CONFIG Filepath of the workspace configuration file.
+  # @param DISPLAY_NAME Name of the display.
+  @staticmethod
+  def get_slice_file(WORKSPACE_CONFIG, DISPLAY_NAME):
+    return os.path.join(ConfigCompiler.get_directory(WORKSPACE_CONFIG), "display_" + DISPLAY_NAME + ".json")
+
+  ## Returns the SHA-1 hash of a file's contents or None if the file cannot be read.
+  # @param FILE_PATH The file to be hashed.
+  @staticmethod
+  def hash_file(FILE_PATH):
+
+    try:
+      with open(FILE_PATH, "rb") as _file:
+        return hashlib.sha1(_file.read()).hexdigest()
+
+    except (IOError, OSError):
+      return None
+
+  ## Returns True if the hashes of all source files match the stored ones.
+  # @param SOURCES Dictionary mapping source filepaths to their hashes at compile time.
+  @staticmethod
+  def sources_unchanged(SOURCES):
+
+    for _file_path, _hash in SOURCES.items():
+
+      if ConfigCompiler.hash_file(_file_path) != _hash:
+        return False
+
+    return True
+
+  ## Returns a JSON compatible representation of a value. Matrices are converted to lists of 16 elements in row-major order.
+  # @param VALUE The value to be converted.
+  @staticmethod
+  def encode_value(VALUE):
+
+    if hasattr(VALUE, "get_element"):
+      return [VALUE.get_element(_row, _column) for _row in range(4) for _column in range(4)]
+
+    if isinstance(VALUE, (list, tuple)):
+      return [ConfigCompiler.encode_value(_item) for _item in VALUE]
+
+    if isinstance(VALUE, dict):
+      return dict((_key, ConfigCompiler.encode_value(_item)) for _key, _item in VALUE.items())
+
+    return VALUE
+
+  ## Returns a matrix from a list of 16 elements in row-major order.
+  # @param ELEMENTS The elements of the matrix.
+  @staticmethod
+  def decode_matrix(ELEMENTS):
+
+    _mat = avango.gua.make_identity_mat()
+
+    for _i in range(16):
+      _mat.set_element(_i // 4, _i % 4, ELEMENTS[_i])
+
+    return _mat
+
+  ## Returns a dictionary of the attributes of an object which are contained in a list of attribute names.
+  # @param OBJECT The object to read the attributes from.
+  # @param ATTRIBUTES List of attribute names. Attributes the object does not have are skipped.
+  @staticmethod
+  def encode_attributes(OBJECT, ATTRIBUTES):
+
+    _values = {"type" : OBJECT.__class__.__name__}
+
+    for _attribute in ATTRIBUTES:
+
+      if hasattr(OBJECT, _attribute):
+        _values[_attribute] = ConfigCompiler.encode_value(getattr(OBJECT, _attribute))
+
+    return _values
+
+  ## Returns the slice of a physical display. The results of register_view are recorded for all display strings.
+  # @param DISPLAY The display to be compiled.
+  @staticmethod
+  def compile_display(DISPLAY):
+
+    _values = ConfigCompiler.encode_attributes(DISPLAY, ConfigCompiler.display_attributes)
+    _views = []
+
+    _num_views = DISPLAY.num_views
+    DISPLAY.num_views = 0
+
+    for _displaystring in DISPLAY.displaystrings:
+      _views.append(ConfigCompiler.encode_value(DISPLAY.register_view()))
+
+    DISPLAY.num_views = _num_views
+    _values["views"] = _views
+
+    return _values
+
+  ## Writes a dictionary to a JSON file. The file is replaced at once so that readers never see a partially written file.
+  # @param FILE_PATH The file to be written.
+  # @param VALUES The dictionary to be written.
+  @staticmethod
+  def write_file(FILE_PATH, VALUES):
+
+    _temporary_file_path = FILE_PATH + ".tmp"
+
+    with open(_temporary_file_path, "w") as _file:
+      json.dump(VALUES, _file, sort_keys = True)
+
+    os.replace(_temporary_file_path, FILE_PATH)
+
+  ## Reads a dictionary from a JSON file. Returns None if the file is missing, invalid, of another version or stale.
+  # @param FILE_PATH The file to be read.
+  @staticmethod
+  def read_file(FILE_PATH):
+
+    try:
+      with open(FILE_PATH, "r") as _file:
+        _values = json.load(_file)
+
+    except (IOError, OSError, ValueError):
+      return None
+
+    if _values.get("version") != ConfigCompiler.version or not ConfigCompiler.sources_unchanged(_values.get("sources", {})):
+      return None
+
+    return _values
+
+  ## Compiles the physical displays of the workspaces loaded from a configuration file unless their slices are up to date.
+  # @param WORKSPACE_CONFIG Filepath of the workspace configuration file.
+  # @param WORKSPACES List of Workspace instances loaded from the configuration file.
+  @staticmethod
+  def compile(WORKSPACE_CONFIG, WORKSPACES):
+
+    # configurations not loaded from a file, e.g. the generated one of the benchmark, are not compiled
+    if not os.path.isfile(WORKSPACE_CONFIG):
+      return
+
+    _directory = ConfigCompiler.get_directory(WORKSPACE_CONFIG)
+    _displays = []
+
+    for _workspace in WORKSPACES:
+      for _display_group in _workspace.display_groups:
+        for _display in _display_group.displays:
+
+          if hasattr(_display, "hostname") and _display not in _displays:
+            _displays.append(_display)
+
+    _stale_displays = [_display for _display in _displays if ConfigCompiler.read_file(ConfigCompiler.get_slice_file(WORKSPACE_CONFIG, _display.name)) == None]
+
+    if len(_stale_displays) == 0:
+      return
+
+    # hash the configuration file and all modules defining the display classes in use
+    _source_files = [WORKSPACE_CONFIG]
+
+    for _display in _displays:
+
+      _source_file = os.path.relpath(inspect.getsourcefile(_display.__class__))
+
+      if _source_file not in _source_files:
+        _source_files.append(_source_file)
+
+    _sources = dict((_file_path, ConfigCompiler.hash_file(_file_path)) for _file_path in _source_files)
+
+    try:
+      if not os.path.isdir(_directory):
+        os.makedirs(_directory)
+
+      for _display in _stale_displays:
+        ConfigCompiler.write_file(ConfigCompiler.get_slice_file(WORKSPACE_CONFIG, _display.name)
+                                , { "version" : ConfigCompiler.version
+                                  , "sources" : _sources
+                                  , "display" : ConfigCompiler.compile_display(_display) })
+
+    except (IOError, OSError) as _error:
+      print_warning("Could not write compiled configuration to " + _directory + ": " + str(_error))
+      return
+
+    print_message("Compiled " + WORKSPACE_CONFIG + " to " + _directory)
+
+  ## Returns a CompiledDisplay for a display of a configuration file or None if its slice is missing or stale.
+  # @param WORKSPACE_CONFIG Filepath of the workspace configuration file.
+  # @param DISPLAY_NAME Name of the display to be loaded.
+  @staticmethod
+  def load_display(WORKSPACE_CONFIG, DISPLAY_NAME):
+
+    _values = ConfigCompiler.read_file(ConfigCompiler.get_slice_file(WORKSPACE_CONFIG, DISPLAY_NAME))
+
+    if _values == None:
+      return None
+
+    _display = CompiledDisplay()
+    _display.my_constructor(_values["display"])
+    return _display
+
+
+## Display loaded from a slice file written by ConfigCompiler. Provides the same attributes as the
+# compiled PhysicalDisplay and replays the recorded results of register_view.
+class CompiledDisplay:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param VALUES Dictionary of display attributes as written by ConfigCompiler.compile_display.
+  def my_constructor(self, VALUES):
+
+    for _attribute in ConfigCompiler.display_attributes:
+      setattr(self, _attribute, VALUES[_attribute])
+
+    self.transformation = ConfigCompiler.decode_matrix(self.transformation)
+
+    ## @var type
+    # Name of the PhysicalDisplay subclass the display was compiled from.
+    self.type = VALUES["type"]
+
+    ## @var views
+    # Recorded results of register_view, one per display string.
+    self.views = VALUES["views"]
+
+    ## @var num_views
+    # Number of views which are already registered with this display.
+    self.num_views = 0
+
+  ## Registers a new view at this display and returns the recorded values of the compiled display.
+  def register_view(self):
+
+    if self.num_views < len(self.views):
+      self.num_views += 1
+      return self.views[self.num_views - 1]
+
+    return None
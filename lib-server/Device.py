@@ -11,6 +11,7 @@ import avango.daemon
 
 # import framework libraries
 from TrackingReader import *
+from StationHub import StationHub
 from ConsoleIO import *
 
 # import standard python modules
@@ -49,9 +50,50 @@ class MultiDofDevice(avango.script.Script):
   def __init__(self):
     self.super(MultiDofDevice).__init__()
 
-    ## @var input_bindings
-    # List of bindings between input values / button values and events. Code form.
-    self.input_bindings = []
+    ## @var dof_bindings
+    # List of compiled bindings adding unfiltered sensor values to degrees of freedom. Tuples of form (dof id, sensor field, factor).
+    self.dof_bindings = []
+
+    ## @var trigger_bindings
+    # List of compiled bindings passing sensor values to trigger setters. Tuples of form (setter method, sensor field).
+    self.trigger_bindings = []
+
+    # compiled filtered bindings, one entry per binding in each of the following lists
+    ## @var filter_dof_ids
+    # Degree of freedom each filtered binding is added to.
+    self.filter_dof_ids = []
+
+    ## @var filter_fields
+    # Sensor fields read by the filtered bindings.
+    self.filter_fields = []
+
+    ## @var filter_factors
+    # Factors the sensor values are multiplied with before filtering.
+    self.filter_factors = []
+
+    ## @var filter_offsets
+    # Offsets applied to the input values and their intervals.
+    self.filter_offsets = []
+
+    ## @var filter_mins
+    # Minimum values of the input intervals, offset already applied.
+    self.filter_mins = []
+
+    ## @var filter_maxs
+    # Maximum values of the input intervals, offset already applied.
+    self.filter_maxs = []
+
+    ## @var filter_neg_thresholds
+    # Absolute negative thresholds beneath which input values are passed on.
+    self.filter_neg_thresholds = []
+
+    ## @var filter_pos_thresholds
+    # Absolute positive thresholds above which input values are passed on.
+    self.filter_pos_thresholds = []
+
+    ## @var filter_ignore_zero
+    # Booleans saying if a binding is skipped while its sensor value is exactly zero.
+    self.filter_ignore_zero = []
     
     # factors for amplifying
     ## @var translation_factor
@@ -85,42 +127,37 @@ class MultiDofDevice(avango.script.Script):
       self.sf_station_mat.connect_from(self.tracking_reader.sf_abs_mat)
 
 
-  ## Map an input value to a certain interval.
-  # @param VALUE The value to be mapped.
-  # @param OFFSET The offset to be applied to VALUE, MIN and MAX.
-  # @param MIN The minimum value of the old interval.
-  # @param MAX The maximum value of the old interval.
-  # @param NEG_THRESHOLD The negative threshold to be used.
-  # @param POS_THRESHOLD The positive threshold to be used.
-  def filter_channel(self, VALUE, OFFSET, MIN, MAX, NEG_THRESHOLD, POS_THRESHOLD):
+  ## Maps a list of input values, one per filtered binding, to the interval [-1, 1]
+  # using the compiled offsets, intervals and thresholds. Returns the list of filtered values.
+  # @param VALUES The raw input values in filtered binding order.
+  def filter_channels(self, VALUES):
 
-    #print VALUE
-    VALUE = VALUE - OFFSET
-    MIN = MIN - OFFSET
-    MAX = MAX - OFFSET
+    _filtered_values = []
 
-    #print "+", VALUE, MAX, POS_THRESHOLD
-    #print "-", VALUE, MIN, NEG_THRESHOLD
+    for _value, _offset, _min, _max, _neg, _pos, _ignore_zero in zip(VALUES
+                                                                     , self.filter_offsets
+                                                                     , self.filter_mins
+                                                                     , self.filter_maxs
+                                                                     , self.filter_neg_thresholds
+                                                                     , self.filter_pos_thresholds
+                                                                     , self.filter_ignore_zero):
 
-    if VALUE > 0:
-      _pos = MAX * POS_THRESHOLD * 0.01
+      if _ignore_zero and _value == 0.0:
+        _filtered_values.append(0.0)
+        continue
 
-      if VALUE > _pos: # above positive threshold
-        VALUE = min( (VALUE - _pos) / (MAX - _pos), 1.0) # normalize interval
+      _value -= _offset
 
-      else: # beneath positive threshold
-        VALUE = 0
+      if _value > _pos: # above positive threshold
+        _filtered_values.append(min( (_value - _pos) / (_max - _pos), 1.0)) # normalize interval
 
-    elif VALUE < 0:
-      _neg = MIN * NEG_THRESHOLD * 0.01
+      elif _value < _neg: # beneath negative threshold
+        _filtered_values.append(max( (_value - _neg) / abs(_min - _neg), -1.0))
 
-      if VALUE < _neg:
-        VALUE = max( (VALUE - _neg) / abs(MIN - _neg), -1.0)
+      else: # inside thresholds
+        _filtered_values.append(0.0)
 
-      else: # above negative threshold
-        VALUE = 0
-    
-    return VALUE
+    return _filtered_values
 
   ## Sets given values as input channel filtering parameters.
   # @param INPUT_CHANNEL_PARAMETERS List on which the following values will be set.
@@ -137,49 +174,109 @@ class MultiDofDevice(avango.script.Script):
     INPUT_CHANNEL_PARAMETERS[3] = NEG_THRESHOLD
     INPUT_CHANNEL_PARAMETERS[4] = POS_THRESHOLD
 
-  ## Adds an input binding to the list of bindings for this device.
-  # @param INSTRUCTION The binding in code form to be set.
-  def add_input_binding(self, INSTRUCTION):
-  
-    self.input_bindings.append(INSTRUCTION)
-
+  ## Resolves a field of a device sensor for an input binding. Prints an error and returns None if the field does not exist.
+  # @param SENSOR The device sensor to read the field from.
+  # @param FIELD_NAME The name of the field, e.g. Value0 or Button1.
+  def get_binding_field(self, SENSOR, FIELD_NAME):
 
-  ## Callback: evaluated every frame
-  def frame_callback(self):
-  
-    ## @var dofs
-    # Temporary list of degrees of freedom to process input bindings.
-    self.dofs = [0.0,0.0,0.0,0.0,0.0,0.0,0.0]
+    try:
+      return getattr(SENSOR, FIELD_NAME)
+    except AttributeError:
+      print_error("Error in input binding of " + self.__class__.__name__ + ": device sensor " + \
+                  SENSOR.Station.value + " has no field " + FIELD_NAME + ".", False)
+      return None
 
-    # evaluate input bindings
-    for _input_binding in self.input_bindings:
+  ## Checks if a degree of freedom id is valid. Prints an error if not.
+  # @param ID ID Number of the degree of freedom to be checked.
+  def is_valid_dof_id(self, ID):
 
-      try:
-        eval(_input_binding)
-      except Exception as e:
-        print_error("Error parsing input binding " + _input_binding + "(" + e + ")", False)
-    
-    self.mf_dof.value = self.dofs
+    if ID < 0 or ID >= len(self.mf_dof.value):
+      print_error("Error in input binding of " + self.__class__.__name__ + ": invalid degree of freedom " + str(ID) + ".", False)
+      return False
 
+    return True
 
-  ## Sets a specific degree of freedom to a value which is filtered before.
+  ## Adds a binding adding the filtered value of a sensor field to a degree of freedom.
   # @param ID ID Number of the degree of freedom to be set.
-  # @param VALUE The value to be filtered.
+  # @param SENSOR The device sensor to read the value from.
+  # @param FIELD_NAME The name of the sensor field to read the value from.
+  # @param FACTOR The factor the value is multiplied with before filtering.
   # @param OFFSET The offset to be applied to VALUE, MIN and MAX.
   # @param MIN The minimum value of the old interval.
   # @param MAX The maximum value of the old interval.
-  # @param NEG_THRESHOLD The negative threshold to be used.
-  # @param POS_THRESHOLD The positive threshold to be used.
-  def set_and_filter_dof(self, ID, VALUE, OFFSET, MIN, MAX, NEG_THRESHOLD, POS_THRESHOLD):
+  # @param NEG_THRESHOLD The negative threshold to be used, in percent of MIN.
+  # @param POS_THRESHOLD The positive threshold to be used, in percent of MAX.
+  # @param IGNORE_ZERO Boolean saying if the binding is skipped while the sensor value is exactly zero.
+  def add_filtered_dof_binding(self, ID, SENSOR, FIELD_NAME, FACTOR, OFFSET, MIN, MAX, NEG_THRESHOLD, POS_THRESHOLD, IGNORE_ZERO = False):
+
+    _field = self.get_binding_field(SENSOR, FIELD_NAME)
+
+    if _field == None or self.is_valid_dof_id(ID) == False:
+      return
+
+    _min = MIN - OFFSET
+    _max = MAX - OFFSET
+
+    if _min >= 0.0 or _max <= 0.0 or \
+       NEG_THRESHOLD < 0 or NEG_THRESHOLD >= 100 or POS_THRESHOLD < 0 or POS_THRESHOLD >= 100:
+      print_error("Error in input binding of " + self.__class__.__name__ + " for " + FIELD_NAME + \
+                  ": invalid interval or thresholds.", False)
+      return
+
+    self.filter_dof_ids.append(ID)
+    self.filter_fields.append(_field)
+    self.filter_factors.append(FACTOR)
+    self.filter_offsets.append(OFFSET)
+    self.filter_mins.append(_min)
+    self.filter_maxs.append(_max)
+    self.filter_neg_thresholds.append(_min * NEG_THRESHOLD * 0.01)
+    self.filter_pos_thresholds.append(_max * POS_THRESHOLD * 0.01)
+    self.filter_ignore_zero.append(IGNORE_ZERO)
+
+  ## Adds a binding adding the unfiltered value of a sensor field to a degree of freedom.
+  # @param ID ID Number of the degree of freedom to be set.
+  # @param SENSOR The device sensor to read the value from.
+  # @param FIELD_NAME The name of the sensor field to read the value from.
+  # @param FACTOR The factor the value is multiplied with.
+  def add_dof_binding(self, ID, SENSOR, FIELD_NAME, FACTOR):
 
-    self.dofs[ID] += self.filter_channel(VALUE, OFFSET, MIN, MAX, NEG_THRESHOLD, POS_THRESHOLD)
+    _field = self.get_binding_field(SENSOR, FIELD_NAME)
 
-  ## Sets a specific degree of freedom to a value.
-  # @param ID ID Number of the degree of freedom to be set.
-  # @param VALUE The value to be set.
-  def set_dof(self, ID, VALUE):
+    if _field != None and self.is_valid_dof_id(ID):
+      self.dof_bindings.append( (ID, _field, FACTOR) )
+
+  ## Adds a binding passing the value of a sensor field to a trigger setter.
+  # @param TRIGGER_SETTER The setter method to be called, e.g. self.set_reset_trigger.
+  # @param SENSOR The device sensor to read the value from.
+  # @param FIELD_NAME The name of the sensor field to read the value from.
+  def add_trigger_binding(self, TRIGGER_SETTER, SENSOR, FIELD_NAME):
+
+    _field = self.get_binding_field(SENSOR, FIELD_NAME)
+
+    if _field != None:
+      self.trigger_bindings.append( (TRIGGER_SETTER, _field) )
+
+
+  ## Callback: evaluated every frame
+  def frame_callback(self):
+
+    # evaluate trigger bindings
+    for _trigger_setter, _field in self.trigger_bindings:
+      _trigger_setter(_field.value)
+
+    _dofs = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+
+    # evaluate filtered bindings
+    _values = [_field.value * _factor for _field, _factor in zip(self.filter_fields, self.filter_factors)]
 
-    self.dofs[ID] += VALUE
+    for _id, _value in zip(self.filter_dof_ids, self.filter_channels(_values)):
+      _dofs[_id] += _value
+
+    # evaluate unfiltered bindings
+    for _id, _field, _factor in self.dof_bindings:
+      _dofs[_id] += _field.value * _factor
+    
+    self.mf_dof.value = _dofs
 
   ## Sets the reset trigger.
   # @param VALUE The value to be set.
@@ -214,8 +311,7 @@ class SpacemouseDevice(MultiDofDevice):
     # init sensor
     ## @var device_sensor
     # Device sensor for the device's inputs.
-    self.device_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor.Station.value = DEVICE_STATION
+    self.device_sensor = StationHub.get_sensor(DEVICE_STATION)
 
     self.init_station_tracking(None, NO_TRACKING_MAT)
 
@@ -227,14 +323,14 @@ class SpacemouseDevice(MultiDofDevice):
     # Factor to modify the device's rotation input.
     self.rotation_factor = 0.7
 
-    self.add_input_binding("self.set_and_filter_dof(0, self.device_sensor.Value0.value, 0.0, -0.76, 0.82, 3, 3)")
-    self.add_input_binding("self.set_and_filter_dof(1, self.device_sensor.Value1.value*-1.0, 0.0, -0.7, 0.6, 3, 3)")
-    self.add_input_binding("self.set_and_filter_dof(2, self.device_sensor.Value2.value, 0.0, -0.95, 0.8, 3, 3)")
-    self.add_input_binding("self.set_and_filter_dof(3, self.device_sensor.Value3.value, 0.0, -0.82, 0.8, 12, 12)")
-    self.add_input_binding("self.set_and_filter_dof(4, self.device_sensor.Value4.value*-1.0, 0.0, -0.5, 0.6, 12, 12)")
-    self.add_input_binding("self.set_and_filter_dof(5, self.device_sensor.Value5.value, 0.0, -0.86, 0.77, 12, 12)")
-    self.add_input_binding("self.set_dof(6, self.device_sensor.Button0.value*1.0)")
-    self.add_input_binding("self.set_dof(6, self.device_sensor.Button1.value*-1.0)")
+    self.add_filtered_dof_binding(0, self.device_sensor, "Value0", 1.0, 0.0, -0.76, 0.82, 3, 3)
+    self.add_filtered_dof_binding(1, self.device_sensor, "Value1", -1.0, 0.0, -0.7, 0.6, 3, 3)
+    self.add_filtered_dof_binding(2, self.device_sensor, "Value2", 1.0, 0.0, -0.95, 0.8, 3, 3)
+    self.add_filtered_dof_binding(3, self.device_sensor, "Value3", 1.0, 0.0, -0.82, 0.8, 12, 12)
+    self.add_filtered_dof_binding(4, self.device_sensor, "Value4", -1.0, 0.0, -0.5, 0.6, 12, 12)
+    self.add_filtered_dof_binding(5, self.device_sensor, "Value5", 1.0, 0.0, -0.86, 0.77, 12, 12)
+    self.add_dof_binding(6, self.device_sensor, "Button0", 1.0)
+    self.add_dof_binding(6, self.device_sensor, "Button1", -1.0)
 
 
 ## Internal representation and reader for a globefish device.
@@ -248,8 +344,7 @@ class GlobefishDevice(MultiDofDevice):
     # init sensor
     ## @var device_sensor
     # Device sensor for the device's inputs.
-    self.device_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor.Station.value = DEVICE_STATION
+    self.device_sensor = StationHub.get_sensor(DEVICE_STATION)
 
     self.init_station_tracking(None, NO_TRACKING_MAT)
 
@@ -261,12 +356,12 @@ class GlobefishDevice(MultiDofDevice):
     # Factor to modify the device's rotation input.
     self.rotation_factor = 10.0
     
-    self.add_input_binding("self.set_and_filter_dof(0, self.device_sensor.Value0.value, 0.0, -0.6, 0.85, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(1, self.device_sensor.Value1.value*-1.0, 0.0, -0.25, 0.25, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(2, self.device_sensor.Value2.value*-1.0, 0.0, -0.15, 0.15, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(3, self.device_sensor.Value3.value*-1.0, 0.0, -512.0, 512.0, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(4, self.device_sensor.Value4.value*-1.0, 0.0, -512.0, 512.0, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(5, self.device_sensor.Value5.value, 0.0, -512.0, 512.0, 0, 0)")
+    self.add_filtered_dof_binding(0, self.device_sensor, "Value0", 1.0, 0.0, -0.6, 0.85, 0, 0)
+    self.add_filtered_dof_binding(1, self.device_sensor, "Value1", -1.0, 0.0, -0.25, 0.25, 0, 0)
+    self.add_filtered_dof_binding(2, self.device_sensor, "Value2", -1.0, 0.0, -0.15, 0.15, 0, 0)
+    self.add_filtered_dof_binding(3, self.device_sensor, "Value3", -1.0, 0.0, -512.0, 512.0, 0, 0)
+    self.add_filtered_dof_binding(4, self.device_sensor, "Value4", -1.0, 0.0, -512.0, 512.0, 0, 0)
+    self.add_filtered_dof_binding(5, self.device_sensor, "Value5", 1.0, 0.0, -512.0, 512.0, 0, 0)
 
 
 ## Internal representation and reader for a keyboard and mouse setup.
@@ -275,18 +370,14 @@ class KeyboardMouseDevice(MultiDofDevice):
   ## Custom constructor.
   # @param NO_TRACKING_MAT The matrix to be applied as a spacemouse is not tracked.
   def my_constructor(self, NO_TRACKING_MAT):
-  
-    _device_service = avango.daemon.DeviceService()
-  
+
     ## @var mouse_sensor
     # Input sensor referencing the mouse connected to the computer.
-    self.mouse_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = _device_service)
-    self.mouse_sensor.Station.value = "device-mouse"
+    self.mouse_sensor = StationHub.get_sensor("device-mouse")
 
     ## @var keyboard_sensor
     # Input sensor referencing the keyboard connected to the computer.
-    self.keyboard_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = _device_service)
-    self.keyboard_sensor.Station.value = "device-keyboard0"
+    self.keyboard_sensor = StationHub.get_sensor("device-keyboard0")
 
     self.init_station_tracking(None, NO_TRACKING_MAT)
 
@@ -299,19 +390,19 @@ class KeyboardMouseDevice(MultiDofDevice):
     self.rotation_factor = 8.0
 
 
-    self.add_input_binding("self.set_dof(0, self.keyboard_sensor.Button1.value*-1.0)")           # A
-    self.add_input_binding("self.set_dof(0, self.keyboard_sensor.Button3.value)")                # D
-    self.add_input_binding("self.set_dof(1, self.keyboard_sensor.Button7.value)")                # UP
-    self.add_input_binding("self.set_dof(1, self.keyboard_sensor.Button8.value*-1.0)")           #  DOWN
-    self.add_input_binding("self.set_dof(2, self.keyboard_sensor.Button0.value*-1.0)")           # W
-    self.add_input_binding("self.set_dof(2, self.keyboard_sensor.Button2.value)")                # S
-    self.add_input_binding("self.set_reset_trigger(self.keyboard_sensor.Button4.value)")         # R
-    self.add_input_binding("self.set_coupling_trigger(self.keyboard_sensor.Button5.value)")      # C
-    self.add_input_binding("self.set_dof_trigger(self.keyboard_sensor.Button6.value)")           # G
-    self.add_input_binding("self.set_and_filter_dof(3, self.mouse_sensor.Value1.value*-1.0, 0.0, -100.0, 100.0, 0, 0)") # mouse up
-    self.add_input_binding("self.set_and_filter_dof(4, self.mouse_sensor.Value0.value*-1.0, 0.0, -100.0, 100.0, 0, 0)") # mouse right
-    self.add_input_binding("self.set_dof(6, self.mouse_sensor.Button0.value*-1.0)")              # left button
-    self.add_input_binding("self.set_dof(6, self.mouse_sensor.Button2.value*1.0)")               # right button
+    self.add_dof_binding(0, self.keyboard_sensor, "Button1", -1.0)                                   # A
+    self.add_dof_binding(0, self.keyboard_sensor, "Button3", 1.0)                                    # D
+    self.add_dof_binding(1, self.keyboard_sensor, "Button7", 1.0)                                    # UP
+    self.add_dof_binding(1, self.keyboard_sensor, "Button8", -1.0)                                   #  DOWN
+    self.add_dof_binding(2, self.keyboard_sensor, "Button0", -1.0)                                   # W
+    self.add_dof_binding(2, self.keyboard_sensor, "Button2", 1.0)                                    # S
+    self.add_trigger_binding(self.set_reset_trigger, self.keyboard_sensor, "Button4")                # R
+    self.add_trigger_binding(self.set_coupling_trigger, self.keyboard_sensor, "Button5")             # C
+    self.add_trigger_binding(self.set_dof_trigger, self.keyboard_sensor, "Button6")                  # G
+    self.add_filtered_dof_binding(3, self.mouse_sensor, "Value1", -1.0, 0.0, -100.0, 100.0, 0, 0)    # mouse up
+    self.add_filtered_dof_binding(4, self.mouse_sensor, "Value0", -1.0, 0.0, -100.0, 100.0, 0, 0)    # mouse right
+    self.add_dof_binding(6, self.mouse_sensor, "Button0", -1.0)                                      # left button
+    self.add_dof_binding(6, self.mouse_sensor, "Button2", 1.0)                                       # right button
 
 
 ## Internal representation and reader for a XBox controller
@@ -327,8 +418,7 @@ class XBoxDevice(MultiDofDevice):
     
     ## @var device_sensor
     # Device sensor for the device's inputs.
-    self.device_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor.Station.value = DEVICE_STATION
+    self.device_sensor = StationHub.get_sensor(DEVICE_STATION)
     
     ## @var translation_factor
     # Factor to modify the device's translation input.
@@ -338,17 +428,17 @@ class XBoxDevice(MultiDofDevice):
     # Factor to modify the device's rotation input.
     self.rotation_factor = 1.2
 
-    self.add_input_binding("self.set_and_filter_dof(0, self.device_sensor.Value0.value, 0.0, -1.0, 1.0, 15, 15)")
-    self.add_input_binding("self.set_and_filter_dof(2, self.device_sensor.Value1.value, 0.0, -1.0, 1.0, 15, 15)")    
-    #self.add_input_binding("self.set_dof(1, self.device_sensor.Value4.value*-1.0)")
-    #self.add_input_binding("self.set_dof(1, self.device_sensor.Value5.value)")
-    self.add_input_binding("self.set_and_filter_dof(3, self.device_sensor.Value3.value, 0.0, -1.0, 1.0, 15, 15)")
-    self.add_input_binding("self.set_and_filter_dof(4, self.device_sensor.Value2.value*-1.0, 0.0, -1.0, 1.0, 15, 15)")
-    self.add_input_binding("self.set_reset_trigger(self.device_sensor.Button0.value)")       # X
-    self.add_input_binding("self.set_coupling_trigger(self.device_sensor.Button1.value)")    # B
-    self.add_input_binding("self.set_dof_trigger(self.device_sensor.Button2.value)")         # A
-    self.add_input_binding("self.set_dof(6, self.device_sensor.Button6.value*-1.0)")         # TL
-    self.add_input_binding("self.set_dof(6, self.device_sensor.Button7.value*1.0)")          # TR
+    self.add_filtered_dof_binding(0, self.device_sensor, "Value0", 1.0, 0.0, -1.0, 1.0, 15, 15)
+    self.add_filtered_dof_binding(2, self.device_sensor, "Value1", 1.0, 0.0, -1.0, 1.0, 15, 15)    
+    #self.add_dof_binding(1, self.device_sensor, "Value4", -1.0)
+    #self.add_dof_binding(1, self.device_sensor, "Value5", 1.0)
+    self.add_filtered_dof_binding(3, self.device_sensor, "Value3", 1.0, 0.0, -1.0, 1.0, 15, 15)
+    self.add_filtered_dof_binding(4, self.device_sensor, "Value2", -1.0, 0.0, -1.0, 1.0, 15, 15)
+    self.add_trigger_binding(self.set_reset_trigger, self.device_sensor, "Button0")       # X
+    self.add_trigger_binding(self.set_coupling_trigger, self.device_sensor, "Button1")    # B
+    self.add_trigger_binding(self.set_dof_trigger, self.device_sensor, "Button2")         # A
+    self.add_dof_binding(6, self.device_sensor, "Button6", -1.0)                          # TL
+    self.add_dof_binding(6, self.device_sensor, "Button7", 1.0)                           # TR
 
   ## Creates a representation of the device in the virutal world.
   # @param PLATFORM_INSTANCE Instance of Platform for which the device avatar is to be created.
@@ -368,13 +458,11 @@ class OldSpheronDevice(MultiDofDevice):
     
     ## @var device_sensor
     # Device sensor for the device's inputs.
-    self.device_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor.Station.value = DEVICE_STATION
+    self.device_sensor = StationHub.get_sensor(DEVICE_STATION)
 
     ## @var button_sensor
     # Device sensor for the device's button inputs.
-    self.button_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.button_sensor.Station.value = "device-old-spheron-buttons"
+    self.button_sensor = StationHub.get_sensor("device-old-spheron-buttons")
     
     ## @var translation_factor
     # Factor to modify the device's translation input.
@@ -384,30 +472,15 @@ class OldSpheronDevice(MultiDofDevice):
     # Factor to modify the device's rotation input.
     self.rotation_factor = 2.5
 
-    self.add_input_binding("self.set_and_filter_dof(0, self.device_sensor.Value0.value, -0.00787377543747, -0.0134, 0.003, 5, 5)")
-    self.add_input_binding("self.set_and_filter_dof(1, self.device_sensor.Value1.value*-1.0, -0.00787377543747, -0.0115, -0.003, 20, 20)")
-    self.add_input_binding("self.set_and_filter_dof(2, self.device_sensor.Value2.value, -0.00787377543747, -0.015, 0.0, 5, 5)")    
-    self.add_input_binding("self.set_and_filter_dof(3, self.device_sensor.Value3.value, -0.00787377543747, -0.0095, -0.006, 0, 0)")
-    self.add_input_binding("self.conditional_set_and_filter_dof(4, self.device_sensor.Value4.value, -0.00787377543747, -0.0095, -0.006, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(5, self.device_sensor.Value5.value, -0.00787377543747, -0.0095, -0.006, 0, 0)")
-    self.add_input_binding("self.set_dof_trigger(self.button_sensor.Button1.value)")       # middle button      
-    self.add_input_binding("self.set_dof(6, self.button_sensor.Button0.value*-1.0)")         # left button
-    self.add_input_binding("self.set_dof(6, self.button_sensor.Button2.value*1.0)")          # right button
-
-  ## Conditional execution of of set_and_filter_dof in order to prevent input errors for the old spheron.
-  # @param ID ID Number of the degree of freedom to be set.
-  # @param VALUE The value to be filtered.
-  # @param OFFSET The offset to be applied to VALUE, MIN and MAX.
-  # @param MIN The minimum value of the old interval.
-  # @param MAX The maximum value of the old interval.
-  # @param NEG_THRESHOLD The negative threshold to be used.
-  # @param POS_THRESHOLD The positive threshold to be used.
-  def conditional_set_and_filter_dof(self, ID, VALUE, OFFSET, MIN, MAX, NEG_THRESHOLD, POS_THRESHOLD):
-    _condition = "self.device_sensor.Value" + str(ID) + ".value != 0.0"
-    _result = eval(_condition)
-
-    if _result:
-      self.set_and_filter_dof(ID, VALUE, OFFSET, MIN, MAX, NEG_THRESHOLD, POS_THRESHOLD)
+    self.add_filtered_dof_binding(0, self.device_sensor, "Value0", 1.0, -0.00787377543747, -0.0134, 0.003, 5, 5)
+    self.add_filtered_dof_binding(1, self.device_sensor, "Value1", -1.0, -0.00787377543747, -0.0115, -0.003, 20, 20)
+    self.add_filtered_dof_binding(2, self.device_sensor, "Value2", 1.0, -0.00787377543747, -0.015, 0.0, 5, 5)    
+    self.add_filtered_dof_binding(3, self.device_sensor, "Value3", 1.0, -0.00787377543747, -0.0095, -0.006, 0, 0)
+    self.add_filtered_dof_binding(4, self.device_sensor, "Value4", 1.0, -0.00787377543747, -0.0095, -0.006, 0, 0, IGNORE_ZERO = True)
+    self.add_filtered_dof_binding(5, self.device_sensor, "Value5", 1.0, -0.00787377543747, -0.0095, -0.006, 0, 0)
+    self.add_trigger_binding(self.set_dof_trigger, self.button_sensor, "Button1")    # middle button
+    self.add_dof_binding(6, self.button_sensor, "Button0", -1.0)                     # left button
+    self.add_dof_binding(6, self.button_sensor, "Button2", 1.0)                      # right button
 
 
 ## Internal representation and reader for the new spheron
@@ -423,13 +496,11 @@ class NewSpheronDevice(MultiDofDevice):
     
     ## @var device_sensor_right
     # Device sensor for the device's right inputs.
-    self.device_sensor_right = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor_right.Station.value = DEVICE_STATION + "-right"
+    self.device_sensor_right = StationHub.get_sensor(DEVICE_STATION + "-right")
 
     ## @var device_sensor_left
     # Device sensor for the device's left inputs.
-    self.device_sensor_left = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor_left.Station.value = DEVICE_STATION + "-left"
+    self.device_sensor_left = StationHub.get_sensor(DEVICE_STATION + "-left")
     
     ## @var translation_factor
     # Factor to modify the device's translation input.
@@ -439,18 +510,18 @@ class NewSpheronDevice(MultiDofDevice):
     # Factor to modify the device's rotation input.
     self.rotation_factor = 1.0
 
-    self.add_input_binding("self.set_and_filter_dof(0, self.device_sensor_left.Value0.value, 0.0, -1.0, 1.0, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(2, self.device_sensor_left.Value1.value, 0.0, -1.0, 1.0, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(1, self.device_sensor_left.Value2.value*-1.0, 0.0, -0.025, 0.34, 0, 0)")            
-    self.add_input_binding("self.set_and_filter_dof(4, self.device_sensor_left.Value3.value*-1.0, 0.0, -1.0, 1.0, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(3, self.device_sensor_right.Value3.value*-1.0, 0.0, -150, 150, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(4, self.device_sensor_right.Value4.value*-1.0, 0.0, -150, 150, 0, 0)")
-    self.add_input_binding("self.set_and_filter_dof(5, self.device_sensor_right.Value5.value*-1.0, 0.0, -150, 150, 0, 0)")    
+    self.add_filtered_dof_binding(0, self.device_sensor_left, "Value0", 1.0, 0.0, -1.0, 1.0, 0, 0)
+    self.add_filtered_dof_binding(2, self.device_sensor_left, "Value1", 1.0, 0.0, -1.0, 1.0, 0, 0)
+    self.add_filtered_dof_binding(1, self.device_sensor_left, "Value2", -1.0, 0.0, -0.025, 0.34, 0, 0)            
+    self.add_filtered_dof_binding(4, self.device_sensor_left, "Value3", -1.0, 0.0, -1.0, 1.0, 0, 0)
+    self.add_filtered_dof_binding(3, self.device_sensor_right, "Value3", -1.0, 0.0, -150, 150, 0, 0)
+    self.add_filtered_dof_binding(4, self.device_sensor_right, "Value4", -1.0, 0.0, -150, 150, 0, 0)
+    self.add_filtered_dof_binding(5, self.device_sensor_right, "Value5", -1.0, 0.0, -150, 150, 0, 0)    
     
-    #self.add_input_binding("self.set_reset_trigger(self.device_sensor_right.Button1.value)")       # middle button
-    self.add_input_binding("self.set_dof_trigger(self.device_sensor_right.Button1.value)")       # middle button      
-    self.add_input_binding("self.set_dof(6, self.device_sensor_right.Button0.value*-1.0)")         # left button
-    self.add_input_binding("self.set_dof(6, self.device_sensor_right.Button2.value*1.0)")          # right button
+    #self.add_trigger_binding(self.set_reset_trigger, self.device_sensor_right, "Button1")    # middle button
+    self.add_trigger_binding(self.set_dof_trigger, self.device_sensor_right, "Button1")       # middle button
+    self.add_dof_binding(6, self.device_sensor_right, "Button0", -1.0)                        # left button
+    self.add_dof_binding(6, self.device_sensor_right, "Button2", 1.0)                         # right button
 
   #  print(self.device_sensor_left.Station.value)
   #  self.always_evaluate(True)
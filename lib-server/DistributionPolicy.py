@@ -0,0 +1,279 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes DistributionPolicy and DistributionMonitor.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import time
+
+
+## Decides which scenegraph nodes are distributed to the clients and keeps track of them.
+#
+# Every subtree belongs to one of three categories. Replicated subtrees are distributed node by node.
+# Client-reconstructible subtrees only consist of carrier nodes whose matrices, names and group names
+# describe helper geometry which the clients rebuild locally. Server-only subtrees are kept outside
+# the nettrans node and are never distributed. Nodes without a category inherit the one of their parent.
+class DistributionPolicy:
+
+  ## @var REPLICATED
+  # Category of subtrees distributed node by node.
+  REPLICATED = "replicated"
+
+  ## @var CLIENT_RECONSTRUCTIBLE
+  # Category of carrier nodes from which the clients rebuild helper geometry locally.
+  CLIENT_RECONSTRUCTIBLE = "client-reconstructible"
+
+  ## @var SERVER_ONLY
+  # Category of subtrees which are not distributed.
+  SERVER_ONLY = "server-only"
+
+  ## @var categories
+  # List of all categories.
+  categories = [REPLICATED, CLIENT_RECONSTRUCTIBLE, SERVER_ONLY]
+
+  ## @var node_categories
+  # Dictionary mapping the root nodes of tagged subtrees to their categories.
+  node_categories = {}
+
+  ## @var category_nodes
+  # Dictionary mapping the categories to the lists of nodes which were handled according to them.
+  category_nodes = {REPLICATED : [], CLIENT_RECONSTRUCTIBLE : [], SERVER_ONLY : []}
+
+  ## @var distributed_nodes
+  # Dictionary mapping all distributed nodes to their categories.
+  distributed_nodes = {}
+
+  ## Tags a subtree with a category. Must be called before the subtree is distributed.
+  # @param NODE The root node of the subtree.
+  # @param CATEGORY The category of the subtree.
+  @staticmethod
+  def tag_subtree(NODE, CATEGORY):
+    DistributionPolicy.node_categories[NODE] = CATEGORY
+
+  ## Distributes a single node if it was not distributed yet.
+  # @param NET_TRANS_NODE The nettrans node to distribute the node with.
+  # @param NODE The node to be distributed.
+  # @param CATEGORY The category the node is accounted to, either REPLICATED or CLIENT_RECONSTRUCTIBLE.
+  @staticmethod
+  def distribute_node(NET_TRANS_NODE, NODE, CATEGORY = REPLICATED):
+
+    if NODE in DistributionPolicy.distributed_nodes:
+      return
+
+    NET_TRANS_NODE.distribute_object(NODE)
+    DistributionPolicy.distributed_nodes[NODE] = CATEGORY
+    DistributionPolicy.category_nodes[CATEGORY].append(NODE)
+
+  ## Distributes a subtree according to the categories of its nodes. Replaces the distribution of all nodes below the nettrans node.
+  # @param NET_TRANS_NODE The nettrans node to distribute the subtree with.
+  # @param NODE The root node of the subtree. The nettrans node itself is not distributed.
+  # @param CATEGORY The category inherited from the parent of NODE.
+  @staticmethod
+  def distribute_subtree(NET_TRANS_NODE, NODE, CATEGORY = REPLICATED):
+
+    _category = DistributionPolicy.node_categories.get(NODE, CATEGORY)
+
+    if _category == DistributionPolicy.SERVER_ONLY:
+      print_warning("Server-only node " + NODE.Name.value + " is attached below the nettrans node and is not distributed.")
+      return
+
+    if NODE != NET_TRANS_NODE:
+      DistributionPolicy.distribute_node(NET_TRANS_NODE, NODE, _category)
+
+    for _child in NODE.Children.value:
+      DistributionPolicy.distribute_subtree(NET_TRANS_NODE, _child, _category)
+
+  ## Appends a server-only subtree to a node outside the nettrans node.
+  # @param PARENT_NODE The node outside the nettrans node to append the subtree to, usually the scenegraph root.
+  # @param NODE The root node of the subtree.
+  @staticmethod
+  def append_server_only_subtree(PARENT_NODE, NODE):
+
+    DistributionPolicy.tag_subtree(NODE, DistributionPolicy.SERVER_ONLY)
+    DistributionPolicy.category_nodes[DistributionPolicy.SERVER_ONLY].append(NODE)
+    PARENT_NODE.Children.value.append(NODE)
+
+  ## Stops accounting the nodes of a subtree which was removed from the scenegraph.
+  # @param NODE The root node of the removed subtree.
+  @staticmethod
+  def forget_subtree(NODE):
+
+    _category = DistributionPolicy.distributed_nodes.pop(NODE, None)
+
+    if _category != None:
+      DistributionPolicy.category_nodes[_category].remove(NODE)
+
+    for _child in NODE.Children.value:
+      DistributionPolicy.forget_subtree(_child)
+
+  ## Returns the number of nodes per category. Server-only subtrees count with all their nodes.
+  @staticmethod
+  def get_object_counts():
+
+    _counts = {}
+
+    for _category in [DistributionPolicy.REPLICATED, DistributionPolicy.CLIENT_RECONSTRUCTIBLE]:
+      _counts[_category] = len(DistributionPolicy.category_nodes[_category])
+
+    _counts[DistributionPolicy.SERVER_ONLY] = sum(DistributionPolicy.count_subtree(_node) for _node in DistributionPolicy.category_nodes[DistributionPolicy.SERVER_ONLY])
+
+    return _counts
+
+  ## Returns the number of nodes in a subtree.
+  # @param NODE The root node of the subtree.
+  @staticmethod
+  def count_subtree(NODE):
+    return 1 + sum(DistributionPolicy.count_subtree(_child) for _child in NODE.Children.value)
+
+
+## Opt-in monitor estimating the network traffic caused by the distributed nodes per category.
+#
+# Compares the distributed fields of all nodes registered at the DistributionPolicy every frame and
+# sums up the sizes of the changed values. The statistics are printed periodically and can be
+# retrieved from the GuaVE shell by calling get_statistics().
+class DistributionMonitor:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param REPORT_INTERVAL Length of a measurement interval in seconds.
+  # @param PRINT_REPORTS Boolean saying if the statistics are to be printed after each measurement interval.
+  def my_constructor(self, REPORT_INTERVAL = 10.0, PRINT_REPORTS = True):
+
+    ## @var report_interval
+    # Length of a measurement interval in seconds.
+    self.report_interval = REPORT_INTERVAL
+
+    ## @var print_reports
+    # Boolean saying if the statistics are to be printed after each measurement interval.
+    self.print_reports = PRINT_REPORTS
+
+    ## @var snapshots
+    # Dictionary mapping distributed nodes to the list of their field values in the last frame.
+    self.snapshots = {}
+
+    ## @var category_bytes
+    # Dictionary mapping the categories to the number of bytes changed since interval_start.
+    self.category_bytes = {}
+
+    ## @var bytes_per_second
+    # Dictionary mapping the categories to the bytes per second measured in the last completed interval.
+    self.bytes_per_second = {}
+
+    ## @var interval_start
+    # Time at which the current measurement interval started.
+    self.interval_start = time.time()
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method while the monitor is enabled.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = False)
+
+  ## Enables or disables the monitor. Measurements are restarted when enabled.
+  # @param FLAG Boolean saying if the monitor is to be enabled.
+  def enable(self, FLAG):
+
+    self.snapshots = {}
+    self.category_bytes = {}
+    self.bytes_per_second = {}
+    self.interval_start = time.time()
+    self.frame_trigger.Active.value = FLAG
+
+  ## Returns the list of distributed field values of a node.
+  # @param NODE The node to retrieve the values for.
+  def get_field_values(self, NODE):
+
+    _mat = NODE.Transform.value
+    _values = [ tuple(_mat.get_element(_row, _column) for _row in range(4) for _column in range(4))
+              , NODE.Name.value
+              , tuple(NODE.GroupNames.value) ]
+
+    _type = NODE.get_type()
+
+    if _type == "av::gua::TriMeshNode":
+      _values.append(NODE.Material.value)
+
+    elif _type == "av::gua::ScreenNode":
+      _values.append( (NODE.Width.value, NODE.Height.value) )
+
+    return _values
+
+  ## Returns the estimated number of bytes needed to transfer a field value.
+  # @param VALUE The field value as returned by get_field_values.
+  def get_value_size(self, VALUE):
+
+    if isinstance(VALUE, str):
+      return 4 + len(VALUE)
+
+    if isinstance(VALUE, tuple) and len(VALUE) > 0 and isinstance(VALUE[0], str):
+      return 4 + sum(4 + len(_string) for _string in VALUE)
+
+    if isinstance(VALUE, tuple):
+      return 4 * len(VALUE)
+
+    return 4
+
+  ## Returns a dictionary mapping the categories to (number of objects, bytes per second) tuples.
+  # Bytes per second are taken from the last completed interval and are None if not measured yet.
+  def get_statistics(self):
+
+    _counts = DistributionPolicy.get_object_counts()
+    _statistics = {}
+
+    for _category in DistributionPolicy.categories:
+      _statistics[_category] = (_counts[_category], self.bytes_per_second.get(_category, None))
+
+    return _statistics
+
+  ## Prints the current statistics on the console.
+  def print_statistics(self):
+
+    for _category, (_objects, _bytes_per_second) in sorted(self.get_statistics().items()):
+
+      if _bytes_per_second == None:
+        print_message("Distribution " + _category + ": " + str(_objects) + " objects")
+      else:
+        print_message("Distribution " + _category + ": " + str(_objects) + " objects, " + str(int(_bytes_per_second)) + " bytes/sec")
+
+  ## Evaluated every frame while enabled. Accumulates the sizes of all changed field values.
+  def frame_callback(self):
+
+    _snapshots = {}
+
+    for _node, _category in DistributionPolicy.distributed_nodes.items():
+
+      _values = self.get_field_values(_node)
+      _last_values = self.snapshots.get(_node)
+      _bytes = 0
+
+      for _i in range(len(_values)):
+
+        if _last_values == None or _last_values[_i] != _values[_i]:
+          _bytes += self.get_value_size(_values[_i])
+
+      _snapshots[_node] = _values
+      self.category_bytes[_category] = self.category_bytes.get(_category, 0) + _bytes
+
+    self.snapshots = _snapshots
+
+    _elapsed = time.time() - self.interval_start
+
+    if _elapsed >= self.report_interval:
+
+      for _category in DistributionPolicy.categories:
+        self.bytes_per_second[_category] = self.category_bytes.get(_category, 0) / _elapsed
+
+      self.category_bytes = {}
+      self.interval_start = time.time()
+
+      if self.print_reports:
+        self.print_statistics()
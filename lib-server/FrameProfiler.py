@@ -0,0 +1,343 @@
+#!/usr/bin/python
+
+## @file
+# Contains class FrameProfiler.
+
+# import avango-guacamole libraries
+import avango
+import avango.script
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import collections
+import csv
+import json
+import os
+import sys
+import time
+import weakref
+
+
+## Opt-in instrumentation of the methods which are evaluated every frame.
+#
+# Wraps the evaluate and frame_callback methods of all framework classes and keeps rolling
+# timing windows per instance, which are aggregated per class on request. The statistics can
+# be printed from the GuaVE shell by calling dump() and are written periodically to a CSV or
+# JSON file. Has to be constructed before the instances to be measured are created, since
+# the Update nodes store the bound frame_callback methods when they are created.
+class FrameProfiler:
+
+  ## @var method_names
+  # Names of the methods to be measured.
+  method_names = ["evaluate", "frame_callback"]
+
+  ## @var histogram_bounds
+  # Upper bounds of the histogram buckets in milliseconds. An additional bucket takes all longer calls.
+  histogram_bounds = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7]
+
+  ## @var frame_budget
+  # Time available for one frame at 60 Hz in milliseconds.
+  frame_budget = 1000.0 / 60.0
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param OUTPUT_FILE Path of the file the statistics are written to periodically, None for no output. Written as JSON if ending on .json, otherwise as CSV.
+  # @param WRITE_INTERVAL Time in seconds between two writes of the output file.
+  # @param WINDOW_FRAMES Number of recent frames the statistics are computed for.
+  def my_constructor(self, OUTPUT_FILE = None, WRITE_INTERVAL = 5.0, WINDOW_FRAMES = 600):
+
+    ## @var output_file
+    # Path of the file the statistics are written to periodically, None for no output.
+    self.output_file = OUTPUT_FILE
+
+    ## @var write_interval
+    # Time in seconds between two writes of the output file.
+    self.write_interval = WRITE_INTERVAL
+
+    ## @var window_frames
+    # Number of recent frames the statistics are computed for.
+    self.window_frames = WINDOW_FRAMES
+
+    ## @var frame_count
+    # Number of frames since the creation of this profiler.
+    self.frame_count = 0
+
+    ## @var last_write_time
+    # Time of the last write of the output file.
+    self.last_write_time = time.time()
+
+    ## @var samples
+    # Dictionary mapping (weak instance reference, method name) to a list [label, class label, deque of (frame, duration in ms)].
+    # Weak references of destroyed instances only compare equal to themselves, so instances reusing their ids get entries of their own.
+    self.samples = {}
+
+    ## @var instance_numbers
+    # Dictionary mapping weak instance references to the numbers of the instances within their class.
+    self.instance_numbers = {}
+
+    ## @var class_instance_counts
+    # Dictionary mapping class names to the number of measured instances.
+    self.class_instance_counts = {}
+
+    ## @var running_calls
+    # Set of (instance id, method name) tuples currently measured, to avoid measuring calls to overridden base class methods twice.
+    self.running_calls = set()
+
+    ## @var instrumented_methods
+    # List of strings naming the instrumented methods.
+    self.instrumented_methods = []
+
+    self.instrument_framework()
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.count_frame, Active = True)
+
+    print_message("Frame profiling enabled for " + str(len(self.instrumented_methods)) + " methods.")
+
+  ## Instruments the methods to be measured of all classes defined in the framework modules loaded.
+  def instrument_framework(self):
+
+    _framework_directory = os.path.dirname(os.path.abspath(__file__))
+
+    for _module in list(sys.modules.values()):
+
+      _module_file = getattr(_module, "__file__", None)
+
+      if _module_file == None or os.path.dirname(os.path.abspath(_module_file)) != _framework_directory:
+        continue
+
+      for _class in list(vars(_module).values()):
+
+        if not isinstance(_class, type) or _class.__module__ != _module.__name__ or _class == FrameProfiler:
+          continue
+
+        for _method_name in FrameProfiler.method_names:
+
+          if _method_name in _class.__dict__:
+            self.instrument_method(_class, _method_name)
+
+  ## Replaces a method of a class by a measuring wrapper.
+  # @param CLASS The class defining the method.
+  # @param METHOD_NAME The name of the method to be wrapped.
+  def instrument_method(self, CLASS, METHOD_NAME):
+
+    _method = CLASS.__dict__[METHOD_NAME]
+
+    if getattr(_method, "frame_profiler", None) == self:
+      return
+
+    _profiler = self
+
+    def _profiled_method(SELF, *args, **kwargs):
+
+      _key = (id(SELF), METHOD_NAME)
+
+      # calls of overridden methods are measured by the outermost call
+      if _key in _profiler.running_calls:
+        return _method(SELF, *args, **kwargs)
+
+      _profiler.running_calls.add(_key)
+      _start_time = time.perf_counter()
+
+      try:
+        return _method(SELF, *args, **kwargs)
+
+      finally:
+        _profiler.running_calls.discard(_key)
+        _profiler.record(SELF, METHOD_NAME, (time.perf_counter() - _start_time) * 1000.0)
+
+    _profiled_method.__name__ = _method.__name__
+    _profiled_method.__doc__ = _method.__doc__
+    _profiled_method.frame_profiler = self
+
+    setattr(CLASS, METHOD_NAME, _profiled_method)
+    self.instrumented_methods.append(CLASS.__name__ + "." + METHOD_NAME)
+
+  ## Stores the duration of a measured call.
+  # @param INSTANCE The instance whose method was called.
+  # @param METHOD_NAME The name of the called method.
+  # @param DURATION The duration of the call in milliseconds.
+  def record(self, INSTANCE, METHOD_NAME, DURATION):
+
+    _reference = weakref.ref(INSTANCE)
+    _key = (_reference, METHOD_NAME)
+
+    try:
+      _entry = self.samples[_key]
+
+    except KeyError:
+      _class_name = type(INSTANCE).__name__
+
+      if _reference not in self.instance_numbers:
+        self.instance_numbers[_reference] = self.class_instance_counts.get(_class_name, 0)
+        self.class_instance_counts[_class_name] = self.instance_numbers[_reference] + 1
+
+      _entry = [ _class_name + "#" + str(self.instance_numbers[_reference]) + "." + METHOD_NAME
+               , _class_name + "." + METHOD_NAME
+               , collections.deque() ]
+      self.samples[_key] = _entry
+
+    _window = _entry[2]
+    _window.append( (self.frame_count, DURATION) )
+
+    # drop samples which left the window
+    while _window[0][0] <= self.frame_count - self.window_frames:
+      _window.popleft()
+
+  ## Callback: evaluated every frame. Counts the frames and writes the output file periodically.
+  def count_frame(self):
+
+    self.frame_count += 1
+
+    if self.frame_count % self.window_frames == 0:
+      self.prune()
+
+    if self.output_file != None and time.time() - self.last_write_time > self.write_interval:
+      self.last_write_time = time.time()
+      self.write(self.output_file)
+
+  ## Removes the entries without samples in the window, e.g. of destroyed instances, and the numbers of destroyed instances without entries.
+  def prune(self):
+
+    for _key in [_key for _key, _entry in self.samples.items() if _entry[2][-1][0] <= self.frame_count - self.window_frames]:
+      del self.samples[_key]
+
+    _references = set([_key[0] for _key in self.samples])
+
+    for _reference in [_reference for _reference in self.instance_numbers if _reference() == None and _reference not in _references]:
+      del self.instance_numbers[_reference]
+
+  ## Computes the statistics of a list of call durations.
+  # @param NAME The name the statistics are computed for.
+  # @param DURATIONS List of call durations in milliseconds.
+  def compute_statistics(self, NAME, DURATIONS):
+
+    _frames = max(1, min(self.frame_count, self.window_frames))
+    _durations = sorted(DURATIONS)
+    _total = sum(_durations)
+
+    _histogram = [0 for _i in range(len(FrameProfiler.histogram_bounds) + 1)]
+
+    for _duration in _durations:
+
+      _bucket = 0
+
+      while _bucket < len(FrameProfiler.histogram_bounds) and _duration > FrameProfiler.histogram_bounds[_bucket]:
+        _bucket += 1
+
+      _histogram[_bucket] += 1
+
+    return { "name" : NAME
+           , "calls_per_frame" : len(_durations) / _frames
+           , "ms_per_frame" : _total / _frames
+           , "mean_ms" : _total / len(_durations)
+           , "p95_ms" : _durations[int(len(_durations) * 0.95)]
+           , "max_ms" : _durations[-1]
+           , "budget_percent" : _total / _frames / FrameProfiler.frame_budget * 100.0
+           , "histogram" : _histogram }
+
+  ## Returns the statistics over the window as tuple of a list per class and a list per instance, both sorted by time per frame.
+  def get_statistics(self):
+
+    _class_durations = collections.OrderedDict()
+    _instance_statistics = []
+
+    for _label, _class_label, _window in list(self.samples.values()):
+
+      _durations = [_sample[1] for _sample in _window if _sample[0] > self.frame_count - self.window_frames]
+
+      if len(_durations) == 0:
+        continue
+
+      _instance_statistics.append(self.compute_statistics(_label, _durations))
+      _class_durations.setdefault(_class_label, []).extend(_durations)
+
+    _class_statistics = [self.compute_statistics(_class_label, _durations) for _class_label, _durations in _class_durations.items()]
+
+    _class_statistics.sort(key = lambda _entry: _entry["ms_per_frame"], reverse = True)
+    _instance_statistics.sort(key = lambda _entry: _entry["ms_per_frame"], reverse = True)
+
+    return (_class_statistics, _instance_statistics)
+
+  ## Prints the statistics on the console. To be called from the GuaVE shell.
+  # @param INSTANCES Boolean saying if the statistics per instance are to be printed as well.
+  # @param NUM_ROWS Maximum number of rows per table.
+  def dump(self, INSTANCES = False, NUM_ROWS = 25):
+
+    _class_statistics, _instance_statistics = self.get_statistics()
+
+    print_headline("Frame profile of the last " + str(min(self.frame_count, self.window_frames)) + " frames (budget " + \
+                   str(round(FrameProfiler.frame_budget, 2)) + " ms)")
+
+    _bucket_names = ["<=" + str(_bound) for _bound in FrameProfiler.histogram_bounds] + [">" + str(FrameProfiler.histogram_bounds[-1])]
+    print("histogram buckets in ms: " + " ".join(_bucket_names) + "\n")
+
+    _tables = [("per class", _class_statistics)]
+
+    if INSTANCES:
+      _tables.append( ("per instance", _instance_statistics) )
+
+    for _title, _statistics in _tables:
+
+      print_subheadline("{0:<52} {1:>8} {2:>9} {3:>8} {4:>8} {5:>7}  {6}".format(_title, "calls/fr", "ms/frame", "p95 ms", "max ms", "budget", "histogram"))
+
+      for _entry in _statistics[:NUM_ROWS]:
+        print("{0:<52} {1:>8.2f} {2:>9.3f} {3:>8.3f} {4:>8.3f} {5:>6.1f}%  {6}".format( _entry["name"]
+                                                                                      , _entry["calls_per_frame"]
+                                                                                      , _entry["ms_per_frame"]
+                                                                                      , _entry["p95_ms"]
+                                                                                      , _entry["max_ms"]
+                                                                                      , _entry["budget_percent"]
+                                                                                      , " ".join(str(_count) for _count in _entry["histogram"])))
+
+      _total = sum(_entry["ms_per_frame"] for _entry in _statistics)
+      print("{0:<52} {1:>8} {2:>9.3f} {3:>8} {4:>8} {5:>6.1f}%\n".format("total", "", _total, "", "", _total / FrameProfiler.frame_budget * 100.0))
+
+  ## Writes the statistics to a file.
+  # @param FILENAME Path of the file to be written. Written as JSON if ending on .json, otherwise as CSV.
+  def write(self, FILENAME):
+
+    _class_statistics, _instance_statistics = self.get_statistics()
+    _temporary_filename = FILENAME + ".tmp"
+
+    try:
+      with open(_temporary_filename, "w") as _file:
+
+        if FILENAME.endswith(".json"):
+          json.dump( { "time" : time.time()
+                     , "frame" : self.frame_count
+                     , "window_frames" : min(self.frame_count, self.window_frames)
+                     , "frame_budget_ms" : FrameProfiler.frame_budget
+                     , "histogram_bounds_ms" : FrameProfiler.histogram_bounds
+                     , "classes" : _class_statistics
+                     , "instances" : _instance_statistics }
+                   , _file
+                   , indent = 2)
+
+        else:
+          _writer = csv.writer(_file)
+          _writer.writerow( ["scope", "name", "calls_per_frame", "ms_per_frame", "mean_ms", "p95_ms", "max_ms", "budget_percent"] + \
+                            ["hist_le_" + str(_bound) for _bound in FrameProfiler.histogram_bounds] + \
+                            ["hist_gt_" + str(FrameProfiler.histogram_bounds[-1])] )
+
+          for _scope, _statistics in [("class", _class_statistics), ("instance", _instance_statistics)]:
+            for _entry in _statistics:
+              _writer.writerow( [ _scope
+                                , _entry["name"]
+                                , round(_entry["calls_per_frame"], 3)
+                                , round(_entry["ms_per_frame"], 4)
+                                , round(_entry["mean_ms"], 4)
+                                , round(_entry["p95_ms"], 4)
+                                , round(_entry["max_ms"], 4)
+                                , round(_entry["budget_percent"], 2) ] + _entry["histogram"] )
+
+      os.replace(_temporary_filename, FILENAME)
+
+    except IOError as _error:
+      print_warning("Could not write frame profile to " + FILENAME + ": " + str(_error))
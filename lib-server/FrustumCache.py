@@ -0,0 +1,211 @@
+#!/usr/bin/python
+
+## @file
+# Contains class FrustumCache.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+
+# import framework libraries
+from SceneManager import *
+
+# import python libraries
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+
+## Computes the viewing frustum planes of the users' screens at most once per frame and
+# tests points against them. Frustum planes are cached per pair of UserRepresentation and
+# screen node and discarded at the beginning of every frame.
+class FrustumCache:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  def my_constructor(self):
+
+    ## @var screen_planes
+    # Dictionary mapping (UserRepresentation, screen node) pairs to the list of the six
+    # frustum planes (nx, ny, nz, d) computed for them in the current frame.
+    self.screen_planes = {}
+
+    ## @var user_planes
+    # Dictionary mapping UserRepresentation instances to the frustum planes of all their screens,
+    # stacked in a single array of shape (screens, 6, 4) if numpy is available.
+    self.user_planes = {}
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+
+  ## Returns the frustum planes of a user's screen, computing them if not done in this frame yet.
+  # @param USER_REPRESENTATION The UserRepresentation to whose head the frustum belongs.
+  # @param SCREEN The screen node to create the viewing frustum for.
+  def get_screen_planes(self, USER_REPRESENTATION, SCREEN):
+
+    _key = (USER_REPRESENTATION, SCREEN)
+
+    try:
+      return self.screen_planes[_key]
+    except KeyError:
+      pass
+
+    _planes = FrustumCache.compute_frustum_planes(USER_REPRESENTATION.head.WorldTransform.value
+                                                , USER_REPRESENTATION.view_transform_node.Transform.value
+                                                , SCREEN)
+    self.screen_planes[_key] = _planes
+    return _planes
+
+  ## Returns the frustum planes of all screens of a user, stacked for a vectorized test if numpy is available.
+  # @param USER_REPRESENTATION The UserRepresentation to retrieve the frustum planes for.
+  def get_user_planes(self, USER_REPRESENTATION):
+
+    try:
+      return self.user_planes[USER_REPRESENTATION]
+    except KeyError:
+      pass
+
+    _planes = [self.get_screen_planes(USER_REPRESENTATION, _screen) for _screen in USER_REPRESENTATION.screens]
+
+    if numpy != None:
+      _planes = numpy.array(_planes, dtype = numpy.float64).reshape(len(_planes), 6, 4)
+
+    self.user_planes[USER_REPRESENTATION] = _planes
+    return _planes
+
+  ## Checks if a point is inside the viewing frustum of a user's screen.
+  # @param POINT The point in world coordinates to be checked.
+  # @param USER_REPRESENTATION The UserRepresentation to whose head the frustum belongs.
+  # @param SCREEN The screen node to create the viewing frustum for.
+  def is_inside_frustum(self, POINT, USER_REPRESENTATION, SCREEN):
+
+    for _nx, _ny, _nz, _d in self.get_screen_planes(USER_REPRESENTATION, SCREEN):
+
+      if (_nx * POINT.x + _ny * POINT.y + _nz * POINT.z + _d) < 0:
+        return False
+
+    return True
+
+  ## Checks for a list of points if they are visible on one of a user's screens.
+  # Returns a list of booleans, one per point.
+  # @param POINTS List of points in world coordinates to be checked.
+  # @param USER_REPRESENTATION The UserRepresentation whose screens are considered.
+  def are_visible_for(self, POINTS, USER_REPRESENTATION):
+
+    if len(POINTS) == 0 or len(USER_REPRESENTATION.screens) == 0:
+      return [False] * len(POINTS)
+
+    _planes = self.get_user_planes(USER_REPRESENTATION)
+
+    if numpy != None:
+      _points = numpy.array([(_point.x, _point.y, _point.z, 1.0) for _point in POINTS], dtype = numpy.float64)
+
+      # signed distances of shape (screens, 6, points)
+      _distances = numpy.dot(_planes, _points.T)
+      return numpy.all(_distances >= 0.0, axis = 1).any(axis = 0).tolist()
+
+    _visibilities = []
+
+    for _point in POINTS:
+
+      _visible = False
+
+      for _screen_planes in _planes:
+
+        for _nx, _ny, _nz, _d in _screen_planes:
+
+          if (_nx * _point.x + _ny * _point.y + _nz * _point.z + _d) < 0:
+            break
+
+        else:
+          _visible = True
+          break
+
+      _visibilities.append(_visible)
+
+    return _visibilities
+
+  ## Computes the six planes of the viewing frustum spanned by a user's head and a screen.
+  # Returns a list of (nx, ny, nz, d) tuples for the near, far, left, right, top and bottom plane.
+  # @param USER_HEAD_WORLD_MAT The user's headtracking matrix in world coordinates.
+  # @param USER_NAV_WORLD_MAT The user's navigation matrix in world coordinates.
+  # @param SCREEN The screen to create the viewing frustum for.
+  @staticmethod
+  def compute_frustum_planes(USER_HEAD_WORLD_MAT, USER_NAV_WORLD_MAT, SCREEN):
+
+    _near_clip = SceneManager.current_near_clip
+    _far_clip = SceneManager.current_far_clip
+
+    # compute screen corner points
+    _screen_mat = SCREEN.WorldTransform.value
+    _half_width = SCREEN.Width.value * 0.5
+    _half_height = SCREEN.Height.value * 0.5
+
+    _corners = [ avango.gua.Vec3(-_half_width, _half_height, 0.0)     # top left
+               , avango.gua.Vec3(_half_width, _half_height, 0.0)      # top right
+               , avango.gua.Vec3(-_half_width, -_half_height, 0.0)    # bottom left
+               , avango.gua.Vec3(_half_width, -_half_height, 0.0) ]   # bottom right
+
+    # transform head matrix and corner points in screen coordinate system
+    _head_abs_mat = avango.gua.make_trans_mat(USER_HEAD_WORLD_MAT.get_translate()) * \
+                    avango.gua.make_rot_mat(USER_NAV_WORLD_MAT.get_rotate_scale_corrected()) * \
+                    avango.gua.make_rot_mat(SCREEN.Transform.value.get_rotate())
+    _screen_to_head_mat = avango.gua.make_inverse_mat(_head_abs_mat) * _screen_mat
+
+    _corners_in_head_space = []
+
+    for _corner in _corners:
+      _pos = _screen_to_head_mat * _corner
+      _corners_in_head_space.append(avango.gua.Vec3(_pos.x, _pos.y, _pos.z))
+
+    _head_to_screen_distance = abs(_corners_in_head_space[0].z)
+
+    # compute scaling factors for corner vectors
+    if _head_to_screen_distance == 0.0:
+      _head_to_screen_distance = 0.001
+
+    _near_world_positions = []
+    _far_world_positions = []
+
+    for _pos in _corners_in_head_space:
+
+      _near_plane_scale_factor = (_pos.length() * _near_clip) / _head_to_screen_distance
+      _far_plane_scale_factor = (_pos.length() * _far_clip) / _head_to_screen_distance
+      _pos.normalize()
+
+      _near_world_pos = _head_abs_mat * (_pos * _near_plane_scale_factor)
+      _far_world_pos = _head_abs_mat * (_pos * _far_plane_scale_factor)
+      _near_world_positions.append(avango.gua.Vec3(_near_world_pos.x, _near_world_pos.y, _near_world_pos.z))
+      _far_world_positions.append(avango.gua.Vec3(_far_world_pos.x, _far_world_pos.y, _far_world_pos.z))
+
+    _tl_near, _tr_near, _bl_near, _br_near = _near_world_positions
+    _tl_far, _tr_far, _bl_far, _br_far = _far_world_positions
+
+    # each plane is spanned by two edge vectors and passes through a support point
+    _plane_definitions = [ (_bl_near - _br_near, _tl_near - _bl_near, _br_near)   # near plane
+                         , (_br_far - _bl_far, _tr_far - _br_far, _bl_far)        # far plane
+                         , (_bl_far - _bl_near, _tl_far - _bl_far, _bl_near)      # left plane
+                         , (_br_near - _br_far, _tr_near - _br_near, _br_far)     # right plane
+                         , (_tr_near - _tr_far, _tl_near - _tr_near, _tr_far)     # top plane
+                         , (_bl_near - _bl_far, _br_near - _bl_near, _bl_far) ]   # bottom plane
+
+    _frustum_planes = []
+
+    for _v1, _v2, _support_point in _plane_definitions:
+      _n = _v1.cross(_v2)
+      _n.normalize()
+      _frustum_planes.append( (_n.x, _n.y, _n.z, - _n.dot(_support_point)) )
+
+    return _frustum_planes
+
+  ## Evaluated every frame. Discards the frustum planes of the previous frame.
+  def frame_callback(self):
+
+    self.screen_planes = {}
+    self.user_planes = {}
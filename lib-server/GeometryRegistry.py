@@ -0,0 +1,82 @@
+#!/usr/bin/python
+
+## @file
+# Contains class GeometryRegistry.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from AssetCache import AssetCache
+
+
+## Registry of loaded geometry files whose nodes are instantiated repeatedly, e.g. for every user representation.
+#
+# Each combination of file, material and loader flags is loaded from disk only once. The loaded node serves as a
+# template which is never attached to a scenegraph. Instances are copies of the template's node hierarchy referring
+# to the same geometry and material, so the mesh is stored once on the host and the GPU and only the transformations
+# and group names are per instance. Modifications of the geometry itself affect all instances.
+class GeometryRegistry:
+
+  ## @var loader
+  # TriMeshLoader used to load the templates. Created on first use.
+  loader = None
+
+  ## @var templates
+  # Dictionary mapping (filename, material, loader flags) tuples to the template nodes loaded for them.
+  templates = {}
+
+  ## @var num_instances
+  # Number of instances created so far.
+  num_instances = 0
+
+  ## Returns a new instance of a geometry. Loads the geometry if no instance of it was created before.
+  # @param NAME The name of the instance's root node.
+  # @param FILENAME Path to the object file to be loaded.
+  # @param MATERIAL Material string to be used for the geometry.
+  # @param FLAGS The loader flags to be used.
+  @staticmethod
+  def create_instance(NAME, FILENAME, MATERIAL, FLAGS):
+
+    _key = (FILENAME, MATERIAL, FLAGS)
+    _template = GeometryRegistry.templates.get(_key)
+
+    if _template == None:
+
+      if GeometryRegistry.loader == None:
+        GeometryRegistry.loader = avango.gua.nodes.TriMeshLoader()
+
+      _template = GeometryRegistry.loader.create_geometry_from_file(NAME, AssetCache.get_geometry_path(FILENAME), MATERIAL, FLAGS)
+      GeometryRegistry.templates[_key] = _template
+
+    GeometryRegistry.num_instances += 1
+
+    _instance = GeometryRegistry.copy_node(_template)
+    _instance.Name.value = NAME
+
+    return _instance
+
+  ## Returns a copy of a template node hierarchy sharing its geometries and materials.
+  # @param TEMPLATE_NODE The root node of the hierarchy to be copied.
+  @staticmethod
+  def copy_node(TEMPLATE_NODE):
+
+    if TEMPLATE_NODE.get_type() == "av::gua::TriMeshNode":
+      _node = avango.gua.nodes.TriMeshNode( Name = TEMPLATE_NODE.Name.value
+                                          , Geometry = TEMPLATE_NODE.Geometry.value
+                                          , Material = TEMPLATE_NODE.Material.value
+                                          , Transform = TEMPLATE_NODE.Transform.value )
+    else:
+      _node = avango.gua.nodes.TransformNode( Name = TEMPLATE_NODE.Name.value
+                                            , Transform = TEMPLATE_NODE.Transform.value )
+
+    for _child in TEMPLATE_NODE.Children.value:
+      _node.Children.value.append(GeometryRegistry.copy_node(_child))
+
+    return _node
+
+  ## Returns the number of loaded geometries and the number of instances created from them.
+  @staticmethod
+  def get_statistics():
+    return (len(GeometryRegistry.templates), GeometryRegistry.num_instances)
@@ -11,6 +11,7 @@ from   avango.script import field_has_changed
 
 # import framework libraries
 from Intersection import *
+import Utilities
 from scene_config import scenegraphs
 
 # import python libraries
@@ -22,6 +23,9 @@ import math
 # respect to gravity using the scenegraph. Therefore, a ray
 # is shot from a specific start height downwards and the intersection
 # point is compared to the position of the device belonging to the platform.
+# The distance to the ground is only determined again when the start of
+# the ray moved beyond a tolerance. If a HeightField is set, it answers
+# the queries it can instead of a scenegraph ray test.
 
 class GroundFollowing(avango.script.Script):
 
@@ -106,6 +110,30 @@ class GroundFollowing(avango.script.Script):
     # Starting height of the ground following ray.
     self.ray_start_height = RAY_START_HEIGHT
 
+    ## @var coherence_tolerance
+    # Distance in meters the start of the ground following ray may move before the distance to the ground is determined again.
+    self.coherence_tolerance = 0.01
+
+    ## @var coherence_max_frames
+    # Maximum number of frames the last determined ground height is reused, so that moving scene geometry is still noticed.
+    self.coherence_max_frames = 30
+
+    ## @var coherent_frames
+    # Number of frames the last determined ground height has been reused.
+    self.coherent_frames = 0
+
+    ## @var last_gf_start_pos
+    # Start position of the ground following ray when the ground height was determined the last time. None if it must be determined.
+    self.last_gf_start_pos = None
+
+    ## @var last_ground_height
+    # World y coordinate of the ground found below last_gf_start_pos. None if no ground was found.
+    self.last_ground_height = None
+
+    ## @var height_field
+    # HeightField instance answering ground height queries without a ray test. None if not used.
+    self.height_field = None
+
     # initialize shoot and output matrices
     self.sf_abs_output_mat.value = self.sf_abs_input_mat.value
 
@@ -121,6 +149,9 @@ class GroundFollowing(avango.script.Script):
     self.ground_intersection.my_constructor(self.SCENEGRAPH, self.sf_gf_start_mat, self.ground_pick_length, "gf_pick_group")
     self.mf_ground_pick_result.connect_from(self.ground_intersection.mf_pick_result)
 
+    # ray tests are triggered by get_ground_distance only
+    self.ground_intersection.activate(False)
+
 
   ## Evaluated every frame.
   def evaluate(self):
@@ -139,14 +170,11 @@ class GroundFollowing(avango.script.Script):
       _gf_start_pos = avango.gua.Vec3(_gf_start_pos.x, _gf_start_pos.y, _gf_start_pos.z)
       self.sf_gf_start_mat.value = avango.gua.make_trans_mat(_gf_start_pos) * self.ground_pick_direction_mat
 
-      if len(self.mf_ground_pick_result.value) > 0: # an intersection with the ground was found
+      _distance_to_ground = self.get_ground_distance(_gf_start_pos)
 
-        # get first intersection target
-        _pick_result = self.mf_ground_pick_result.value[0]             
-        #print _pick_result.Object.value, _pick_result.Object.value.Name.value
+      if _distance_to_ground != None: # an intersection with the ground was found
 
         # compare distance to ground and ray_start_height
-        _distance_to_ground = _pick_result.Distance.value * self.ground_pick_length
         _difference = _distance_to_ground - (self.ray_start_height * self.sf_scale.value)
         _difference = round(_difference, 3)
 
@@ -193,6 +221,52 @@ class GroundFollowing(avango.script.Script):
       self.sf_abs_output_mat.value = self.sf_abs_input_mat.value            # ground following is deactivated
 
 
+  ## Returns the distance from the start of the ground following ray to the ground or None if no ground was found.
+  # Reuses the last determined ground height as long as the ray start stays within the coherence tolerance.
+  # @param GF_START_POS Start position of the ground following ray in world coordinates.
+  def get_ground_distance(self, GF_START_POS):
+
+    if self.last_gf_start_pos != None and \
+       self.coherent_frames < self.coherence_max_frames and \
+       Utilities.euclidean_distance(GF_START_POS, self.last_gf_start_pos) <= self.coherence_tolerance:
+
+      self.coherent_frames += 1
+
+      if self.last_ground_height == None:
+        return None
+
+      return GF_START_POS.y - self.last_ground_height
+
+    _ground_height = None
+
+    if self.height_field != None:
+      _ground_height = self.height_field.get_ground_height(GF_START_POS)
+
+      if _ground_height != None and GF_START_POS.y - _ground_height > self.ground_pick_length:
+        _ground_height = None
+
+    if _ground_height == None:
+
+      self.ground_intersection.compute_pick_result()
+
+      if len(self.mf_ground_pick_result.value) > 0:
+        _ground_height = GF_START_POS.y - self.mf_ground_pick_result.value[0].Distance.value * self.ground_pick_length
+
+    self.last_gf_start_pos = GF_START_POS
+    self.last_ground_height = _ground_height
+    self.coherent_frames = 0
+
+    if _ground_height == None:
+      return None
+
+    return GF_START_POS.y - _ground_height
+
+  ## Sets the HeightField instance to be used for ground height queries.
+  # @param HEIGHT_FIELD The HeightField instance or None if only ray tests are to be used.
+  def set_height_field(self, HEIGHT_FIELD):
+    self.height_field = HEIGHT_FIELD
+    self.last_gf_start_pos = None
+
   ## Sets the pick_direction attribute.
   # @param PICK_DIRECTION New pick direction.
   def set_pick_direction(self, PICK_DIRECTION):
@@ -209,9 +283,8 @@ class GroundFollowing(avango.script.Script):
   ## Activates the ground following algorithm.
   def activate(self):
     self.activated = True
-    self.ground_intersection.activate(True)
+    self.last_gf_start_pos = None
 
   ## Deactivates the ground following algorithm. The input matrix is just passed through after calling this method.
   def deactivate(self):
     self.activated = False
-    self.ground_intersection.activate(False)
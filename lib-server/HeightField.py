@@ -0,0 +1,189 @@
+#!/usr/bin/python
+
+## @file
+# Contains class HeightField.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from PickService import PickService
+
+# import python libraries
+import math
+
+## Precomputed grid of surface heights of the ground following geometry of a scene.
+#
+# At each grid vertex and cell center, a single vertical ray test collects the heights of all surfaces below
+# the top of the sampled region. Ground heights are queried by choosing the highest surface below the query
+# position at the four surrounding vertices and interpolating between them. The interpolation is only trusted
+# if it matches the sample at the cell center, otherwise an edge of the geometry passes the cell. Queries outside
+# the grid or at such edges are not answered and have to be resolved by a ray test.
+# The scene geometry is assumed to be static while the height field is in use.
+class HeightField:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param SCENEGRAPH The scenegraph to sample the surface heights from.
+  # @param PICK_MASK Picking mask of the geometry to be sampled.
+  # @param BB_MIN Minimum corner of the region to be sampled in world coordinates.
+  # @param BB_MAX Maximum corner of the region to be sampled in world coordinates.
+  # @param CELL_SIZE Horizontal distance between two neighboring grid vertices in meters.
+  def my_constructor(self, SCENEGRAPH, PICK_MASK, BB_MIN, BB_MAX, CELL_SIZE):
+
+    ## @var SCENEGRAPH
+    # Reference to the scenegraph the surface heights are sampled from.
+    self.SCENEGRAPH = SCENEGRAPH
+
+    ## @var pick_mask
+    # Picking mask of the geometry to be sampled.
+    self.pick_mask = PICK_MASK
+
+    ## @var cell_size
+    # Horizontal distance between two neighboring grid vertices in meters.
+    self.cell_size = CELL_SIZE
+
+    ## @var max_step_height
+    # Maximum height difference in meters between the four vertices around a query position to interpolate in between.
+    # Larger differences indicate a step or an edge of the geometry, queries at such positions are not answered.
+    self.max_step_height = 0.2
+
+    ## @var max_error
+    # Maximum difference in meters between the interpolated and the sampled height at a cell center to interpolate within the cell.
+    self.max_error = 0.01
+
+    ## @var origin_x
+    # World x coordinate of the first grid vertex.
+    self.origin_x = BB_MIN.x
+
+    ## @var origin_z
+    # World z coordinate of the first grid vertex.
+    self.origin_z = BB_MIN.z
+
+    ## @var num_x
+    # Number of grid vertices along the x axis.
+    self.num_x = int(math.ceil((BB_MAX.x - BB_MIN.x) / CELL_SIZE)) + 1
+
+    ## @var num_z
+    # Number of grid vertices along the z axis.
+    self.num_z = int(math.ceil((BB_MAX.z - BB_MIN.z) / CELL_SIZE)) + 1
+
+    ## @var ray_start_height
+    # World y coordinate the sampling rays start from.
+    self.ray_start_height = BB_MAX.y + 1.0
+
+    ## @var ray_length
+    # Length of the sampling rays in meters.
+    self.ray_length = BB_MAX.y - BB_MIN.y + 2.0
+
+    ## @var samples
+    # List of all grid vertices in row-major order, each being a list of surface heights in descending order.
+    self.samples = []
+
+    ## @var center_samples
+    # List of all cell centers in row-major order, each being a list of surface heights in descending order.
+    self.center_samples = []
+
+    ## @var picking_options
+    # Picking options for the sampling ray tests. All surfaces along the ray are collected.
+    self.picking_options = avango.gua.PickingOptions.GET_POSITIONS \
+                         | avango.gua.PickingOptions.GET_WORLD_POSITIONS
+
+    self.sample_all()
+
+  ## Samples the surface heights at all grid vertices and cell centers.
+  def sample_all(self):
+
+    self.SCENEGRAPH.update_cache()
+
+    _ray_direction_mat = avango.gua.make_rot_mat(-90.0, 1.0, 0.0, 0.0) * \
+                         avango.gua.make_scale_mat(1.0, 1.0, self.ray_length)
+
+    # request all sampling rays first to have them tested in one batch
+    _pick_service = PickService.get_service(self.SCENEGRAPH)
+    _vertex_keys = []
+    _center_keys = []
+
+    for _iz in range(self.num_z):
+      for _ix in range(self.num_x):
+        _vertex_keys.append(self.request_sample(_pick_service, self.origin_x + _ix * self.cell_size, self.origin_z + _iz * self.cell_size, _ray_direction_mat))
+
+    for _iz in range(self.num_z - 1):
+      for _ix in range(self.num_x - 1):
+        _center_keys.append(self.request_sample(_pick_service, self.origin_x + (_ix + 0.5) * self.cell_size, self.origin_z + (_iz + 0.5) * self.cell_size, _ray_direction_mat))
+
+    self.samples = [self.get_sample(_pick_service, _key) for _key in _vertex_keys]
+    self.center_samples = [self.get_sample(_pick_service, _key) for _key in _center_keys]
+
+  ## Requests the sampling ray test at a horizontal position and returns the request key.
+  # @param PICK_SERVICE The PickService instance to request the ray test from.
+  # @param X World x coordinate of the position.
+  # @param Z World z coordinate of the position.
+  # @param RAY_DIRECTION_MAT Matrix rotating and scaling the sampling ray to point downwards over the whole sampled region.
+  def request_sample(self, PICK_SERVICE, X, Z, RAY_DIRECTION_MAT):
+    return PICK_SERVICE.request(avango.gua.make_trans_mat(X, self.ray_start_height, Z) * RAY_DIRECTION_MAT, self.picking_options, self.pick_mask)
+
+  ## Returns the heights of all surfaces hit by a sampling ray in descending order.
+  # @param PICK_SERVICE The PickService instance the ray test was requested from.
+  # @param KEY The request key of the sampling ray.
+  def get_sample(self, PICK_SERVICE, KEY):
+    return sorted([_result.WorldPosition.value.y for _result in PICK_SERVICE.get_result(KEY)], reverse = True)
+
+  ## Returns the highest of the given surface heights which is not above a height or None if there is none.
+  # @param HEIGHTS List of surface heights in descending order.
+  # @param MAX_HEIGHT The height not to be exceeded.
+  def get_surface_below(self, HEIGHTS, MAX_HEIGHT):
+
+    for _height in HEIGHTS:
+
+      if _height <= MAX_HEIGHT:
+        return _height
+
+    return None
+
+  ## Returns the height of the ground below a position or None if the height field cannot answer the query.
+  # @param POS The position in world coordinates to look for the ground below.
+  def get_ground_height(self, POS):
+
+    _fx = (POS.x - self.origin_x) / self.cell_size
+    _fz = (POS.z - self.origin_z) / self.cell_size
+    _ix = int(math.floor(_fx))
+    _iz = int(math.floor(_fz))
+
+    if _ix < 0 or _iz < 0 or _ix >= self.num_x - 1 or _iz >= self.num_z - 1:
+      return None
+
+    _corner_heights = []
+
+    for _index in [ _iz * self.num_x + _ix
+                  , _iz * self.num_x + _ix + 1
+                  , (_iz + 1) * self.num_x + _ix
+                  , (_iz + 1) * self.num_x + _ix + 1 ]:
+
+      _height = self.get_surface_below(self.samples[_index], POS.y)
+
+      if _height == None:
+        return None
+
+      _corner_heights.append(_height)
+
+    if max(_corner_heights) - min(_corner_heights) > self.max_step_height:
+      return None
+
+    # check the interpolation at the cell center against the sampled height
+    _center_height = self.get_surface_below(self.center_samples[_iz * (self.num_x - 1) + _ix], POS.y)
+
+    if _center_height == None or abs(sum(_corner_heights) * 0.25 - _center_height) > self.max_error:
+      return None
+
+    # bilinear interpolation between the four vertices
+    _tx = _fx - _ix
+    _tz = _fz - _iz
+    _height_z0 = _corner_heights[0] + (_corner_heights[1] - _corner_heights[0]) * _tx
+    _height_z1 = _corner_heights[2] + (_corner_heights[3] - _corner_heights[2]) * _tx
+
+    return _height_z0 + (_height_z1 - _height_z0) * _tz
@@ -0,0 +1,501 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes InputLog, InputRecorder and InputReplayer.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+
+# import framework libraries
+from TrackingReader import TrackingTargetReader
+from ConsoleIO import *
+
+# import python libraries
+import re
+import struct
+import time
+
+
+## Binary log format of the tracking and device inputs of a session.
+#
+# A log starts with a header holding the magic bytes, the format version and the channel table. Each channel is
+# stored with its kind and name. Tracking channels carry the sensor matrix of one TrackingStation before any
+# prediction, i.e. as delivered by the daemon with the station's offsets applied, device channels the
+# degrees of freedom and trigger states of the device of one navigation and button channels the button fields of
+# a tool reading a device station. The header is followed by one record per frame: the timestamp in seconds since
+# the start of the recording and the values of all channels in table order, each with the fixed width of its kind.
+# All values are little endian.
+class InputLog:
+
+  ## @var magic
+  # Bytes identifying an input log file.
+  magic = b"NVFINPUT"
+
+  ## @var version
+  # Version of the log format. To be increased whenever the layout changes.
+  version = 2
+
+  ## @var header_struct
+  # Layout of the header before the channel table: magic bytes, version and number of channels.
+  header_struct = struct.Struct("<8sHH")
+
+  ## @var channel_struct
+  # Layout of a channel table entry before its name: channel kind and length of the UTF-8 encoded name.
+  channel_struct = struct.Struct("<BH")
+
+  ## @var TRACKING
+  # Channel kind of a tracking station: the 16 matrix elements in row-major order.
+  TRACKING = 0
+
+  ## @var DEVICE
+  # Channel kind of a MultiDofDevice: the 7 degrees of freedom and a bitmask of the reset, coupling and dof triggers.
+  DEVICE = 1
+
+  ## @var BUTTONS
+  # Channel kind of the button fields of a tool: a bitmask of up to 32 buttons in the order of their field names.
+  BUTTONS = 2
+
+  ## @var channel_formats
+  # Dictionary mapping channel kinds to the struct formats of their values in a frame record.
+  channel_formats = { TRACKING : "16f"
+                    , DEVICE : "7fB"
+                    , BUTTONS : "I" }
+
+  ## Returns the list of (kind, name, objects) tuples of all recordable inputs of a list of workspaces, in a stable order.
+  # For tracking channels, the object list contains a TrackingStation. Tracking channels are named by the target name,
+  # further TrackingStation instances of the same target with other offsets get the suffix #2, #3 and so on in the order
+  # of their readers. For device channels, the object list contains the MultiDofDevice instance of a navigation. For
+  # button channels, the objects are the button fields of a tool, i.e. its fields named sf_*button or sf_*buttonN, sorted by name.
+  # @param WORKSPACES List of the Workspace instances to collect the inputs of.
+  @staticmethod
+  def get_channels(WORKSPACES):
+
+    _channels = []
+    _tracking_stations = []
+    _num_stations_per_target = {}
+    _devices = []
+
+    for _workspace in WORKSPACES:
+
+      _readers = [_user.headtracking_reader for _user in _workspace.users] + \
+                 [_tool.tracking_reader for _tool in _workspace.tools]
+
+      for _tool in _workspace.tools:
+
+        if hasattr(_tool, "device_sensor"):
+          _button_fields = [getattr(_tool, _name) for _name in sorted(dir(_tool)) if re.match(r"sf_\w*button\d*$", _name)]
+          _channels.append( (InputLog.BUTTONS, _tool.device_sensor.Station.value, _button_fields[:32]) )
+
+      for _display_group in _workspace.display_groups:
+        for _navigation_id, _navigation in enumerate(_display_group.navigations):
+
+          _device = getattr(_navigation, "device", None)
+
+          if _device == None or _device in _devices:
+            continue
+
+          _devices.append(_device)
+          _channels.append( (InputLog.DEVICE, "w" + str(_workspace.id) + "_dg" + str(_display_group.id) + "_nav" + str(_navigation_id), [_device]) )
+          _readers.append(_device.tracking_reader)
+
+      for _reader in _readers:
+
+        if not isinstance(_reader, TrackingTargetReader) or _reader.tracking_station == None:
+          continue
+
+        _station = _reader.tracking_station
+
+        if _station in _tracking_stations:
+          continue
+
+        _tracking_stations.append(_station)
+
+        _num_stations = _num_stations_per_target.get(_reader.target_name, 0) + 1
+        _num_stations_per_target[_reader.target_name] = _num_stations
+
+        if _num_stations == 1:
+          _channels.append( (InputLog.TRACKING, _reader.target_name, [_station]) )
+        else:
+          _channels.append( (InputLog.TRACKING, _reader.target_name + "#" + str(_num_stations), [_station]) )
+
+    return _channels
+
+  ## Returns the struct of a frame record for a list of channel kinds.
+  # @param KINDS List of the channel kinds in table order.
+  @staticmethod
+  def get_record_struct(KINDS):
+    return struct.Struct("<d" + "".join([InputLog.channel_formats[_kind] for _kind in KINDS]))
+
+  ## Writes the header of a log.
+  # @param FILE The file opened in binary mode.
+  # @param CHANNELS List of (kind, name, objects) tuples as returned by get_channels.
+  @staticmethod
+  def write_header(FILE, CHANNELS):
+
+    FILE.write(InputLog.header_struct.pack(InputLog.magic, InputLog.version, len(CHANNELS)))
+
+    for _kind, _name, _objects in CHANNELS:
+
+      _encoded_name = _name.encode("utf-8")
+      FILE.write(InputLog.channel_struct.pack(_kind, len(_encoded_name)))
+      FILE.write(_encoded_name)
+
+  ## Reads the header of a log and returns the list of its (kind, name) channel tuples. Raises a ValueError if the file is not a log of this version.
+  # @param FILE The file opened in binary mode.
+  @staticmethod
+  def read_header(FILE):
+
+    _magic, _version, _num_channels = InputLog.header_struct.unpack(InputLog.read_exactly(FILE, InputLog.header_struct.size))
+
+    if _magic != InputLog.magic:
+      raise ValueError("not an input log")
+
+    if _version != InputLog.version:
+      raise ValueError("input log version " + str(_version) + " is not supported")
+
+    _channels = []
+
+    for _i in range(_num_channels):
+
+      _kind, _name_length = InputLog.channel_struct.unpack(InputLog.read_exactly(FILE, InputLog.channel_struct.size))
+
+      if _kind not in InputLog.channel_formats:
+        raise ValueError("unknown channel kind " + str(_kind))
+
+      _channels.append( (_kind, InputLog.read_exactly(FILE, _name_length).decode("utf-8")) )
+
+    return _channels
+
+  ## Reads a number of bytes from a file. Raises a ValueError if the file ends before.
+  # @param FILE The file opened in binary mode.
+  # @param SIZE The number of bytes to be read.
+  @staticmethod
+  def read_exactly(FILE, SIZE):
+
+    _bytes = FILE.read(SIZE)
+
+    if len(_bytes) != SIZE:
+      raise ValueError("unexpected end of input log")
+
+    return _bytes
+
+
+## Records the tracking and device inputs of all workspaces to an InputLog file, one record per frame.
+#
+# Inputs are tapped after the scripts reading them were evaluated: the sensor matrices of all TrackingStation instances,
+# the degrees of freedom and trigger states of the devices of all navigations and the button fields of all tools.
+# Recording can be started and stopped from the shell.
+class InputRecorder:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param WORKSPACES List of the Workspace instances whose inputs are to be recorded.
+  def my_constructor(self, WORKSPACES):
+
+    ## @var WORKSPACES
+    # List of the Workspace instances whose inputs are recorded.
+    self.WORKSPACES = WORKSPACES
+
+    ## @var file
+    # The log file being written. None if not recording.
+    self.file = None
+
+    ## @var channels
+    # List of (kind, name, objects) tuples of the recorded channels.
+    self.channels = []
+
+    ## @var record_struct
+    # Struct of the frame records.
+    self.record_struct = None
+
+    ## @var start_time
+    # Time at which the recording was started.
+    self.start_time = 0.0
+
+    ## @var num_frames
+    # Number of frames recorded so far.
+    self.num_frames = 0
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method while recording.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = False)
+
+  ## Starts recording to a file. A running recording is stopped before.
+  # @param FILENAME Path of the log file to be written.
+  def start(self, FILENAME):
+
+    self.stop()
+
+    self.channels = InputLog.get_channels(self.WORKSPACES)
+    self.record_struct = InputLog.get_record_struct([_channel[0] for _channel in self.channels])
+
+    self.file = open(FILENAME, "wb")
+    InputLog.write_header(self.file, self.channels)
+
+    self.start_time = time.time()
+    self.num_frames = 0
+    self.frame_trigger.Active.value = True
+
+    print_message("Recording " + str(len(self.channels)) + " input channels to " + FILENAME + ".")
+
+  ## Stops the recording and closes the file.
+  def stop(self):
+
+    self.frame_trigger.Active.value = False
+
+    if self.file != None:
+      self.file.close()
+      self.file = None
+      print_message("Recorded " + str(self.num_frames) + " frames.")
+
+  ## Evaluated every frame while recording. Writes a frame record.
+  def frame_callback(self):
+
+    _values = [time.time() - self.start_time]
+
+    for _kind, _name, _objects in self.channels:
+
+      if _kind == InputLog.TRACKING:
+        _mat = _objects[0].sf_tracking_mat.value
+        _values.extend([_mat.get_element(_row, _column) for _row in range(4) for _column in range(4)])
+
+      elif _kind == InputLog.DEVICE:
+        _device = _objects[0]
+        _values.extend(_device.mf_dof.value)
+        _values.append( int(_device.sf_reset_trigger.value) | \
+                        int(_device.sf_coupling_trigger.value) << 1 | \
+                        int(_device.sf_dof_trigger.value) << 2 )
+
+      else:
+        _values.append(sum([int(bool(_field.value)) << _i for _i, _field in enumerate(_objects)]))
+
+    self.file.write(self.record_struct.pack(*_values))
+    self.num_frames += 1
+
+
+## Replays an InputLog file instead of the live tracking and device inputs.
+#
+# While replaying, the TrackingStation instances of the recorded channels are detached from their device sensors
+# and supplied with the recorded sensor matrices, so their prediction is applied as for live values and all readers
+# of a station receive its matrices as before. The devices of the recorded navigations stop evaluating their sensors
+# and receive the recorded degrees of freedom and trigger states, and the button fields of the recorded tools are
+# disconnected from their sensors and set to the recorded states.
+# Channels are matched by name, so the log should be replayed with the workspace configuration it was recorded with.
+# Frame records are read from the file as needed.
+class InputReplayer:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param WORKSPACES List of the Workspace instances whose inputs are to be replaced.
+  def my_constructor(self, WORKSPACES):
+
+    ## @var WORKSPACES
+    # List of the Workspace instances whose inputs are replaced.
+    self.WORKSPACES = WORKSPACES
+
+    ## @var file
+    # The log file being replayed. None if not replaying.
+    self.file = None
+
+    ## @var data_start
+    # File position of the first frame record.
+    self.data_start = 0
+
+    ## @var targets
+    # List of the (kind, objects) tuples receiving the values of the channels in table order, objects None for channels not found.
+    self.targets = []
+
+    ## @var record_struct
+    # Struct of the frame records.
+    self.record_struct = None
+
+    ## @var speed
+    # Playback speed relative to the recording. 0 replays one record per frame.
+    self.speed = 1.0
+
+    ## @var loop
+    # Boolean saying if the replay restarts at the end of the log.
+    self.loop = False
+
+    ## @var start_time
+    # Time at which the replay of the first record was started.
+    self.start_time = 0.0
+
+    ## @var next_record
+    # Values of the next record to be replayed, None if the end of the log is reached.
+    self.next_record = None
+
+    ## @var num_frames
+    # Number of records replayed so far.
+    self.num_frames = 0
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method while replaying.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = False)
+
+  ## Starts replaying a log. A running replay is stopped before, but the inputs stay detached.
+  # @param FILENAME Path of the log file to be replayed.
+  # @param SPEED Playback speed relative to the recording, e.g. 2.0 for twice as fast. 0 replays one record per frame regardless of the timestamps.
+  # @param LOOP Boolean saying if the replay restarts at the end of the log.
+  def start(self, FILENAME, SPEED = 1.0, LOOP = False):
+
+    self.stop()
+
+    _file = open(FILENAME, "rb")
+
+    try:
+      _log_channels = InputLog.read_header(_file)
+
+    except ValueError as _error:
+      _file.close()
+      print_error("Cannot replay " + FILENAME + ": " + str(_error) + ".", False)
+      return
+
+    _channels = dict( ((_kind, _name), _objects) for _kind, _name, _objects in InputLog.get_channels(self.WORKSPACES))
+    self.targets = []
+
+    for _kind, _name in _log_channels:
+
+      _objects = _channels.pop( (_kind, _name), None)
+      self.targets.append( (_kind, _objects) )
+
+      if _objects == None:
+        print_warning("Input channel " + _name + " of the log does not exist in this configuration and is skipped.")
+
+      elif _kind == InputLog.TRACKING:
+        _objects[0].detach_sensor()
+
+      elif _kind == InputLog.DEVICE:
+        _objects[0].frame_trigger.Active.value = False
+
+      else:
+        for _field in _objects:
+          _field.disconnect()
+
+    for _kind, _name in _channels:
+      print_warning("Input channel " + _name + " is not contained in the log and keeps its live input.")
+
+    self.file = _file
+    self.data_start = _file.tell()
+    self.record_struct = InputLog.get_record_struct([_channel[0] for _channel in _log_channels])
+    self.speed = SPEED
+    self.loop = LOOP
+    self.num_frames = 0
+
+    self.rewind()
+    self.frame_trigger.Active.value = True
+
+    print_message("Replaying " + FILENAME + " with " + str(len(_log_channels)) + " input channels.")
+
+  ## Stops the replay and closes the file. The inputs keep the last replayed values.
+  def stop(self):
+
+    self.frame_trigger.Active.value = False
+
+    if self.file != None:
+      self.file.close()
+      self.file = None
+      print_message("Replayed " + str(self.num_frames) + " frames.")
+
+  ## Restarts the replay at the first record.
+  def rewind(self):
+
+    self.file.seek(self.data_start)
+    self.start_time = time.time()
+    self.next_record = self.read_record()
+
+  ## Returns the values of the next record in the file or None at the end of the log.
+  def read_record(self):
+
+    _bytes = self.file.read(self.record_struct.size)
+
+    if len(_bytes) < self.record_struct.size:
+      return None
+
+    return self.record_struct.unpack(_bytes)
+
+  ## Passes the values of a record to the inputs.
+  # @param RECORD The values of the record.
+  def apply_record(self, RECORD):
+
+    _index = 1
+
+    for _kind, _objects in self.targets:
+
+      if _kind == InputLog.TRACKING:
+
+        if _objects != None:
+
+          _mat = avango.gua.make_identity_mat()
+
+          for _i in range(16):
+            _mat.set_element(_i // 4, _i % 4, RECORD[_index + _i])
+
+          _objects[0].sf_tracking_mat.value = _mat
+
+        _index += 16
+
+      elif _kind == InputLog.DEVICE:
+
+        if _objects != None:
+
+          _device = _objects[0]
+          _triggers = RECORD[_index + 7]
+
+          _device.set_reset_trigger(bool(_triggers & 1))
+          _device.set_coupling_trigger(bool(_triggers & 2))
+          _device.set_dof_trigger(bool(_triggers & 4))
+          _device.mf_dof.value = list(RECORD[_index:_index + 7])
+
+        _index += 8
+
+      else:
+
+        if _objects != None:
+
+          for _i, _field in enumerate(_objects):
+
+            # only propagate changes, like the device sensors do
+            _value = bool(RECORD[_index] & (1 << _i))
+
+            if _field.value != _value:
+              _field.value = _value
+
+        _index += 1
+
+    self.num_frames += 1
+
+  ## Evaluated every frame while replaying. Applies the latest record due at the current playback time.
+  def frame_callback(self):
+
+    if self.next_record == None:
+
+      if self.loop and self.num_frames > 0:
+        self.rewind()
+      else:
+        self.stop()
+        return
+
+    if self.speed <= 0.0:
+      self.apply_record(self.next_record)
+      self.next_record = self.read_record()
+      return
+
+    # records between two frames are skipped, e.g. if the replay runs at a lower frame rate than the recording
+    _playback_time = (time.time() - self.start_time) * self.speed
+    _record = None
+
+    while self.next_record != None and self.next_record[0] <= _playback_time:
+      _record = self.next_record
+      self.next_record = self.read_record()
+
+    if _record != None:
+      self.apply_record(_record)
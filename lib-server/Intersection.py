@@ -8,6 +8,9 @@ import avango
 import avango.gua
 import avango.script
 
+# import framework libraries
+from PickService import PickService
+
 # import python libraries
 # ...
 
@@ -21,6 +24,10 @@ class Intersection(avango.script.Script):
   # Starting matrix of the ray to be analyzed.
   sf_pick_mat = avango.gua.SFMatrix4()
 
+  ## @var sf_pick_batch
+  # Number of the last framewise batch of the pick service, connected while the framewise evaluation is activated.
+  sf_pick_batch = avango.SFInt()
+
   # output fields
   ## @var mf_pick_result
   # Intersections of the ray with the objects in the scene.
@@ -49,11 +56,7 @@ class Intersection(avango.script.Script):
     ## @var activated
     # Indicates if the intersection computation is activated or not. In the last case,
     # nothing will be written in mf_pick_result.
-    self.activated = True
-  
-    ## @var ray
-    # The spatial ray to be analyzed.
-    self.ray = avango.gua.nodes.RayNode()
+    self.activated = False
   
     ## @var picking_options
     # Picking options for the intersection process.
@@ -71,28 +74,49 @@ class Intersection(avango.script.Script):
     # Picking mask of the intersection process.
     self.picking_mask = PICK_MASK
   
+    ## @var pick_service
+    # PickService instance testing the ray.
+    self.pick_service = PickService.get_service(SCENEGRAPH)
+
+    ## @var SF_PICK_MAT
+    # The field the starting matrix of the ray is connected from.
+    self.SF_PICK_MAT = SF_PICK_MAT
+
     # init field connections
     self.sf_pick_mat.connect_from(SF_PICK_MAT)
-  
-    self.always_evaluate(True)
-    
-  ## Evaluated every frame.
+
+    self.activate(True)
+
+  ## Evaluated after every framewise batch of the pick service. Takes over the pick result of the batch.
   def evaluate(self):
-  
+
     if self.activated == True:
-     
-      # set ray properties
-      self.ray.Transform.value =  self.sf_pick_mat.value * \
-                                  avango.gua.make_scale_mat(1.0, 1.0, self.pick_length)
-
-      #print self.pick_length, self.ray.Transform.value, self.ray.Transform.value.get_rotate()
-          
-      # compute picking results
-      _pick_result = self.SCENEGRAPH.ray_test(self.ray, self.picking_options, self.picking_mask)
-      self.mf_pick_result.value = _pick_result.value
-  
 
-  ## Activate/Deactivate the intersection procedure.
+      _pick_result = self.pick_service.get_standing_result(self)
+
+      if _pick_result != None:
+        self.mf_pick_result.value = _pick_result
+
+  ## Returns the matrix of the ray starting at a matrix, scaled to the length of the ray.
+  # @param PICK_MAT Starting matrix of the ray.
+  def get_ray_mat(self, PICK_MAT):
+    return PICK_MAT * avango.gua.make_scale_mat(1.0, 1.0, self.pick_length)
+
+  ## Intersects the ray at the current sf_pick_mat with the scene immediately and writes the result to mf_pick_result.
+  # Can be called directly by owners which deactivated the framewise evaluation.
+  def compute_pick_result(self):
+    self.mf_pick_result.value = self.pick_service.pick(self.get_ray_mat(self.sf_pick_mat.value), self.picking_options, self.picking_mask)
+
+  ## Activate/Deactivate the intersection procedure. Activated intersections are tested in the framewise batches of the pick service.
   def activate(self, FLAG):
+
+    if FLAG == self.activated:
+      return
+
     self.activated = FLAG
 
+    if FLAG:
+      self.pick_service.register(self, self.SF_PICK_MAT)
+    else:
+      self.pick_service.unregister(self)
+
@@ -127,19 +127,7 @@ class Navigation(VisibilityHandler1D):
   ## Triggers the correct GroupNames for the different DisplayGroups.
   def handle_correct_visibility_groups(self):
 
-    _trace_visible_for = []
-
-    for _user_repr in ApplicationManager.all_user_representations:
-
-      if self.visibility_list[_user_repr.DISPLAY_GROUP.visibility_tag]:
-        _trace_visible_for.append(_user_repr.view_transform_node.Name.value)
-
-    if len(_trace_visible_for) == 0:
-      self.trace.append_to_group_names("do_not_display_group")
-    
-    else:  
-      for _string in _trace_visible_for:
-        self.trace.append_to_group_names(_string)
+    ApplicationManager.visibility_engine.update_trace_row(self, self.visibility_list)
 
 
   ## Evaluated when value changes.
@@ -0,0 +1,242 @@
+#!/usr/bin/python
+
+## @file
+# Contains class NodeRegistry.
+
+# import python libraries
+import re
+
+
+## Maps the numeric identities of the distributed viewing nodes to their names, paths and node handles and back.
+#
+# A node identity is a (workspace id, display group id, user id, screen id, portal id) tuple with None for the ids
+# that do not apply. The following identities are used by server and clients:
+#   (w, dg, u, None, None)   view transform node of a user in a display group, named "w<w>_dg<dg>_u<u>"
+#   (w, dg, u, s, None)      screen node of a view transform node, named "screen_<s>"
+#   (w, dg, None, s, None)   screen proxy geometry, named "proxy_w<w>_dg<dg>_s<s>"
+#   (w, dg, None, None, p)   portal node, named "portal_<p>_w<w>_dg<dg>" or "portal_<p>_wa_dga" for portals
+#                            of the configuration, which have no workspace and display group
+#   (w, dg, u, None, p)      head node of a user within a portal, named "head_w<w>_dg<dg>_u<u>"
+# Names and paths are built once per identity and cached. Names decoded back to identities are cached as well,
+# so server and clients can resolve the names found in the scenegraph, e.g. of pick results, without parsing
+# them every frame. Only screen proxy, view transform and portal nodes have names unique in the scenegraph and
+# can be decoded. Node handles are registered by the side that created or looked them up. Nodes without an identity,
+# e.g. the head node of a view transform node or the scene matrix node of a portal, are found by their fixed names
+# relative to a node with an identity.
+class NodeRegistry:
+
+  ## @var head_name
+  # Name of the head node below a view transform node.
+  head_name = "head"
+
+  ## @var left_eye_name
+  # Name of the left eye node below a head node.
+  left_eye_name = "eyeL"
+
+  ## @var right_eye_name
+  # Name of the right eye node below a head node.
+  right_eye_name = "eyeR"
+
+  ## @var portal_matrix_name
+  # Name of the portal matrix (entry) node below a portal node.
+  portal_matrix_name = "portal_matrix"
+
+  ## @var scene_matrix_name
+  # Name of the scene matrix (exit) node below a portal node.
+  scene_matrix_name = "scene_matrix"
+
+  ## @var portal_screen_name
+  # Name of the screen node below the scene matrix node of a portal node.
+  portal_screen_name = "portal_screen"
+
+  ## @var names
+  # Dictionary mapping node identities to their node names.
+  names = {}
+
+  ## @var paths
+  # Dictionary mapping node identities to their absolute paths in the distributed scenegraph.
+  paths = {}
+
+  ## @var keys
+  # Dictionary mapping decoded node names to their identities, or to None for names not encoding an identity.
+  keys = {}
+
+  ## @var nodes
+  # Dictionary mapping node identities to the registered node handles.
+  nodes = {}
+
+  ## @var portal_keys
+  # Dictionary mapping portal ids to the identities of their portal nodes.
+  portal_keys = {}
+
+  ## @var name_patterns
+  # List of (regular expression, identity positions) tuples to decode unique node names. The positions give
+  # the index in the identity tuple for each group of the expression.
+  name_patterns = [ (re.compile(r"w(\d+)_dg(\d+)_u(\d+)$"), (0, 1, 2))
+                  , (re.compile(r"proxy_w(\d+)_dg(\d+)_s(\d+)$"), (0, 1, 3))
+                  , (re.compile(r"portal_(\d+)_w(\d+)_dg(\d+)$"), (4, 0, 1))
+                  , (re.compile(r"portal_(\d+)_wa_dga$"), (4,)) ]
+
+  ## Returns the name of the node with an identity.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  @staticmethod
+  def get_name(KEY):
+
+    _name = NodeRegistry.names.get(KEY)
+
+    if _name == None:
+
+      _workspace_id, _display_group_id, _user_id, _screen_id, _portal_id = KEY
+
+      if _user_id != None and _screen_id != None:
+        _name = "screen_" + str(_screen_id)
+
+      elif _user_id != None:
+        _name = "w" + str(_workspace_id) + "_dg" + str(_display_group_id) + "_u" + str(_user_id)
+
+        if _portal_id != None:
+          _name = "head_" + _name
+
+      elif _screen_id != None:
+        _name = "proxy_w" + str(_workspace_id) + "_dg" + str(_display_group_id) + "_s" + str(_screen_id)
+
+      elif _workspace_id != None:
+        _name = "portal_" + str(_portal_id) + "_w" + str(_workspace_id) + "_dg" + str(_display_group_id)
+
+      else:
+        _name = "portal_" + str(_portal_id) + "_wa_dga"
+
+      NodeRegistry.names[KEY] = _name
+
+    return _name
+
+  ## Returns the absolute path of the node with an identity. The path of a head node within a portal
+  # depends on the identity of the portal node, which has to be registered or decoded from its name before.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  @staticmethod
+  def get_path(KEY):
+
+    _path = NodeRegistry.paths.get(KEY)
+
+    if _path == None:
+
+      _workspace_id, _display_group_id, _user_id, _screen_id, _portal_id = KEY
+
+      if _user_id != None and _screen_id != None:
+        _path = NodeRegistry.get_path( (_workspace_id, _display_group_id, _user_id, None, None) ) + "/" + NodeRegistry.get_name(KEY)
+
+      elif _user_id != None and _portal_id != None:
+        _path = NodeRegistry.get_path(NodeRegistry.get_portal_key(_portal_id)) + "/" + NodeRegistry.scene_matrix_name + "/" + NodeRegistry.get_name(KEY)
+
+      elif _portal_id != None:
+        _path = "/net/portal_group/" + NodeRegistry.get_name(KEY)
+
+      # screen proxy geometries are not distributed
+      elif _screen_id != None:
+        _path = "/" + NodeRegistry.get_name(KEY)
+
+      else:
+        _path = "/net/" + NodeRegistry.get_name(KEY)
+
+      NodeRegistry.paths[KEY] = _path
+
+    return _path
+
+  ## Returns the identity encoded in a unique node name or None if the name does not encode one.
+  # @param NAME The node name.
+  @staticmethod
+  def get_key(NAME):
+
+    try:
+      return NodeRegistry.keys[NAME]
+    except KeyError:
+      pass
+
+    _key = None
+
+    for _pattern, _positions in NodeRegistry.name_patterns:
+
+      _match = _pattern.match(NAME)
+
+      if _match != None:
+        _ids = [None, None, None, None, None]
+
+        for _position, _id in zip(_positions, _match.groups()):
+          _ids[_position] = int(_id)
+
+        _key = tuple(_ids)
+        NodeRegistry.add_portal_key(_key)
+        break
+
+    NodeRegistry.keys[NAME] = _key
+    return _key
+
+  ## Returns the identity of a portal node by the portal id. Portal identities are known once the portal node was
+  # registered or its name was decoded. Unknown portals are assumed to stem from the configuration.
+  # @param PORTAL_ID The id of the portal.
+  @staticmethod
+  def get_portal_key(PORTAL_ID):
+    return NodeRegistry.portal_keys.get(PORTAL_ID, (None, None, None, None, PORTAL_ID))
+
+  ## Remembers the identity of a portal node by its portal id, if the identity is one of a portal node.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  @staticmethod
+  def add_portal_key(KEY):
+
+    if KEY[2] == None and KEY[3] == None and KEY[4] != None:
+      NodeRegistry.portal_keys[KEY[4]] = KEY
+
+  ## Registers the node handle of an identity.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  # @param NODE The scenegraph node.
+  @staticmethod
+  def register(KEY, NODE):
+
+    NodeRegistry.nodes[KEY] = NODE
+    NodeRegistry.add_portal_key(KEY)
+
+  ## Removes the node handle of an identity.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  @staticmethod
+  def unregister(KEY):
+    NodeRegistry.nodes.pop(KEY, None)
+
+  ## Removes the node handles of a portal node and of all nodes within the portal.
+  # @param PORTAL_ID The id of the portal.
+  @staticmethod
+  def unregister_portal(PORTAL_ID):
+
+    for _key in [_key for _key in NodeRegistry.nodes if _key[4] == PORTAL_ID]:
+      del NodeRegistry.nodes[_key]
+
+  ## Returns the registered node handle of an identity or None if there is none.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  @staticmethod
+  def get_node(KEY):
+    return NodeRegistry.nodes.get(KEY)
+
+  ## Returns the node of an identity, looking it up in a scenegraph by its path and registering it if it is not registered yet.
+  # Returns None if the node does not exist.
+  # @param SCENEGRAPH The scenegraph to look the node up in.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node.
+  @staticmethod
+  def find_node(SCENEGRAPH, KEY):
+
+    _node = NodeRegistry.nodes.get(KEY)
+
+    if _node == None:
+      _node = SCENEGRAPH[NodeRegistry.get_path(KEY)]
+
+      if _node != None:
+        NodeRegistry.register(KEY, _node)
+
+    return _node
+
+  ## Returns the node at a path relative to the node of an identity, looking it up in a scenegraph by its absolute path.
+  # Returns None if the node does not exist.
+  # @param SCENEGRAPH The scenegraph to look the node up in.
+  # @param KEY The (workspace id, display group id, user id, screen id, portal id) tuple of the node the path is relative to.
+  # @param RELATIVE_PATH The path of the node below the node of the identity, the names of the nodes separated by '/'.
+  @staticmethod
+  def find_child(SCENEGRAPH, KEY, RELATIVE_PATH):
+    return SCENEGRAPH[NodeRegistry.get_path(KEY) + "/" + RELATIVE_PATH]
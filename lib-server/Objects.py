@@ -11,6 +11,9 @@ from avango.script import field_has_changed
 
 # import framework libraries
 from Visualization import *
+from HeightField import *
+from PipelineSettings import PipelineSettings
+from AssetCache import AssetCache
 
 ## Abstract base class to represent a scene which is a collection of interactive objects.
 # Not to be instantiated.
@@ -125,6 +128,19 @@ class SceneObject:
     # Mapping of pipeline value FarClip.
     self.far_clip = 1000.0
 
+    '''
+      Ground following
+    '''
+
+    ## @var height_field_cell_size
+    # Grid spacing in meters of the HeightField used for ground following in this scene. None or 0 if ground following only uses ray tests.
+    # To be set by scenes whose ground geometry has no steps or obstacles smaller than a cell, as these may be missed by the grid samples.
+    self.height_field_cell_size = None
+
+    ## @var height_field
+    # HeightField instance of this scene's ground following geometry. Built on first request if height_field_cell_size is set.
+    self.height_field = None
+
   # functions
   ## Returns the SceneManager instance this scene object is belonging to.
   def get_scene_manager(self):
@@ -141,25 +157,51 @@ class SceneObject:
   
     return self.NET_TRANS_NODE   
 
-  ## Returns a string of all concatenated pipeline values for this SceneObject.
-  def get_pipeline_value_string(self):
-    return self.background_texture + "#" + \
-           str(self.enable_bloom) + "#" + \
-           str(self.bloom_intensity) + "#" + \
-           str(self.bloom_threshold) + "#" + \
-           str(self.bloom_radius) + "#" + \
-           str(self.enable_ssao) + "#" + \
-           str(self.ssao_radius) + "#" + \
-           str(self.ssao_intensity) + "#" + \
-           str(self.enable_backface_culling) + "#" + \
-           str(self.enable_frustum_culling) + "#" + \
-           str(self.enable_fxaa) + "#" + \
-           str(round(self.ambient_color.r,3)) + "," + str(round(self.ambient_color.g,3)) + "," + str(round(self.ambient_color.b,3)) + "#" + \
-           str(self.enable_fog) + "#" + \
-           str(self.fog_start) + "#" + \
-           str(self.fog_end) + "#" + \
-           str(self.near_clip) + "#" + \
-           str(self.far_clip)
+  ## Returns the HeightField of the ground following geometry of this scene, building it on first call.
+  # Returns None if no height field is to be used or the scene has no ground following geometry.
+  def get_height_field(self):
+
+    if self.height_field_cell_size == None or self.height_field_cell_size == 0:
+      return None
+
+    if self.height_field == None:
+
+      self.SCENEGRAPH.update_cache()
+
+      _bb_min = None
+      _bb_max = None
+
+      for _object in self.objects:
+
+        if _object.gf_pick_flag == False:
+          continue
+
+        _bb = _object.get_node().BoundingBox.value
+
+        if _bb_min == None:
+          _bb_min = avango.gua.Vec3(_bb.Min.value.x, _bb.Min.value.y, _bb.Min.value.z)
+          _bb_max = avango.gua.Vec3(_bb.Max.value.x, _bb.Max.value.y, _bb.Max.value.z)
+        else:
+          _bb_min = avango.gua.Vec3(min(_bb_min.x, _bb.Min.value.x), min(_bb_min.y, _bb.Min.value.y), min(_bb_min.z, _bb.Min.value.z))
+          _bb_max = avango.gua.Vec3(max(_bb_max.x, _bb.Max.value.x), max(_bb_max.y, _bb.Max.value.y), max(_bb_max.z, _bb.Max.value.z))
+
+      if _bb_min == None:
+        return None
+
+      self.height_field = HeightField()
+      self.height_field.my_constructor(self.SCENEGRAPH, "gf_pick_group", _bb_min, _bb_max, self.height_field_cell_size)
+
+    return self.height_field
+
+  ## Returns a dictionary mapping the keys of all pipeline settings to their values for this SceneObject.
+  def get_pipeline_settings(self):
+
+    _settings = {}
+
+    for _key, _type, _fields in PipelineSettings.schema:
+      _settings[_key] = getattr(self, _key)
+
+    return _settings
 
 
   ## Creates and initializes a geometry node in the scene.
@@ -184,7 +226,7 @@ class SceneObject:
     if GROUNDFOLLOWING_PICK_FLAG == True or MANIPULATION_PICK_FLAG == True:
       _loader_flags += " | avango.gua.LoaderFlags.MAKE_PICKABLE"
 
-    _node = _loader.create_geometry_from_file(NAME, FILENAME, MATERIAL, eval(_loader_flags))
+    _node = _loader.create_geometry_from_file(NAME, AssetCache.get_geometry_path(FILENAME), MATERIAL, eval(_loader_flags))
     _node.Transform.value = MATRIX
   
     #print "LOADED", _node, _node.Name.value#, _loader_flags
@@ -271,7 +313,7 @@ class SceneObject:
 
       _loader = avango.gua.nodes.TriMeshLoader()
   
-      _light_geometry = _loader.create_geometry_from_file(_light_node.Name.value + "_geometry", _filename, "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.MAKE_PICKABLE)
+      _light_geometry = _loader.create_geometry_from_file(_light_node.Name.value + "_geometry", AssetCache.get_geometry_path(_filename), "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.MAKE_PICKABLE)
       #_light_geometry.Transform.value = avango.gua.make_scale_mat(0.1)
       _light_geometry.Transform.value = avango.gua.make_scale_mat(3.0)
       _light_geometry.ShadowMode.value = avango.gua.ShadowMode.OFF
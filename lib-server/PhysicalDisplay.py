@@ -10,6 +10,9 @@ import avango.gua
 # import framework libraries
 from Display import *
 from ConsoleIO import *
+from AssetCache import AssetCache
+from GeometryRegistry import GeometryRegistry
+from NodeRegistry import NodeRegistry
 
 ## Class representing a physical display. A physical display is a projection medium
 # running on a host and having certain resolution, size and transformation. It
@@ -136,9 +139,7 @@ class PhysicalDisplay(Display):
   ## Creates a visualization of the display's screen in the scene (white frame). Returns the scenegraph geometry node.
   def create_screen_visualization(self, NODE_NAME):
   
-    _loader = avango.gua.nodes.TriMeshLoader()
-  
-    _node = _loader.create_geometry_from_file(NODE_NAME, "data/objects/screen.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
+    _node = GeometryRegistry.create_instance(NODE_NAME, "data/objects/screen.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
     _node.ShadowMode.value = avango.gua.ShadowMode.OFF
 
     _w, _h = self.size
@@ -153,9 +154,10 @@ class PhysicalDisplay(Display):
   def create_transformed_proxy_geometry(self, WORKSPACE_INSTANCE, DISPLAY_GROUP_INSTANCE, DISPLAY_NUM):
   
     _loader = avango.gua.nodes.TriMeshLoader()
+    _key = (WORKSPACE_INSTANCE.id, DISPLAY_GROUP_INSTANCE.id, None, DISPLAY_NUM, None)
   
-    _node = _loader.create_geometry_from_file("proxy_w" + str(WORKSPACE_INSTANCE.id) + "_dg" + str(DISPLAY_GROUP_INSTANCE.id) + "_s" + str(DISPLAY_NUM)
-                                            , "data/objects/plane.obj"
+    _node = _loader.create_geometry_from_file(NodeRegistry.get_name(_key)
+                                            , AssetCache.get_geometry_path("data/objects/plane.obj")
                                             , "data/materials/White.gmd"
                                             , avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS | avango.gua.LoaderFlags.MAKE_PICKABLE)
     _node.GroupNames.value = ["screen_proxy_group"]
@@ -169,7 +171,8 @@ class PhysicalDisplay(Display):
 
     _node.Transform.value = avango.gua.make_inverse_mat(DISPLAY_GROUP_INSTANCE.offset_to_workspace * WORKSPACE_INSTANCE.transmitter_offset) * \
                             self.transformation * avango.gua.make_rot_mat(90, 1, 0 ,0) * avango.gua.make_scale_mat(_w,1.0,_h)
-    
+
+    NodeRegistry.register(_key, _node)
     return _node
 
 
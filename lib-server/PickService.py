@@ -0,0 +1,196 @@
+#!/usr/bin/python
+
+## @file
+# Contains class PickService.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+
+
+## Collects the ray tests of a frame and performs them together, one batch per picking mask.
+#
+# Intersection instances with framewise evaluation register their rays as standing requests. The service
+# connects an input field from the source of each ray matrix and an output field to each registered
+# Intersection, so the field dependencies make it evaluate once per frame after all ray matrices were
+# updated and before the Intersections hand the results to their consumers. Owners computing their rays
+# during their own evaluation, e.g. ground following or the ray pointers, request their ray tests on demand.
+# Pending on-demand requests are performed together when the first of their results is read, so every
+# result read after a request stems from a ray test performed after that request.
+class PickService(avango.script.Script):
+
+  ## @var sf_batch
+  # Number of the last framewise batch. Registered Intersection instances are connected from it.
+  sf_batch = avango.SFInt()
+
+  ## @var services
+  # Dictionary mapping scenegraphs to the PickService instances created for them.
+  services = {}
+
+  ## Returns the PickService of a scenegraph, creating it on first use.
+  # @param SCENEGRAPH The scenegraph to perform the ray tests in.
+  @staticmethod
+  def get_service(SCENEGRAPH):
+
+    _service = PickService.services.get(SCENEGRAPH)
+
+    if _service == None:
+      _service = PickService()
+      _service.my_constructor(SCENEGRAPH)
+      PickService.services[SCENEGRAPH] = _service
+
+    return _service
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(PickService).__init__()
+
+  ## Custom constructor.
+  # @param SCENEGRAPH The scenegraph to perform the ray tests in.
+  def my_constructor(self, SCENEGRAPH):
+
+    ## @var SCENEGRAPH
+    # Reference to the scenegraph to perform the ray tests in.
+    self.SCENEGRAPH = SCENEGRAPH
+
+    ## @var ray
+    # The spatial ray used for all ray tests.
+    self.ray = avango.gua.nodes.RayNode()
+
+    ## @var standing_requests
+    # Dictionary mapping the registered Intersection instances to the input fields connected from the sources of their ray matrices.
+    self.standing_requests = {}
+
+    ## @var free_ray_fields
+    # List of input fields of unregistered Intersection instances, to be reused by the next registrations.
+    self.free_ray_fields = []
+
+    ## @var num_ray_fields
+    # Number of input fields added for ray matrices so far.
+    self.num_ray_fields = 0
+
+    ## @var standing_results
+    # Dictionary mapping the registered Intersection instances to the lists of their pick results of the last framewise batch.
+    self.standing_results = {}
+
+    ## @var pending_requests
+    # Dictionary mapping the keys of the on-demand requests not performed yet to (ray matrix, picking options, picking mask) tuples.
+    self.pending_requests = {}
+
+    ## @var results
+    # Dictionary mapping the keys of the on-demand requests performed in the last batch to the lists of their pick results.
+    self.results = {}
+
+    ## @var next_key
+    # Key to be given to the next on-demand request.
+    self.next_key = 0
+
+    self.always_evaluate(True)
+
+  ## Registers an Intersection instance whose ray is to be tested in every framewise batch.
+  # @param INTERSECTION The Intersection instance to be registered.
+  # @param SF_PICK_MAT The field the starting matrix of the Intersection's ray is connected from.
+  def register(self, INTERSECTION, SF_PICK_MAT):
+
+    if INTERSECTION in self.standing_requests:
+      return
+
+    if len(self.free_ray_fields) > 0:
+      _ray_field = self.free_ray_fields.pop()
+    else:
+      _ray_field = avango.gua.SFMatrix4()
+      self.add_and_init_field(_ray_field, "sf_ray_mat_" + str(self.num_ray_fields), avango.gua.make_identity_mat())
+      self.num_ray_fields += 1
+
+    _ray_field.connect_from(SF_PICK_MAT)
+    self.standing_requests[INTERSECTION] = _ray_field
+    INTERSECTION.sf_pick_batch.connect_from(self.sf_batch)
+
+  ## Removes an Intersection instance from the framewise batches.
+  # @param INTERSECTION The Intersection instance to be unregistered.
+  def unregister(self, INTERSECTION):
+
+    _ray_field = self.standing_requests.pop(INTERSECTION, None)
+
+    if _ray_field == None:
+      return
+
+    _ray_field.disconnect()
+    self.free_ray_fields.append(_ray_field)
+    self.standing_results.pop(INTERSECTION, None)
+    INTERSECTION.sf_pick_batch.disconnect()
+
+  ## Returns the list of pick results of a registered Intersection instance from the last framewise batch
+  # or None if it was not tested yet.
+  # @param INTERSECTION The registered Intersection instance.
+  def get_standing_result(self, INTERSECTION):
+    return self.standing_results.get(INTERSECTION)
+
+  ## Requests an on-demand ray test and returns the key to retrieve the result with.
+  # @param RAY_MAT Matrix of the ray, including the scaling of the ray to its length.
+  # @param PICKING_OPTIONS Picking options of the ray test.
+  # @param PICKING_MASK Picking mask of the ray test.
+  def request(self, RAY_MAT, PICKING_OPTIONS, PICKING_MASK):
+
+    _key = self.next_key
+    self.next_key += 1
+    self.pending_requests[_key] = (RAY_MAT, PICKING_OPTIONS, PICKING_MASK)
+    return _key
+
+  ## Returns the list of pick results of an on-demand request. Performs all pending requests first if there are any.
+  # @param KEY The key returned by request.
+  def get_result(self, KEY):
+
+    if len(self.pending_requests) > 0:
+      self.flush()
+
+    return self.results[KEY]
+
+  ## Performs a single on-demand ray test together with all pending requests and returns the list of its pick results.
+  # @param RAY_MAT Matrix of the ray, including the scaling of the ray to its length.
+  # @param PICKING_OPTIONS Picking options of the ray test.
+  # @param PICKING_MASK Picking mask of the ray test.
+  def pick(self, RAY_MAT, PICKING_OPTIONS, PICKING_MASK):
+    return self.get_result(self.request(RAY_MAT, PICKING_OPTIONS, PICKING_MASK))
+
+  ## Performs all pending on-demand requests and replaces the results of the last batch by theirs.
+  def flush(self):
+
+    _pending_requests = self.pending_requests
+    self.pending_requests = {}
+    self.results = self.perform(_pending_requests)
+
+  ## Performs a batch of ray tests, grouped by picking mask. Returns a dictionary mapping the keys of the requests to the lists of their pick results.
+  # @param REQUESTS Dictionary mapping keys to (ray matrix, picking options, picking mask) tuples.
+  def perform(self, REQUESTS):
+
+    _requests_per_mask = {}
+
+    for _key, _request in REQUESTS.items():
+      _requests_per_mask.setdefault(_request[2], []).append( (_key, _request[0], _request[1]) )
+
+    _results = {}
+
+    for _picking_mask, _requests in _requests_per_mask.items():
+
+      for _key, _ray_mat, _picking_options in _requests:
+
+        self.ray.Transform.value = _ray_mat
+        _results[_key] = self.SCENEGRAPH.ray_test(self.ray, _picking_options, _picking_mask).value
+
+    return _results
+
+  ## Evaluated every frame. Tests the rays of all registered Intersection instances in one batch and notifies them.
+  def evaluate(self):
+
+    if len(self.standing_requests) == 0:
+      return
+
+    _requests = {}
+
+    for _intersection, _ray_field in self.standing_requests.items():
+      _requests[_intersection] = (_intersection.get_ray_mat(_ray_field.value), _intersection.picking_options, _intersection.picking_mask)
+
+    self.standing_results = self.perform(_requests)
+    self.sf_batch.value = self.sf_batch.value + 1
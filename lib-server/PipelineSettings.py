@@ -0,0 +1,147 @@
+#!/usr/bin/python
+
+## @file
+# Contains class PipelineSettings.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+## Schema and encoding of the pipeline settings record distributed from the server to the clients.
+#
+# The record is stored in the name of an info node below /net/pipeline_values. It starts with a header
+# carrying the schema version, followed by one key=value entry per setting, all separated by '#'.
+# Entries are identified by their keys instead of their positions, so settings can be added to the schema
+# without breaking the parsing of older records. Clients decode the record into typed values and only
+# apply the settings whose values differ from the ones applied before.
+class PipelineSettings:
+
+  ## @var version
+  # Version of the schema. To be increased whenever the meaning of an existing setting changes.
+  version = 1
+
+  ## @var header
+  # Prefix of the first entry of each record, followed by the schema version.
+  header = "pipeline_settings_v"
+
+  ## @var schema
+  # List of (key, type, pipeline field names) tuples of all settings. The keys are the names of the
+  # corresponding SceneObject attributes, the types are one of 'string', 'bool', 'float' and 'color'.
+  # The values are written to the listed fields of the client pipelines.
+  schema = [ ("background_texture",      "string", ["BackgroundTexture", "FogTexture"])
+           , ("enable_bloom",            "bool",   ["EnableBloom"])
+           , ("bloom_intensity",         "float",  ["BloomIntensity"])
+           , ("bloom_threshold",         "float",  ["BloomThreshold"])
+           , ("bloom_radius",            "float",  ["BloomRadius"])
+           , ("enable_ssao",             "bool",   ["EnableSsao"])
+           , ("ssao_radius",             "float",  ["SsaoRadius"])
+           , ("ssao_intensity",          "float",  ["SsaoIntensity"])
+           , ("enable_backface_culling", "bool",   ["EnableBackfaceCulling"])
+           , ("enable_frustum_culling",  "bool",   ["EnableFrustumCulling"])
+           , ("enable_fxaa",             "bool",   ["EnableFXAA"])
+           , ("ambient_color",           "color",  ["AmbientColor"])
+           , ("enable_fog",              "bool",   ["EnableFog"])
+           , ("fog_start",               "float",  ["FogStart"])
+           , ("fog_end",                 "float",  ["FogEnd"])
+           , ("near_clip",               "float",  ["NearClip"])
+           , ("far_clip",                "float",  ["FarClip"]) ]
+
+  ## @var types
+  # Dictionary mapping the keys of all settings to their types.
+  types = dict((_key, _type) for _key, _type, _fields in schema)
+
+  ## @var pipeline_fields
+  # Dictionary mapping the keys of all settings to the names of the pipeline fields they are written to.
+  pipeline_fields = dict((_key, _fields) for _key, _type, _fields in schema)
+
+  ## Returns the string representation of a setting value.
+  # @param TYPE The type of the setting.
+  # @param VALUE The value to be encoded.
+  @staticmethod
+  def encode_value(TYPE, VALUE):
+
+    if TYPE == "bool":
+      return str(bool(VALUE))
+
+    if TYPE == "float":
+      return str(float(VALUE))
+
+    if TYPE == "color":
+      return str(round(VALUE.r, 3)) + "," + str(round(VALUE.g, 3)) + "," + str(round(VALUE.b, 3))
+
+    return str(VALUE)
+
+  ## Returns the typed value of a setting from its string representation.
+  # @param TYPE The type of the setting.
+  # @param STRING The string to be decoded.
+  @staticmethod
+  def decode_value(TYPE, STRING):
+
+    if TYPE == "bool":
+      return STRING == "True"
+
+    if TYPE == "float":
+      return float(STRING)
+
+    if TYPE == "color":
+      _values = STRING.split(",")
+      return avango.gua.Color(float(_values[0]), float(_values[1]), float(_values[2]))
+
+    return STRING
+
+  ## Returns the record string for a dictionary of setting values. Keys not contained in the schema are ignored.
+  # @param VALUES Dictionary mapping setting keys to their values.
+  @staticmethod
+  def encode(VALUES):
+
+    _strings = [PipelineSettings.header + str(PipelineSettings.version)]
+
+    for _key, _type, _fields in PipelineSettings.schema:
+
+      if _key in VALUES:
+        _strings.append(_key + "=" + PipelineSettings.encode_value(_type, VALUES[_key]))
+
+    return "#".join(_strings)
+
+  ## Returns a (version, entries) tuple for a record string, entries being a dictionary mapping setting keys
+  # to the string representations of their values. Entries with keys unknown to this schema are skipped.
+  # Returns (None, {}) for invalid records.
+  # @param STRING The record string to be split.
+  @staticmethod
+  def split(STRING):
+
+    _entries = STRING.split("#")
+
+    if not _entries[0].startswith(PipelineSettings.header):
+      return (None, {})
+
+    try:
+      _version = int(_entries[0][len(PipelineSettings.header):])
+
+    except ValueError:
+      return (None, {})
+
+    _strings = {}
+
+    for _entry in _entries[1:]:
+
+      _key, _separator, _string = _entry.partition("=")
+
+      if _key in PipelineSettings.types:
+        _strings[_key] = _string
+
+    return (_version, _strings)
+
+  ## Returns a (version, values) tuple for a record string, values being a dictionary mapping setting keys
+  # to their typed values. Entries with keys unknown to this schema are skipped. Returns (None, {}) for invalid records.
+  # @param STRING The record string to be decoded.
+  @staticmethod
+  def decode(STRING):
+
+    _version, _strings = PipelineSettings.split(STRING)
+    _values = {}
+
+    for _key, _string in _strings.items():
+      _values[_key] = PipelineSettings.decode_value(PipelineSettings.types[_key], _string)
+
+    return (_version, _values)
@@ -13,6 +13,10 @@ from avango.script import field_has_changed
 from ApplicationManager import *
 from Display import *
 from ConsoleIO import *
+from DistributionPolicy import DistributionPolicy
+from NodeRegistry import NodeRegistry
+from PortalState import PortalState
+from TransformCache import TransformCache
 from scene_config import scenegraphs
 import Utilities
 
@@ -41,7 +45,8 @@ class Portal(Display):
   # @param NEGATIVE_PARALLAX Indicating if negative parallax is allowed in the portal, can be either "True" or "False".
   # @param BORDER_MATERIAL The material string to be used for the portal's border.
   # @param TRANSITABLE Boolean saying if teleportation for this portal is enabled.
-  # @param PORTAL_NODE_NAME_ATTACHMENT Additional string information passed in the name of portal_node.
+  # @param WORKSPACE_ID ID of the workspace of the portal camera creating this portal, None for portals of the configuration.
+  # @param DISPLAY_GROUP_ID ID of the display group of the portal camera creating this portal, None for portals of the configuration.
   def __init__(self
              , PORTAL_MATRIX
              , WIDTH
@@ -51,7 +56,8 @@ class Portal(Display):
              , NEGATIVE_PARALLAX
              , BORDER_MATERIAL
              , TRANSITABLE
-             , PORTAL_NODE_NAME_ATTACHMENT = "wa_dga"):
+             , WORKSPACE_ID = None
+             , DISPLAY_GROUP_ID = None):
 
 
     _stereo = True
@@ -101,9 +107,17 @@ class Portal(Display):
     # Offset of this portal to the display group. Used when multiple portals are in one display group.
     self.display_group_offset = avango.gua.make_identity_mat()
 
-    ## @var portal_node_name_attachment
-    # Additional string information passed in the name of portal_node.
-    self.portal_node_name_attachment = PORTAL_NODE_NAME_ATTACHMENT
+    ## @var key
+    # Identity of portal_node in the NodeRegistry.
+    self.key = (WORKSPACE_ID, DISPLAY_GROUP_ID, None, None, self.id)
+
+    ## @var border_materials
+    # List of all border materials used by this portal so far. Distributed as group names of settings_node.
+    self.border_materials = []
+
+    ## @var frame_trigger
+    # Triggers the evaluation of frame_callback method in the frame after the portal state changed.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = False)
 
   ## Sets the offset to the display group and updates the screen node accordingly..
   # @param OFFSET_MATRIX The matrix to be set.
@@ -129,7 +143,7 @@ class Portal(Display):
         else:
           _user_repr.make_complex_viewing_setup()
 
-    self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
+    self.mark_state_changed()
 
   ## Switches camera_mode to the other state.
   def switch_camera_mode(self):
@@ -138,7 +152,7 @@ class Portal(Display):
     else:
       self.camera_mode = "PERSPECTIVE"
 
-    self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
+    self.mark_state_changed()
 
   ## Switches negative_parallax to the other state.
   def switch_negative_parallax(self):
@@ -147,8 +161,33 @@ class Portal(Display):
     else:
       self.negative_parallax = "True"
 
-    self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
+    self.mark_state_changed()
+
+
+  ## Schedules the distribution of the portal state. All changes within one frame are distributed as a single update.
+  def mark_state_changed(self):
+    self.frame_trigger.Active.value = True
+
+  ## Writes the encoded portal state to settings_node. The material list is only reassigned when a new border material is used.
+  def write_state(self):
+
+    if self.border_material not in self.border_materials:
+      self.border_materials.append(self.border_material)
+      self.settings_node.GroupNames.value = list(self.border_materials)
+
+    self.settings_node.Name.value = PortalState.encode(self.viewing_mode, self.camera_mode, self.negative_parallax, self.visible, self.border_materials.index(self.border_material))
+
+  ## Evaluated in the frame after the portal state changed.
+  def frame_callback(self):
+
+    # wait until the portal nodes are appended
+    try:
+      self.settings_node
+    except AttributeError:
+      return
 
+    self.write_state()
+    self.frame_trigger.Active.value = False
 
   ## Connects the portal matrix node to a field or disconnects it if None is given.
   # @param SF_PORTAL_MATRIX The field to connect the portal matrix node with. None if disconnection is required.
@@ -163,7 +202,7 @@ class Portal(Display):
   # @param BORDER_MATERIAL The material string to be set.
   def set_border_material(self, BORDER_MATERIAL):
     self.border_material = BORDER_MATERIAL
-    self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
+    self.mark_state_changed()
 
   ## Sets the visiblity of this portal.
   # @param VISIBLE Boolean describing the visibility to be set.
@@ -173,7 +212,7 @@ class Portal(Display):
     else:
       self.visible = "False"
 
-    self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
+    self.mark_state_changed()
 
   ## Sets width and height of the portal.
   # @param WIDTH The new portal width to be set.
@@ -188,38 +227,39 @@ class Portal(Display):
 
     ## @var portal_node
     # Grouping node for this portal below the group node for all portals.
-    self.portal_node = avango.gua.nodes.TransformNode(Name = "portal_" + str(self.id) + "_" + self.portal_node_name_attachment)
+    self.portal_node = avango.gua.nodes.TransformNode(Name = NodeRegistry.get_name(self.key))
     Portal.portal_group_node.Children.value.append(self.portal_node)
-    self.NET_TRANS_NODE.distribute_object(self.portal_node)
+    NodeRegistry.register(self.key, self.portal_node)
+    DistributionPolicy.distribute_node(self.NET_TRANS_NODE, self.portal_node)
 
     ## @var settings_node
-    # Node whose group names store information about the portal settings, such as viewing mode, etc.
-    self.settings_node = avango.gua.nodes.TransformNode(Name = "settings")
-    self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
+    # Node whose name stores the encoded portal state, see PortalState. Its group names list the border materials used so far.
+    self.settings_node = avango.gua.nodes.TransformNode()
+    self.write_state()
     self.portal_node.Children.value.append(self.settings_node)
-    self.NET_TRANS_NODE.distribute_object(self.settings_node)
+    DistributionPolicy.distribute_node(self.NET_TRANS_NODE, self.settings_node)
 
     ## @var portal_matrix_node
     # Scenegraph node representing the location where the portal display is located (entry).
-    self.portal_matrix_node = avango.gua.nodes.TransformNode(Name = "portal_matrix")
+    self.portal_matrix_node = avango.gua.nodes.TransformNode(Name = NodeRegistry.portal_matrix_name)
     self.portal_matrix_node.Transform.value = self.portal_matrix
     self.portal_node.Children.value.append(self.portal_matrix_node)
-    self.NET_TRANS_NODE.distribute_object(self.portal_matrix_node)
+    DistributionPolicy.distribute_node(self.NET_TRANS_NODE, self.portal_matrix_node)
 
     ## @var scene_matrix_node
     # Scenegraph node representing the location where the portal looks from (exit).
-    self.scene_matrix_node = avango.gua.nodes.TransformNode(Name = "scene_matrix")
+    self.scene_matrix_node = avango.gua.nodes.TransformNode(Name = NodeRegistry.scene_matrix_name)
     self.scene_matrix_node.Transform.value = avango.gua.make_identity_mat()
     self.portal_node.Children.value.append(self.scene_matrix_node)
-    self.NET_TRANS_NODE.distribute_object(self.scene_matrix_node)
+    DistributionPolicy.distribute_node(self.NET_TRANS_NODE, self.scene_matrix_node)
 
     ## @var portal_screen_node
     # Screen node representing the portal's screen in the scene.
-    self.portal_screen_node = avango.gua.nodes.ScreenNode(Name = "portal_screen")
+    self.portal_screen_node = avango.gua.nodes.ScreenNode(Name = NodeRegistry.portal_screen_name)
     self.portal_screen_node.Width.value = self.size[0]
     self.portal_screen_node.Height.value = self.size[1]
     self.scene_matrix_node.Children.value.append(self.portal_screen_node)
-    self.NET_TRANS_NODE.distribute_object(self.portal_screen_node)
+    DistributionPolicy.distribute_node(self.NET_TRANS_NODE, self.portal_screen_node)
 
   ## Deletes all nodes below a given node.
   # @param NODE The node to start deleting from.
@@ -232,7 +272,11 @@ class Portal(Display):
   ## Removes this portal from the portal group and destroys all the scenegraph nodes.
   def deactivate(self):
 
+    self.frame_trigger.Active.value = False
     Portal.portal_group_node.Children.value.remove(self.portal_node)
+    DistributionPolicy.forget_subtree(self.portal_node)
+    TransformCache.forget(self.portal_node)
+    NodeRegistry.unregister_portal(self.id)
 
     for _user_repr in ApplicationManager.all_user_representations:
       if _user_repr.DISPLAY_GROUP.displays[0] == self:
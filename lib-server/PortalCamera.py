@@ -15,6 +15,8 @@ from Portal import *
 from PortalCameraNavigation import *
 from TrackingReader import *
 from Tool import *
+from TransformCache import TransformCache
+from StationHub import StationHub
 import Utilities
 
 # import python libraries
@@ -99,7 +101,8 @@ class PortalCameraRepresentation(ToolRepresentation):
                        , NEGATIVE_PARALLAX = PORTAL_CAMERA_INSTANCE.capture_parallax_mode
                        , BORDER_MATERIAL = "data/materials/White.gmd"
                        , TRANSITABLE = False
-                       , PORTAL_NODE_NAME_ATTACHMENT = "w" + str(PORTAL_CAMERA_INSTANCE.WORKSPACE_INSTANCE.id) + "_dg" + str(self.DISPLAY_GROUP.id))
+                       , WORKSPACE_ID = PORTAL_CAMERA_INSTANCE.WORKSPACE_INSTANCE.id
+                       , DISPLAY_GROUP_ID = self.DISPLAY_GROUP.id)
 
     ## @var portal_nav
     # Instance of PortalCameraNavigation in which the captured shots are to be loaded.
@@ -129,13 +132,10 @@ class PortalCameraRepresentation(ToolRepresentation):
     self.portal_matrix_connected = False
 
   ## Computes the WorldTransform of a scenegraph node manually without using the pre-defined field.
+  # The world matrices of the node's ancestors are taken from the TransformCache, which is shared by all representations.
   # @param NODE The scenegraph node to compute the world transformation for.
   def compute_world_transform(self, NODE):
-
-    if NODE == None:
-      return avango.gua.make_identity_mat()
-    else:   
-      return self.compute_world_transform(NODE.Parent.value) * NODE.Transform.value
+    return TransformCache.get_world_transform(NODE.Parent.value) * NODE.Transform.value
 
   ## Evaluated every frame.
   def evaluate(self):
@@ -399,8 +399,7 @@ class PortalCamera(Tool):
 
     ## @var device_sensor
     # Device sensor for the PortalCamera's button inputs.
-    self.device_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor.Station.value = CAMERA_DEVICE_STATION
+    self.device_sensor = StationHub.get_sensor(CAMERA_DEVICE_STATION)
 
     # init field connections
     self.sf_focus_button.connect_from(self.device_sensor.Button0)
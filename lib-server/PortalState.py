@@ -0,0 +1,89 @@
+#!/usr/bin/python
+
+## @file
+# Contains class PortalState.
+
+## Compact encoding of the portal settings distributed from the server to the clients.
+#
+# The state of a portal is stored in the name of its settings node as "settings_<flags>#<material index>", the prefix
+# identifying the settings node among the children of the portal node.
+# The flags combine the viewing mode, camera mode, negative parallax and visibility bits below. The
+# material index refers to the GroupNames of the same node, which hold all border materials used by
+# the portal so far. Materials are only appended, so the list is rarely distributed again.
+class PortalState:
+
+  ## @var VIEWING_MODE_3D
+  # Flag set if the portal's viewing mode is "3D", unset for "2D".
+  VIEWING_MODE_3D = 1
+
+  ## @var CAMERA_MODE_ORTHOGRAPHIC
+  # Flag set if the portal's camera mode is "ORTHOGRAPHIC", unset for "PERSPECTIVE".
+  CAMERA_MODE_ORTHOGRAPHIC = 2
+
+  ## @var NEGATIVE_PARALLAX
+  # Flag set if negative parallax is allowed in the portal.
+  NEGATIVE_PARALLAX = 4
+
+  ## @var VISIBLE
+  # Flag set if the portal is currently visible.
+  VISIBLE = 8
+
+  ## @var node_name_prefix
+  # Prefix of the state strings, by which the settings node is found among the children of the portal node.
+  node_name_prefix = "settings_"
+
+  ## Returns the state string of a portal.
+  # @param VIEWING_MODE Viewing mode of the portal, either "2D" or "3D".
+  # @param CAMERA_MODE Projection mode of the portal camera, either "PERSPECTIVE" or "ORTHOGRAPHIC".
+  # @param NEGATIVE_PARALLAX Indicating if negative parallax is allowed in the portal, either "True" or "False".
+  # @param VISIBLE Indicating if the portal is visible, either "True" or "False".
+  # @param MATERIAL_INDEX Index of the border material in the portal's material list.
+  @staticmethod
+  def encode(VIEWING_MODE, CAMERA_MODE, NEGATIVE_PARALLAX, VISIBLE, MATERIAL_INDEX):
+
+    _flags = 0
+
+    if VIEWING_MODE == "3D":
+      _flags |= PortalState.VIEWING_MODE_3D
+
+    if CAMERA_MODE == "ORTHOGRAPHIC":
+      _flags |= PortalState.CAMERA_MODE_ORTHOGRAPHIC
+
+    if NEGATIVE_PARALLAX == "True":
+      _flags |= PortalState.NEGATIVE_PARALLAX
+
+    if VISIBLE == "True":
+      _flags |= PortalState.VISIBLE
+
+    return PortalState.node_name_prefix + str(_flags) + "#" + str(MATERIAL_INDEX)
+
+  ## Returns a (flags, material index) tuple for a state string or None if the string is invalid.
+  # @param STRING The state string to be decoded.
+  @staticmethod
+  def decode(STRING):
+
+    if not STRING.startswith(PortalState.node_name_prefix):
+      return None
+
+    _splitted_string = STRING[len(PortalState.node_name_prefix):].split("#")
+
+    if len(_splitted_string) != 2:
+      return None
+
+    try:
+      return (int(_splitted_string[0]), int(_splitted_string[1]))
+
+    except ValueError:
+      return None
+
+  ## Returns the settings node among the children of a portal node or None if it was not distributed yet.
+  # @param PORTAL_NODE The portal node to search the settings node in.
+  @staticmethod
+  def find_settings_node(PORTAL_NODE):
+
+    for _child in PORTAL_NODE.Children.value:
+
+      if _child.Name.value.startswith(PortalState.node_name_prefix):
+        return _child
+
+    return None
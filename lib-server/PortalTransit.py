@@ -0,0 +1,224 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes PortalTransitVolume and PortalTransitDetector.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+from avango.script import field_has_changed
+
+# import python libraries
+import math
+
+
+## Transit region of a transitable portal. Caches the inverse portal matrix and a world space
+# bounding sphere, both updated only when the portal's matrix or size changes.
+class PortalTransitVolume(avango.script.Script):
+
+  # input fields
+  ## @var sf_portal_matrix
+  # Matrix of the portal entry, connected from the portal matrix node.
+  sf_portal_matrix = avango.gua.SFMatrix4()
+  sf_portal_matrix.value = avango.gua.make_identity_mat()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(PortalTransitVolume).__init__()
+
+  ## Custom constructor.
+  # @param PORTAL_DISPLAY_GROUP The DisplayGroup containing the portal.
+  # @param PORTAL The transitable Portal instance.
+  # @param FIRST_VIRTUAL_USER_REPRESENTATION The first virtual UserRepresentation created for the portal.
+  def my_constructor(self, PORTAL_DISPLAY_GROUP, PORTAL, FIRST_VIRTUAL_USER_REPRESENTATION):
+
+    ## @var PORTAL_DISPLAY_GROUP
+    # The DisplayGroup containing the portal.
+    self.PORTAL_DISPLAY_GROUP = PORTAL_DISPLAY_GROUP
+
+    ## @var PORTAL
+    # The transitable Portal instance.
+    self.PORTAL = PORTAL
+
+    ## @var FIRST_VIRTUAL_USER_REPRESENTATION
+    # The first virtual UserRepresentation of the portal, determining the active navigation of the portal display group.
+    self.FIRST_VIRTUAL_USER_REPRESENTATION = FIRST_VIRTUAL_USER_REPRESENTATION
+
+    ## @var inverse_portal_mat
+    # Cached inverse of the portal matrix.
+    self.inverse_portal_mat = avango.gua.make_identity_mat()
+
+    ## @var center
+    # Center of the portal in world coordinates, as tuple of floats.
+    self.center = (0.0, 0.0, 0.0)
+
+    ## @var radius
+    # Distance of the portal corners from the center in world coordinates.
+    self.radius = 0.0
+
+    ## @var depth_factor
+    # Upper bound for the world space length of a portal space depth of 1 per world space unit.
+    # Used to enlarge the bounding sphere by the depth range checked in the transit test.
+    self.depth_factor = 1.0
+
+    ## @var bounds_size
+    # Portal size the bounding sphere was computed for.
+    self.bounds_size = None
+
+    self.sf_portal_matrix.connect_from(self.PORTAL.portal_matrix_node.Transform)
+
+  ## Recomputes the cached inverse matrix and the bounding sphere from the current portal matrix and size.
+  def update_bounds(self):
+
+    _portal_mat = self.sf_portal_matrix.value
+    self.inverse_portal_mat = avango.gua.make_inverse_mat(_portal_mat)
+    self.bounds_size = self.PORTAL.size
+
+    _center = _portal_mat.get_translate()
+    self.center = (_center.x, _center.y, _center.z)
+
+    _half_width = self.PORTAL.size[0] / 2
+    _half_height = self.PORTAL.size[1] / 2
+    self.radius = 0.0
+
+    for _corner in [ avango.gua.Vec3(-_half_width, -_half_height, 0.0)
+                   , avango.gua.Vec3(_half_width, -_half_height, 0.0)
+                   , avango.gua.Vec3(-_half_width, _half_height, 0.0)
+                   , avango.gua.Vec3(_half_width, _half_height, 0.0) ]:
+
+      _pos = _portal_mat * _corner
+      self.radius = max(self.radius, math.sqrt((_pos.x - _center.x) ** 2 + (_pos.y - _center.y) ** 2 + (_pos.z - _center.z) ** 2))
+
+    # length of the portal's z axis times the frobenius norm of the inverse linear part
+    _z_axis_length = math.sqrt(sum(_portal_mat.get_element(_row, 2) ** 2 for _row in range(3)))
+    _inverse_norm = math.sqrt(sum(self.inverse_portal_mat.get_element(_row, _column) ** 2 for _row in range(3) for _column in range(3)))
+    self.depth_factor = _z_axis_length * _inverse_norm
+
+  ## Checks if a device movement may pass the portal. Conservative broad phase test against the bounding sphere.
+  # @param POS The device position in world coordinates.
+  # @param STEP_LENGTH Length of the device's forward vector in world coordinates.
+  def may_contain(self, POS, STEP_LENGTH):
+
+    if self.bounds_size != self.PORTAL.size:
+      self.update_bounds()
+
+    _dx = POS.x - self.center[0]
+    _dy = POS.y - self.center[1]
+    _dz = POS.z - self.center[2]
+    _reach = self.radius + STEP_LENGTH * self.depth_factor
+
+    return _dx * _dx + _dy * _dy + _dz * _dz <= _reach * _reach
+
+  ## Called whenever sf_portal_matrix changes.
+  @field_has_changed(sf_portal_matrix)
+  def sf_portal_matrix_changed(self):
+    self.update_bounds()
+
+
+## Detects navigation devices entering transitable portals and teleports their navigations through them.
+# Only navigations within the bounding sphere of a portal are tested precisely.
+class PortalTransitDetector:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param NAVIGATIONS List of Navigation instances of the physical workspaces. Duplicates are ignored.
+  # @param TRANSIT_PORTALS List of (display group, portal, first virtual user representation) tuples of the transitable portals.
+  def my_constructor(self, NAVIGATIONS, TRANSIT_PORTALS):
+
+    ## @var navigations
+    # Navigation instances checked for portal transits, each contained once.
+    self.navigations = []
+
+    for _nav in NAVIGATIONS:
+
+      if _nav not in self.navigations:
+        self.navigations.append(_nav)
+
+    ## @var transit_volumes
+    # PortalTransitVolume instances of all transitable portals.
+    self.transit_volumes = []
+
+    for _portal_display_group, _portal, _first_virtual_user_repr in TRANSIT_PORTALS:
+      _transit_volume = PortalTransitVolume()
+      _transit_volume.my_constructor(_portal_display_group, _portal, _first_virtual_user_repr)
+      self.transit_volumes.append(_transit_volume)
+
+  ## Checks all navigations for portal transits and teleports them if necessary. To be called every frame.
+  def handle_portal_transits(self):
+
+    if len(self.transit_volumes) == 0:
+      return
+
+    for _nav in self.navigations:
+
+      # if navigation does not allow portal transit, go to next loop iteration
+      if _nav.reacts_on_portal_transit == False:
+        continue
+
+      # if navigation has no device (e.g. static navigation), do not allow transit
+      try:
+        _nav.device
+      except:
+        continue
+
+      _nav_device_mat = _nav.sf_abs_mat.value * \
+                        avango.gua.make_scale_mat(_nav.sf_scale.value) * \
+                        avango.gua.make_trans_mat(_nav.device.sf_station_mat.value.get_translate())
+
+      _nav_device_pos = _nav_device_mat.get_translate()
+
+      _nav_device_pos2 = _nav_device_mat * avango.gua.Vec3(0.0,0.0,1.0)
+      _nav_device_pos2 = avango.gua.Vec3(_nav_device_pos2.x, _nav_device_pos2.y, _nav_device_pos2.z)
+
+      _step_length = (_nav_device_pos2 - _nav_device_pos).length()
+
+      for _transit_volume in self.transit_volumes:
+
+        if _transit_volume.may_contain(_nav_device_pos, _step_length):
+          self.check_transit(_nav, _transit_volume, _nav_device_mat, _nav_device_pos, _nav_device_pos2)
+
+  ## Teleports a navigation through a portal if its device enters the portal.
+  # @param NAVIGATION The Navigation instance to be checked.
+  # @param TRANSIT_VOLUME The PortalTransitVolume of the portal.
+  # @param NAV_DEVICE_MAT The navigation's device matrix in world coordinates.
+  # @param NAV_DEVICE_POS The navigation's device position in world coordinates.
+  # @param NAV_DEVICE_POS2 A point one unit in front of the device in world coordinates.
+  def check_transit(self, NAVIGATION, TRANSIT_VOLUME, NAV_DEVICE_MAT, NAV_DEVICE_POS, NAV_DEVICE_POS2):
+
+    _portal = TRANSIT_VOLUME.PORTAL
+    _mat = TRANSIT_VOLUME.inverse_portal_mat
+
+    _nav_device_portal_space_pos = _mat * NAV_DEVICE_POS
+    _nav_device_portal_space_pos2 = _mat * NAV_DEVICE_POS2
+    _nav_device_portal_space_pos = avango.gua.Vec3(_nav_device_portal_space_pos.x, _nav_device_portal_space_pos.y, _nav_device_portal_space_pos.z)
+
+    # do a teleportation if navigation enters portal
+    if  _nav_device_portal_space_pos.x > -_portal.size[0]/2     and \
+        _nav_device_portal_space_pos.x <  _portal.size[0]/2     and \
+        _nav_device_portal_space_pos.y > -_portal.size[1]/2     and \
+        _nav_device_portal_space_pos.y <  _portal.size[1]/2     and \
+        _nav_device_portal_space_pos.z < 0.0                    and \
+        _nav_device_portal_space_pos2.z >= 0.0                  and \
+        _portal.viewing_mode == "3D":
+
+      _active_navigation = TRANSIT_VOLUME.PORTAL_DISPLAY_GROUP.navigations[TRANSIT_VOLUME.FIRST_VIRTUAL_USER_REPRESENTATION.connected_navigation_id]
+      _nav_device_portal_space_mat = _mat * NAV_DEVICE_MAT
+
+      NAVIGATION.inputmapping.set_abs_mat(avango.gua.make_trans_mat(_portal.portal_screen_node.Transform.value.get_translate()) * \
+                                          _active_navigation.sf_abs_mat.value * \
+                                          avango.gua.make_rot_mat(_portal.portal_screen_node.Transform.value.get_rotate()) * \
+                                          avango.gua.make_scale_mat(_active_navigation.sf_scale.value) * \
+                                          avango.gua.make_trans_mat(_nav_device_portal_space_pos) * \
+                                          avango.gua.make_rot_mat(_nav_device_portal_space_mat.get_rotate_scale_corrected()) * \
+                                          avango.gua.make_trans_mat(NAVIGATION.device.sf_station_mat.value.get_translate() * -1.0) * \
+                                          avango.gua.make_inverse_mat(avango.gua.make_scale_mat(_active_navigation.sf_scale.value)))
+
+      if NAVIGATION.trace != None:
+        NAVIGATION.trace.clear(NAVIGATION.inputmapping.sf_abs_mat.value)
+
+      NAVIGATION.inputmapping.scale_stop_time = None
+      NAVIGATION.inputmapping.set_scale(_active_navigation.sf_scale.value, False)
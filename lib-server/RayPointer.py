@@ -14,8 +14,15 @@ import avango.daemon
 from Tool import *
 import Utilities
 from TrackingReader import TrackingTargetReader
+from StationHub import StationHub
 from scene_config import *
 from SceneManager import *
+from FrustumCache import FrustumCache
+from PickService import PickService
+from AssetCache import AssetCache
+
+# import python libraries
+import collections
 
 
 ## Geometric representation of a RayPointer in a DisplayGroup.
@@ -46,7 +53,7 @@ class RayPointerRepresentation(ToolRepresentation):
     ## @var ray_geometry
     # Geometry node representing the ray graphically.
     self.ray_geometry = _loader.create_geometry_from_file( "ray_geometry"
-                                                         , "data/objects/cylinder.obj"
+                                                         , AssetCache.get_geometry_path("data/objects/cylinder.obj")
                                                          , "data/materials/White.gmd"
                                                          , avango.gua.LoaderFlags.DEFAULTS)
     self.ray_geometry.GroupNames.value.append(self.USER_REPRESENTATION.view_transform_node.Name.value)
@@ -56,17 +63,21 @@ class RayPointerRepresentation(ToolRepresentation):
     ## @var intersection_point_geometry
     # Geometry node representing the intersection point of the ray if any.
     self.intersection_point_geometry = _loader.create_geometry_from_file("intersection_point_geometry"
-                                                                       , "data/objects/sphere.obj"
+                                                                       , AssetCache.get_geometry_path("data/objects/sphere.obj")
                                                                        , "data/materials/White.gmd"
                                                                        , avango.gua.LoaderFlags.DEFAULTS)
     self.intersection_point_geometry.GroupNames.value.append("do_not_display_group")
     self.intersection_point_geometry.GroupNames.value.append(self.USER_REPRESENTATION.view_transform_node.Name.value)
     self.tool_transform_node.Children.value.append(self.intersection_point_geometry)
 
+    ## @var intersection_hidden
+    # Boolean saying if the intersection geometry is currently hidden by hide_intersection_geometry.
+    self.intersection_hidden = True
+
     ## @var ray_start_geometry
     # Geometry node representing the origin of the ray graphically.
     self.ray_start_geometry = _loader.create_geometry_from_file("ray_start_geometry"
-                                                               , "data/objects/cube.obj"
+                                                               , AssetCache.get_geometry_path("data/objects/cube.obj")
                                                                , "data/materials/White.gmd"
                                                                , avango.gua.LoaderFlags.DEFAULTS)
     self.ray_start_geometry.Transform.value = avango.gua.make_scale_mat(0.015, 0.015, 0.015)
@@ -91,13 +102,20 @@ class RayPointerRepresentation(ToolRepresentation):
   # @param NEW_RAY_DISTANCE The new distance of the ray to be set.
   def show_intersection_geometry_at(self, MATRIX, NEW_RAY_DISTANCE):
 
-    self.intersection_point_geometry.GroupNames.value.remove("do_not_display_group")
+    if self.intersection_hidden:
+      self.intersection_point_geometry.GroupNames.value.remove("do_not_display_group")
+      self.intersection_hidden = False
+
     self.intersection_point_geometry.Transform.value = MATRIX * avango.gua.make_scale_mat(self.intersection_sphere_size)
     self.set_ray_distance(NEW_RAY_DISTANCE)
 
   ## Hides the intersection geometry and resets the ray distance.
   def hide_intersection_geometry(self):
-    self.intersection_point_geometry.GroupNames.value.append("do_not_display_group")
+
+    if not self.intersection_hidden:
+      self.intersection_point_geometry.GroupNames.value.append("do_not_display_group")
+      self.intersection_hidden = True
+
     self.set_ray_distance(self.TOOL_INSTANCE.ray_length)
 
   ## Hides the ray geometry.
@@ -122,6 +140,7 @@ class RayPointerRepresentation(ToolRepresentation):
   def reset_visualization_group_names(self):
     self.ray_geometry.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
     self.intersection_point_geometry.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
+    self.intersection_hidden = False
     self.ray_start_geometry.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
 
   ## Enables a highlight for this RayPointerRepresentation.
@@ -178,6 +197,10 @@ class RayPointer(Tool):
   # Intersections of the picking ray with the objects in the scene.
   mf_pointer_pick_result = avango.gua.MFPickResult()
 
+  ## @var frustum_cache
+  # FrustumCache instance shared by all RayPointers to test pick positions against the users' viewing frustums.
+  frustum_cache = None
+
   ## Default constructor.
   def __init__(self):
     self.super(RayPointer).__init__()
@@ -193,6 +216,10 @@ class RayPointer(Tool):
     # call base class constructor
     self.base_constructor(WORKSPACE_INSTANCE, TOOL_ID, POINTER_TRACKING_STATION, VISIBILITY_TABLE)
 
+    if RayPointer.frustum_cache == None:
+      RayPointer.frustum_cache = FrustumCache()
+      RayPointer.frustum_cache.my_constructor()
+
     # parameters
     ## @var ray_length
     # Length of the pointer's ray in meters.
@@ -226,8 +253,7 @@ class RayPointer(Tool):
     
     ## @var device_sensor
     # Device sensor capturing the pointer's button input values.
-    self.device_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.device_sensor.Station.value = POINTER_DEVICE_STATION
+    self.device_sensor = StationHub.get_sensor(POINTER_DEVICE_STATION)
     
     # init field connections
     self.sf_pointer_button0.connect_from(self.device_sensor.Button0)
@@ -244,12 +270,9 @@ class RayPointer(Tool):
     self.tool_representations.append(_ray_pointer_repr)
     return _ray_pointer_repr
 
-  ## Computes the pick result of a matrix with the scene.
+  ## Requests the pick of a matrix with the scene from the pick service and returns the request key.
   # @param MATRIX The matrix to shoot the pick ray from.
-  def compute_pick_result(self, MATRIX):
-
-    _ray = avango.gua.nodes.RayNode()
-    _ray.Transform.value = MATRIX * avango.gua.make_scale_mat(1.0, 1.0, self.ray_length)
+  def request_pick(self, MATRIX):
 
     _picking_options = avango.gua.PickingOptions.PICK_ONLY_FIRST_OBJECT \
                      | avango.gua.PickingOptions.GET_WORLD_POSITIONS \
@@ -257,8 +280,12 @@ class RayPointer(Tool):
 
     _picking_mask = "man_pick_group"
 
-    _pick_result = scenegraphs[0].ray_test(_ray, _picking_options, _picking_mask)
-    return _pick_result
+    return PickService.get_service(scenegraphs[0]).request(MATRIX * avango.gua.make_scale_mat(1.0, 1.0, self.ray_length), _picking_options, _picking_mask)
+
+  ## Computes the pick result of a matrix with the scene. Returns the list of pick results.
+  # @param MATRIX The matrix to shoot the pick ray from.
+  def compute_pick_result(self, MATRIX):
+    return PickService.get_service(scenegraphs[0]).get_result(self.request_pick(MATRIX))
 
   ## Selects a list of potentially currently active RayPointerRepresentations by computing picks for them.
   def create_candidate_list(self):
@@ -268,50 +295,53 @@ class RayPointer(Tool):
     # only go on if a user is assigned to the ray
     if self.assigned_user != None:
 
-      # iterate over all tool representations of assigned user
+      _pick_service = PickService.get_service(scenegraphs[0])
+
+      # request the picks of all tool representations of the assigned user at once to have them tested in one batch
+      _requests = []
+
       for _tool_repr in self.tool_representations:
 
         if _tool_repr.user_id == self.assigned_user.id:
-        
-          # compute pick result for current tool representation
+          _requests.append( (_tool_repr, self.request_pick(_tool_repr.get_world_transform())) )
+
+      # collect the picks per user representation to test their visibility in one batch per representation
+      _user_repr_picks = collections.OrderedDict()
+
+      for _tool_repr, _key in _requests:
+
+        # compute pick result for current tool representation
+        _pick_results = _pick_service.get_result(_key)
 
-          _world_transform = _tool_repr.get_world_transform()
-          _mf_pick_result = self.compute_pick_result(_world_transform)
+        # if a pick was found
+        if len(_pick_results) > 0:
 
-          # if a pick was found
-          if len(_mf_pick_result.value) > 0:
+          _pick_result = _pick_results[0]
+          _pick_world_position = _pick_result.Object.value.WorldTransform.value * _pick_result.Position.value
+          _pick_world_position = avango.gua.Vec3(_pick_world_position.x, _pick_world_position.y, _pick_world_position.z)
 
-            _pick_result = _mf_pick_result.value[0]
-            _pick_world_position = _pick_result.Object.value.WorldTransform.value * _pick_result.Position.value
-            _pick_world_position = avango.gua.Vec3(_pick_world_position.x, _pick_world_position.y, _pick_world_position.z)
-            
-            # is pick in frustum of user?
-            _user_repr = self.assigned_user.get_user_representation_at(_tool_repr.DISPLAY_GROUP.id)
-            _pick_visible = False
+          _user_repr = self.assigned_user.get_user_representation_at(_tool_repr.DISPLAY_GROUP.id)
+          _user_repr_picks.setdefault(_user_repr, []).append( (_pick_result, _tool_repr, _pick_world_position) )
 
-            _user_head_mat = _user_repr.head.WorldTransform.value
-            _user_nav_mat = _user_repr.view_transform_node.Transform.value
+      for _user_repr, _picks in _user_repr_picks.items():
 
-            # pick is visible when visible in one of the display group's screens
-            for _screen in _user_repr.screens:
+        # is pick in frustum of user?
+        # pick is visible when visible in one of the display group's screens
+        _user_nav_mat = _user_repr.view_transform_node.Transform.value
+        _picks_visible = RayPointer.frustum_cache.are_visible_for([_pick[2] for _pick in _picks], _user_repr)
 
-              if self.is_inside_frustum(_pick_world_position
-                                      , _user_head_mat
-                                      , _user_nav_mat
-                                      , _screen) == True:
-                _pick_visible = True
-                break
+        for (_pick_result, _tool_repr, _pick_world_position), _pick_visible in zip(_picks, _picks_visible):
 
-            # append to candidate list if visible
-            if _pick_visible:
+          # append to candidate list if visible
+          if _pick_visible:
 
-              _tool_world_transform = _tool_repr.tool_transform_node.WorldTransform.value
+            _tool_world_transform = _tool_repr.tool_transform_node.WorldTransform.value
 
-              _intersection_in_nav_space = avango.gua.make_inverse_mat(_tool_world_transform) * \
-                                           (avango.gua.make_trans_mat(_pick_world_position) * \
-                                           avango.gua.make_scale_mat(_user_nav_mat.get_scale() * -1))
+            _intersection_in_nav_space = avango.gua.make_inverse_mat(_tool_world_transform) * \
+                                         (avango.gua.make_trans_mat(_pick_world_position) * \
+                                         avango.gua.make_scale_mat(_user_nav_mat.get_scale() * -1))
 
-              _candidate_list.append( (_pick_result, _tool_repr, _intersection_in_nav_space) )
+            _candidate_list.append( (_pick_result, _tool_repr, _intersection_in_nav_space) )
 
     return _candidate_list
 
@@ -515,165 +545,3 @@ class RayPointer(Tool):
 
     if self.sf_pointer_button2.value == True:
       self.set_hierarchy_selection_level(max(self.hierarchy_selection_level - 1, -1))
-
-  ## Checks if a point is inside the viewing frustum of a user.
-  # @param POINT The point to be checked.
-  # @param USER_HEAD_WORLD_MAT The user's headtracking matrix in world coordinates.
-  # @param USER_NAV_WORLD_MAT The user's navigation matrix in world coordinates.
-  # @param SCREEN The screen to create the viewing frustum for. 
-  def is_inside_frustum(self, POINT, USER_HEAD_WORLD_MAT, USER_NAV_WORLD_MAT, SCREEN):
-    
-    _near_clip = SceneManager.current_near_clip
-    _far_clip = SceneManager.current_far_clip
-
-    # compute screen corner points
-    _screen_mat = SCREEN.WorldTransform.value
-    _screen_width = SCREEN.Width.value
-    _screen_height = SCREEN.Height.value
-    
-    _tl_pos = _screen_mat * avango.gua.Vec3(-_screen_width * 0.5, _screen_height * 0.5, 0.0)
-    _tr_pos = _screen_mat * avango.gua.Vec3(_screen_width * 0.5, _screen_height * 0.5, 0.0)
-    _bl_pos = _screen_mat * avango.gua.Vec3(-_screen_width * 0.5, -_screen_height * 0.5, 0.0)
-    _br_pos = _screen_mat * avango.gua.Vec3(_screen_width * 0.5, -_screen_height * 0.5, 0.0)
-
-    _tl_pos = avango.gua.Vec3(_tl_pos.x, _tl_pos.y, _tl_pos.z)
-    _tr_pos = avango.gua.Vec3(_tr_pos.x, _tr_pos.y, _tr_pos.z)    
-    _bl_pos = avango.gua.Vec3(_bl_pos.x, _bl_pos.y, _bl_pos.z)
-    _br_pos = avango.gua.Vec3(_br_pos.x, _br_pos.y, _br_pos.z)
-
-    # transform head matrix and corner points in screen coordinate system
-    _head_abs_mat = avango.gua.make_trans_mat(USER_HEAD_WORLD_MAT.get_translate()) * \
-                    avango.gua.make_rot_mat(USER_NAV_WORLD_MAT.get_rotate_scale_corrected()) * \
-                    avango.gua.make_rot_mat(SCREEN.Transform.value.get_rotate())
-    _inv_head_abs_mat = avango.gua.make_inverse_mat(_head_abs_mat)
-
-    _tl_pos_in_head_space = _inv_head_abs_mat * _tl_pos    
-    _tr_pos_in_head_space = _inv_head_abs_mat * _tr_pos
-    _bl_pos_in_head_space = _inv_head_abs_mat * _bl_pos
-    _br_pos_in_head_space = _inv_head_abs_mat * _br_pos
-
-    _tl_pos_in_head_space = avango.gua.Vec3(_tl_pos_in_head_space.x, _tl_pos_in_head_space.y, _tl_pos_in_head_space.z)
-    _tr_pos_in_head_space = avango.gua.Vec3(_tr_pos_in_head_space.x, _tr_pos_in_head_space.y, _tr_pos_in_head_space.z)
-    _bl_pos_in_head_space = avango.gua.Vec3(_bl_pos_in_head_space.x, _bl_pos_in_head_space.y, _bl_pos_in_head_space.z)
-    _br_pos_in_head_space = avango.gua.Vec3(_br_pos_in_head_space.x, _br_pos_in_head_space.y, _br_pos_in_head_space.z)
-
-    _head_to_screen_distance = abs(_tl_pos_in_head_space.z)
-
-    # compute scaling factors for corner vectors
-    if _head_to_screen_distance == 0.0:
-      _head_to_screen_distance = 0.001
-
-    _tl_near_plane_scale_factor = (_tl_pos_in_head_space.length() * _near_clip) / _head_to_screen_distance
-    _tr_near_plane_scale_factor = (_tr_pos_in_head_space.length() * _near_clip) / _head_to_screen_distance
-    _bl_near_plane_scale_factor = (_bl_pos_in_head_space.length() * _near_clip) / _head_to_screen_distance
-    _br_near_plane_scale_factor = (_br_pos_in_head_space.length() * _near_clip) / _head_to_screen_distance
-    
-    _tl_far_plane_scale_factor = (_tl_pos_in_head_space.length() * _far_clip) / _head_to_screen_distance
-    _tr_far_plane_scale_factor = (_tr_pos_in_head_space.length() * _far_clip) / _head_to_screen_distance
-    _bl_far_plane_scale_factor = (_bl_pos_in_head_space.length() * _far_clip) / _head_to_screen_distance
-    _br_far_plane_scale_factor = (_br_pos_in_head_space.length() * _far_clip) / _head_to_screen_distance 
-    
-    _tl_pos_in_head_space.normalize()
-    _tr_pos_in_head_space.normalize()
-    _bl_pos_in_head_space.normalize()
-    _br_pos_in_head_space.normalize()
-
-    # compute near clip points
-    _tl_near_pos_in_head_space = _tl_pos_in_head_space * _tl_near_plane_scale_factor
-    _tr_near_pos_in_head_space = _tr_pos_in_head_space * _tr_near_plane_scale_factor
-    _bl_near_pos_in_head_space = _bl_pos_in_head_space * _bl_near_plane_scale_factor
-    _br_near_pos_in_head_space = _br_pos_in_head_space * _br_near_plane_scale_factor
-
-    _tl_near_world_pos = _head_abs_mat * _tl_near_pos_in_head_space
-    _tr_near_world_pos = _head_abs_mat * _tr_near_pos_in_head_space
-    _bl_near_world_pos = _head_abs_mat * _bl_near_pos_in_head_space
-    _br_near_world_pos = _head_abs_mat * _br_near_pos_in_head_space
-
-    _tl_near_world_pos = avango.gua.Vec3(_tl_near_world_pos.x, _tl_near_world_pos.y, _tl_near_world_pos.z)
-    _tr_near_world_pos = avango.gua.Vec3(_tr_near_world_pos.x, _tr_near_world_pos.y, _tr_near_world_pos.z)
-    _bl_near_world_pos = avango.gua.Vec3(_bl_near_world_pos.x, _bl_near_world_pos.y, _bl_near_world_pos.z)
-    _br_near_world_pos = avango.gua.Vec3(_br_near_world_pos.x, _br_near_world_pos.y, _br_near_world_pos.z)
-
-    # compute far clip points
-    _tl_far_pos_in_head_space = _tl_pos_in_head_space * _tl_far_plane_scale_factor
-    _tr_far_pos_in_head_space = _tr_pos_in_head_space * _tr_far_plane_scale_factor
-    _bl_far_pos_in_head_space = _bl_pos_in_head_space * _bl_far_plane_scale_factor
-    _br_far_pos_in_head_space = _br_pos_in_head_space * _br_far_plane_scale_factor
-
-    _tl_far_world_pos = _head_abs_mat * _tl_far_pos_in_head_space
-    _tr_far_world_pos = _head_abs_mat * _tr_far_pos_in_head_space
-    _bl_far_world_pos = _head_abs_mat * _bl_far_pos_in_head_space
-    _br_far_world_pos = _head_abs_mat * _br_far_pos_in_head_space
-
-    _tl_far_world_pos = avango.gua.Vec3(_tl_far_world_pos.x, _tl_far_world_pos.y, _tl_far_world_pos.z)
-    _tr_far_world_pos = avango.gua.Vec3(_tr_far_world_pos.x, _tr_far_world_pos.y, _tr_far_world_pos.z)
-    _bl_far_world_pos = avango.gua.Vec3(_bl_far_world_pos.x, _bl_far_world_pos.y, _bl_far_world_pos.z)
-    _br_far_world_pos = avango.gua.Vec3(_br_far_world_pos.x, _br_far_world_pos.y, _br_far_world_pos.z)
-
-    ## compute planes ##
-    _frustum_planes = []
-
-    # near plane
-    _v1 = _bl_near_world_pos - _br_near_world_pos
-    _v2 = _tl_near_world_pos - _bl_near_world_pos
-    _n = _v1.cross(_v2)
-    _n.normalize()
-    _d = - _n.dot(_br_near_world_pos)
-    _near_plane = (_n, _d)
-    _frustum_planes.append(_near_plane)
-
-    # far plane
-    _v1 = _br_far_world_pos - _bl_far_world_pos
-    _v2 = _tr_far_world_pos - _br_far_world_pos
-    _n = _v1.cross(_v2)
-    _n.normalize()
-    _d = - _n.dot(_bl_far_world_pos)
-    _far_plane = (_n, _d)
-    _frustum_planes.append(_far_plane)
-
-    # left plane
-    _v1 = _bl_far_world_pos - _bl_near_world_pos
-    _v2 = _tl_far_world_pos - _bl_far_world_pos
-    _n = _v1.cross(_v2)
-    _n.normalize()
-    _d = - _n.dot(_bl_near_world_pos)
-    _left_plane = (_n, _d)
-    _frustum_planes.append(_left_plane)
-
-    # right plane
-    _v1 = _br_near_world_pos - _br_far_world_pos
-    _v2 = _tr_near_world_pos - _br_near_world_pos
-    _n = _v1.cross(_v2)
-    _n.normalize()
-    _d = - _n.dot(_br_far_world_pos)
-    _right_plane = (_n, _d)
-    _frustum_planes.append(_right_plane)
-
-    # top plane
-    _v1 = _tr_near_world_pos - _tr_far_world_pos
-    _v2 = _tl_near_world_pos - _tr_near_world_pos
-    _n = _v1.cross(_v2)
-    _n.normalize()
-    _d = - _n.dot(_tr_far_world_pos)
-    _top_plane = (_n, _d)
-    _frustum_planes.append(_top_plane)
-
-    # bottom plane
-    _v1 = _bl_near_world_pos - _bl_far_world_pos
-    _v2 = _br_near_world_pos - _bl_near_world_pos
-    _n = _v1.cross(_v2)
-    _n.normalize()
-    _d = - _n.dot(_bl_far_world_pos)
-    _bottom_plane = (_n, _d)
-    _frustum_planes.append(_bottom_plane)
-
-    # determine realtion to planes (in front, behind)
-    for _plane in _frustum_planes:
-
-      _n = _plane[0]
-      _d = _plane[1]
-
-      if (_n.x * POINT.x + _n.y * POINT.y + _n.z * POINT.z + _d) < 0:
-        return False
-
-    return True
@@ -15,6 +15,8 @@ from ApplicationManager import *
 import Utilities
 from Scene import *
 from ConsoleIO import *
+from PipelineSettings import PipelineSettings
+from StationHub import StationHub
 
 from scene_config import scenegraphs
 from scene_config import scenes
@@ -225,8 +227,7 @@ class SceneManager(avango.script.Script):
 
     ## @var keyboard_sensor
     # Device sensor representing the keyboard attached to the computer.
-    self.keyboard_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.keyboard_sensor.Station.value = "device-keyboard0"
+    self.keyboard_sensor = StationHub.get_sensor("device-keyboard0")
 
     # init field connections
     if enable_key_bindings:
@@ -352,18 +353,42 @@ class SceneManager(avango.script.Script):
     if ID < len(self.scenes):
       self.active_scene = self.scenes[ID]
       self.active_scene.enable_scene(True)
-      self.pipeline_info_node.Name.value = self.active_scene.get_pipeline_value_string()
+      self.pipeline_info_node.Name.value = PipelineSettings.encode(self.active_scene.get_pipeline_settings())
 
       SceneManager.current_near_clip = self.active_scene.near_clip
       SceneManager.current_far_clip = self.active_scene.far_clip
 
+      _height_field = self.active_scene.get_height_field()
+
       # reset all navigations to starting position
       for _workspace in ApplicationManager.all_workspaces:
         for _display_group in _workspace.display_groups:
           for _nav in _display_group.navigations:
             _nav.reset()
+
+            # static navigations have no ground following
+            try:
+              _nav.groundfollowing.set_height_field(_height_field)
+            except AttributeError:
+              pass
   
       print("Switching to Scene: " + self.active_scene.name)
+
+  ## Changes a single pipeline setting of the active scene and distributes it to the clients.
+  # The clients only update the pipeline fields belonging to this setting.
+  # @param KEY The key of the setting as listed in PipelineSettings.schema, e.g. 'fog_end'.
+  # @param VALUE The new value of the setting.
+  def set_pipeline_setting(self, KEY, VALUE):
+
+    if KEY not in PipelineSettings.types:
+      print_warning("Unknown pipeline setting " + KEY + ".")
+      return
+
+    setattr(self.active_scene, KEY, VALUE)
+    self.pipeline_info_node.Name.value = PipelineSettings.encode(self.active_scene.get_pipeline_settings())
+
+    SceneManager.current_near_clip = self.active_scene.near_clip
+    SceneManager.current_far_clip = self.active_scene.far_clip
   
   ## Prints all the nodes of the active scene on the console.
   def print_active_scene(self):
@@ -0,0 +1,243 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes StationHub and TrackingStation.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+import avango.daemon
+from avango.script import field_has_changed
+
+# import framework libraries
+from TrackingPredictor import TrackingPredictor
+import Utilities
+
+# import python libraries
+import time
+
+
+## Owns the device sensors of all daemon stations read by the application and shares them among their readers.
+#
+# Sensors are created on first use, one per station name and pair of transmitter and receiver offsets, as the
+# offsets are applied by the sensor itself. Tracking values are processed by TrackingStation instances, one per
+# sensor, which compute the values derived from the tracking matrix once per update and pass them on to all
+# subscribed tracking readers by field connections. Stations can optionally smooth and extrapolate their tracking
+# values by a TrackingPredictor, configured per station name.
+class StationHub:
+
+  ## @var device_service
+  # DeviceService shared by all sensors. Created on first use.
+  device_service = None
+
+  ## @var sensors
+  # Dictionary mapping (station name, transmitter offset, receiver offset) keys to the device sensors created for them.
+  sensors = {}
+
+  ## @var tracking_stations
+  # Dictionary mapping (station name, transmitter offset, receiver offset) keys to the TrackingStation instances created for them.
+  tracking_stations = {}
+
+  ## @var prediction_settings
+  # Dictionary mapping station names to the (look-ahead, smoothing) tuples of the tracking predictions configured for them.
+  prediction_settings = {}
+
+  ## Returns the key of a station and its offsets. Matrices are represented by the tuples of their elements.
+  # @param STATION_NAME The station name as chosen in daemon.
+  # @param TRANSMITTER_OFFSET The transmitter offset of the sensor or None to keep the sensor's default.
+  # @param RECEIVER_OFFSET The receiver offset of the sensor or None to keep the sensor's default.
+  @staticmethod
+  def get_key(STATION_NAME, TRANSMITTER_OFFSET, RECEIVER_OFFSET):
+
+    _offsets = []
+
+    for _offset in [TRANSMITTER_OFFSET, RECEIVER_OFFSET]:
+
+      if _offset == None:
+        _offsets.append(None)
+      else:
+        _offsets.append(tuple(_offset.get_element(_row, _column) for _row in range(4) for _column in range(4)))
+
+    return (STATION_NAME, _offsets[0], _offsets[1])
+
+  ## Returns the device sensor of a station, creating it on first use.
+  # @param STATION_NAME The station name as chosen in daemon.
+  # @param TRANSMITTER_OFFSET The transmitter offset to be applied by the sensor or None to keep the sensor's default.
+  # @param RECEIVER_OFFSET The receiver offset to be applied by the sensor or None to keep the sensor's default.
+  @staticmethod
+  def get_sensor(STATION_NAME, TRANSMITTER_OFFSET = None, RECEIVER_OFFSET = None):
+
+    _key = StationHub.get_key(STATION_NAME, TRANSMITTER_OFFSET, RECEIVER_OFFSET)
+    _sensor = StationHub.sensors.get(_key)
+
+    if _sensor == None:
+
+      if StationHub.device_service == None:
+        StationHub.device_service = avango.daemon.DeviceService()
+
+      _sensor = avango.daemon.nodes.DeviceSensor(DeviceService = StationHub.device_service)
+      _sensor.Station.value = STATION_NAME
+
+      if TRANSMITTER_OFFSET != None:
+        _sensor.TransmitterOffset.value = TRANSMITTER_OFFSET
+
+      if RECEIVER_OFFSET != None:
+        _sensor.ReceiverOffset.value = RECEIVER_OFFSET
+
+      StationHub.sensors[_key] = _sensor
+
+    return _sensor
+
+  ## Returns the TrackingStation of a tracking target and registers a subscriber for it.
+  # @param STATION_NAME The target name of the tracked object as chosen in daemon.
+  # @param TRANSMITTER_OFFSET The transmitter offset to be applied.
+  # @param RECEIVER_OFFSET The receiver offset to be applied.
+  @staticmethod
+  def subscribe_tracking(STATION_NAME, TRANSMITTER_OFFSET, RECEIVER_OFFSET):
+
+    _key = StationHub.get_key(STATION_NAME, TRANSMITTER_OFFSET, RECEIVER_OFFSET)
+    _station = StationHub.tracking_stations.get(_key)
+
+    if _station == None:
+      _station = TrackingStation()
+      _station.my_constructor(_key, StationHub.get_sensor(STATION_NAME, TRANSMITTER_OFFSET, RECEIVER_OFFSET))
+      StationHub.tracking_stations[_key] = _station
+
+    _station.num_subscribers += 1
+    return _station
+
+  ## Configures the prediction of the tracking values of a station, for its existing and all future TrackingStation instances.
+  # @param STATION_NAME The target name of the tracked object as chosen in daemon.
+  # @param LOOK_AHEAD Time in seconds the tracking values are extrapolated into the future or None to disable the prediction.
+  # @param SMOOTHING Smoothing parameter in [0, 1) of the TrackingPredictor. 0 disables the smoothing.
+  @staticmethod
+  def set_prediction(STATION_NAME, LOOK_AHEAD, SMOOTHING = 0.0):
+
+    if LOOK_AHEAD == None:
+      StationHub.prediction_settings.pop(STATION_NAME, None)
+    else:
+      StationHub.prediction_settings[STATION_NAME] = (LOOK_AHEAD, SMOOTHING)
+
+    for _key, _station in StationHub.tracking_stations.items():
+
+      if _key[0] == STATION_NAME:
+        _station.set_prediction(LOOK_AHEAD, SMOOTHING)
+
+  ## Unregisters a subscriber of a TrackingStation. The station and its sensor are released with the last subscriber.
+  # @param STATION The TrackingStation returned by subscribe_tracking.
+  @staticmethod
+  def unsubscribe_tracking(STATION):
+
+    STATION.num_subscribers -= 1
+
+    if STATION.num_subscribers > 0:
+      return
+
+    STATION.sf_tracking_mat.disconnect()
+    del StationHub.tracking_stations[STATION.key]
+    del StationHub.sensors[STATION.key]
+
+
+## Processes the tracking values of one device sensor for all tracking readers subscribed to it.
+class TrackingStation(avango.script.Script):
+
+  # input field
+  ## @var sf_tracking_mat
+  # Matrix read from the device sensor.
+  sf_tracking_mat = avango.gua.SFMatrix4()
+  sf_tracking_mat.value = avango.gua.make_identity_mat()
+
+  # output fields
+  ## @var sf_abs_mat
+  # The absolute matrix read from the tracking system.
+  sf_abs_mat = avango.gua.SFMatrix4()
+  sf_abs_mat.value = avango.gua.make_identity_mat()
+
+  ## @var sf_abs_vec
+  # Just the translation vector read from the tracking system.
+  sf_abs_vec = avango.gua.SFVec3()
+  sf_abs_vec.value = avango.gua.Vec3(0.0, 0.0, 0.0)
+
+  ## @var sf_global_mat
+  # Tracking matrix without the consideration of the transmitter offset.
+  sf_global_mat = avango.gua.SFMatrix4()
+  sf_global_mat.value = avango.gua.make_identity_mat()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(TrackingStation).__init__()
+
+  ## Custom constructor.
+  # @param KEY The key of the station in StationHub.
+  # @param SENSOR The device sensor to read the tracking values from.
+  def my_constructor(self, KEY, SENSOR):
+
+    ## @var key
+    # The key of the station in StationHub.
+    self.key = KEY
+
+    ## @var sensor
+    # The device sensor to read the tracking values from.
+    self.sensor = SENSOR
+
+    ## @var inverse_transmitter_offset
+    # Inverse of the sensor's transmitter offset, which is constant for a station.
+    self.inverse_transmitter_offset = avango.gua.make_inverse_mat(SENSOR.TransmitterOffset.value)
+
+    ## @var yaw
+    # Yaw angle of the current tracking matrix. None if not computed since the last update.
+    self.yaw = None
+
+    ## @var num_subscribers
+    # Number of tracking readers subscribed to this station.
+    self.num_subscribers = 0
+
+    ## @var predictor
+    # TrackingPredictor applied to the tracking values. None if the prediction is disabled.
+    self.predictor = None
+
+    _settings = StationHub.prediction_settings.get(KEY[0])
+
+    if _settings != None:
+      self.set_prediction(_settings[0], _settings[1])
+
+    self.sf_tracking_mat.connect_from(SENSOR.Matrix)
+
+  ## Stops reading the device sensor. Afterwards, the station only processes the matrices written to sf_tracking_mat,
+  # e.g. by the InputReplayer.
+  def detach_sensor(self):
+    self.sf_tracking_mat.disconnect()
+
+  ## Enables or disables the prediction of the tracking values.
+  # @param LOOK_AHEAD Time in seconds the tracking values are extrapolated into the future or None to disable the prediction.
+  # @param SMOOTHING Smoothing parameter in [0, 1) of the TrackingPredictor.
+  def set_prediction(self, LOOK_AHEAD, SMOOTHING):
+
+    if LOOK_AHEAD == None:
+      self.predictor = None
+    else:
+      self.predictor = TrackingPredictor()
+      self.predictor.my_constructor(LOOK_AHEAD, SMOOTHING)
+
+  ## Called whenever sf_tracking_mat changes.
+  @field_has_changed(sf_tracking_mat)
+  def sf_tracking_mat_changed(self):
+
+    _mat = self.sf_tracking_mat.value
+
+    if self.predictor != None:
+      _mat = self.predictor.update(_mat, time.time())
+
+    self.sf_abs_mat.value = _mat
+    self.sf_global_mat.value = self.inverse_transmitter_offset * _mat
+    self.sf_abs_vec.value = _mat.get_translate()
+    self.yaw = None
+
+  ## Returns the yaw angle of the current tracking matrix. Computed on the first call after an update.
+  def get_yaw(self):
+
+    if self.yaw == None:
+      self.yaw = Utilities.get_yaw(self.sf_abs_mat.value)
+
+    return self.yaw
@@ -13,6 +13,7 @@ import avango.daemon
 # import framework libraries
 from ApplicationManager import *
 from VisibilityHandler import *
+from NodeRegistry import NodeRegistry
 from TrackingReader import TrackingTargetReader
 import Utilities
 
@@ -53,7 +54,7 @@ class ToolRepresentation(avango.script.Script):
 
     ## @var workspace_id
     # Identification number of the workspace in which TOOL_INSTANCE is active.
-    self.workspace_id = int(self.USER_REPRESENTATION.view_transform_node.Name.value.split("_")[0].replace("w", ""))
+    self.workspace_id = NodeRegistry.get_key(self.USER_REPRESENTATION.view_transform_node.Name.value)[0]
 
 
     ## @var tool_transform_node
@@ -166,21 +167,7 @@ class Tool(VisibilityHandler2D):
 
     _assigned_user_before = self.assigned_user
 
-    _closest_user = None
-    _closest_distance = 1000
-
-    for _user in self.WORKSPACE_INSTANCE.users:
-
-      if _user.is_active:
-
-
-        _dist = Utilities.compute_point_to_line_distance( self.tracking_reader.sf_abs_vec.value
-                                                        , _user.headtracking_reader.sf_abs_vec.value
-                                                        , avango.gua.Vec3(0, -1, 0) )
-
-        if _dist < _closest_distance:
-          _closest_distance = _dist
-          _closest_user = _user
+    _closest_user = self.WORKSPACE_INSTANCE.user_index.get_nearest_user(self.tracking_reader.sf_abs_vec.value, 1000)
 
     if _closest_user != self.assigned_user:
       self.assign_user(_closest_user)
@@ -222,61 +209,4 @@ class Tool(VisibilityHandler2D):
   # @param DISPLAY_GROUP The DisplayGroup to be handled.
   def handle_correct_visibility_groups_for(self, DISPLAY_GROUP):
 
-    #print "display group", DISPLAY_GROUP
-
-    # All ToolRepresentation instances at DISPLAY_GROUP
-    _tool_reprs_at_display_group = []
-
-    # ToolRepresentation instance belonging to the assigned user at DISPLAY_GROUP
-    _tool_repr_of_assigned_user = None
-
-    # display group instance belonging to DISPLAY_GROUP
-    _handled_display_group_instance = DISPLAY_GROUP
-
-    ## fill the variables ##
-    for _tool_repr in self.tool_representations:
-
-      # get all tool representations in display group
-      if _tool_repr.DISPLAY_GROUP == DISPLAY_GROUP:
-        _tool_reprs_at_display_group.append(_tool_repr)
-
-        # find tool representation of assigned user
-        if _tool_repr.USER_REPRESENTATION.USER == self.assigned_user:
-          _tool_repr_of_assigned_user = _tool_repr
-
-    ## determine which group names have to be added to the tool representations ##
-    _assigned_user_tool_visible_for = []
-
-    for _tool_repr in _tool_reprs_at_display_group:
-
-      # check for navigation of corresponding user and compare it to assigned user
-
-      # reset initial GroupName state
-      _tool_repr.reset_visualization_group_names()
-
-      # if user does not share the assigned user's navigation, hide the tool representation
-      if _tool_repr.USER_REPRESENTATION.connected_navigation_id != _tool_repr_of_assigned_user.USER_REPRESENTATION.connected_navigation_id:
-        _tool_repr.append_to_visualization_group_names("do_not_display_group")
-        _assigned_user_tool_visible_for.append(_tool_repr.USER_REPRESENTATION.view_transform_node.Name.value)
-
-    # check for all user representations outside the handled display group
-    for _user_repr in ApplicationManager.all_user_representations:
-      if _user_repr.DISPLAY_GROUP != _handled_display_group_instance:
-
-        # consider visibility table
-        _handled_display_group_tag = _handled_display_group_instance.visibility_tag
-        _user_repr_display_group_tag = _user_repr.DISPLAY_GROUP.visibility_tag
-        
-        _visible = self.visibility_table[_user_repr_display_group_tag][_handled_display_group_tag]
-
-        #print "Does", _user_repr.view_transform_node.Name.value, "(", _user_repr_display_group_tag, ") see"
-        #, _handled_display_group_tag, "?", _visible
-        if _visible:
-          if _user_repr.view_transform_node.Name.value == "scene_matrix":
-            _assigned_user_tool_visible_for.append(_user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value)
-          else:
-            _assigned_user_tool_visible_for.append(_user_repr.view_transform_node.Name.value)
-
-    # make tool holder tool representation visible for all others on different navigations and display groups
-    for _string in _assigned_user_tool_visible_for:
-      _tool_repr_of_assigned_user.append_to_visualization_group_names(_string)
\ No newline at end of file
+    ApplicationManager.visibility_engine.update_tool_rows(self, self.visibility_table, DISPLAY_GROUP)
@@ -6,24 +6,27 @@
 # import avango-guacamole libraries
 import avango
 import avango.gua
+import avango.script
 
 # import framework libraries
 import Utilities
+from DistributionPolicy import DistributionPolicy
+from TracePoints import TracePoints
 from scene_config import scenegraphs
 
-# import python libraries
-import time
-
 ## Class which handles the creation and updating of the trace lines.
 #
-# Is used by Navigation instances to draw the trace of their movement.
+# Is used by Navigation instances to draw the trace of their movement. The trace points are kept
+# in a fixed-size ring buffer, which is distributed as a whole in the name of a single info node encoded
+# by TracePoints. The info node is renamed at most once per frame, so adding points distributes a single
+# string. The line segment geometry is rebuilt on client side by ClientTrace instances.
 class Trace:
 
   ## Default constructor.
-  # @param IDENTIFIER A string that is appended to the scene graph name to separate the line segments of multiple instances of this class.
+  # @param IDENTIFIER A string that is appended to the scene graph name to separate the traces of multiple instances of this class.
   # @param NUM_LINES The number of line segments to be used.
   # @param LINE_DISTANCE The overall distance of all line segments together. Determines how long the trace lines are kept before they are overwritten.
-  # @param INITIAL_MAT This matrix is used as initial position of all line segments.
+  # @param INITIAL_MAT This matrix is used as initial position of all trace points.
   # @param TRACE_MATERIAL The material to be used to display the trace.
   def __init__(self, IDENTIFIER, NUM_LINES, LINE_DISTANCE, INITIAL_MAT, TRACE_MATERIAL):
 
@@ -34,83 +37,80 @@ class Trace:
     ## @var distance_trigger
     # After this distance a new line segment is created. This value is calculated with the given parameters and determines the resolution the trace line.
     self.distance_trigger = LINE_DISTANCE / NUM_LINES
-    
-    ## @var lines
-    # A list of scene graph nodes where each respresents a line segment.
-    self.lines  = []
 
     ## @var line_thickness
     # Thickness of the trace lines in meters.
     self.line_thickness = 0.1
 
-    ## @var transform_node
-    # A transform node that is the parent of all line segments. It groups the line segments in the scene graph as the given identifier is added to its name and therefore allows multiple instances of this class.
-    self.transform_node = avango.gua.nodes.TransformNode(Name = 'nav_trace_' + str(IDENTIFIER))
-    #self.transform_node = avango.gua.nodes.TransformNode(Name = 'nav_trace_' + str(0))
-    scenegraphs[0]["/net"].distribute_object(self.transform_node)
-    scenegraphs[0]["/net"].Children.value.append(self.transform_node)
+    ## @var trace_material
+    # The material to be used to display the trace.
+    self.trace_material = TRACE_MATERIAL
 
-    # create each line segment node by loading the geometry and appending it to the parent node
-    _loader = avango.gua.nodes.TriMeshLoader()
-    for i in range(self.num_lines):
-      _line = _loader.create_geometry_from_file('line_geometry_' + str(i), 'data/objects/cube.obj', 'data/materials/' + TRACE_MATERIAL + '.gmd', avango.gua.LoaderFlags.DEFAULTS)
-      _line.Transform.value = avango.gua.make_scale_mat(0, 0, 0)
-      _line.ShadowMode.value = avango.gua.ShadowMode.OFF
-      scenegraphs[0]["/net"].distribute_object(_line)
-      self.lines.append(_line)
-
-    # append all line segments to the transform_node that groups the tracing lines of different platforms.
-    self.transform_node.Children.value = self.lines
+    ## @var points
+    # Ring buffer of NUM_LINES + 1 trace points. Each point except the oldest one is the end point
+    # of a line segment starting at its predecessor. Initialized with the translation of INITIAL_MAT.
+    self.points = [INITIAL_MAT.get_translate() for _i in range(self.num_lines + 1)]
 
     ## @var crrnt_idx
-    # The index of the current point in the list of lines.
+    # The index of the newest point in the ring buffer.
     self.crrnt_idx = 0
 
-    ## @var crrnt_point
-    # The end point of the last drawn line segment that is used as start point for the next line segment. It is initialized with the translation of the INITIAL_MATRIX parameter.
-    self.crrnt_point = INITIAL_MAT.get_translate()
+    ## @var points_changed
+    # Boolean indicating if the ring buffer changed since the info node was written the last time.
+    self.points_changed = False
 
-  ## Appends a string to the GroupNames field of all line segments.
-  def append_to_group_names(self, STRING):
+    ## @var transform_node
+    # A transform node that groups the trace in the scene graph as the given identifier is added to its name and therefore allows multiple instances of this class.
+    # Its GroupNames are applied to the line segments on client side.
+    self.transform_node = avango.gua.nodes.TransformNode(Name = 'nav_trace_' + str(IDENTIFIER))
+    DistributionPolicy.distribute_node(scenegraphs[0]["/net"], self.transform_node, DistributionPolicy.CLIENT_RECONSTRUCTIBLE)
 
-    for _line in self.lines:
-      _line.GroupNames.value.append(STRING)
+    ## @var points_node
+    # Info node whose name carries the trace settings and the ring buffer of trace points to the clients.
+    self.points_node = avango.gua.nodes.TransformNode(Name = self.get_info_string())
+    DistributionPolicy.distribute_node(scenegraphs[0]["/net"], self.points_node, DistributionPolicy.CLIENT_RECONSTRUCTIBLE)
+    self.transform_node.Children.value.append(self.points_node)
 
+    scenegraphs[0]["/net"].Children.value.append(self.transform_node)
 
-  ## Calculates the transformation matrix of a line segment node in the scene graph.
-  def calc_transform_mat(self, START_VEC, END_VEC):
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
 
-    # calc the vector in between the two points, the resulting center of the line segment and the scaling needed to connect both points
-    _vec = avango.gua.Vec3( END_VEC.x - START_VEC.x, END_VEC.y - START_VEC.y, END_VEC.z - START_VEC.z)
-    _center = START_VEC + (_vec * 0.5)
-    _scale  = 0.5 * _vec.length()
+  ## Returns the newest point of the trace, being the start point of the next line segment.
+  def get_current_point(self):
+    return self.points[self.crrnt_idx]
 
-    # calc the rotation according negative z-axis
-    _rotation_mat = Utilities.get_rotation_between_vectors(avango.gua.Vec3(0, 0, -1), _vec)
+  ## Encodes the trace settings and the ring buffer into the string distributed by points_node.
+  def get_info_string(self):
+    return TracePoints.encode(self.trace_material, self.line_thickness, self.crrnt_idx, self.points)
 
-    # build the complete matrix
-    return avango.gua.make_trans_mat(_center) * _rotation_mat * avango.gua.make_scale_mat(self.line_thickness, self.line_thickness, _scale * 2.0)
+  ## Appends a string to the GroupNames field of the trace. The field is reassigned to notify the connected clients.
+  def append_to_group_names(self, STRING):
+    self.transform_node.GroupNames.value = self.transform_node.GroupNames.value + [STRING]
 
   ## Clears the traces and starts drawing again from the current position.
   def clear(self, CURRENT_MAT):
-    _clear_transform_mat = self.calc_transform_mat(CURRENT_MAT.get_translate(), CURRENT_MAT.get_translate())
 
-    for _line in self.lines:
-      _line.Transform.value = _clear_transform_mat
+    self.points = [CURRENT_MAT.get_translate() for _i in range(self.num_lines + 1)]
+    self.points_changed = True
 
-    self.crrnt_point = CURRENT_MAT.get_translate()
-
-  ## Update function that updates the point list whenever the time_offset was reached.
+  ## Update function that adds a point to the ring buffer whenever the distance trigger was reached.
   def update(self, ABS_MAT):
 
-    # only update when time_offset is reached
-    if Utilities.euclidean_distance(ABS_MAT.get_translate(), self.crrnt_point) > self.distance_trigger:
+    _pos = ABS_MAT.get_translate()
+
+    # only update when distance trigger is reached
+    if Utilities.euclidean_distance(_pos, self.get_current_point()) > self.distance_trigger:
+
+      # overwrite the oldest point
+      self.crrnt_idx = (self.crrnt_idx + 1) % len(self.points)
+      self.points[self.crrnt_idx] = _pos
+      self.points_changed = True
 
-      # increase index counter
-      self.crrnt_idx = (self.crrnt_idx + 1) % self.num_lines
+  ## Evaluated every frame. Distributes the changed ring buffer at most once per frame.
+  def frame_callback(self):
 
-      # set line segment's transform matrix
-      self.lines[self.crrnt_idx].Transform.value = self.calc_transform_mat(self.crrnt_point, ABS_MAT.get_translate())
-      
-      # set current position as new start point for the next line segment
-      self.crrnt_point = ABS_MAT.get_translate()
+    if self.points_changed:
+      self.points_changed = False
+      self.points_node.Name.value = self.get_info_string()
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+## @file
+# Contains class TracePoints.
+
+## Compact description of a navigation trace distributed from the server to the clients.
+#
+# The server distributes the whole ring buffer of trace points in the name of a single info node, storing
+# "<material>#<thickness>#<index of the newest point>#<points>". The points are given in ring buffer order
+# in millimeters, the first one absolute and each further one relative to its predecessor, as comma separated
+# integer coordinates separated by ';'. As consecutive trace points are close to each other, most of the
+# differences are short numbers.
+class TracePoints:
+
+  ## Returns the description string of a trace.
+  # @param MATERIAL Material string to be used for the line segments.
+  # @param THICKNESS Thickness of the line segments in meters.
+  # @param CRRNT_IDX Index of the newest point in the ring buffer.
+  # @param POINTS List of the points of the ring buffer.
+  @staticmethod
+  def encode(MATERIAL, THICKNESS, CRRNT_IDX, POINTS):
+
+    _strings = []
+    _last = (0, 0, 0)
+
+    for _point in POINTS:
+
+      _quantized = (int(round(_point.x * 1000.0)), int(round(_point.y * 1000.0)), int(round(_point.z * 1000.0)))
+      _strings.append(str(_quantized[0] - _last[0]) + "," + str(_quantized[1] - _last[1]) + "," + str(_quantized[2] - _last[2]))
+      _last = _quantized
+
+    return "#".join([MATERIAL, str(THICKNESS), str(CRRNT_IDX), ";".join(_strings)])
+
+  ## Returns a (material, thickness, index of the newest point, points) tuple for a description string or None
+  # if the string is invalid. The points are given as list of (x, y, z) tuples in meters.
+  # @param STRING The description string to be decoded.
+  @staticmethod
+  def decode(STRING):
+
+    _splitted_string = STRING.split("#")
+
+    if len(_splitted_string) != 4:
+      return None
+
+    try:
+      _points = []
+      _x = _y = _z = 0
+
+      for _string in _splitted_string[3].split(";"):
+        _dx, _dy, _dz = _string.split(",")
+        _x += int(_dx)
+        _y += int(_dy)
+        _z += int(_dz)
+        _points.append((_x * 0.001, _y * 0.001, _z * 0.001))
+
+      _crrnt_idx = int(_splitted_string[2])
+
+      if len(_points) < 2 or _crrnt_idx < 0 or _crrnt_idx >= len(_points):
+        return None
+
+      return (_splitted_string[0], float(_splitted_string[1]), _crrnt_idx, _points)
+
+    except ValueError:
+      return None
@@ -0,0 +1,209 @@
+#!/usr/bin/python
+
+## @file
+# Contains class TrackingPredictor.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import python libraries
+import math
+
+
+## Smooths tracking matrices and extrapolates them into the future to compensate the latency between tracking and display.
+#
+# Position and orientation are filtered separately by critically damped alpha-beta filters, the steady-state form of
+# a constant-velocity Kalman filter. Each filter keeps an estimate of the value and its velocity, the angular velocity
+# being a rotation vector in world coordinates. The smoothing parameter trades jitter suppression for responsiveness:
+# 0 passes the measurements through unfiltered and estimates the velocities by finite differences. The returned
+# matrix is the filtered one extrapolated by the look-ahead time with constant velocities.
+class TrackingPredictor:
+
+  ## @var max_sample_interval
+  # Time in seconds between two samples after which the tracking is assumed to have been lost and the filters are reset.
+  max_sample_interval = 0.5
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param LOOK_AHEAD Time in seconds the tracking matrices are extrapolated into the future.
+  # @param SMOOTHING Smoothing parameter in [0, 1). Larger values suppress more jitter but react slower to changes of the motion.
+  def my_constructor(self, LOOK_AHEAD, SMOOTHING = 0.0):
+
+    ## @var look_ahead
+    # Time in seconds the tracking matrices are extrapolated into the future.
+    self.look_ahead = LOOK_AHEAD
+
+    ## @var alpha
+    # Weight of the residual in the correction of the filtered values.
+    self.alpha = 1.0 - SMOOTHING * SMOOTHING
+
+    ## @var beta
+    # Weight of the residual in the correction of the velocities.
+    self.beta = (1.0 - SMOOTHING) * (1.0 - SMOOTHING)
+
+    self.reset()
+
+  ## Discards the filter state. The next sample is passed through unchanged.
+  def reset(self):
+
+    ## @var position
+    # Filtered position as [x, y, z] list. None if no sample was filtered yet.
+    self.position = None
+
+    ## @var velocity
+    # Estimated velocity in units per second as [x, y, z] list.
+    self.velocity = [0.0, 0.0, 0.0]
+
+    ## @var orientation
+    # Filtered orientation as (x, y, z, w) quaternion tuple.
+    self.orientation = None
+
+    ## @var angular_velocity
+    # Estimated angular velocity as rotation vector in radians per second.
+    self.angular_velocity = [0.0, 0.0, 0.0]
+
+    ## @var last_time
+    # Time of the last sample in seconds.
+    self.last_time = None
+
+    ## @var last_sample
+    # Position and orientation components of the last sample, used to detect repeated samples.
+    self.last_sample = None
+
+  ## Filters a new tracking sample and returns the predicted tracking matrix.
+  # @param MATRIX The measured tracking matrix. Assumed to be a rigid transformation.
+  # @param TIME The time of the measurement in seconds.
+  def update(self, MATRIX, TIME):
+
+    _translation = MATRIX.get_translate()
+    _rotation = MATRIX.get_rotate()
+    _sample = (_translation.x, _translation.y, _translation.z, _rotation.x, _rotation.y, _rotation.z, _rotation.w)
+
+    # sensors may repeat the last sample until a new one arrives, which is not to be filtered again
+    if _sample == self.last_sample:
+      return self.predict(self.look_ahead + TIME - self.last_time)
+
+    self.last_sample = _sample
+
+    _measured_position = _sample[0:3]
+    _measured_orientation = TrackingPredictor.normalize_quat(_sample[3:7])
+
+    if self.last_time == None or TIME - self.last_time <= 0.0 or TIME - self.last_time > TrackingPredictor.max_sample_interval:
+
+      self.reset()
+      self.last_sample = _sample
+      self.position = list(_measured_position)
+      self.orientation = _measured_orientation
+      self.last_time = TIME
+      return self.predict(self.look_ahead)
+
+    _dt = TIME - self.last_time
+    self.last_time = TIME
+
+    # position
+    for _i in range(3):
+
+      _predicted = self.position[_i] + self.velocity[_i] * _dt
+      _residual = _measured_position[_i] - _predicted
+
+      self.position[_i] = _predicted + self.alpha * _residual
+      self.velocity[_i] += self.beta * _residual / _dt
+
+    # orientation, residual as rotation vector from the predicted to the measured orientation
+    _predicted_orientation = TrackingPredictor.rotate_quat(self.orientation, self.angular_velocity, _dt)
+    _residual = TrackingPredictor.get_rotation_vector(TrackingPredictor.multiply_quats(_measured_orientation, TrackingPredictor.conjugate_quat(_predicted_orientation)))
+
+    self.orientation = TrackingPredictor.rotate_quat(_predicted_orientation, _residual, self.alpha)
+    self.angular_velocity = [_omega + self.beta * _r / _dt for _omega, _r in zip(self.angular_velocity, _residual)]
+
+    return self.predict(self.look_ahead)
+
+  ## Returns the filtered tracking matrix extrapolated by a time span.
+  # @param TIME_SPAN Time in seconds to extrapolate the filtered values by.
+  def predict(self, TIME_SPAN):
+
+    _position = [_p + _v * TIME_SPAN for _p, _v in zip(self.position, self.velocity)]
+    _orientation = TrackingPredictor.rotate_quat(self.orientation, self.angular_velocity, TIME_SPAN)
+
+    return avango.gua.make_trans_mat(_position[0], _position[1], _position[2]) * TrackingPredictor.make_rot_mat(_orientation)
+
+  ## Returns a quaternion rotated by a rotation vector scaled by a factor, i.e. by the angular velocity over a time span.
+  # @param QUAT The (x, y, z, w) quaternion tuple to be rotated.
+  # @param ROTATION_VECTOR The rotation vector in world coordinates as list of three numbers.
+  # @param FACTOR The factor the rotation vector is scaled with.
+  @staticmethod
+  def rotate_quat(QUAT, ROTATION_VECTOR, FACTOR):
+
+    _angle = math.sqrt(sum([_v * _v for _v in ROTATION_VECTOR])) * FACTOR
+
+    if abs(_angle) < 1e-12:
+      return QUAT
+
+    _s = math.sin(_angle / 2.0) * FACTOR / _angle
+    _rotation = (ROTATION_VECTOR[0] * _s, ROTATION_VECTOR[1] * _s, ROTATION_VECTOR[2] * _s, math.cos(_angle / 2.0))
+
+    return TrackingPredictor.normalize_quat(TrackingPredictor.multiply_quats(_rotation, QUAT))
+
+  ## Returns the rotation vector of a quaternion, taking the shorter of the two equivalent rotations.
+  # @param QUAT The (x, y, z, w) quaternion tuple.
+  @staticmethod
+  def get_rotation_vector(QUAT):
+
+    _x, _y, _z, _w = QUAT
+
+    if _w < 0.0:
+      _x, _y, _z, _w = -_x, -_y, -_z, -_w
+
+    _s = math.sqrt(_x * _x + _y * _y + _z * _z)
+
+    if _s < 1e-12:
+      return [0.0, 0.0, 0.0]
+
+    _factor = 2.0 * math.atan2(_s, _w) / _s
+    return [_x * _factor, _y * _factor, _z * _factor]
+
+  ## Returns the product of two quaternions, i.e. the rotation B followed by A.
+  # @param A The first (x, y, z, w) quaternion tuple.
+  # @param B The second (x, y, z, w) quaternion tuple.
+  @staticmethod
+  def multiply_quats(A, B):
+
+    return ( A[3] * B[0] + A[0] * B[3] + A[1] * B[2] - A[2] * B[1]
+           , A[3] * B[1] - A[0] * B[2] + A[1] * B[3] + A[2] * B[0]
+           , A[3] * B[2] + A[0] * B[1] - A[1] * B[0] + A[2] * B[3]
+           , A[3] * B[3] - A[0] * B[0] - A[1] * B[1] - A[2] * B[2] )
+
+  ## Returns the conjugate of a quaternion, which is the inverse rotation of a unit quaternion.
+  # @param QUAT The (x, y, z, w) quaternion tuple.
+  @staticmethod
+  def conjugate_quat(QUAT):
+    return (-QUAT[0], -QUAT[1], -QUAT[2], QUAT[3])
+
+  ## Returns a quaternion scaled to unit length.
+  # @param QUAT The (x, y, z, w) quaternion tuple.
+  @staticmethod
+  def normalize_quat(QUAT):
+
+    _length = math.sqrt(sum([_c * _c for _c in QUAT]))
+
+    if _length == 0.0:
+      return (0.0, 0.0, 0.0, 1.0)
+
+    return tuple([_c / _length for _c in QUAT])
+
+  ## Returns the rotation matrix of a quaternion.
+  # @param QUAT The (x, y, z, w) quaternion tuple.
+  @staticmethod
+  def make_rot_mat(QUAT):
+
+    _rotation_vector = TrackingPredictor.get_rotation_vector(QUAT)
+    _angle = math.sqrt(sum([_v * _v for _v in _rotation_vector]))
+
+    if _angle == 0.0:
+      return avango.gua.make_identity_mat()
+
+    return avango.gua.make_rot_mat(math.degrees(_angle), _rotation_vector[0] / _angle, _rotation_vector[1] / _angle, _rotation_vector[2] / _angle)
@@ -11,6 +11,7 @@ import avango.daemon
 from avango.script import field_has_changed
 
 # import framework libraries
+from StationHub import StationHub
 import Utilities
 
 # import python libraries
@@ -37,14 +38,11 @@ class TrackingReader(avango.script.Script):
 
 
 ## Reads tracking values of a device registered in daemon.
+#
+# The values are computed by a TrackingStation shared with all readers of the same target and offsets,
+# this reader only passes them on.
 class TrackingTargetReader(TrackingReader):
 
-  # internal field
-  ## @var sf_tracking_mat
-  # Field containing the tracked values used for evaluation purposes.
-  sf_tracking_mat = avango.gua.SFMatrix4()
-  sf_tracking_mat.value = avango.gua.make_identity_mat()
-
   ## Default constructor.
   def __init__(self):
     self.super(TrackingReader).__init__()
@@ -52,35 +50,74 @@ class TrackingTargetReader(TrackingReader):
   ## Custom constructor
   # @param TARGET_NAME The target name of the tracked object as chosen in daemon.
   def my_constructor(self, TARGET_NAME):
-    
-    ## @var tracking_sensor
-    # A device sensor to capture the tracking values.
-    self.tracking_sensor = avango.daemon.nodes.DeviceSensor(DeviceService = avango.daemon.DeviceService())
-    self.tracking_sensor.Station.value = TARGET_NAME
-
-    self.tracking_sensor.TransmitterOffset.value = avango.gua.make_trans_mat(0.0, 0.043, 1.6)
-    self.tracking_sensor.ReceiverOffset.value = avango.gua.make_identity_mat()
-
-    self.sf_tracking_mat.connect_from(self.tracking_sensor.Matrix)
-
-  ## Called whenever sf_tracking_mat changes.
-  @field_has_changed(sf_tracking_mat)
-  def sf_tracking_mat_changed(self):
-  
-    self.sf_abs_mat.value = self.tracking_sensor.Matrix.value
-    self.sf_global_mat.value = avango.gua.make_inverse_mat(self.tracking_sensor.TransmitterOffset.value) * self.tracking_sensor.Matrix.value
-    self.sf_abs_vec.value = self.sf_abs_mat.value.get_translate()
-    _yaw = Utilities.get_yaw(self.sf_abs_mat.value)
+
+    ## @var target_name
+    # The target name of the tracked object as chosen in daemon.
+    self.target_name = TARGET_NAME
+
+    ## @var transmitter_offset
+    # The transmitter offset applied to the tracking values.
+    self.transmitter_offset = avango.gua.make_trans_mat(0.0, 0.043, 1.6)
+
+    ## @var receiver_offset
+    # The receiver offset applied to the tracking values.
+    self.receiver_offset = avango.gua.make_identity_mat()
+
+    ## @var tracking_station
+    # TrackingStation supplying the tracking values. None if the reader is detached.
+    self.tracking_station = None
+
+    self.attach_station()
+
+  ## Subscribes to the TrackingStation of the target and offsets and connects the output fields to it.
+  def attach_station(self):
+
+    self.tracking_station = StationHub.subscribe_tracking(self.target_name, self.transmitter_offset, self.receiver_offset)
+
+    self.sf_abs_mat.connect_from(self.tracking_station.sf_abs_mat)
+    self.sf_global_mat.connect_from(self.tracking_station.sf_global_mat)
+    self.sf_abs_vec.connect_from(self.tracking_station.sf_abs_vec)
+
+  ## Disconnects the output fields from the TrackingStation and unsubscribes from it.
+  def detach_sensor(self):
+
+    if self.tracking_station == None:
+      return
+
+    self.sf_abs_mat.disconnect()
+    self.sf_global_mat.disconnect()
+    self.sf_abs_vec.disconnect()
+
+    StationHub.unsubscribe_tracking(self.tracking_station)
+    self.tracking_station = None
+
+  ## Returns the yaw angle of the current tracking matrix.
+  def get_yaw(self):
+
+    if self.tracking_station != None:
+      return self.tracking_station.get_yaw()
+
+    return Utilities.get_yaw(self.sf_abs_mat.value)
 
   ## Sets the transmitter offset for this tracking reader.
   # @param TRANSMITTER_OFFSET The transmitter offset to be set.
   def set_transmitter_offset(self, TRANSMITTER_OFFSET):
-    self.tracking_sensor.TransmitterOffset.value = TRANSMITTER_OFFSET
+
+    self.transmitter_offset = TRANSMITTER_OFFSET
+
+    if self.tracking_station != None:
+      self.detach_sensor()
+      self.attach_station()
 
   ## Sets the receiver offset for this tracking reader.
   # @param RECEIVER_OFFSET The receiver offset to be set.
   def set_receiver_offset(self, RECEIVER_OFFSET):
-    self.tracking_sensor.ReceiverOffset.value = RECEIVER_OFFSET
+
+    self.receiver_offset = RECEIVER_OFFSET
+
+    if self.tracking_station != None:
+      self.detach_sensor()
+      self.attach_station()
 
 
 ## Supplies constant tracking values if no real tracking is available.
@@ -90,6 +127,10 @@ class TrackingDefaultReader(TrackingReader):
   def __init__(self):
     self.super(TrackingReader).__init__()
 
+    ## @var yaw
+    # Yaw angle of the constant matrix.
+    self.yaw = 0.0
+
   ## Sets the transmitter offset for this tracking reader.
   # @param TRANSMITTER_OFFSET The transmitter offset to be set.
   def set_transmitter_offset(self, TRANSMITTER_OFFSET):
@@ -106,3 +147,8 @@ class TrackingDefaultReader(TrackingReader):
     self.sf_abs_mat.value = CONSTANT_MATRIX
     self.sf_global_mat.value = CONSTANT_MATRIX
     self.sf_abs_vec.value = self.sf_abs_mat.value.get_translate()
+    self.yaw = Utilities.get_yaw(CONSTANT_MATRIX)
+
+  ## Returns the yaw angle of the constant matrix.
+  def get_yaw(self):
+    return self.yaw
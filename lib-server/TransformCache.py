@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes TransformCache and TransformWatcher.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+from avango.script import field_has_changed
+
+
+## Computes world transformations of scenegraph nodes manually and shares the accumulated matrices of common ancestors.
+#
+# For each node, the cache keeps a TransformWatcher storing the world matrix of the node. The watcher is connected
+# from the Transform field of the node, so a changed Transform invalidates the world matrices of the node and all its
+# cached descendants as soon as it is written. Queries for nodes with a valid world matrix return it without reading
+# any ancestor. Nodes moved to another parent have to be passed to invalidate, subtrees removed from the scenegraph
+# have to be removed from the cache by forget.
+class TransformCache:
+
+  ## @var identity_mat
+  # World matrix of the parent of the root node.
+  identity_mat = avango.gua.make_identity_mat()
+
+  ## @var watchers
+  # Dictionary mapping scenegraph nodes to their TransformWatcher instances.
+  watchers = {}
+
+  ## Returns the world transformation of a scenegraph node.
+  # @param NODE The scenegraph node to compute the world transformation for. None stands for the parent of the root node.
+  @staticmethod
+  def get_world_transform(NODE):
+
+    if NODE == None:
+      return TransformCache.identity_mat
+
+    _watcher = TransformCache.watchers.get(NODE)
+
+    if _watcher != None and _watcher.world_mat != None:
+      return _watcher.world_mat
+
+    _parent = NODE.Parent.value
+    _parent_world_mat = TransformCache.get_world_transform(_parent)
+
+    if _watcher == None:
+      _watcher = TransformWatcher()
+      _watcher.my_constructor(NODE)
+      TransformCache.watchers[NODE] = _watcher
+
+    if _parent != None:
+      TransformCache.watchers[_parent].dependents.add(NODE)
+
+    _watcher.world_mat = _parent_world_mat * NODE.Transform.value
+    return _watcher.world_mat
+
+  ## Invalidates the world matrices of a node and all its cached descendants.
+  # @param NODE The scenegraph node whose Transform or parent changed.
+  @staticmethod
+  def invalidate(NODE):
+
+    _watcher = TransformCache.watchers.get(NODE)
+
+    # descendants of an invalid node are invalid already
+    if _watcher == None or _watcher.world_mat == None:
+      return
+
+    _watcher.world_mat = None
+
+    for _dependent in _watcher.dependents:
+      TransformCache.invalidate(_dependent)
+
+  ## Removes a subtree from the cache. To be called when the subtree is removed from the scenegraph.
+  # @param NODE The root node of the subtree.
+  @staticmethod
+  def forget(NODE):
+
+    _watcher = TransformCache.watchers.pop(NODE, None)
+
+    if _watcher != None:
+      _watcher.deactivate()
+
+    _parent_watcher = TransformCache.watchers.get(NODE.Parent.value)
+
+    if _parent_watcher != None:
+      _parent_watcher.dependents.discard(NODE)
+
+    for _child in NODE.Children.value:
+      TransformCache.forget(_child)
+
+
+## Watches the Transform field of a node cached by the TransformCache and invalidates the cached world matrices on changes.
+class TransformWatcher(avango.script.Script):
+
+  ## @var sf_transform
+  # Field connected from the Transform field of the watched node.
+  sf_transform = avango.gua.SFMatrix4()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(TransformWatcher).__init__()
+
+  ## Custom constructor.
+  # @param NODE The scenegraph node to be watched.
+  def my_constructor(self, NODE):
+
+    ## @var NODE
+    # The watched scenegraph node.
+    self.NODE = NODE
+
+    ## @var world_mat
+    # The cached world matrix of the watched node. None if invalid.
+    self.world_mat = None
+
+    ## @var dependents
+    # Set of the children of the watched node whose world matrices were computed from the world matrix of this node.
+    self.dependents = set()
+
+    self.sf_transform.connect_from(NODE.Transform)
+
+  ## Disconnects the watcher from the watched node.
+  def deactivate(self):
+    self.sf_transform.disconnect()
+
+  ## Called whenever sf_transform changes.
+  @field_has_changed(sf_transform)
+  def sf_transform_changed(self):
+    TransformCache.invalidate(self.NODE)
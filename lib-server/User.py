@@ -15,6 +15,8 @@ from Intersection import *
 from TrackingReader import *
 from VisibilityHandler import *
 from ConsoleIO import *
+from GeometryRegistry import GeometryRegistry
+from NodeRegistry import NodeRegistry
 import Utilities
 
 # import math libraries
@@ -37,7 +39,7 @@ class UserRepresentation:
   # @param HEAD_NODE_NAME Name of the UserRepresentation's head node in the scenegraph.
   # @param COMPLEX_SETUP If activated, the transformation policy is evaluated every frame to update head. If deactivated,
   #                      a standard mono viewing setup is assumed.
-  def my_constructor(self, USER, DISPLAY_GROUP, VIEW_TRANSFORM_NODE, VIRTUAL_USER_REPR_DISPLAY_INDEX = -1, HEAD_NODE_NAME = 'head', COMPLEX_SETUP = True):
+  def my_constructor(self, USER, DISPLAY_GROUP, VIEW_TRANSFORM_NODE, VIRTUAL_USER_REPR_DISPLAY_INDEX = -1, HEAD_NODE_NAME = NodeRegistry.head_name, COMPLEX_SETUP = True):
 
     ## @var USER
     # Reference to the user to be represented.
@@ -83,12 +85,12 @@ class UserRepresentation:
 
     ## @var left_eye
     # Left eye node of the user.
-    self.left_eye = avango.gua.nodes.TransformNode(Name = "eyeL")
+    self.left_eye = avango.gua.nodes.TransformNode(Name = NodeRegistry.left_eye_name)
     self.head.Children.value.append(self.left_eye)
 
     ## @var right_eye
     # Right eye node of the user.
-    self.right_eye = avango.gua.nodes.TransformNode(Name = "eyeR")
+    self.right_eye = avango.gua.nodes.TransformNode(Name = NodeRegistry.right_eye_name)
     self.head.Children.value.append(self.right_eye)
 
     # assign correct transformations to nodes
@@ -118,6 +120,11 @@ class UserRepresentation:
     # Boolean indicating if the portal if a default viewing setup is activated although the portal might suggest it differently.
     self.thumbnail_mode = False
 
+    ## @var in_foreign_portal
+    # If this is a portal user representation, boolean saying if the portal belongs to another workspace or display group
+    # than the represented physical user. None until first evaluated.
+    self.in_foreign_portal = None
+
 
   ## Evaluated every frame.
   def frame_callback(self):
@@ -132,15 +139,9 @@ class UserRepresentation:
 
         # activate thumbnail mode when scale is too small
         # make sure not to switch off own PortalCameraRepresentations
-        _physical_nav_node = self.dependent_nodes[0].Parent.value
-        _physical_nav_scale = _physical_nav_node.Transform.value.get_scale()
-
-        _physical_user_w_id = _physical_nav_node.Name.value.split("_")[0].replace("w", "")
-        _physical_user_dg_id = _physical_nav_node.Name.value.split("_")[1].replace("dg", "")
-        _portal_w_id = self.view_transform_node.Parent.value.Name.value.split("_")[2].replace("w", "")
-        _portal_dg_id = self.view_transform_node.Parent.value.Name.value.split("_")[3].replace("dg", "")
+        _physical_nav_scale = self.dependent_nodes[0].Parent.value.Transform.value.get_scale()
 
-        if _physical_nav_scale.x > 30.0 and (_physical_user_w_id != _portal_w_id or _physical_user_dg_id != _portal_dg_id):
+        if _physical_nav_scale.x > 30.0 and self.is_in_foreign_portal():
           self.thumbnail_mode = True
           self.make_default_viewing_setup()
 
@@ -150,16 +151,10 @@ class UserRepresentation:
       self.perform_virtual_user_head_transformation(self.virtual_user_repr_display_index)
 
       # same check as performed above
-      _physical_nav_node = self.dependent_nodes[0].Parent.value
-      _physical_nav_scale = _physical_nav_node.Transform.value.get_scale()
-
-      _physical_user_w_id = _physical_nav_node.Name.value.split("_")[0].replace("w", "")
-      _physical_user_dg_id = _physical_nav_node.Name.value.split("_")[1].replace("dg", "")
-      _portal_w_id = self.view_transform_node.Parent.value.Name.value.split("_")[2].replace("w", "")
-      _portal_dg_id = self.view_transform_node.Parent.value.Name.value.split("_")[3].replace("dg", "")
+      _physical_nav_scale = self.dependent_nodes[0].Parent.value.Transform.value.get_scale()
 
       # remain in thumbnail mode
-      if _physical_nav_scale.x > 30.0 and (_physical_user_w_id != _portal_w_id or _physical_user_dg_id != _portal_dg_id):
+      if _physical_nav_scale.x > 30.0 and self.is_in_foreign_portal():
         self.make_default_viewing_setup()
       
       # deactive thumbnail mode
@@ -171,6 +166,17 @@ class UserRepresentation:
 
         self.thumbnail_mode = False
 
+  ## Returns if this portal user representation's portal belongs to another workspace or display group than the represented
+  # physical user. Portals of the configuration belong to none. Looked up in the NodeRegistry on the first call.
+  def is_in_foreign_portal(self):
+
+    if self.in_foreign_portal == None:
+      _physical_user_key = NodeRegistry.get_key(self.dependent_nodes[0].Parent.value.Name.value)
+      _portal_key = NodeRegistry.get_key(self.view_transform_node.Parent.value.Name.value)
+      self.in_foreign_portal = _physical_user_key[0:2] != _portal_key[0:2]
+
+    return self.in_foreign_portal
+
   ## Transforms the head node according to the display group offset and the tracking matrix.
   def perform_physical_user_head_transformation(self):
     self.head.Transform.value = self.DISPLAY_GROUP.offset_to_workspace * self.USER.headtracking_reader.sf_abs_mat.value
@@ -231,18 +237,16 @@ class UserRepresentation:
 
     ## @var workspace_id
     # Identification number of the workspace the associated user is belonging to.
-    self.workspace_id = int(self.view_transform_node.Name.value.split("_")[0].replace("w", ""))
+    self.workspace_id = NodeRegistry.get_key(self.view_transform_node.Name.value)[0]
 
     _screen = DISPLAY_INSTANCE.create_screen_node("screen_" + str(len(self.screens)))
     self.view_transform_node.Children.value.append(_screen)
     self.screens.append(_screen)
 
-    _loader = avango.gua.nodes.TriMeshLoader()
-
-    _navigation_color_geometry = _loader.create_geometry_from_file('nav_color_plane',
-                                                                   'data/objects/plane.obj',
-                                                                   'data/materials/' + self.DISPLAY_GROUP.navigations[0].trace_material + 'Shadeless.gmd',
-                                                                    avango.gua.LoaderFlags.LOAD_MATERIALS)
+    _navigation_color_geometry = GeometryRegistry.create_instance('nav_color_plane',
+                                                                  'data/objects/plane.obj',
+                                                                  'data/materials/' + self.DISPLAY_GROUP.navigations[0].trace_material + 'Shadeless.gmd',
+                                                                  avango.gua.LoaderFlags.LOAD_MATERIALS)
 
     _trans = avango.gua.Vec3(-0.45 * _screen.Width.value, 0.4 * _screen.Height.value, 0.0)
     _scale = 0.05 * _screen.Height.value
@@ -250,7 +254,7 @@ class UserRepresentation:
                                                   avango.gua.make_rot_mat(90, 1, 0, 0) * \
                                                   avango.gua.make_scale_mat(_scale, _scale, _scale)
     _navigation_color_geometry.ShadowMode.value = avango.gua.ShadowMode.OFF
-    _navigation_color_geometry.GroupNames.value = ["w" + str(self.workspace_id) + "_dg" + str(self.DISPLAY_GROUP.id) + "_u" + str(self.USER.id)]
+    _navigation_color_geometry.GroupNames.value = [self.view_transform_node.Name.value]
     _screen.Children.value.append(_navigation_color_geometry)
 
 
@@ -421,10 +425,11 @@ class User(VisibilityHandler2D):
 
       _pick_object = self.mf_screen_pick_result.value[_i].Object.value
 
+      _key = NodeRegistry.get_key(_pick_object.Name.value)
+
       # only consider own workspace geometries
-      if _pick_object.Name.value.startswith("proxy_w" + str(self.WORKSPACE_INSTANCE.id)):
-        _display_group_id = int(_pick_object.Name.value.split("_")[2].replace("dg", ""))
-        self.last_seen_display_group = self.WORKSPACE_INSTANCE.display_groups[_display_group_id]
+      if _key != None and _key[0] == self.WORKSPACE_INSTANCE.id:
+        self.last_seen_display_group = self.WORKSPACE_INSTANCE.display_groups[_key[1]]
         break
 
     _track_vec = self.headtracking_reader.sf_abs_vec.value
@@ -455,7 +460,7 @@ class User(VisibilityHandler2D):
   # @param HEAD_NODE_NAME Name of the UserRepresentation's head node in the scenegraph.
   # @param COMPLEX_SETUP If activated, the transformation policy is evaluated every frame to update head. If deactivated,
   #                      a standard mono viewing setup is assumed.
-  def create_user_representation_for(self, DISPLAY_GROUP, VIEW_TRANSFORM_NODE, VIRTUAL_USER_REPR_DISPLAY_INDEX = -1, HEAD_NODE_NAME = "head", COMPLEX_SETUP = True):
+  def create_user_representation_for(self, DISPLAY_GROUP, VIEW_TRANSFORM_NODE, VIRTUAL_USER_REPR_DISPLAY_INDEX = -1, HEAD_NODE_NAME = NodeRegistry.head_name, COMPLEX_SETUP = True):
 
     _user_repr = UserRepresentation()
     _user_repr.my_constructor(self, DISPLAY_GROUP, VIEW_TRANSFORM_NODE, VIRTUAL_USER_REPR_DISPLAY_INDEX, HEAD_NODE_NAME, COMPLEX_SETUP)
@@ -516,66 +521,7 @@ class User(VisibilityHandler2D):
   # @param DISPLAY_GROUP The DisplayGroup to be handled.
   def handle_correct_visibility_groups_for(self, DISPLAY_GROUP):
 
-    # All UserRepresentation instances at DISPLAY_GROUP
-    # normally, this list should just contain one user representation
-    # in case of portals, however, a display group may have more than one user representation
-    _user_representations_at_display_group = []
-
-    for _user_repr in self.user_representations:
-      
-      if _user_repr.DISPLAY_GROUP == DISPLAY_GROUP:
-        _user_representations_at_display_group.append(_user_repr)
-        
-    # for all found user representations in the given display group
-    for _user_repr_at_display_group in _user_representations_at_display_group:
-
-      # display group instance belonging to DISPLAY_GROUP
-      _handled_display_group_instance = _user_repr_at_display_group.DISPLAY_GROUP
-
-      _all_user_reprs_at_display_group = []
-
-      for _user_repr in ApplicationManager.all_user_representations:
-        if _user_repr.DISPLAY_GROUP == _handled_display_group_instance:
-          _all_user_reprs_at_display_group.append(_user_repr)
-
-      ## determine which group names have to be added to the user representations ##
-      _user_visible_for = []
-
-      # when video avatars are enabled, do not make josephs visible
-      if ApplicationManager.current_avatar_mode == "JOSEPH":
-        
-        # append all names of user representations which are not on same navigation
-        for _user_repr in _all_user_reprs_at_display_group:
-
-          if _user_repr.connected_navigation_id != _user_repr_at_display_group.connected_navigation_id:
-            _user_visible_for.append(_user_repr.view_transform_node.Name.value)
-
-        # check for all user representations outside the handled display group
-        for _user_repr in ApplicationManager.all_user_representations:
-          if _user_repr.DISPLAY_GROUP != _handled_display_group_instance:
-
-            # consider visibility table
-            _handled_display_group_tag = _handled_display_group_instance.visibility_tag
-            _user_repr_display_group_tag = _user_repr.DISPLAY_GROUP.visibility_tag
-            
-            try:
-              _visible = self.visibility_table[_user_repr_display_group_tag][_handled_display_group_tag]
-            except:
-              _visible = False
-            
-            if _visible:
-              if _user_repr.view_transform_node.Name.value == "scene_matrix":
-                _user_visible_for.append(_user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value)
-              else:
-                _user_visible_for.append(_user_repr.view_transform_node.Name.value)
-
-      # apply the obtained group names to the user representation
-      if len(_user_visible_for) == 0:
-
-        # prevent wildcard from rendering the avatar
-        _user_repr_at_display_group.set_avatar_group_names(["do_not_display_group"])
-
-      else:
-
-        for _string in _user_visible_for:
-          _user_repr_at_display_group.set_avatar_group_names(_user_visible_for)
\ No newline at end of file
+    ApplicationManager.visibility_engine.update_avatar_rows(self
+                                                          , self.visibility_table
+                                                          , DISPLAY_GROUP
+                                                          , ApplicationManager.current_avatar_mode)
@@ -0,0 +1,193 @@
+#!/usr/bin/python
+
+## @file
+# Contains class UserIndex.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+
+# import framework libraries
+import Utilities
+
+# import python libraries
+import math
+
+
+## Spatial index of the head positions of all users in a workspace.
+#
+# Distances are measured to the vertical line through a user's head, so only the x and z coordinates of the
+# head positions are indexed in a uniform grid. The index is rebuilt from the tracking readers at most once per
+# frame, on the first query after the frame started, and then answers the nearest-user and radius queries of
+# all tools and navigations of the workspace.
+class UserIndex:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param WORKSPACE_INSTANCE The Workspace instance whose users are indexed.
+  # @param CELL_SIZE Edge length of the grid cells in meters.
+  def my_constructor(self, WORKSPACE_INSTANCE, CELL_SIZE = 1.0):
+
+    ## @var WORKSPACE_INSTANCE
+    # The Workspace instance whose users are indexed.
+    self.WORKSPACE_INSTANCE = WORKSPACE_INSTANCE
+
+    ## @var cell_size
+    # Edge length of the grid cells in meters.
+    self.cell_size = CELL_SIZE
+
+    ## @var cells
+    # Dictionary mapping (column, row) tuples of grid cells to the lists of (x, z, user index) tuples of the heads within.
+    self.cells = {}
+
+    ## @var min_cell
+    # (column, row) tuple of the minimum corner of the occupied grid cells.
+    self.min_cell = (0, 0)
+
+    ## @var max_cell
+    # (column, row) tuple of the maximum corner of the occupied grid cells.
+    self.max_cell = (0, 0)
+
+    ## @var outdated
+    # Boolean saying if the index has to be rebuilt before the next query.
+    self.outdated = True
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+
+  ## Returns the grid cell of a position.
+  # @param X The x coordinate of the position.
+  # @param Z The z coordinate of the position.
+  def get_cell(self, X, Z):
+    return (int(math.floor(X / self.cell_size)), int(math.floor(Z / self.cell_size)))
+
+  ## Rebuilds the grid from the current head positions of the users.
+  def rebuild(self):
+
+    self.cells = {}
+
+    for _i, _user in enumerate(self.WORKSPACE_INSTANCE.users):
+
+      _pos = _user.headtracking_reader.sf_abs_vec.value
+      self.cells.setdefault(self.get_cell(_pos.x, _pos.z), []).append( (_pos.x, _pos.z, _i) )
+
+    if len(self.cells) > 0:
+      _columns = [_cell[0] for _cell in self.cells]
+      _rows = [_cell[1] for _cell in self.cells]
+      self.min_cell = (min(_columns), min(_rows))
+      self.max_cell = (max(_columns), max(_rows))
+
+    self.outdated = False
+
+  ## Returns the list of (x, z, user index) tuples of the heads in a ring of cells around a cell.
+  # @param CELL The (column, row) tuple of the center cell.
+  # @param RING Distance of the ring from the center cell in cells. Ring 0 is the center cell itself.
+  def get_ring_entries(self, CELL, RING):
+
+    if RING == 0:
+      return self.cells.get(CELL, [])
+
+    _entries = []
+
+    for _column in range(CELL[0] - RING, CELL[0] + RING + 1):
+
+      # upper and lower row of the ring completely, inner rows only at the left and right border
+      if _column == CELL[0] - RING or _column == CELL[0] + RING:
+        _rows = range(CELL[1] - RING, CELL[1] + RING + 1)
+      else:
+        _rows = [CELL[1] - RING, CELL[1] + RING]
+
+      for _row in _rows:
+        _entries.extend(self.cells.get( (_column, _row), []))
+
+    return _entries
+
+  ## Returns the active user whose head is closest to the vertical line through a point or None if there is none
+  # within a maximum distance. Ties are resolved in favor of the user created first.
+  # @param POINT The point to compute the proximity to.
+  # @param MAX_DISTANCE Only users closer than this horizontal distance are considered.
+  def get_nearest_user(self, POINT, MAX_DISTANCE):
+
+    if self.outdated:
+      self.rebuild()
+
+    _users = self.WORKSPACE_INSTANCE.users
+    _center_cell = self.get_cell(POINT.x, POINT.z)
+    _closest = (MAX_DISTANCE, len(_users))
+
+    # rings beyond the occupied cells or the maximum distance do not contain any candidates
+    _max_ring = max( abs(_center_cell[0] - self.min_cell[0]), abs(_center_cell[0] - self.max_cell[0])
+                   , abs(_center_cell[1] - self.min_cell[1]), abs(_center_cell[1] - self.max_cell[1]) )
+    _max_ring = min(_max_ring, int(MAX_DISTANCE / self.cell_size) + 1)
+
+    # scanning more cells than there are users is slower than testing all users, e.g. if no active user is close
+    if (2 * _max_ring + 1) ** 2 > len(_users):
+      _rings = [[_entry for _entries in self.cells.values() for _entry in _entries]]
+    else:
+      _rings = (self.get_ring_entries(_center_cell, _ring) for _ring in range(_max_ring + 1))
+
+    for _ring, _ring_entries in enumerate(_rings):
+
+      # heads in this ring and beyond are at least this far away
+      if (_ring - 1) * self.cell_size > _closest[0]:
+        break
+
+      _entries = [_entry for _entry in _ring_entries if _users[_entry[2]].is_active]
+
+      if len(_entries) == 0:
+        continue
+
+      # distances of all heads in the ring at once
+      _distances = Utilities.euclidean_distance_batch([(_x, 0.0, _z) for _x, _z, _i in _entries], [(POINT.x, 0.0, POINT.z)])
+
+      for (_x, _z, _i), _distance in zip(_entries, _distances):
+
+        _candidate = (float(_distance), _i)
+
+        if _candidate < _closest:
+          _closest = _candidate
+
+    if _closest[1] == len(_users):
+      return None
+
+    return _users[_closest[1]]
+
+  ## Returns the list of users whose heads are closer than a distance to the vertical line through a point,
+  # in the order of their creation.
+  # @param POINT The point to compute the proximity to.
+  # @param DISTANCE The tolerance distance to be applied.
+  def get_users_in_range(self, POINT, DISTANCE):
+
+    if self.outdated:
+      self.rebuild()
+
+    _min_cell = self.get_cell(POINT.x - DISTANCE, POINT.z - DISTANCE)
+    _max_cell = self.get_cell(POINT.x + DISTANCE, POINT.z + DISTANCE)
+    _entries = []
+
+    # as for nearest-user queries, all users are tested if the range covers more cells than there are users
+    if (_max_cell[0] - _min_cell[0] + 1) * (_max_cell[1] - _min_cell[1] + 1) > len(self.WORKSPACE_INSTANCE.users):
+      _entries = [_entry for _cell_entries in self.cells.values() for _entry in _cell_entries]
+
+    else:
+      for _column in range(_min_cell[0], _max_cell[0] + 1):
+        for _row in range(_min_cell[1], _max_cell[1] + 1):
+          _entries.extend(self.cells.get( (_column, _row), []))
+
+    if len(_entries) == 0:
+      return []
+
+    # distances of all heads in the covered cells at once
+    _distances = Utilities.euclidean_distance_batch([(_x, 0.0, _z) for _x, _z, _i in _entries], [(POINT.x, 0.0, POINT.z)])
+    _indices = [_entry[2] for _entry, _distance in zip(_entries, _distances) if _distance < DISTANCE]
+
+    return [self.WORKSPACE_INSTANCE.users[_i] for _i in sorted(_indices)]
+
+  ## Evaluated every frame. Marks the index to be rebuilt on the next query.
+  def frame_callback(self):
+    self.outdated = True
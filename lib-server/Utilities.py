@@ -11,15 +11,33 @@ import avango.script
 # import python libraries
 import math
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# The *_batch functions below compute the same results as their scalar counterparts for many inputs at once.
+# They operate on numpy arrays and return numpy arrays. If numpy is not available, they fall back to the scalar
+# functions and return lists instead. Inputs for which the scalar function would raise an exception yield NaN.
+
 ## Converts a rotation matrix to the Euler angles yaw, pitch and roll.
 # @param MATRIX The rotation matrix to be converted.
 def get_euler_angles(MATRIX):
 
   quat = MATRIX.get_rotate()
-  qx = quat.x
-  qy = quat.y
-  qz = quat.z
-  qw = quat.w
+  return compute_euler_angles(quat.x, quat.y, quat.z, quat.w)
+
+## Converts the components of a rotation quaternion to the Euler angles yaw, pitch and roll.
+# @param QX The x component of the quaternion.
+# @param QY The y component of the quaternion.
+# @param QZ The z component of the quaternion.
+# @param QW The w component of the quaternion.
+def compute_euler_angles(QX, QY, QZ, QW):
+
+  qx = QX
+  qy = QY
+  qz = QZ
+  qw = QW
 
   sqx = qx * qx
   sqy = qy * qy
@@ -91,7 +109,7 @@ def euclidean_distance(POINT1, POINT2):
   _diff_y = POINT2.y - POINT1.y
   _diff_z = POINT2.z - POINT1.z
 
-  return math.sqrt(math.pow(_diff_x, 2) + math.pow(_diff_y, 2) + math.pow(_diff_z, 2))
+  return math.sqrt(_diff_x * _diff_x + _diff_y * _diff_y + _diff_z * _diff_z)
 
 ## Computes the distance between a Point and a 3D-line.
 # @param POINT_TO_CHECK The point to compute the distance for.
@@ -99,8 +117,201 @@ def euclidean_distance(POINT1, POINT2):
 # @param LINE_VEC Direction vector of the line.
 def compute_point_to_line_distance(POINT_TO_CHECK, LINE_POINT_1, LINE_VEC):
 
-  _point_line_vec = avango.gua.Vec3(LINE_POINT_1.x - POINT_TO_CHECK.x, LINE_POINT_1.y - POINT_TO_CHECK.y, LINE_POINT_1.z - POINT_TO_CHECK.z)
+  _diff_x = LINE_POINT_1.x - POINT_TO_CHECK.x
+  _diff_y = LINE_POINT_1.y - POINT_TO_CHECK.y
+  _diff_z = LINE_POINT_1.z - POINT_TO_CHECK.z
+
+  # length of the cross product of the difference vector and the line vector
+  _cross_x = _diff_y * LINE_VEC.z - _diff_z * LINE_VEC.y
+  _cross_y = _diff_z * LINE_VEC.x - _diff_x * LINE_VEC.z
+  _cross_z = _diff_x * LINE_VEC.y - _diff_y * LINE_VEC.x
+
+  return math.sqrt( (_cross_x * _cross_x + _cross_y * _cross_y + _cross_z * _cross_z) / \
+                    (LINE_VEC.x * LINE_VEC.x + LINE_VEC.y * LINE_VEC.y + LINE_VEC.z * LINE_VEC.z) )
+
+## Converts a list of vectors to an array of shape (N, 3).
+# @param VECTORS List of avango.gua.Vec3 instances or (x, y, z) sequences, a single avango.gua.Vec3 or an array of shape (N, 3) or (3,).
+def get_vec3_array(VECTORS):
+
+  if numpy != None and isinstance(VECTORS, numpy.ndarray):
+    return VECTORS
+
+  if hasattr(VECTORS, "x"):
+    VECTORS = [VECTORS]
+
+  _rows = [(_vec.x, _vec.y, _vec.z) if hasattr(_vec, "x") else tuple(_vec) for _vec in VECTORS]
+
+  if numpy == None:
+    return _rows
+
+  return numpy.array(_rows, dtype = float).reshape(-1, 3)
+
+## Converts a list of rotations to an array of quaternions of shape (N, 4), with the components in the order x, y, z, w.
+# @param ROTATIONS List of avango.gua.Mat4 or avango.gua.Quat instances or (x, y, z, w) sequences, or an array of shape (N, 4).
+def get_quat_array(ROTATIONS):
+
+  if numpy != None and isinstance(ROTATIONS, numpy.ndarray):
+    return ROTATIONS
+
+  _rows = []
+
+  for _rotation in ROTATIONS:
+
+    if hasattr(_rotation, "get_rotate"):
+      _rotation = _rotation.get_rotate()
+
+    if hasattr(_rotation, "w"):
+      _rows.append( (_rotation.x, _rotation.y, _rotation.z, _rotation.w) )
+    else:
+      _rows.append(tuple(_rotation))
+
+  if numpy == None:
+    return _rows
+
+  return numpy.array(_rows, dtype = float).reshape(-1, 4)
+
+## Batched variant of get_euler_angles. Returns an array of shape (N, 3) holding the yaw, pitch and roll angles per rotation.
+# @param ROTATIONS List or array of rotations, see get_quat_array.
+def get_euler_angles_batch(ROTATIONS):
+
+  _quats = get_quat_array(ROTATIONS)
+
+  if numpy == None:
+    return [_compute_euler_angles_or_nan(*_quat) for _quat in _quats]
+
+  qx, qy, qz, qw = _quats[:, 0], _quats[:, 1], _quats[:, 2], _quats[:, 3]
+
+  sqx = qx * qx
+  sqy = qy * qy
+  sqz = qz * qz
+  sqw = qw * qw
+
+  unit = sqx + sqy + sqz + sqw
+  test = (qx * qy) + (qz * qw)
+
+  _north = test > (0.49999 * unit)
+  _south = numpy.logical_and(numpy.logical_not(_north), test < (-0.49999 * unit))
+  _pole = numpy.logical_or(_north, _south)
+
+  with numpy.errstate(invalid = "ignore"):
+    yaw = numpy.arctan2(2.0 * qy * qw - 2.0 * qx * qz, 1.0 - 2.0 * sqy - 2.0 * sqz)
+    roll = numpy.arcsin(numpy.where(_pole, 0.0, 2.0 * test))
+    pitch = numpy.arctan2(2.0 * qx * qw - 2.0 * qy * qz, 1.0 - 2.0 * sqx - 2.0 * sqz)
+
+  _pole_yaw = 2.0 * numpy.arctan2(qx, qw)
+  yaw = numpy.where(_north, _pole_yaw, numpy.where(_south, -_pole_yaw, yaw))
+  roll = numpy.where(_north, math.pi / 2.0, numpy.where(_south, math.pi / -2.0, roll))
+  pitch = numpy.where(_pole, 0.0, pitch)
+
+  _angles = numpy.stack( (yaw, pitch, roll), axis = 1)
+  _angles = numpy.where(_angles < 0.0, _angles + 2.0 * math.pi, _angles)
+
+  # the scalar function fails for all angles if the roll angle is undefined
+  return numpy.where(numpy.isnan(roll)[:, None], numpy.nan, _angles)
+
+## Returns the result of compute_euler_angles or NaN angles if it fails.
+# @param QX The x component of the quaternion.
+# @param QY The y component of the quaternion.
+# @param QZ The z component of the quaternion.
+# @param QW The w component of the quaternion.
+def _compute_euler_angles_or_nan(QX, QY, QZ, QW):
+
+  try:
+    return compute_euler_angles(QX, QY, QZ, QW)
+  except ValueError:
+    return (float("nan"), float("nan"), float("nan"))
+
+## Batched variant of get_yaw. Returns an array of shape (N,) holding the yaw angle per rotation, 0 where get_yaw returns 0 on failure.
+# @param ROTATIONS List or array of rotations, see get_quat_array.
+def get_yaw_batch(ROTATIONS):
+
+  _angles = get_euler_angles_batch(ROTATIONS)
+
+  if numpy == None:
+    return [0 if math.isnan(_yaw) else _yaw for _yaw, _, _ in _angles]
+
+  return numpy.nan_to_num(_angles[:, 0])
+
+## Batched variant of get_rotation_between_vectors. Returns a tuple of an array of shape (N,) holding the rotation angles
+# in degrees and an array of shape (N, 3) holding the rotation axes, to be passed to avango.gua.make_rot_mat.
+# Unlike the scalar function, the input vectors are not normalized in place.
+# @param VECS1 List or array of first vectors, see get_vec3_array. A single vector is rotated to all second vectors.
+# @param VECS2 List or array of second vectors, see get_vec3_array. All first vectors are rotated to a single vector.
+def get_rotation_between_vectors_batch(VECS1, VECS2):
+
+  _vecs1 = get_vec3_array(VECS1)
+  _vecs2 = get_vec3_array(VECS2)
+
+  if numpy == None:
+
+    _angles = []
+    _axes = []
+
+    for _vec1, _vec2 in _broadcast( [_vecs1, _vecs2] ):
+
+      _vec1 = avango.gua.Vec3(*_vec1)
+      _vec2 = avango.gua.Vec3(*_vec2)
+      _vec1.normalize()
+      _vec2.normalize()
+
+      try:
+        _angles.append(math.degrees(math.acos(_vec1.dot(_vec2))))
+      except ValueError:
+        _angles.append(float("nan"))
+
+      _axis = _vec1.cross(_vec2)
+      _axes.append( (_axis.x, _axis.y, _axis.z) )
+
+    return _angles, _axes
+
+  with numpy.errstate(invalid = "ignore", divide = "ignore"):
+    _vecs1 = _vecs1 / numpy.linalg.norm(_vecs1, axis = -1, keepdims = True)
+    _vecs2 = _vecs2 / numpy.linalg.norm(_vecs2, axis = -1, keepdims = True)
+    _angles = numpy.degrees(numpy.arccos(numpy.sum(_vecs1 * _vecs2, axis = -1)))
+
+  return _angles, numpy.cross(_vecs1, _vecs2)
+
+## Batched variant of euclidean_distance. Returns an array of shape (N,) holding the distances between corresponding points.
+# @param POINTS1 List or array of starting points, see get_vec3_array. A single point is compared to all end points.
+# @param POINTS2 List or array of end points, see get_vec3_array. A single point is compared to all starting points.
+def euclidean_distance_batch(POINTS1, POINTS2):
+
+  _points1 = get_vec3_array(POINTS1)
+  _points2 = get_vec3_array(POINTS2)
+
+  if numpy == None:
+    return [math.sqrt(sum((_b - _a) * (_b - _a) for _a, _b in zip(_point1, _point2))) for _point1, _point2 in _broadcast( [_points1, _points2] )]
+
+  return numpy.linalg.norm(_points2 - _points1, axis = -1)
+
+## Batched variant of compute_point_to_line_distance. Returns an array of shape (N,) holding the distances.
+# @param POINTS_TO_CHECK List or array of points to compute the distances for, see get_vec3_array.
+# @param LINE_POINTS List or array of points lying on the lines, see get_vec3_array. May be a single point for all lines.
+# @param LINE_VECS List or array of direction vectors of the lines, see get_vec3_array. May be a single vector for all lines.
+def compute_point_to_line_distance_batch(POINTS_TO_CHECK, LINE_POINTS, LINE_VECS):
+
+  _points = get_vec3_array(POINTS_TO_CHECK)
+  _line_points = get_vec3_array(LINE_POINTS)
+  _line_vecs = get_vec3_array(LINE_VECS)
+
+  if numpy == None:
+
+    _distances = []
+
+    for _point, _line_point, _line_vec in _broadcast( [_points, _line_points, _line_vecs] ):
+      _distances.append(compute_point_to_line_distance( avango.gua.Vec3(*_point)
+                                                      , avango.gua.Vec3(*_line_point)
+                                                      , avango.gua.Vec3(*_line_vec) ))
+
+    return _distances
+
+  _cross = numpy.cross(_line_points - _points, _line_vecs)
+  return numpy.linalg.norm(_cross, axis = -1) / numpy.linalg.norm(_line_vecs, axis = -1)
 
-  _dist = (_point_line_vec.cross(LINE_VEC)).length() / LINE_VEC.length()
+## Returns the tuples of corresponding rows of several lists, repeating the single row of lists of length 1.
+# Used by the batched functions without numpy.
+# @param LISTS List of lists of rows.
+def _broadcast(LISTS):
 
-  return _dist
\ No newline at end of file
+  _length = max([len(_rows) for _rows in LISTS])
+  return [tuple(_rows[0] if len(_rows) == 1 else _rows[_i] for _rows in LISTS) for _i in range(_length)]
\ No newline at end of file
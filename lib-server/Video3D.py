@@ -150,45 +150,8 @@ class Video3D(VisibilityHandler2D):
         _nav_display_group = _display_group
         break
 
-    ## determine which group names have to be added to the video representation ##
-    _video_visible_for = []
-
-    # if the navigation is not used, hide the video representation, also when avatar mode is not set to video
-    if len(NAVIGATION_INSTANCE.active_user_representations) > 0 and ApplicationManager.current_avatar_mode == "VIDEO":
-
-      # loop over all user representations to find the ones for which the video is visible
-      for _user_repr in ApplicationManager.all_user_representations:
-
-        # video is only visible for users not on the corresponding navigation to avoid physical overlap
-        if _user_repr.DISPLAY_GROUP.navigations[_user_repr.connected_navigation_id] != NAVIGATION_INSTANCE:
-
-          _nav_display_group_tag = _nav_display_group.visibility_tag
-          _user_repr_display_group_tag = _user_repr.DISPLAY_GROUP.visibility_tag
-
-          # if tags are identical, show video due to different navigations (see above)
-          if _nav_display_group_tag == _user_repr_display_group_tag:
-            _visible = True
-          else:
-            try:
-              _visible = self.visibility_table[_user_repr_display_group_tag][_nav_display_group_tag]
-            except:
-              _visible = False
-
-
-          if _visible:
-            if _user_repr.view_transform_node.Name.value == "scene_matrix":
-              _video_visible_for.append(_user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value)
-            else:
-              _video_visible_for.append(_user_repr.view_transform_node.Name.value)
-
-
-    # apply the obtained group names to the video representation
-    if len(_video_visible_for) == 0:
-
-      # prevent wildcard from rendering the avatar
-      _video_representation_at_navigation.set_group_names(["do_not_display_group"])
-
-    else:
-
-      for _string in _video_visible_for:
-        _video_representation_at_navigation.set_group_names(_video_visible_for)
\ No newline at end of file
+    ApplicationManager.visibility_engine.update_video_row(self.visibility_table
+                                                        , _video_representation_at_navigation
+                                                        , NAVIGATION_INSTANCE
+                                                        , _nav_display_group
+                                                        , ApplicationManager.current_avatar_mode)
@@ -0,0 +1,317 @@
+#!/usr/bin/python
+
+## @file
+# Contains class VisibilityEngine.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+
+## Central bookkeeping of which viewing UserRepresentations see which entity representations
+# (avatars, tool representations, 3D videos and navigation traces). Every entity representation
+# forms a row of visible viewer group names. Rows are only recomputed for the entities touched by
+# a change and GroupNames are only written for rows whose content actually changed.
+class VisibilityEngine:
+
+  ## Default constructor.
+  def __init__(self):
+    pass
+
+  ## Custom constructor.
+  # @param USER_REPRESENTATIONS List of all UserRepresentation instances in the setup. Kept as reference, so later changes are seen.
+  def my_constructor(self, USER_REPRESENTATIONS):
+
+    ## @var USER_REPRESENTATIONS
+    # Reference to the list of all UserRepresentation instances in the setup.
+    self.USER_REPRESENTATIONS = USER_REPRESENTATIONS
+
+    ## @var viewer_groups
+    # List of (DisplayGroup, list of UserRepresentations) tuples grouping all viewers by their display group.
+    self.viewer_groups = []
+
+    ## @var indexed_viewers
+    # Tuple of the (UserRepresentation, DisplayGroup) pairs viewer_groups was built from. None if it was not built yet.
+    self.indexed_viewers = None
+
+    ## @var viewer_names
+    # Dictionary mapping UserRepresentations to a tuple of the (view transform node name, portal node name, head name)
+    # tuple the names were derived from and the (view transform node name, render group name) tuple.
+    self.viewer_names = {}
+
+    ## @var rows
+    # Dictionary mapping entity representations to the tuple of group names last written for them.
+    self.rows = {}
+
+  ## Returns the viewers grouped by display group. The grouping is rebuilt when UserRepresentations were added, removed
+  # or replaced or changed their display group.
+  def get_viewer_groups(self):
+
+    _viewers = tuple([(_user_repr, _user_repr.DISPLAY_GROUP) for _user_repr in self.USER_REPRESENTATIONS])
+
+    if self.indexed_viewers != _viewers:
+
+      self.viewer_groups = []
+      _group_indices = {}
+
+      for _user_repr in self.USER_REPRESENTATIONS:
+
+        _display_group = _user_repr.DISPLAY_GROUP
+
+        if id(_display_group) not in _group_indices:
+          _group_indices[id(_display_group)] = len(self.viewer_groups)
+          self.viewer_groups.append( (_display_group, []) )
+
+        self.viewer_groups[_group_indices[id(_display_group)]][1].append(_user_repr)
+
+      self.indexed_viewers = _viewers
+
+      # forget the names of removed viewers
+      for _user_repr in [_user_repr for _user_repr in self.viewer_names if _user_repr not in self.USER_REPRESENTATIONS]:
+        del self.viewer_names[_user_repr]
+
+    return self.viewer_groups
+
+  ## Returns all viewers at a display group.
+  # @param DISPLAY_GROUP The DisplayGroup to retrieve the UserRepresentations for.
+  def get_viewers_at(self, DISPLAY_GROUP):
+
+    for _display_group, _user_reprs in self.get_viewer_groups():
+
+      if _display_group == DISPLAY_GROUP:
+        return _user_reprs
+
+    return []
+
+  ## Returns the name of a viewer's view transform node.
+  # @param USER_REPRESENTATION The viewing UserRepresentation.
+  def get_view_transform_name(self, USER_REPRESENTATION):
+    return self.get_names_of(USER_REPRESENTATION)[0]
+
+  ## Returns the group name an entity has to carry to be rendered for a viewer.
+  # Portal viewers are identified by their portal node name combined with their head name.
+  # @param USER_REPRESENTATION The viewing UserRepresentation.
+  def get_render_group_name(self, USER_REPRESENTATION):
+    return self.get_names_of(USER_REPRESENTATION)[1]
+
+  ## Returns the cached (view transform node name, render group name) tuple of a viewer.
+  # The names are derived again when the view transform node was renamed or reparented or the head was renamed.
+  # @param USER_REPRESENTATION The viewing UserRepresentation.
+  def get_names_of(self, USER_REPRESENTATION):
+
+    _view_transform_node = USER_REPRESENTATION.view_transform_node
+    _view_transform_name = _view_transform_node.Name.value
+
+    # only viewers in portals depend on the name of the parent node
+    if _view_transform_name == "scene_matrix":
+      _sources = (_view_transform_name, _view_transform_node.Parent.value.Name.value, USER_REPRESENTATION.head.Name.value)
+    else:
+      _sources = (_view_transform_name, None, None)
+
+    _entry = self.viewer_names.get(USER_REPRESENTATION)
+
+    if _entry != None and _entry[0] == _sources:
+      return _entry[1]
+
+    if _view_transform_name == "scene_matrix":
+      _render_group_name = _sources[1] + "_" + _sources[2]
+    else:
+      _render_group_name = _view_transform_name
+
+    self.viewer_names[USER_REPRESENTATION] = (_sources, (_view_transform_name, _render_group_name))
+    return self.viewer_names[USER_REPRESENTATION][1]
+
+  ## Returns the render group names of all viewers outside a display group which see entities of it according to a visibility table.
+  # @param VISIBILITY_TABLE A matrix containing visibility rules according to the DisplayGroups' visibility tags.
+  # @param DISPLAY_GROUP The DisplayGroup the entity is located at.
+  def get_table_viewer_names(self, VISIBILITY_TABLE, DISPLAY_GROUP):
+
+    _names = []
+    _entity_tag = DISPLAY_GROUP.visibility_tag
+
+    for _display_group, _user_reprs in self.get_viewer_groups():
+
+      if _display_group == DISPLAY_GROUP:
+        continue
+
+      try:
+        _visible = VISIBILITY_TABLE[_display_group.visibility_tag][_entity_tag]
+      except:
+        _visible = False
+
+      if _visible:
+        for _user_repr in _user_reprs:
+          _names.append(self.get_render_group_name(_user_repr))
+
+    return _names
+
+  ## Stores a row of group names. Returns True if the row differs from the one stored before.
+  # @param ENTITY_REPRESENTATION The entity representation the row belongs to.
+  # @param NAMES List of group names to be stored.
+  def update_row(self, ENTITY_REPRESENTATION, NAMES):
+
+    _row = tuple(NAMES)
+
+    if self.rows.get(ENTITY_REPRESENTATION) == _row:
+      return False
+
+    self.rows[ENTITY_REPRESENTATION] = _row
+    return True
+
+  ## Recomputes the avatar rows of a user's UserRepresentations at a display group.
+  # @param USER The User instance whose avatars are handled.
+  # @param VISIBILITY_TABLE The user's avatar visibility table.
+  # @param DISPLAY_GROUP The DisplayGroup to be handled.
+  # @param AVATAR_MODE String saying which type of avatars is used, "JOSEPH" or "VIDEO". Avatars are hidden in "VIDEO" mode.
+  def update_avatar_rows(self, USER, VISIBILITY_TABLE, DISPLAY_GROUP, AVATAR_MODE):
+
+    # normally, there is just one user representation per display group
+    # in case of portals, however, a display group may have more than one user representation
+    for _user_repr_at_display_group in USER.user_representations:
+
+      if _user_repr_at_display_group.DISPLAY_GROUP != DISPLAY_GROUP:
+        continue
+
+      _user_visible_for = []
+
+      if AVATAR_MODE == "JOSEPH":
+
+        # visible for all user representations at the display group which are not on same navigation
+        for _user_repr in self.get_viewers_at(DISPLAY_GROUP):
+
+          if _user_repr.connected_navigation_id != _user_repr_at_display_group.connected_navigation_id:
+            _user_visible_for.append(self.get_view_transform_name(_user_repr))
+
+        _user_visible_for.extend(self.get_table_viewer_names(VISIBILITY_TABLE, DISPLAY_GROUP))
+
+      # prevent wildcard from rendering the avatar
+      if len(_user_visible_for) == 0:
+        _user_visible_for = ["do_not_display_group"]
+
+      if self.update_row(_user_repr_at_display_group.avatar, _user_visible_for):
+        _user_repr_at_display_group.set_avatar_group_names(_user_visible_for)
+
+  ## Recomputes the rows of a tool's ToolRepresentations at a display group.
+  # The assigned user's representation is visible for all viewers on other navigations and at other display groups,
+  # the representations of the other users are hidden if they are not on the assigned user's navigation.
+  # @param TOOL The Tool instance whose representations are handled.
+  # @param VISIBILITY_TABLE The tool's visibility table.
+  # @param DISPLAY_GROUP The DisplayGroup to be handled.
+  def update_tool_rows(self, TOOL, VISIBILITY_TABLE, DISPLAY_GROUP):
+
+    _tool_reprs_at_display_group = []
+    _tool_repr_of_assigned_user = None
+
+    for _tool_repr in TOOL.tool_representations:
+
+      if _tool_repr.DISPLAY_GROUP == DISPLAY_GROUP:
+        _tool_reprs_at_display_group.append(_tool_repr)
+
+        if _tool_repr.USER_REPRESENTATION.USER == TOOL.assigned_user:
+          _tool_repr_of_assigned_user = _tool_repr
+
+    _rows = {}
+
+    # without a representation of the assigned user, all representations are reset to be visible for their own users only
+    if _tool_repr_of_assigned_user == None:
+
+      for _tool_repr in _tool_reprs_at_display_group:
+        _rows[_tool_repr] = []
+
+      self.apply_tool_rows(_tool_reprs_at_display_group, _rows)
+      return
+
+    _assigned_user_tool_visible_for = []
+    _assigned_navigation_id = _tool_repr_of_assigned_user.USER_REPRESENTATION.connected_navigation_id
+
+    for _tool_repr in _tool_reprs_at_display_group:
+
+      _rows[_tool_repr] = []
+
+      # if user does not share the assigned user's navigation, hide the tool representation
+      if _tool_repr.USER_REPRESENTATION.connected_navigation_id != _assigned_navigation_id:
+        _rows[_tool_repr].append("do_not_display_group")
+        _assigned_user_tool_visible_for.append(self.get_view_transform_name(_tool_repr.USER_REPRESENTATION))
+
+    _assigned_user_tool_visible_for.extend(self.get_table_viewer_names(VISIBILITY_TABLE, DISPLAY_GROUP))
+    _rows[_tool_repr_of_assigned_user] = _assigned_user_tool_visible_for
+
+    self.apply_tool_rows(_tool_reprs_at_display_group, _rows)
+
+  ## Writes the rows of tool representations whose content changed to their visualizations.
+  # @param TOOL_REPRESENTATIONS List of the ToolRepresentations to be handled.
+  # @param ROWS Dictionary mapping the ToolRepresentations to the lists of group names to be appended to their reset group names.
+  def apply_tool_rows(self, TOOL_REPRESENTATIONS, ROWS):
+
+    for _tool_repr in TOOL_REPRESENTATIONS:
+
+      if self.update_row(_tool_repr, ROWS[_tool_repr]):
+        _tool_repr.reset_visualization_group_names()
+
+        for _string in ROWS[_tool_repr]:
+          _tool_repr.append_to_visualization_group_names(_string)
+
+  ## Recomputes the row of a 3D video's representation at a navigation.
+  # The video is only visible for viewers not on the navigation, to avoid physical overlap.
+  # @param VISIBILITY_TABLE The video's visibility table.
+  # @param VIDEO_3D_REPRESENTATION The Video3DRepresentation at NAVIGATION.
+  # @param NAVIGATION The Navigation instance to be handled.
+  # @param NAVIGATION_DISPLAY_GROUP The DisplayGroup NAVIGATION belongs to.
+  # @param AVATAR_MODE String saying which type of avatars is used, "JOSEPH" or "VIDEO". Videos are hidden in "JOSEPH" mode.
+  def update_video_row(self, VISIBILITY_TABLE, VIDEO_3D_REPRESENTATION, NAVIGATION, NAVIGATION_DISPLAY_GROUP, AVATAR_MODE):
+
+    _video_visible_for = []
+
+    # if the navigation is not used, hide the video representation, also when avatar mode is not set to video
+    if len(NAVIGATION.active_user_representations) > 0 and AVATAR_MODE == "VIDEO":
+
+      _nav_display_group_tag = NAVIGATION_DISPLAY_GROUP.visibility_tag
+
+      for _display_group, _user_reprs in self.get_viewer_groups():
+
+        # if tags are identical, show video due to different navigations
+        if _display_group.visibility_tag == _nav_display_group_tag:
+          _visible = True
+        else:
+          try:
+            _visible = VISIBILITY_TABLE[_display_group.visibility_tag][_nav_display_group_tag]
+          except:
+            _visible = False
+
+        if _visible:
+          for _user_repr in _user_reprs:
+
+            if _display_group.navigations[_user_repr.connected_navigation_id] != NAVIGATION:
+              _video_visible_for.append(self.get_render_group_name(_user_repr))
+
+    # prevent wildcard from rendering the video
+    if len(_video_visible_for) == 0:
+      _video_visible_for = ["do_not_display_group"]
+
+    if self.update_row(VIDEO_3D_REPRESENTATION, _video_visible_for):
+      VIDEO_3D_REPRESENTATION.set_group_names(_video_visible_for)
+
+  ## Recomputes the row of a navigation's trace. Group names are only appended, as the trace lines
+  # may carry further group names.
+  # @param NAVIGATION The Navigation instance whose trace is handled.
+  # @param VISIBILITY_LIST A list containing visibility rules according to the DisplayGroups' visibility tags.
+  def update_trace_row(self, NAVIGATION, VISIBILITY_LIST):
+
+    _trace_visible_for = []
+
+    for _display_group, _user_reprs in self.get_viewer_groups():
+
+      if VISIBILITY_LIST[_display_group.visibility_tag]:
+        for _user_repr in _user_reprs:
+          _trace_visible_for.append(self.get_view_transform_name(_user_repr))
+
+    if len(_trace_visible_for) == 0:
+      _trace_visible_for = ["do_not_display_group"]
+
+    _appended = self.rows.get(NAVIGATION.trace, ())
+    self.update_row(NAVIGATION.trace, _appended + tuple(_string for _string in _trace_visible_for if _string not in _appended))
+
+    for _string in _trace_visible_for:
+
+      if _string not in _appended:
+        NAVIGATION.trace.append_to_group_names(_string)
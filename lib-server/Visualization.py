@@ -9,10 +9,16 @@ import avango.gua
 import avango.script
 from avango.script import field_has_changed
 
-# import python libraries
-import time
+# import framework libraries
+from BoundingBoxEdges import BoundingBoxEdges
+from DistributionPolicy import DistributionPolicy
 
 ## Initializes a bounding box visualization of an object in the scene.
+#
+# The box is distributed as a client-reconstructible carrier node described by BoundingBoxEdges, from which the
+# clients rebuild the edge geometry. The carrier node is only created when the visualization is enabled for the
+# first time. When it is disabled, the box is hidden and the carrier node is handed back to a pool shared by all
+# instances, from which it is reused by the next visualization being enabled below the same nettrans node.
 class BoundingBoxVisualization(avango.script.Script):
 
   # internal fields
@@ -24,6 +30,14 @@ class BoundingBoxVisualization(avango.script.Script):
   # Boolean field indicating if this bounding box visualization is activated.
   sf_enable_flag = avango.SFBool()
 
+  ## @var box_node_pool
+  # Dictionary mapping nettrans nodes to the lists of currently unused carrier nodes appended to them.
+  box_node_pool = {}
+
+  ## @var num_box_nodes
+  # Number of carrier nodes created so far, used to give them unique names.
+  num_box_nodes = 0
+
   ## Default constructor.
   def __init__(self):
     self.super(BoundingBoxVisualization).__init__()
@@ -44,241 +58,117 @@ class BoundingBoxVisualization(avango.script.Script):
     # Reference to the scenegraph in which the handled object is located.
     self.SCENEGRAPH = SCENEGRAPH
 
+    ## @var NET_TRANS_NODE
+    # Active nettrans node to be used for distribution.
+    self.NET_TRANS_NODE = NET_TRANS_NODE
+
+    ## @var material
+    # Material string to be used for the visualization.
+    self.material = MATERIAL
+
     ## @var bb_thickness
     # Thickness of the bounding box lines in meters.
     self.bb_thickness	= 0.01
 
     # variables
-    ## @var lf_node_mat
-    # Last frame matrix of the handled object to detect changes.
-    self.lf_node_mat = avango.gua.make_identity_mat()
-
     ## @var bb
     # The bounding box to be visualized.
     self.bb = None
 
-    # init nodes    
-    _loader = avango.gua.nodes.TriMeshLoader()
-            
-    ## @var edge_group
-    # Scenegraph transformation node to group all the bounding box edges.
-    self.edge_group = avango.gua.nodes.TransformNode()
-    NET_TRANS_NODE.Children.value.append(self.edge_group)
-    
-    ## @var edge1
-    # Geometry node representing the first edge of the visualized bounding box.
-    self.edge1 = _loader.create_geometry_from_file("edge1", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge1.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge1)
-
-    ## @var edge2
-    # Geometry node representing the second edge of the visualized bounding box.
-    self.edge2 = _loader.create_geometry_from_file("edge2", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge2.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge2)
-
-    ## @var edge3
-    # Geometry node representing the third edge of the visualized bounding box.
-    self.edge3 = _loader.create_geometry_from_file("edge3", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge3.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge3)
-
-    ## @var edge4
-    # Geometry node representing the fourth edge of the visualized bounding box.
-    self.edge4 = _loader.create_geometry_from_file("edge4", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge4.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge4)
-
-    ## @var edge5
-    # Geometry node representing the fifth edge of the visualized bounding box.
-    self.edge5 = _loader.create_geometry_from_file("edge5", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge5.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge5)
-
-    ## @var edge6
-    # Geometry node representing the sixth edge of the visualized bounding box.
-    self.edge6 = _loader.create_geometry_from_file("edge6", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge6.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge6)
- 
-    ## @var edge7
-    # Geometry node representing the seventh edge of the visualized bounding box.
-    self.edge7 = _loader.create_geometry_from_file("edge7", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge7.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge7)
-
-    ## @var edge8
-    # Geometry node representing the eighth edge of the visualized bounding box.
-    self.edge8 = _loader.create_geometry_from_file("edge8", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge8.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge8)
-
-    ## @var edge9
-    # Geometry node representing the nineth edge of the visualized bounding box.
-    self.edge9 = _loader.create_geometry_from_file("edge9", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge9.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge9)
-
-    ## @var edge10
-    # Geometry node representing the tenth edge of the visualized bounding box.
-    self.edge10 = _loader.create_geometry_from_file("edge10", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge10.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge10)
-
-    ## @var edge11
-    # Geometry node representing the eleventh edge of the visualized bounding box.
-    self.edge11 = _loader.create_geometry_from_file("edge11", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge11.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge11)
-
-    ## @var edge12
-    # Geometry node representing the twelveth edge of the visualized bounding box.
-    self.edge12 = _loader.create_geometry_from_file("edge12", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge12.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge12)
-    
+    ## @var box_node
+    # Carrier node of the visualized box. None as long as the visualization is disabled.
+    self.box_node = None
+
     # init field connection
     self.sf_node_mat.connect_from(OBJECT.get_node().WorldTransform)
     self.sf_enable_flag.connect_from(OBJECT.sf_highlight_flag)
-  
-    self.edge_group.Transform.connect_from(self.sf_node_mat)
-  
-  
+
 
   # callbacks
   ## Called whenever sf_enable_flag changes.
   @field_has_changed(sf_enable_flag)
   def sf_enable_flag_changed(self):
-    
-    if self.sf_enable_flag.value == True: # set geometry visible
-      self.edge1.GroupNames.value = []
-      self.edge2.GroupNames.value = []      
-      self.edge3.GroupNames.value = []
-      self.edge4.GroupNames.value = []
-      self.edge5.GroupNames.value = []
-      self.edge6.GroupNames.value = []
-      self.edge7.GroupNames.value = []
-      self.edge8.GroupNames.value = []
-      self.edge9.GroupNames.value = []
-      self.edge10.GroupNames.value = []
-      self.edge11.GroupNames.value = []
-      self.edge12.GroupNames.value = []
-
-    else: # set geometry invisible
-      self.edge1.GroupNames.value = ["do_not_display_group"]
-      self.edge2.GroupNames.value = ["do_not_display_group"]
-      self.edge3.GroupNames.value = ["do_not_display_group"]
-      self.edge4.GroupNames.value = ["do_not_display_group"]
-      self.edge5.GroupNames.value = ["do_not_display_group"]
-      self.edge6.GroupNames.value = ["do_not_display_group"]
-      self.edge7.GroupNames.value = ["do_not_display_group"]  
-      self.edge8.GroupNames.value = ["do_not_display_group"]
-      self.edge9.GroupNames.value = ["do_not_display_group"]
-      self.edge10.GroupNames.value = ["do_not_display_group"]
-      self.edge11.GroupNames.value = ["do_not_display_group"]
-      self.edge12.GroupNames.value = ["do_not_display_group"]
-  
-  
-  ## Called whenever sf_node_mat changes.
-  @field_has_changed(sf_node_mat)
-  def sf_node_mat_changed(self):
-
-    #print "object moved"
-    _lf_scale = self.lf_node_mat.get_scale()
-    _scale = self.sf_node_mat.value.get_scale()
-
-    #if _lf_scale != _scale: # scale has changed
-    #  self.update_bb_scale()
-      
-    self.lf_node_mat = self.sf_node_mat.value
+
+    if self.sf_enable_flag.value == True and self.box_node == None: # set geometry visible
+      self.acquire_box_node()
+
+    elif self.sf_enable_flag.value == False and self.box_node != None: # set geometry invisible
+      self.release_box_node()
 
 
   # functions
-  ## Changes the material of the visualized bounding box.
-  # @param MATERIAL The material string to be set and used.
-  def set_material(self, MATERIAL):
+  ## Takes a carrier node from the pool or creates a new one and shows it for the handled object.
+  def acquire_box_node(self):
 
-    self.edge1.Material.value = MATERIAL
-    self.edge2.Material.value = MATERIAL
-    self.edge3.Material.value = MATERIAL
-    self.edge4.Material.value = MATERIAL
-    self.edge5.Material.value = MATERIAL
-    self.edge6.Material.value = MATERIAL
-    self.edge7.Material.value = MATERIAL
-    self.edge8.Material.value = MATERIAL
-    self.edge9.Material.value = MATERIAL
-    self.edge10.Material.value = MATERIAL
-    self.edge11.Material.value = MATERIAL
-    self.edge12.Material.value = MATERIAL
-      
-  ## Calculates the bounding box of the current object.
-  def calc_bb(self):
+    _pool = BoundingBoxVisualization.box_node_pool.setdefault(self.NET_TRANS_NODE, [])
 
-    self.SCENEGRAPH.update_cache()
-  
-    _node = self.OBJECT.get_node()
+    if len(_pool) > 0:
+      self.box_node = _pool.pop()
+    else:
+      self.box_node = BoundingBoxVisualization.create_box_node(self.NET_TRANS_NODE)
 
-    self.bb = _node.BoundingBox.value
-    #print _node.Name.value, len(_node.Children.value), self.bb.Min.value, self.bb.Max.value
+    self.box_node.Transform.connect_from(self.sf_node_mat)
+    self.box_node.GroupNames.value = []
 
     self.update_bb_scale()
 
-  ## Computes and sets the correct transformations for the edges of the visualized bounding box.
-  def update_bb_scale(self):
-    
-    if self.bb != None:
+  ## Hides the box of the handled object and hands its carrier node back to the pool.
+  def release_box_node(self):
 
-      _bb_min = avango.gua.make_inverse_mat(self.sf_node_mat.value) * self.bb.Min.value
-      _bb_max = avango.gua.make_inverse_mat(self.sf_node_mat.value) * self.bb.Max.value
+    self.box_node.Transform.disconnect()
+    self.box_node.GroupNames.value = ["do_not_display_group"]
 
-      _x_min	= _bb_min.x    
-      _x_max	= _bb_max.x
-      _dist_x	= _x_max - _x_min
-      _center_x	= _x_min + _dist_x * 0.5
+    BoundingBoxVisualization.box_node_pool[self.NET_TRANS_NODE].append(self.box_node)
+    self.box_node = None
 
-      _y_min	= _bb_min.y
-      _y_max	= _bb_max.y
-      _dist_y	= _y_max - _y_min
-      _center_y	= _y_min + _dist_y * 0.5
+  ## Creates a carrier node with its description node and appends it to a nettrans node.
+  # @param NET_TRANS_NODE Nettrans node to append the carrier node to.
+  @staticmethod
+  def create_box_node(NET_TRANS_NODE):
 
-      _z_min	= _bb_min.z
-      _z_max	= _bb_max.z
-      _dist_z	= _z_max - _z_min
-      _center_z	= _z_min + _dist_z * 0.5
+    _box_node = avango.gua.nodes.TransformNode(Name = BoundingBoxEdges.node_name_prefix + str(BoundingBoxVisualization.num_box_nodes))
+    _box_node.Children.value = [avango.gua.nodes.TransformNode(Name = "")]
+    BoundingBoxVisualization.num_box_nodes += 1
 
+    NET_TRANS_NODE.Children.value.append(_box_node)
 
-      _world_mat = self.OBJECT.get_world_transform()
-      _scale = _world_mat.get_scale()
+    # carrier nodes are created after the initial distribution and have to be distributed on their own
+    DistributionPolicy.distribute_subtree(NET_TRANS_NODE, _box_node, DistributionPolicy.CLIENT_RECONSTRUCTIBLE)
 
-      # depth edges
-      _scale_mat = avango.gua.make_scale_mat(self.bb_thickness/_scale.x, _dist_y + self.bb_thickness/_scale.y, self.bb_thickness/_scale.z)
+    return _box_node
 
-      self.edge1.Transform.value = avango.gua.make_trans_mat(_x_min, _center_y, _z_min) * _scale_mat
+  ## Changes the material of the visualized bounding box.
+  # @param MATERIAL The material string to be set and used.
+  def set_material(self, MATERIAL):
 
-      self.edge2.Transform.value = avango.gua.make_trans_mat(_x_max, _center_y, _z_min) * _scale_mat
+    self.material = MATERIAL
+    self.update_bb_scale()
 
-      self.edge3.Transform.value = avango.gua.make_trans_mat(_x_min, _center_y, _z_max) * _scale_mat
+  ## Calculates the bounding box of the current object.
+  def calc_bb(self):
 
-      self.edge4.Transform.value = avango.gua.make_trans_mat(_x_max, _center_y, _z_max) * _scale_mat
+    self.SCENEGRAPH.update_cache()
 
-      # width edges
-      _scale_mat = avango.gua.make_scale_mat(_dist_x + self.bb_thickness/_scale.x, self.bb_thickness/_scale.y, self.bb_thickness/_scale.z)
+    _node = self.OBJECT.get_node()
 
-      self.edge5.Transform.value = avango.gua.make_trans_mat(_center_x, _y_min, _z_min) * _scale_mat
+    self.bb = _node.BoundingBox.value
+    #print _node.Name.value, len(_node.Children.value), self.bb.Min.value, self.bb.Max.value
 
-      self.edge6.Transform.value = avango.gua.make_trans_mat(_center_x, _y_max, _z_min) * _scale_mat
+    self.update_bb_scale()
 
-      self.edge7.Transform.value = avango.gua.make_trans_mat(_center_x, _y_min, _z_max) * _scale_mat
-      
-      self.edge8.Transform.value = avango.gua.make_trans_mat(_center_x, _y_max, _z_max) * _scale_mat
+  ## Computes the box in the coordinate system of the handled object and distributes its description to the clients.
+  def update_bb_scale(self):
 
-      # height edges
-      _scale_mat = avango.gua.make_scale_mat(self.bb_thickness/_scale.x, self.bb_thickness/_scale.y, _dist_z + self.bb_thickness/_scale.z)
+    if self.bb != None and self.box_node != None:
 
-      self.edge9.Transform.value = avango.gua.make_trans_mat(_x_min, _y_min, _center_z) * _scale_mat
+      _inverse_node_mat = avango.gua.make_inverse_mat(self.sf_node_mat.value)
+      _bb_min = _inverse_node_mat * self.bb.Min.value
+      _bb_max = _inverse_node_mat * self.bb.Max.value
 
-      self.edge10.Transform.value = avango.gua.make_trans_mat(_x_min, _y_max, _center_z) * _scale_mat
+      _scale = self.OBJECT.get_world_transform().get_scale()
 
-      self.edge11.Transform.value = avango.gua.make_trans_mat(_x_max, _y_min, _center_z) * _scale_mat
+      _info_node = self.box_node.Children.value[0]
+      _string = BoundingBoxEdges.encode(self.material, self.bb_thickness, _bb_min, _bb_max, _scale)
 
-      self.edge12.Transform.value = avango.gua.make_trans_mat(_x_max, _y_max, _center_z) * _scale_mat
+      if _info_node.Name.value != _string:
+        _info_node.Name.value = _string
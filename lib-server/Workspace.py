@@ -12,7 +12,9 @@ from ConsoleIO import *
 from DisplayGroup import *
 from PortalCamera import *
 from RayPointer import *
+from StationHub import StationHub
 from User import *
+from UserIndex import UserIndex
 from Video3D import *
 import Utilities
 
@@ -61,6 +63,11 @@ class Workspace:
     # Instance of Video3D capturing this workspace if it was associated.
     self.video_3D = None
 
+    ## @var user_index
+    # Spatial index of the users' head positions, answering the proximity queries of tools and navigations.
+    self.user_index = UserIndex()
+    self.user_index.my_constructor(self)
+
 
 
   ## Computes a list of users whose tracking targets are not farer away than DISTANCE from a user, taking the line to ground.
@@ -68,19 +75,7 @@ class Workspace:
   # @param DISTANCE The tolerance distance to be applied.
   def get_all_users_in_range(self, POINT, DISTANCE):
 
-    _users_in_range = []
-
-    for _user in self.users:
-
-      if Utilities.compute_point_to_line_distance(POINT, _user.headtracking_reader.sf_abs_vec.value, avango.gua.Vec3(0, -1, 0)) < DISTANCE:
-        _users_in_range.append(_user)
-        #print "In range", _user.id, Utilities.compute_point_to_line_distance(POINT, _user.headtracking_reader.sf_abs_vec.value, avango.gua.Vec3(0, -1, 0))
-
-      else:
-        pass
-        #print "not in range", _user.id, Utilities.compute_point_to_line_distance(POINT, _user.headtracking_reader.sf_abs_vec.value, avango.gua.Vec3(0, -1, 0))
-
-    return _users_in_range
+    return self.user_index.get_users_in_range(POINT, DISTANCE)
 
 
   ## Creates a DisplayGroup instance and adds it to this workspace.
@@ -122,6 +117,21 @@ class Workspace:
 
     self.users.append(_user)
 
+  ## Enables the prediction of the tracking values of a tracking target to compensate the latency between tracking and display.
+  # The tracking matrices are smoothed and extrapolated by a TrackingPredictor before being passed to the readers of the target.
+  # @param TARGET_NAME Name of the tracking station as registered in daemon.
+  # @param LOOK_AHEAD Time in seconds the tracking values are extrapolated into the future or None to disable the prediction.
+  # @param SMOOTHING Smoothing parameter in [0, 1). Larger values suppress more jitter but react slower to changes of the motion.
+  def set_tracking_prediction( self
+                             , TARGET_NAME
+                             , LOOK_AHEAD
+                             , SMOOTHING = 0.0):
+
+    if SMOOTHING < 0.0 or SMOOTHING >= 1.0:
+      print_error("Error in tracking prediction of " + TARGET_NAME + ": smoothing must be in [0, 1).", True)
+
+    StationHub.set_prediction(TARGET_NAME, LOOK_AHEAD, SMOOTHING)
+
   ## Creates a RayPointer instance and adds it to the tools of this workspace.
   # @param POINTER_TRACKING_STATION The tracking target name of this RayPointer.
   # @param POINTER_DEVICE_STATION The device station name of this RayPointer.
@@ -13,6 +13,9 @@ from ApplicationManager import *
 from Portal import *
 from PortalCamera import *
 from Device import *
+from FrameProfiler import *
+from DistributionPolicy import *
+from InputLog import *
 
 from scene_config import scenegraphs
 
@@ -21,8 +24,10 @@ import sys
 import subprocess
 
 # Command line parameters:
-# main.py START_CLIENTS
+# main.py WORKSPACE_CONFIG START_CLIENTS [PROFILE_FILE]
+# @param WORKSPACE_CONFIG Filepath of the workspace configuration file to be loaded.
 # @param START_CLIENTS Boolean saying if the client processes are to be started automatically.
+# @param PROFILE_FILE Optional CSV or JSON file to which frame timings of all scripts are written periodically. Enables frame profiling.
 
 ## Main method for the server application
 def start():
@@ -37,6 +42,11 @@ def start():
   else:
     start_clients = False
 
+  # enable frame profiling before the scripts to be measured are created
+  if len(sys.argv) > 3:
+    frame_profiler = FrameProfiler()
+    frame_profiler.my_constructor(OUTPUT_FILE = sys.argv[3])
+
   # preload materials and shading models
   avango.gua.load_shading_models_from("data/materials")
   avango.gua.load_materials_from("data/materials")
@@ -53,25 +63,23 @@ def start():
   #animation_manager.my_constructor([ graph["/net/platform_0"]]
   #                               , [ application_manager.navigation_list[0]])
 
-  ## distribute all nodes in the scenegraph
-  distribute_all_nodes(scenegraphs[0]["/net"], scenegraphs[0]["/net"])
+  ## distribute the nodes below the nettrans node according to their categories
+  DistributionPolicy.distribute_subtree(scenegraphs[0]["/net"], scenegraphs[0]["/net"])
 
-  # run application loop
-  application_manager.run(locals(), globals())
+  # initialize distribution monitor, can be enabled from the shell by distribution_monitor.enable(True)
+  distribution_monitor = DistributionMonitor()
+  distribution_monitor.my_constructor()
 
-## Registers a scenegraph node and all of its children at a NetMatrixTransform node for distribution.
-# @param NET_TRANS_NODE The NetMatrixTransform node on which all nodes should be marked distributable.
-# @param PARENT_NODE The node that should be registered distributable with all of its children.
-def distribute_all_nodes(NET_TRANS_NODE, NODE):
+  # initialize input recording and replay, can be started from the shell by input_recorder.start(FILENAME)
+  # and input_replayer.start(FILENAME, SPEED, LOOP)
+  input_recorder = InputRecorder()
+  input_recorder.my_constructor(application_manager.workspaces)
 
-  # do not distribute the nettrans node itself
-  if NODE != NET_TRANS_NODE:
-    NET_TRANS_NODE.distribute_object(NODE)
-    #print "distribute", NODE, NODE.Name.value, NODE.Path.value
+  input_replayer = InputReplayer()
+  input_replayer.my_constructor(application_manager.workspaces)
 
-  # iterate over children and make them distributable
-  for _child in NODE.Children.value:
-    distribute_all_nodes(NET_TRANS_NODE, _child)
+  # run application loop
+  application_manager.run(locals(), globals())
 
 
 if __name__ == '__main__':
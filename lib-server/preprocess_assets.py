@@ -0,0 +1,28 @@
+#!/usr/bin/python
+
+## @file
+# Preprocesses the geometry files of the framework into the asset cache. To be run from the framework's root directory
+# whenever geometry files were added or changed. Requires pyassimp.
+
+# import framework libraries
+from AssetCache import AssetCache
+
+# import python libraries
+import sys
+
+# Command line parameters:
+# preprocess_assets.py [DIRECTORY ...]
+# @param DIRECTORY Directory to be searched for OBJ files recursively. Defaults to data/objects.
+
+## Main method for the asset preprocessing.
+def start():
+
+  if len(sys.argv) > 1:
+    _directories = sys.argv[1:]
+  else:
+    _directories = ["data/objects"]
+
+  AssetCache.preprocess_directories(_directories)
+
+if __name__ == '__main__':
+  start()
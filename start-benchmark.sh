@@ -0,0 +1,13 @@
+#!/bin/bash
+
+# Usage: start-benchmark.sh [OPTIONS]
+# Runs the headless frame-loop benchmark of the server scripts, no avango or guacamole installation required.
+# OPTIONS are passed to lib-benchmark/main.py, e.g. --workspaces 2 --display-groups 2 --users 3 --tools 2 --portals 1 --frames 500
+
+# get directory of script
+DIR="$( cd "$( dirname "$0" )" && pwd )"
+
+# stand-in avango modules have to shadow any installed version
+export PYTHONPATH="./lib-benchmark":"./configs":"./lib-server":$PYTHONPATH
+
+cd "$DIR" && python3 ./lib-benchmark/main.py "$@"
@@ -1,8 +1,9 @@
 #!/bin/bash
 
-# Usage: start.sh WORKSPACE_CONFIG_FILE [OPTION]
+# Usage: start.sh WORKSPACE_CONFIG_FILE [OPTION] [PROFILE_FILE]
 # OPTION = server: just starts server
 # OPTION = daemon: just starts daemon
+# PROFILE_FILE: enables frame profiling, timings are written periodically to this CSV or JSON file
 
 # kill running python on this machine
 if [ "$2" != false ] ; then
@@ -44,9 +45,9 @@ fi
 
 # run program
 if [ "$2" != "server" ] ; then
-    cd "$DIR" && python3 ./lib-server/main.py $1 True
+    cd "$DIR" && python3 ./lib-server/main.py $1 True $3
 else 
-	  cd "$DIR" && python3 ./lib-server/main.py $1 False
+	  cd "$DIR" && python3 ./lib-server/main.py $1 False $3
 fi
 
 # kill daemon